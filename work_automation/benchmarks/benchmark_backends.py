@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+ブラウザ操作の方式（Selenium / CDP）のベンチマーク
+
+ローカルの代替画面（timesheet_standin.py）に対して、ヘッドレスChromeを
+デバッグポート9222で起動し、1日分の典型的な操作（遷移、日付の読み取り、
+勤務時間の入力、在宅/出社区分の選択、計算、エラーの読み取り）の所要時間と
+送信コマンド数を方式ごとに比較する。
+
+使い方:
+    python benchmarks/benchmark_backends.py --days 20 --latency 100
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+
+from benchmark_error_scan import CHROME_CANDIDATES, launch_chrome
+from timesheet_standin import start_server
+from classes.driver_service import get_shared_service
+from classes.work_time_automation import WorkTimeAutomation
+
+
+def process_day(automation: WorkTimeAutomation, base_url: str, day) -> None:
+    """1日分の典型的な操作"""
+    driver = automation.driver
+    driver.get(f"{base_url}/daily?date={day:%Y%m%d}")
+    automation.wait_for_page_load()
+    automation.get_current_date()
+    for name, value in (('KNMTMRNGSTDI', '09:00'), ('KNMTMRNGETDI', '18:00')):
+        field = driver.find_element(By.NAME, name)
+        field.clear()
+        field.send_keys(value)
+    Select(driver.find_element(By.NAME, 'GI_COMBOBOX38_Seq0S')).select_by_value(
+        WorkTimeAutomation.LOCATION_VALUES['在宅'])
+    driver.find_element(By.ID, 'btnCalc0').click()
+    automation.check_errors()
+
+
+def run_backend(backend: str, base_url: str, days: list) -> dict:
+    """方式ごとに全日を処理し、1日あたりの時間とコマンド数を集計"""
+    started = time.perf_counter()
+    automation = WorkTimeAutomation.connect_to_existing_chrome(backend=backend)
+    connect_time = time.perf_counter() - started
+    durations = []
+    commands = []
+    try:
+        for day in days:
+            count = automation.command_count
+            started = time.perf_counter()
+            process_day(automation, base_url, day)
+            durations.append((time.perf_counter() - started) * 1000)
+            commands.append(automation.command_count - count)
+    finally:
+        automation.close()
+    return {
+        'connect': connect_time,
+        'mean_ms': sum(durations) / len(durations),
+        'median_ms': median(durations),
+        'commands': sum(commands) / len(commands),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ブラウザ操作の方式（Selenium / CDP）のベンチマーク")
+    parser.add_argument("--days", type=int, default=20, help="処理する日数")
+    parser.add_argument("--start-date", default="2024-01-01", help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--latency", type=int, default=100, help="代替画面の応答遅延（ミリ秒）")
+    parser.add_argument("--chrome", help="Chromeの実行ファイル")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    chrome_path = args.chrome or next((c for c in CHROME_CANDIDATES if shutil.which(c)), None)
+    if not chrome_path:
+        print("Chromeが見つかりません。--chrome で実行ファイルを指定してください")
+        return 1
+
+    server = start_server(0, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    start = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    days = [start + timedelta(days=offset) for offset in range(args.days)]
+
+    with tempfile.TemporaryDirectory() as user_data_dir:
+        chrome = launch_chrome(chrome_path, user_data_dir)
+        try:
+            results = {backend: run_backend(backend, base_url, days) for backend in ('selenium', 'cdp')}
+        finally:
+            get_shared_service().stop()
+            chrome.terminate()
+            server.shutdown()
+
+    print(f"代替画面: {base_url}  応答遅延: {args.latency}ms  日数: {args.days}")
+    print(f"{'方式':<10}{'接続(秒)':>10}{'平均(ms/日)':>14}{'中央値(ms/日)':>16}{'コマンド/日':>12}")
+    for backend, result in results.items():
+        print(f"{backend:<10}{result['connect']:>10.2f}{result['mean_ms']:>14.1f}"
+              f"{result['median_ms']:>16.1f}{result['commands']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+chromedriver 共有サービスのベンチマーク
+
+ヘッドレスChromeをデバッグポート9222で起動し、セッションごとに chromedriver を
+起動する従来の接続と、共有の chromedriver（keep-alive 接続プール）への接続について、
+接続時間（chromedriver の起動を含む）と1コマンドあたりの往復時間を比較する。
+
+使い方:
+    python benchmarks/benchmark_driver_service.py --sessions 5 --samples 200
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_error_scan import CHROME_CANDIDATES, launch_chrome
+from classes.work_time_automation import WorkTimeAutomation
+from classes.driver_service import get_shared_service, measure_command_overhead
+
+
+def run_sessions(shared_service: bool, sessions: int, samples: int) -> dict:
+    """セッションの接続・コマンド送信・終了を繰り返し、時間を集計"""
+    connect_times = []
+    overheads = []
+    for _ in range(sessions):
+        started = time.perf_counter()
+        automation = WorkTimeAutomation.connect_to_existing_chrome(shared_service=shared_service)
+        connect_times.append(time.perf_counter() - started)
+        try:
+            overheads.append(measure_command_overhead(automation.driver, samples))
+        finally:
+            automation.close()
+    return {
+        'first_connect': connect_times[0],
+        'connect': sum(connect_times[1:] or connect_times) / len(connect_times[1:] or connect_times),
+        'mean_ms': sum(o['mean_ms'] for o in overheads) / len(overheads),
+        'median_ms': sum(o['median_ms'] for o in overheads) / len(overheads),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chromedriver 共有サービスのベンチマーク")
+    parser.add_argument("--sessions", type=int, default=5, help="接続するセッション数")
+    parser.add_argument("--samples", type=int, default=200, help="1セッションあたりのコマンド数")
+    parser.add_argument("--chrome", help="Chromeの実行ファイル")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    chrome_path = args.chrome or next((c for c in CHROME_CANDIDATES if shutil.which(c)), None)
+    if not chrome_path:
+        print("Chromeが見つかりません。--chrome で実行ファイルを指定してください")
+        return 1
+
+    with tempfile.TemporaryDirectory() as user_data_dir:
+        chrome = launch_chrome(chrome_path, user_data_dir)
+        try:
+            legacy = run_sessions(False, args.sessions, args.samples)
+            shared = run_sessions(True, args.sessions, args.samples)
+        finally:
+            get_shared_service().stop()
+            chrome.terminate()
+
+    print(f"セッション数: {args.sessions}  コマンド数: {args.samples}/セッション")
+    print(f"{'方式':<24}{'初回接続(秒)':>12}{'2回目以降(秒)':>14}{'平均(ms)':>10}{'中央値(ms)':>12}")
+    for label, result in (("従来（毎回chromedriver起動）", legacy), ("共有chromedriver", shared)):
+        print(f"{label:<20}{result['first_connect']:>12.2f}{result['connect']:>14.2f}"
+              f"{result['mean_ms']:>10.2f}{result['median_ms']:>12.2f}")
+    print(f"chromedriver起動時間（共有・1回のみ）: {get_shared_service().stats()['startup_time']:.2f}秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
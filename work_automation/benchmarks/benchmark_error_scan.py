@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+期間指定エラーチェックのベンチマーク
+
+ローカルの代替画面（timesheet_standin.py）に対して、ヘッドレスChromeを
+デバッグポート9222で起動して接続し、従来の1日ずつの走査とタブ並列走査の
+処理速度（日/分）を比較する。
+
+使い方:
+    python benchmarks/benchmark_error_scan.py --days 60 --tabs 1 4 8 --latency 300
+"""
+import argparse
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from timesheet_standin import errors_for, start_server
+from classes.work_time_automation import WorkTimeAutomation
+from classes.error_scanner import RangeErrorScanner
+
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+
+def launch_chrome(chrome_path: str, user_data_dir: str) -> subprocess.Popen:
+    """デバッグポート9222でヘッドレスChromeを起動"""
+    process = subprocess.Popen([
+        chrome_path,
+        '--headless=new',
+        '--remote-debugging-port=9222',
+        f'--user-data-dir={user_data_dir}',
+        '--no-first-run',
+        '--no-default-browser-check',
+        'about:blank'
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(2)
+    return process
+
+
+def run_legacy_scan(automation: WorkTimeAutomation, base_url: str, dates: list) -> float:
+    """従来方式: 全暦日を1日ずつ遷移し、エラー要素を個別に読み取る"""
+    started = time.perf_counter()
+    for day in dates:
+        automation.driver.get(f"{base_url}/daily?date={day:%Y%m%d}")
+        automation.wait_for_page_load()
+        automation.get_current_date()
+        automation.check_errors()
+    return time.perf_counter() - started
+
+
+def verify(results: dict, dates: list) -> int:
+    """代替画面の既知のエラーと一致しない日数を返す"""
+    mismatches = 0
+    for day in dates:
+        expected = [e for e in errors_for(day) if not any(i in e for i in RangeErrorScanner.IGNORED_ERRORS)]
+        if results.get(day.strftime('%Y-%m-%d')) != expected:
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="期間指定エラーチェックのベンチマーク")
+    parser.add_argument("--days", type=int, default=60, help="走査する暦日数")
+    parser.add_argument("--start-date", default="2024-01-01", help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--tabs", type=int, nargs='+', default=[1, 4, 8], help="比較するタブ数")
+    parser.add_argument("--latency", type=int, default=300, help="代替画面の応答遅延（ミリ秒）")
+    parser.add_argument("--chrome", help="Chromeの実行ファイル")
+    parser.add_argument("--skip-legacy", action="store_true", help="従来方式の計測を省略")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    chrome_path = args.chrome or next((c for c in CHROME_CANDIDATES if shutil.which(c)), None)
+    if not chrome_path:
+        print("Chromeが見つかりません。--chrome で実行ファイルを指定してください")
+        return 1
+
+    server = start_server(0, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    start = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    end = start + timedelta(days=args.days - 1)
+    all_days = [start + timedelta(days=offset) for offset in range(args.days)]
+
+    with tempfile.TemporaryDirectory() as user_data_dir, tempfile.TemporaryDirectory() as output_dir:
+        chrome = launch_chrome(chrome_path, user_data_dir)
+        automation = None
+        try:
+            automation = WorkTimeAutomation.connect_to_existing_chrome()
+            # 実運用のエラー記録を汚さないよう一時ディレクトリに記録
+            automation.error_records_dir = output_dir
+            automation.driver.get(f"{base_url}/daily?date={start:%Y%m%d}")
+
+            print(f"代替画面: {base_url}  応答遅延: {args.latency}ms  期間: {start} 〜 {end}")
+            print(f"{'方式':<28}{'日数':>6}{'秒':>9}{'日/分':>9}{'不一致':>7}")
+
+            if not args.skip_legacy:
+                elapsed = run_legacy_scan(automation, base_url, all_days)
+                print(f"{'従来（全暦日・1日ずつ）':<24}{len(all_days):>6}{elapsed:>9.1f}{len(all_days) / elapsed * 60:>9.1f}{'-':>7}")
+
+            for tabs in args.tabs:
+                automation.driver.get(f"{base_url}/daily?date={start:%Y%m%d}")
+                scanner = RangeErrorScanner(automation, tabs=tabs)
+                results = scanner.scan(f"{start:%Y-%m-%d}", f"{end:%Y-%m-%d}",
+                                       output_file=str(Path(output_dir) / f"scan_{tabs}.csv"))
+                stats = scanner.stats
+                mismatches = verify(results, scanner.target_dates(f"{start:%Y-%m-%d}", f"{end:%Y-%m-%d}"))
+                label = f"走査（平日のみ・{tabs}タブ）"
+                print(f"{label:<24}{stats['days']:>6}{stats['elapsed']:>9.1f}{stats['days_per_minute']:>9.1f}{mismatches:>7}")
+        finally:
+            if automation:
+                automation.close()
+            chrome.terminate()
+            server.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+通信ブロック設定のベンチマーク
+
+ローカルの代替画面（timesheet_standin.py）に対して、ヘッドレスChromeを
+デバッグポート9222で起動し、日次画面の遷移と再読み込みを繰り返したときの
+ページ読み込み時間（Navigation Timing の loadEventEnd）と操作側から見た所要時間を、
+通信ブロック設定の有無で比較する。
+
+使い方:
+    python benchmarks/benchmark_resource_blocking.py --days 20 --static-latency 50
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_error_scan import CHROME_CANDIDATES, launch_chrome
+from timesheet_standin import start_server
+from classes.driver_service import get_shared_service
+from classes.resource_blocking import ResourceBlockingProfile
+from classes.work_time_automation import WorkTimeAutomation
+
+
+def run_navigations(automation: WorkTimeAutomation, base_url: str, days: list) -> dict:
+    """全日を遷移・再読み込みし、読み込み時間を集計"""
+    load_times = []
+    wall_times = []
+    for day in days:
+        for action in ('get', 'refresh'):
+            started = time.perf_counter()
+            if action == 'get':
+                automation.driver.get(f"{base_url}/daily?date={day:%Y%m%d}")
+            else:
+                automation.driver.refresh()
+            automation.wait_for_page_load()
+            wall_times.append((time.perf_counter() - started) * 1000)
+            load_time = automation.page_load_time()
+            if load_time is not None:
+                load_times.append(load_time)
+    return {
+        'load_mean_ms': sum(load_times) / len(load_times) if load_times else 0.0,
+        'load_median_ms': median(load_times) if load_times else 0.0,
+        'wall_mean_ms': sum(wall_times) / len(wall_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="通信ブロック設定のベンチマーク")
+    parser.add_argument("--days", type=int, default=20, help="遷移する日数（1日あたり遷移と再読み込みを1回ずつ）")
+    parser.add_argument("--start-date", default="2024-01-01", help="開始日（YYYY-MM-DD）")
+    parser.add_argument("--latency", type=int, default=100, help="日次画面の応答遅延（ミリ秒）")
+    parser.add_argument("--static-latency", type=int, default=50, help="静的ファイルの応答遅延（ミリ秒）")
+    parser.add_argument("--backend", choices=["selenium", "cdp"], default="selenium", help="ブラウザ操作の方式")
+    parser.add_argument("--chrome", help="Chromeの実行ファイル")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    chrome_path = args.chrome or next((c for c in CHROME_CANDIDATES if shutil.which(c)), None)
+    if not chrome_path:
+        print("Chromeが見つかりません。--chrome で実行ファイルを指定してください")
+        return 1
+
+    server = start_server(0, args.latency, args.static_latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    start = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    days = [start + timedelta(days=offset) for offset in range(args.days)]
+    # 代替画面のアクセス解析スクリプトは同一ホストのため、パターンを追加
+    profile = ResourceBlockingProfile(blocked_urls=['*/analytics/*'])
+
+    with tempfile.TemporaryDirectory() as user_data_dir:
+        chrome = launch_chrome(chrome_path, user_data_dir)
+        automation = None
+        try:
+            automation = WorkTimeAutomation.connect_to_existing_chrome(backend=args.backend)
+            results = {'ブロックなし': run_navigations(automation, base_url, days)}
+            automation.set_resource_blocking(profile)
+            results['ブロックあり'] = run_navigations(automation, base_url, days)
+            automation.set_resource_blocking(None)
+        finally:
+            if automation:
+                automation.close()
+            get_shared_service().stop()
+            chrome.terminate()
+            server.shutdown()
+
+    print(f"代替画面: {base_url}  応答遅延: {args.latency}ms  静的ファイル遅延: {args.static_latency}ms  "
+          f"読み込み回数: {args.days * 2}")
+    print(f"{'設定':<10}{'読み込み平均(ms)':>16}{'読み込み中央値(ms)':>18}{'操作側平均(ms)':>16}")
+    for label, result in results.items():
+        print(f"{label:<10}{result['load_mean_ms']:>16.1f}{result['load_median_ms']:>18.1f}{result['wall_mean_ms']:>16.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+勤務実績入力（日次用）画面のローカル代替サーバー
+
+ベンチマーク用に、自動化が参照する要素（日付表示、勤務時間、在宅/出社区分、
+休憩時間、エラー表示、計算・次へ・提出ボタン、ToNextDateActionの翌日リンク）と、
+自動化では使わないロゴ・バナー画像・Webフォント・アクセス解析スクリプトを持つ画面を返す。
+日次画面と静的ファイルそれぞれの応答遅延を指定できる。
+
+使い方:
+    python benchmarks/timesheet_standin.py --port 8765 --latency 300 --static-latency 50
+    → http://127.0.0.1:8765/daily?date=20240115
+"""
+import argparse
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WEEKDAY_NAMES = ['月', '火', '水', '木', '金', '土', '日']
+
+
+def errors_for(day: date) -> list:
+    """日付ごとに決まったエラーを返す（結果の検証用に再現性を持たせる）"""
+    errors = []
+    if day.day % 7 == 3:
+        errors.append("深夜勤務申請が提出されていません")
+    if day.day % 10 == 5:
+        errors.append("勤務時間と工数の合計が一致しません")
+    if day.weekday() < 5 and day.day % 2 == 0:
+        errors.append("在宅/出社区分が入力されていません")
+    return errors
+
+
+def render_daily_page(day: date) -> str:
+    """日次画面のHTMLを生成"""
+    next_day = day + timedelta(days=1)
+    previous_day = day - timedelta(days=1)
+    errors = "\n".join(f'<div class="error">{message}</div>' for message in errors_for(day))
+    end_time = "23:00" if day.day % 7 == 3 else "18:00"
+    return f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>勤務実績入力（日次用）</title>
+<link rel="stylesheet" href="/static/app.css">
+<script src="/static/app.js"></script>
+<script async src="/analytics/collect.js"></script>
+</head>
+<body>
+<img id="srw_global_logo_img" src="/static/logo.png" alt="logo">
+<img id="srw_banner" src="/static/banner.jpg?v=2" alt="banner">
+<div id="srw_page_navi">
+  <a title="前日" onclick="ToPrevDateAction(); location.href='/daily?date={previous_day:%Y%m%d}'">前日</a>
+  <div id="srw_page_navi_date"><span>{day:%Y/%m/%d}({WEEKDAY_NAMES[day.weekday()]})</span></div>
+  <a title="翌日" onclick="ToNextDateAction(); location.href='/daily?date={next_day:%Y%m%d}'">翌日</a>
+</div>
+<div id="status" class="status">未提出</div>
+{errors}
+<form id="daily" method="post" action="/daily?date={day:%Y%m%d}">
+  <input type="text" name="KNMTMRNGSTDI" value="9:00">
+  <input type="text" name="KNMTMRNGETDI" value="{end_time}">
+  <select name="GI_COMBOBOX38_Seq0S">
+    <option value=""></option>
+    <option value="2">在宅</option>
+    <option value="5">出社（通勤費往復）</option>
+    <option value="6">出社（通勤費片道）</option>
+    <option value="7">出社（通勤費なし）</option>
+    <option value="4">その他</option>
+  </select>
+  <input type="text" name="RCSST10_Seq0STDI" value="12:00">
+  <input type="text" name="RCSST10_Seq0ETDI" value="13:00">
+  <button type="button" id="btnCalc0">計算</button>
+  <button type="button" id="btnNext0">次へ</button>
+</form>
+<div id="srw_fixed_footer_button_area">フッター</div>
+</body>
+</html>"""
+
+
+STATIC_FILES = {
+    '/static/app.css': ('text/css', b"@font-face { font-family: AppFont; src: url(/static/app.woff2); } "
+                                    b"body { font-family: AppFont, sans-serif; } .error { color: red; }"),
+    '/static/app.js': ('application/javascript',
+                       b"function ToNextDateAction() {} function ToPrevDateAction() {}"),
+    '/static/logo.png': ('image/png', b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048),
+    '/static/banner.jpg': ('image/jpeg', b"\xff\xd8\xff\xe0" + b"\x00" * 65536),
+    '/static/app.woff2': ('font/woff2', b"wOF2" + b"\x00" * 32768),
+    '/analytics/collect.js': ('application/javascript', b"window.__analyticsLoaded = true;"),
+}
+
+
+class TimesheetHandler(BaseHTTPRequestHandler):
+    """日次画面と静的ファイルを返すハンドラ"""
+
+    latency = 0.0
+    static_latency = 0.0
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+
+        if parsed.path in STATIC_FILES:
+            content_type, body = STATIC_FILES[parsed.path]
+            time.sleep(self.static_latency)
+            self._respond(200, content_type, body)
+            return
+
+        if parsed.path == '/daily':
+            value = parse_qs(parsed.query).get('date', [date.today().strftime('%Y%m%d')])[0]
+            try:
+                day = datetime.strptime(value, '%Y%m%d').date()
+            except ValueError:
+                self._respond(400, 'text/plain', b"invalid date")
+                return
+            time.sleep(self.latency)
+            self._respond(200, 'text/html; charset=utf-8', render_daily_page(day).encode('utf-8'))
+            return
+
+        self._respond(404, 'text/plain', b"not found")
+
+    def _respond(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        # 遷移のたびに再取得させる（キャッシュの再検証を伴う実画面と同様の読み込み量）
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int = 0, latency_ms: int = 0, static_latency_ms: int = 0) -> ThreadingHTTPServer:
+    """
+    バックグラウンドスレッドでサーバーを起動
+
+    Args:
+        port: 待ち受けポート（0の場合は空きポート）
+        latency_ms: 日次画面の応答遅延（ミリ秒）
+        static_latency_ms: 静的ファイルの応答遅延（ミリ秒）
+
+    Returns:
+        ThreadingHTTPServer: 起動したサーバー（server_address[1] でポートを取得）
+    """
+    handler = type('ConfiguredTimesheetHandler', (TimesheetHandler,),
+                   {'latency': latency_ms / 1000, 'static_latency': static_latency_ms / 1000})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="勤務実績入力画面のローカル代替サーバー")
+    parser.add_argument("--port", type=int, default=8765, help="待ち受けポート")
+    parser.add_argument("--latency", type=int, default=300, help="日次画面の応答遅延（ミリ秒）")
+    parser.add_argument("--static-latency", type=int, default=0, help="静的ファイルの応答遅延（ミリ秒）")
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.latency, args.static_latency)
+    print(f"http://127.0.0.1:{server.server_address[1]}/daily?date={date.today():%Y%m%d}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+ボタン操作の完了検知
+
+計算（btnCalc0）・次へ（btnNext0）・提出（dSubmission0）の押下で発生する通信を、
+ページ内に設置した fetch / XMLHttpRequest のフックで追跡する。応答を受け取り、
+画面の更新が落ち着いた時点（画面遷移の場合は遷移先の読み込み完了時点）で戻り、
+サーバーの応答時間と画面への反映時間を分けて記録する。
+"""
+import time
+import uuid
+import logging
+from typing import Any, Dict, Optional
+
+# 通信フックの設置（初回のみ）と、操作の開始・ボタンのクリック
+_CLICK_JS = """
+var button = arguments[0];
+var w = window;
+if (!w.__automationNetHooks) {
+    w.__automationNetHooks = true;
+    var current = function() {
+        var s = w.__automationAction;
+        return s && !s.finished ? s : null;
+    };
+    var begin = function() {
+        var s = current();
+        if (s) {
+            s.requests++;
+            s.pending++;
+            if (s.requestAt === null) { s.requestAt = performance.now(); }
+        }
+        return s;
+    };
+    var end = function(s) {
+        if (!s) { return; }
+        s.pending--;
+        s.responseAt = performance.now();
+        s.paintedAt = null;
+        // 応答処理後の最初の描画フレームを画面への反映とみなす
+        requestAnimationFrame(function() {
+            setTimeout(function() { s.paintedAt = performance.now(); }, 0);
+        });
+    };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        var s = begin();
+        if (s) { this.addEventListener('loadend', function() { end(s); }); }
+        return send.apply(this, arguments);
+    };
+    if (w.fetch) {
+        var originalFetch = w.fetch;
+        w.fetch = function() {
+            var s = begin();
+            var promise = originalFetch.apply(this, arguments);
+            if (s) { promise.then(function() { end(s); }, function() { end(s); }); }
+            return promise;
+        };
+    }
+    new MutationObserver(function() {
+        var s = current();
+        if (s) { s.lastMutation = performance.now(); }
+    }).observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    var leaving = function() {
+        var s = current();
+        if (s) { s.navigating = true; }
+    };
+    w.addEventListener('beforeunload', leaving);
+    w.addEventListener('pagehide', leaving);
+}
+w.__automationAction = {
+    token: arguments[1], started: performance.now(), requests: 0, pending: 0,
+    requestAt: null, responseAt: null, paintedAt: null, lastMutation: null,
+    navigating: false, finished: false
+};
+button.click();
+return true;
+"""
+
+# 操作の状態の取得（遷移した場合は遷移先の読み込み状況）
+_POLL_JS = """
+var s = window.__automationAction;
+var now = performance.now();
+if (s && s.token === arguments[0]) {
+    var finished = arguments[1];
+    if (finished) { s.finished = true; }
+    return {document: 'same', now: now, started: s.started, requests: s.requests, pending: s.pending,
+            requestAt: s.requestAt, responseAt: s.responseAt, paintedAt: s.paintedAt,
+            lastMutation: s.lastMutation, navigating: s.navigating};
+}
+var navigation = performance.getEntriesByType('navigation')[0];
+return {document: 'new', readyState: document.readyState,
+        requestStart: navigation ? navigation.requestStart : null,
+        responseEnd: navigation ? navigation.responseEnd : null,
+        loadEventEnd: navigation ? navigation.loadEventEnd : null};
+"""
+
+
+class ActionCompletionWatcher:
+    """ボタン押下後の通信と画面反映を追跡し、完了した時点で戻るクラス"""
+
+    def __init__(self, driver, timeout: float = 30, start_grace: float = 1.0,
+                 quiet_ms: float = 150, poll_interval: float = 0.05):
+        """
+        初期化
+
+        Args:
+            driver: WebDriver（CDPバックエンドを含む）
+            timeout: 完了待ちの上限（秒）
+            start_grace: 押下後に通信も遷移も始まらない場合に、画面内の処理のみとみなすまでの時間（秒）
+            quiet_ms: 応答後、画面の更新がこの時間途絶えたら反映完了とみなす（ミリ秒）
+            poll_interval: 状態確認の間隔（秒）
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.start_grace = start_grace
+        self.quiet_ms = quiet_ms
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def click_and_wait(self, element, action: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        ボタンをクリックし、発生した通信の応答が画面に反映されるまで待つ
+
+        Args:
+            element: クリックするボタン
+            action: 操作名（記録用）
+            timeout: 完了待ちの上限（省略時は初期化時の値）
+
+        Returns:
+            action, server_ms（通信開始から応答まで）, render_ms（応答から画面反映まで）,
+            total_ms, requests, navigated, timed_out
+        """
+        token = uuid.uuid4().hex
+        started = time.perf_counter()
+        deadline = started + (timeout or self.timeout)
+        self.driver.execute_script(_CLICK_JS, element, token)
+
+        timing = None
+        state = None
+        while time.perf_counter() < deadline:
+            time.sleep(self.poll_interval)
+            try:
+                state = self.driver.execute_script(_POLL_JS, token, False)
+            except Exception as e:
+                # 遷移中は状態を取得できないことがある
+                self.logger.debug(f"操作状態の取得を再試行します: {e}")
+                continue
+            if not isinstance(state, dict):
+                continue
+            timing = self._completed(state)
+            if timing is not None:
+                break
+
+        if timing is None:
+            timing = {'server_ms': None, 'render_ms': None, 'requests': (state or {}).get('requests', 0),
+                      'navigated': False, 'timed_out': True}
+            self.logger.warning(f"{action}: 完了を検知できませんでした（{timeout or self.timeout}秒）")
+        elif not timing['navigated']:
+            try:
+                # 以降の通信を今回の操作に数えない
+                self.driver.execute_script(_POLL_JS, token, True)
+            except Exception:
+                pass
+
+        timing.update(action=action, total_ms=(time.perf_counter() - started) * 1000)
+        return timing
+
+    def _completed(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """状態から完了を判定（未完了なら None）"""
+        if state['document'] == 'new':
+            # 画面遷移: 遷移先の読み込み完了まで待つ
+            if state.get('readyState') != 'complete' or not state.get('loadEventEnd'):
+                return None
+            return {
+                'server_ms': state['responseEnd'] - state['requestStart'],
+                'render_ms': state['loadEventEnd'] - state['responseEnd'],
+                'requests': 1,
+                'navigated': True,
+                'timed_out': False,
+            }
+
+        if state['navigating'] or state['pending'] > 0:
+            return None
+
+        now = state['now']
+        if state['requests'] == 0:
+            # 通信が始まらない操作（入力チェックのみ等）は、猶予時間後に画面の更新が落ち着いていれば完了
+            last_change = state['lastMutation'] or state['started']
+            if now - state['started'] < self.start_grace * 1000 or now - last_change < self.quiet_ms:
+                return None
+            return {
+                'server_ms': 0.0,
+                'render_ms': (state['lastMutation'] - state['started']) if state['lastMutation'] else 0.0,
+                'requests': 0,
+                'navigated': False,
+                'timed_out': False,
+            }
+
+        # 通信あり: 応答後の描画が済み、画面の更新が落ち着くまで待つ
+        if state['paintedAt'] is None:
+            return None
+        last_change = max(state['responseAt'], state['lastMutation'] or 0)
+        if now - last_change < self.quiet_ms:
+            return None
+        applied = max(state['paintedAt'], state['lastMutation'] or 0)
+        return {
+            'server_ms': state['responseAt'] - state['requestAt'],
+            'render_ms': applied - state['responseAt'],
+            'requests': state['requests'],
+            'navigated': False,
+            'timed_out': False,
+        }
@@ -0,0 +1,586 @@
+"""
+常駐型の自動化デーモンとジョブAPI
+
+Chromeに接続済みの WorkTimeAutomation を保持したまま常駐し、
+localhost の HTTP でジョブ（CSV一括入力・期間エラーチェック）を受け付ける。
+ジョブは1件ずつ順に実行し、進捗（ログと1日ごとの結果）を NDJSON で返す。
+
+API:
+    POST /jobs                 ジョブを登録（{"type": "bulk", "csv": ...} など）
+    GET  /jobs                 ジョブ一覧
+    GET  /jobs/<id>            ジョブの状態
+    GET  /jobs/<id>/events     進捗の逐次取得（?since=N で N 件目から、ジョブ終了まで接続を保持）
+    POST /shutdown             デーモンを停止
+
+全ての要求に起動時に生成したトークン（0600 のトークンファイルに保存）を X-Daemon-Token ヘッダーで付ける。
+ブラウザからの要求（Origin ヘッダー付き）と Content-Type が application/json でない POST は拒否する。
+
+クライアント側（DaemonClient）は標準ライブラリのみを使用し、pandas・selenium を読み込まない。
+"""
+import hmac
+import json
+import os
+import queue
+import logging
+import secrets
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib import error as urlerror
+from urllib import request as urlrequest
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 終了済みのジョブの状態
+FINISHED_STATUSES = ('success', 'failure', 'error', 'cancelled')
+
+# 認証トークンを送るヘッダー
+TOKEN_HEADER = 'X-Daemon-Token'
+
+
+def default_token_file(port: int) -> str:
+    """ポートごとの認証トークンファイルの既定の保存先（ユーザーのホーム配下）"""
+    return os.path.join(os.path.expanduser('~'), '.work_automation', f'daemon_{port}.token')
+
+
+def write_token_file(path: str) -> str:
+    """新しい認証トークンを生成し、本人のみ読み書きできるファイル（0600）に保存して返す"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    # 既存のファイルの権限を引き継がないよう作り直す
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+def read_token_file(path: str) -> Optional[str]:
+    """認証トークンファイルを読み込む（無い場合は None）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _default_automation_factory(debugger_address: Optional[str] = None, managed_chrome=None):
+    from .work_time_automation import WorkTimeAutomation
+
+    if managed_chrome is not None:
+        # 自動化用のChromeを起動（動作中なら再利用）して接続
+        return WorkTimeAutomation.launch_managed_chrome(managed_chrome)
+    if debugger_address:
+        return WorkTimeAutomation.connect_to_existing_chrome(debugger_address)
+    return WorkTimeAutomation.connect_to_existing_chrome()
+
+
+def _filter_date_range(csv_processor, start_date: Optional[str], end_date: Optional[str]) -> int:
+    """CSVの対象日を期間で絞り込む（残った日数を返す）"""
+    from .navigation_planner import parse_date_text
+
+    start = parse_date_text(start_date) if start_date else None
+    end = parse_date_text(end_date) if end_date else None
+
+    def in_range(value) -> bool:
+        day = parse_date_text(str(value))
+        if day is None:
+            return False
+        return (start is None or day >= start) and (end is None or day <= end)
+
+    csv_processor.data = csv_processor.data[csv_processor.data['日付'].map(in_range)]
+    return len(csv_processor.data)
+
+
+def run_bulk_job(automation, params: Dict[str, Any]) -> Dict[str, Any]:
+    """CSV一括入力ジョブ"""
+    from .bulk_automation import BulkWorkAutomation
+    from .csv_processor import WorkDataCSVProcessor
+    from .results_journal import ResultsJournal
+
+    logger = logging.getLogger("AutomationDaemon")
+    csv_file = params['csv']
+    csv_processor = WorkDataCSVProcessor(csv_file)
+    if not csv_processor.load_csv_data():
+        return {'success': False, 'message': "CSVファイルの読み込みに失敗しました"}
+    if not csv_processor.validate_data():
+        return {'success': False, 'message': "データ検証でエラーが見つかりました"}
+
+    if params.get('start_date') or params.get('end_date'):
+        days = _filter_date_range(csv_processor, params.get('start_date'), params.get('end_date'))
+        logger.info(f"処理期間: {params.get('start_date') or '最初'} 〜 {params.get('end_date') or '最後'}（{days}日分）")
+    csv_processor.show_data_summary()
+
+    bulk_processor = BulkWorkAutomation(automation, csv_processor)
+    if not params.get('dry_run'):
+        # ドライランは入力しないため、再開に使うジャーナルへは記録しない
+        journal_file = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "journals",
+            f"{os.path.splitext(os.path.basename(csv_file))[0]}.jsonl"
+        )
+        bulk_processor.attach_journal(ResultsJournal(journal_file), resume=bool(params.get('resume')))
+
+    success = bulk_processor.process_all_data(
+        dry_run=bool(params.get('dry_run')),
+        concurrency=int(params.get('concurrency') or 1)
+    )
+    bulk_processor.show_results_summary()
+    result_file = bulk_processor.save_results_to_csv()
+
+    counts = {}
+    for result in bulk_processor.results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return {'success': success, 'result_file': result_file, 'counts': counts}
+
+
+def run_error_check_job(automation, params: Dict[str, Any]) -> Dict[str, Any]:
+    """期間エラーチェックジョブ"""
+    from .bulk_automation import BulkWorkAutomation
+    from .csv_processor import WorkDataCSVProcessor
+    from .error_scanner import load_holidays
+
+    holidays = load_holidays(params['holidays']) if params.get('holidays') else set()
+    bulk_automation = BulkWorkAutomation(automation, WorkDataCSVProcessor(None))
+    error_results = bulk_automation.check_errors_only(
+        params['start_date'],
+        params['end_date'],
+        tabs=int(params.get('tabs') or 4),
+        include_weekends=bool(params.get('include_weekends')),
+        holidays=holidays,
+        include_holidays=bool(params.get('include_holidays'))
+    )
+    error_dates = sorted(date for date, errors in error_results.items() if errors and errors != ["エラーなし"])
+    stats = bulk_automation.error_scan_stats
+    return {
+        'success': True,
+        'error_dates': error_dates,
+        'output_file': stats.get('output_file'),
+        'days_per_minute': stats.get('days_per_minute'),
+    }
+
+
+DEFAULT_RUNNERS = {
+    'bulk': run_bulk_job,
+    'error_check': run_error_check_job,
+}
+
+
+class _JobLogHandler(logging.Handler):
+    """実行中のジョブにログを進捗として流すハンドラ"""
+
+    def __init__(self, daemon: "AutomationDaemon", job: Dict[str, Any]):
+        super().__init__(level=logging.INFO)
+        self.daemon = daemon
+        self.job = job
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.daemon._add_event(self.job, 'log', level=record.levelname,
+                                   logger=record.name, message=record.getMessage())
+        except Exception:
+            self.handleError(record)
+
+
+class AutomationDaemon:
+    """ブラウザに接続済みの自動化インスタンスを保持し、ジョブを順に実行する常駐デーモン"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 debugger_address: Optional[str] = None,
+                 automation_factory: Optional[Callable[[], Any]] = None,
+                 runners: Optional[Dict[str, Callable]] = None,
+                 managed_chrome=None, token_file: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            host: 待ち受けるアドレス（ローカルのみ）
+            port: 待ち受けるポート（0 の場合は空いているポート）
+            debugger_address: 接続先Chromeのデバッグアドレス
+            automation_factory: 自動化インスタンスを生成する関数（テスト用）
+            runners: ジョブ種別と実行関数の対応
+            managed_chrome: 起動して所有するChrome（ManagedChrome、ジョブ間で再利用しデーモン停止時に終了）
+            token_file: 認証トークンの保存先（省略時は ~/.work_automation/daemon_<ポート>.token）
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.managed_chrome = managed_chrome
+        self.automation_factory = automation_factory or (
+            lambda: _default_automation_factory(debugger_address, managed_chrome))
+        self.runners = runners or dict(DEFAULT_RUNNERS)
+        self.automation = None
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.job_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.condition = threading.Condition()
+        self.next_id = 1
+        self.stopping = False
+
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.address = "%s:%d" % self.server.server_address[:2]
+        self.token_file = token_file or default_token_file(self.server.server_address[1])
+        try:
+            self.token = write_token_file(self.token_file)
+        except OSError:
+            self.server.server_close()
+            raise
+        self.worker = threading.Thread(target=self._work_loop, name="AutomationDaemonWorker", daemon=True)
+
+    # ---- ジョブ管理 ----
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ジョブを登録
+
+        Raises:
+            ValueError: ジョブの種別・引数が正しくない場合
+        """
+        if job_type not in self.runners:
+            raise ValueError(f"不明なジョブ種別です: {job_type}")
+        if job_type == 'bulk':
+            if not params.get('csv'):
+                raise ValueError("csv を指定してください")
+            params = dict(params, csv=os.path.abspath(params['csv']))
+            if not os.path.exists(params['csv']):
+                raise ValueError(f"CSVファイルが見つかりません: {params['csv']}")
+        if job_type == 'error_check':
+            for key in ('start_date', 'end_date'):
+                try:
+                    datetime.strptime(params.get(key) or '', '%Y-%m-%d')
+                except ValueError:
+                    raise ValueError(f"{key} はYYYY-MM-DD形式で指定してください")
+
+        with self.condition:
+            if self.stopping:
+                raise ValueError("デーモンは停止処理中です")
+            job = {
+                'id': str(self.next_id),
+                'type': job_type,
+                'params': params,
+                'status': 'queued',
+                'submitted_at': datetime.now().isoformat(timespec='seconds'),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'events': [],
+            }
+            self.next_id += 1
+            self.jobs[job['id']] = job
+            position = sum(1 for j in self.jobs.values() if j['status'] in ('queued', 'running'))
+        self.job_queue.put(job)
+        self.logger.info(f"ジョブを登録しました: #{job['id']} {job_type}（待ち {position - 1}件）")
+        return self.describe(job)
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """ジョブの状態（進捗イベントを除く）"""
+        with self.condition:
+            summary = {key: value for key, value in job.items() if key != 'events'}
+            summary['event_count'] = len(job['events'])
+        return summary
+
+    def events_since(self, job_id: str, since: int = 0, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        since 件目以降の進捗を取得（新しい進捗かジョブ終了まで最大 timeout 秒待つ）
+
+        Returns:
+            {'events': [...], 'finished': bool}、ジョブがない場合は None
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            self.condition.wait_for(
+                lambda: len(job['events']) > since or job['status'] in FINISHED_STATUSES or self.stopping,
+                timeout=timeout
+            )
+            return {'events': job['events'][since:], 'finished': job['status'] in FINISHED_STATUSES}
+
+    def _add_event(self, job: Dict[str, Any], event_type: str, **payload):
+        with self.condition:
+            job['events'].append(dict(payload, type=event_type, index=len(job['events']),
+                                      time=datetime.now().isoformat(timespec='seconds')))
+            self.condition.notify_all()
+
+    def _set_status(self, job: Dict[str, Any], status: str, **fields):
+        with self.condition:
+            job['status'] = status
+            job.update(fields)
+            self.condition.notify_all()
+
+    # ---- 実行 ----
+
+    def _ensure_automation(self):
+        """接続済みの自動化インスタンスを返す（切断されていれば再接続）"""
+        if self.automation is not None:
+            try:
+                self.automation.driver.current_url
+                return self.automation
+            except Exception as e:
+                self.logger.warning(f"ブラウザとの接続が切れています。再接続します: {e}")
+                try:
+                    self.automation.close()
+                except Exception:
+                    pass
+                self.automation = None
+
+        self.logger.info("Chromeブラウザに接続します")
+        self.automation = self.automation_factory()
+        return self.automation
+
+    def _work_loop(self):
+        while True:
+            job = self.job_queue.get()
+            if job is None:
+                break
+            if job['status'] != 'queued':
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job: Dict[str, Any]):
+        self._set_status(job, 'running', started_at=datetime.now().isoformat(timespec='seconds'))
+        handler = _JobLogHandler(self, job)
+        root_logger = logging.getLogger()
+        root_logger.addHandler(handler)
+        try:
+            self.logger.info(f"ジョブを開始します: #{job['id']} {job['type']}")
+            result = self.runners[job['type']](self._ensure_automation(), job['params'])
+            status = 'success' if result.get('success') else 'failure'
+        except Exception as e:
+            self.logger.error(f"ジョブでエラーが発生しました: #{job['id']} - {e}", exc_info=True)
+            result = {'success': False, 'message': str(e)}
+            status = 'error'
+        finally:
+            root_logger.removeHandler(handler)
+            if self.managed_chrome is not None and self.automation is not None:
+                # ジョブ中に更新されたセッションCookieを保存（Chromeが落ちても次回の起動で使える）
+                self.managed_chrome.save_cookies(self.automation.driver)
+
+        self._add_event(job, 'finished', status=status, result=result)
+        self._set_status(job, status, result=result, finished_at=datetime.now().isoformat(timespec='seconds'))
+        self.logger.info(f"ジョブが終了しました: #{job['id']} {status}")
+
+    # ---- 起動・停止 ----
+
+    def start(self):
+        """ジョブの実行スレッドとHTTPサーバーをバックグラウンドで開始"""
+        self.worker.start()
+        threading.Thread(target=self.server.serve_forever, name="AutomationDaemonServer", daemon=True).start()
+        self.logger.info(f"デーモンを開始しました: http://{self.address}")
+
+    def serve_forever(self):
+        """ジョブの実行スレッドを開始し、停止要求までHTTPサーバーを実行"""
+        self.worker.start()
+        self.logger.info(f"デーモンを開始しました: http://{self.address}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self._stop_worker()
+
+    def shutdown(self):
+        """デーモンを停止（待ちのジョブは取り消し、実行中のジョブの終了を待つ）"""
+        self.server.shutdown()
+        self._stop_worker()
+
+    def _stop_worker(self):
+        with self.condition:
+            if self.stopping:
+                return
+            self.stopping = True
+            for job in self.jobs.values():
+                if job['status'] == 'queued':
+                    job['status'] = 'cancelled'
+            self.condition.notify_all()
+        self.job_queue.put(None)
+        if self.worker.is_alive() and threading.current_thread() is not self.worker:
+            self.worker.join()
+        self.server.server_close()
+        if self.automation is not None:
+            self.automation.close()
+            self.automation = None
+        if self.managed_chrome is not None:
+            self.managed_chrome.stop()
+        try:
+            os.remove(self.token_file)
+        except OSError:
+            pass
+        self.logger.info("デーモンを停止しました")
+
+    # ---- HTTP ----
+
+    def _handler_class(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                daemon.logger.debug("%s - %s" % (self.address_string(), format % args))
+
+            def _send_json(self, status: int, body: Any):
+                data = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _authorize(self, require_json: bool = False) -> bool:
+                """ブラウザからの要求・トークン不一致・JSON以外の本文を拒否（拒否した場合は応答済み）"""
+                if self.headers.get('Origin') is not None:
+                    # ブラウザ上のページからの要求（CSRF・DNSリバインディング）は受け付けない
+                    self._send_json(403, {'error': "ブラウザからの要求は受け付けません"})
+                    return False
+                token = self.headers.get(TOKEN_HEADER) or ''
+                if not hmac.compare_digest(token.encode('utf-8'), daemon.token.encode('utf-8')):
+                    self._send_json(401, {'error': "認証トークンが正しくありません"})
+                    return False
+                content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+                if require_json and content_type != 'application/json':
+                    self._send_json(415, {'error': "Content-Type は application/json を指定してください"})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._authorize():
+                    return
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split('/') if part]
+                if parts == ['jobs']:
+                    self._send_json(200, [daemon.describe(job) for job in list(daemon.jobs.values())])
+                elif len(parts) == 2 and parts[0] == 'jobs' and parts[1] in daemon.jobs:
+                    self._send_json(200, daemon.describe(daemon.jobs[parts[1]]))
+                elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events' and parts[1] in daemon.jobs:
+                    since = int(parse_qs(url.query).get('since', ['0'])[0])
+                    self._stream_events(parts[1], since)
+                else:
+                    self._send_json(404, {'error': "見つかりません"})
+
+            def _stream_events(self, job_id: str, since: int):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+                self.end_headers()
+                while True:
+                    chunk = daemon.events_since(job_id, since, timeout=15)
+                    lines = [json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in chunk['events']]
+                    since += len(lines)
+                    try:
+                        # 進捗がない間も空行を送り、切断されたクライアントを検出する
+                        self.wfile.write(("".join(lines) or "\n").encode('utf-8'))
+                        self.wfile.flush()
+                    except OSError:
+                        return
+                    # 終了イベントは状態の更新より先に追加されるため、終了時点で全件送信済み
+                    if chunk['finished'] or (daemon.stopping and not lines):
+                        return
+
+            def do_POST(self):
+                if not self._authorize(require_json=True):
+                    return
+                parts = [part for part in urlparse(self.path).path.split('/') if part]
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self._send_json(400, {'error': "JSONの形式が正しくありません"})
+                    return
+
+                if parts == ['jobs']:
+                    params = dict(body)
+                    job_type = params.pop('type', None)
+                    try:
+                        self._send_json(202, daemon.submit(job_type, params))
+                    except ValueError as e:
+                        self._send_json(400, {'error': str(e)})
+                elif parts == ['shutdown']:
+                    self._send_json(200, {'stopping': True})
+                    threading.Thread(target=daemon.shutdown, daemon=True).start()
+                else:
+                    self._send_json(404, {'error': "見つかりません"})
+
+        return Handler
+
+
+class DaemonError(Exception):
+    """デーモンへの要求が失敗した場合の例外"""
+
+
+class DaemonClient:
+    """デーモンのジョブAPIのクライアント（ジョブの登録はすぐに戻る）"""
+
+    def __init__(self, address: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float = 10,
+                 token_file: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            address: デーモンのアドレス（ホスト:ポート）
+            timeout: 要求のタイムアウト（秒）
+            token_file: デーモンの認証トークンファイル（省略時はポートごとの既定の保存先）
+        """
+        self.base_url = f"http://{address}"
+        self.timeout = timeout
+        self.token_file = token_file or default_token_file(int(address.rsplit(':', 1)[1]))
+
+    def _headers(self) -> Dict[str, str]:
+        """認証トークン付きの要求ヘッダー（デーモンの再起動でトークンが変わるため毎回読み込む）"""
+        token = read_token_file(self.token_file)
+        if token is None:
+            raise DaemonError(f"認証トークンが見つかりません（{self.token_file}）。デーモンが起動しているか確認してください")
+        return {TOKEN_HEADER: token, 'Content-Type': 'application/json'}
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else None
+        req = urlrequest.Request(self.base_url + path, data=data, method=method, headers=self._headers())
+        try:
+            with urlrequest.urlopen(req, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urlerror.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error')
+            except ValueError:
+                message = str(e)
+            raise DaemonError(message)
+        except urlerror.URLError as e:
+            raise DaemonError(f"デーモンに接続できません（{self.base_url}）: {e.reason}")
+
+    def is_running(self) -> bool:
+        """デーモンが応答するか"""
+        try:
+            self._request('GET', '/jobs')
+            return True
+        except DaemonError:
+            return False
+
+    def submit(self, job_type: str, **params) -> Dict[str, Any]:
+        """ジョブを登録"""
+        return self._request('POST', '/jobs', dict(params, type=job_type))
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        """ジョブの状態"""
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """ジョブ一覧"""
+        return self._request('GET', '/jobs')
+
+    def follow(self, job_id: str, since: int = 0) -> Iterator[Dict[str, Any]]:
+        """ジョブの進捗を終了まで逐次取得"""
+        req = urlrequest.Request(f"{self.base_url}/jobs/{job_id}/events?since={since}", headers=self._headers())
+        try:
+            response = urlrequest.urlopen(req, timeout=60)
+        except urlerror.URLError as e:
+            raise DaemonError(f"進捗を取得できません: {e}")
+        with response:
+            for line in response:
+                line = line.strip()
+                if line:
+                    yield json.loads(line.decode('utf-8'))
+
+    def shutdown(self) -> Dict[str, Any]:
+        """デーモンを停止"""
+        return self._request('POST', '/shutdown', {})
@@ -0,0 +1,405 @@
+"""
+複数Chromeでの並列処理クラス
+
+担当者ごとにログイン済みのChromeプロファイルをデバッグポート付きで起動（または接続）し、
+(担当者, CSV) のジョブを別プロセスで並列に処理する。
+"""
+import csv
+import json
+import os
+import queue
+import shutil
+import subprocess
+import time
+import logging
+import multiprocessing
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+CHROME_CANDIDATES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+
+
+def find_chrome() -> Optional[str]:
+    """Chromeの実行ファイルを探す"""
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def is_chrome_alive(port: int, timeout: float = 2) -> bool:
+    """デバッグポートが応答するか確認"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def launch_chrome(chrome_path: str, port: int, user_data_dir: str,
+                  profile_directory: Optional[str] = None, timeout: float = 30,
+                  extra_args: Optional[List[str]] = None) -> subprocess.Popen:
+    """
+    デバッグポート付きでChromeを起動し、ポートが応答するまで待機
+
+    Args:
+        extra_args: 追加の起動引数（ヘッドレス実行用の調整など）
+
+    Raises:
+        RuntimeError: 起動待ちがタイムアウトした場合
+    """
+    command = [
+        chrome_path,
+        f'--remote-debugging-port={port}',
+        f'--user-data-dir={user_data_dir}',
+        '--no-first-run',
+        '--no-default-browser-check',
+    ]
+    if profile_directory:
+        command.append(f'--profile-directory={profile_directory}')
+    command.extend(extra_args or [])
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if is_chrome_alive(port):
+            return process
+        if process.poll() is not None:
+            break
+        time.sleep(0.5)
+    raise RuntimeError(f"Chrome（ポート{port}）の起動を確認できません")
+
+
+def load_pool_config(config_file: str) -> Dict[str, Any]:
+    """
+    ワーカー構成ファイル（JSON）を読み込む
+
+    形式:
+        {
+          "chrome_path": "C:/Program Files/Google/Chrome/Application/chrome.exe",
+          "workers": [
+            {"name": "yamada", "port": 9222, "user_data_dir": "C:/temp/chrome_yamada",
+             "url": "https://...（任意: 開始時に開く日次画面）",
+             "jobs": [{"employee": "山田", "csv": "yamada_202401.csv"}]}
+          ]
+        }
+
+    Raises:
+        ValueError: 構成に不備がある場合
+    """
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    workers = config.get('workers') or []
+    if not workers:
+        raise ValueError("workers が指定されていません")
+
+    base_dir = Path(config_file).parent
+    names, ports = set(), set()
+    for worker in workers:
+        for key in ('name', 'port', 'jobs'):
+            if key not in worker:
+                raise ValueError(f"ワーカーに {key} が指定されていません: {worker}")
+        if worker['name'] in names:
+            raise ValueError(f"ワーカー名が重複しています: {worker['name']}")
+        if worker['port'] in ports:
+            raise ValueError(f"デバッグポートが重複しています: {worker['port']}")
+        names.add(worker['name'])
+        ports.add(worker['port'])
+        for job in worker['jobs']:
+            if 'employee' not in job or 'csv' not in job:
+                raise ValueError(f"ジョブには employee と csv が必要です: {job}")
+            # 相対パスは構成ファイルの位置を基準にする
+            job['csv'] = str(base_dir / job['csv'])
+    return config
+
+
+def run_worker(worker: Dict[str, Any], jobs: List[Dict[str, Any]], events, chrome_path: Optional[str] = None):
+    """
+    ワーカープロセスの本体: Chromeへ接続し、割り当てられたジョブを順に処理
+
+    進捗は events キューへ辞書で通知する（ready / job_started / day / job_finished / worker_error）。
+    各ジョブの skip_dates に含まれる日付は再起動前に処理済みのため飛ばす。
+    worker に journal_dir がある場合、ジョブごとの処理結果を <ワーカー名>_<CSV名>.jsonl へ逐次追記する。
+    """
+    from .work_time_automation import WorkTimeAutomation
+    from .csv_processor import WorkDataCSVProcessor
+    from .bulk_automation import BulkWorkAutomation
+    from .results_journal import ResultsJournal
+
+    name = worker['name']
+    port = worker['port']
+    automation = None
+
+    def notify(event_type: str, **payload):
+        events.put({'type': event_type, 'worker': name, 'time': datetime.now(), **payload})
+
+    if worker.get('log_file'):
+        # ワーカープロセスの詳細ログはワーカーごとのファイルへ
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[logging.FileHandler(worker['log_file'], encoding='utf-8')]
+        )
+
+    try:
+        if not is_chrome_alive(port):
+            if not worker.get('user_data_dir') or not worker.get('launch', True):
+                raise RuntimeError(f"ポート{port}のChromeに接続できません")
+            launch_chrome(chrome_path or find_chrome(), port, worker['user_data_dir'],
+                          worker.get('profile_directory'))
+
+        automation = WorkTimeAutomation.connect_to_existing_chrome(f"127.0.0.1:{port}")
+        automation.screenshot_dir = os.path.join(automation.screenshot_dir, name)
+        os.makedirs(automation.screenshot_dir, exist_ok=True)
+        if worker.get('url'):
+            automation.driver.get(worker['url'])
+            automation.wait_for_page_load()
+        notify('ready', port=port)
+
+        for job in jobs:
+            employee = job['employee']
+            notify('job_started', employee=employee, csv=job['csv'])
+
+            csv_processor = WorkDataCSVProcessor(job['csv'])
+            if not csv_processor.load_csv_data() or not csv_processor.validate_data():
+                notify('job_finished', employee=employee, success=False, message="CSVの読み込み・検証に失敗")
+                continue
+
+            skip_dates = set(job.get('skip_dates') or [])
+            all_data = [d for d in csv_processor.get_all_data() if d['date'] not in skip_dates]
+            bulk = BulkWorkAutomation(automation, csv_processor)
+            if worker.get('journal_dir'):
+                # 再起動後は同じジャーナルへ続けて追記
+                journal_file = os.path.join(worker['journal_dir'], f"{name}_{Path(job['csv']).stem}.jsonl")
+                bulk.attach_journal(ResultsJournal(journal_file), resume=bool(skip_dates))
+            first_result = len(bulk.results)
+            for idx, work_data in enumerate(all_data, 1):
+                bulk._process_work_item(idx, work_data, fallback_route='jump')
+                notify('day', employee=employee, result=bulk.results[-1])
+
+            results = bulk.results[first_result:]
+            failed = [r for r in results if r['status'] == 'failure']
+            notify('job_finished', employee=employee, success=not failed,
+                   message=f"{len(results) - len(failed)}/{len(results)} 件成功")
+
+    except Exception as e:
+        notify('worker_error', message=str(e))
+        raise
+    finally:
+        if automation:
+            automation.close()
+
+
+class BrowserWorkerPool:
+    """複数のChrome（デバッグポート・プロファイル別）でジョブを並列処理し、結果を1か所に集約するクラス"""
+
+    def __init__(self, config: Dict[str, Any], output_dir: Optional[str] = None,
+                 max_restarts: int = 2, heartbeat_timeout: float = 600, health_interval: float = 5,
+                 start_method: str = 'spawn', worker_target: Callable = run_worker,
+                 health_check: Callable[[int], bool] = is_chrome_alive):
+        """
+        初期化
+
+        Args:
+            config: load_pool_config の戻り値
+            output_dir: 進捗・結果の出力先（省略時は logs/pool_YYYYMMDD_HHMMSS）
+            max_restarts: ワーカーごとの再起動の上限
+            heartbeat_timeout: 進捗通知が途絶えたとみなす秒数
+            health_interval: ヘルスチェックの間隔（秒）
+            start_method: multiprocessing の起動方式
+            worker_target: ワーカープロセスで実行する関数
+            health_check: ポート番号を受け取りChromeの応答を確認する関数
+        """
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if output_dir is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_dir = str(Path(__file__).parent.parent / "logs" / f"pool_{timestamp}")
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.progress_file = os.path.join(self.output_dir, "progress.jsonl")
+        self.results_file = os.path.join(self.output_dir, "results.csv")
+        self.max_restarts = max_restarts
+        self.heartbeat_timeout = heartbeat_timeout
+        self.health_interval = health_interval
+        self.context = multiprocessing.get_context(start_method)
+        self.worker_target = worker_target
+        self.health_check = health_check
+        self.results = []  # {'worker', 'employee', 'date', 'status', ...}
+        self.job_results = []  # {'worker', 'employee', 'success', 'message'}
+        self.states = {}
+
+    def run(self) -> bool:
+        """
+        全ワーカーを起動し、完了まで監視
+
+        Returns:
+            bool: 全ジョブが成功した場合 True
+        """
+        events = self.context.Queue()
+        for worker in self.config['workers']:
+            self.states[worker['name']] = {
+                'worker': worker,
+                'remaining': [dict(job, skip_dates=[]) for job in worker['jobs']],
+                'restarts': 0,
+                'process': None,
+                'ready': False,
+                'last_seen': time.time(),
+            }
+            self._start(worker['name'], events)
+
+        with open(self.progress_file, 'a', encoding='utf-8') as progress:
+            last_check = time.time()
+            while any(state['process'] is not None for state in self.states.values()):
+                try:
+                    self._handle_event(events.get(timeout=self.health_interval), progress)
+                except queue.Empty:
+                    pass
+                if time.time() - last_check >= self.health_interval:
+                    self._check_health(events, progress)
+                    last_check = time.time()
+
+            # 終了後に残った通知を回収
+            while True:
+                try:
+                    self._handle_event(events.get_nowait(), progress)
+                except queue.Empty:
+                    break
+
+        self._save_results()
+        self.show_summary()
+        return bool(self.job_results) and all(job['success'] for job in self.job_results)
+
+    def _start(self, name: str, events):
+        """ワーカープロセスを起動"""
+        state = self.states[name]
+        state['ready'] = False
+        state['last_seen'] = time.time()
+        process = self.context.Process(
+            target=self.worker_target,
+            args=(dict(state['worker'], log_file=os.path.join(self.output_dir, f"{name}.log"),
+                       journal_dir=os.path.join(self.output_dir, "journals")),
+                  state['remaining'], events, self.config.get('chrome_path')),
+            name=f"browser-worker-{name}",
+            daemon=True
+        )
+        process.start()
+        state['process'] = process
+        self.logger.info(f"[{name}] ワーカー起動（ポート{state['worker']['port']}, 残り{len(state['remaining'])}ジョブ）")
+
+    def _handle_event(self, event: Dict[str, Any], progress):
+        """ワーカーからの通知を進捗ファイルと集計に反映"""
+        state = self.states.get(event['worker'])
+        if state is None:
+            return
+        state['last_seen'] = time.time()
+        progress.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+        progress.flush()
+
+        if event['type'] == 'ready':
+            state['ready'] = True
+        elif event['type'] == 'day':
+            result = dict(event['result'], worker=event['worker'], employee=event['employee'])
+            self.results.append(result)
+            if state['remaining'] and result['status'] != 'failure':
+                state['remaining'][0]['skip_dates'].append(result['date'])
+            self.logger.info(f"[{event['worker']}] {event['employee']} {result['date']}: {result['status']}")
+        elif event['type'] == 'job_finished':
+            if state['remaining']:
+                state['remaining'].pop(0)
+            self.job_results.append({'worker': event['worker'], 'employee': event['employee'],
+                                     'success': event['success'], 'message': event['message']})
+            self.logger.info(f"[{event['worker']}] {event['employee']} 完了: {event['message']}")
+        elif event['type'] == 'worker_error':
+            self.logger.error(f"[{event['worker']}] ワーカーエラー: {event['message']}")
+
+    def _check_health(self, events, progress):
+        """プロセスの生存・進捗の途絶・Chromeの応答を確認し、必要なら再起動"""
+        for name, state in self.states.items():
+            process = state['process']
+            if process is None:
+                continue
+
+            reason = None
+            if not process.is_alive():
+                process.join()
+                if not state['remaining']:
+                    state['process'] = None
+                    continue
+                reason = f"プロセス終了（終了コード {process.exitcode}）"
+            elif time.time() - state['last_seen'] > self.heartbeat_timeout:
+                reason = f"{self.heartbeat_timeout:.0f}秒間応答なし"
+            elif state['ready'] and not self.health_check(state['worker']['port']):
+                reason = "Chromeのデバッグポートが応答しません"
+
+            if reason is None:
+                continue
+
+            if process.is_alive():
+                process.terminate()
+                process.join(10)
+
+            # 終了前に届いた通知を反映してから残りのジョブを決める
+            while True:
+                try:
+                    self._handle_event(events.get_nowait(), progress)
+                except queue.Empty:
+                    break
+
+            if not state['remaining']:
+                state['process'] = None
+                continue
+
+            if state['restarts'] >= self.max_restarts:
+                self.logger.error(f"[{name}] {reason}。再起動の上限に達したため残りのジョブを中止します")
+                for job in state['remaining']:
+                    self.job_results.append({'worker': name, 'employee': job['employee'], 'success': False,
+                                             'message': f"ワーカー停止: {reason}"})
+                state['remaining'] = []
+                state['process'] = None
+                continue
+
+            state['restarts'] += 1
+            self.logger.warning(f"[{name}] {reason}。再起動します（{state['restarts']}/{self.max_restarts}）")
+            self._start(name, events)
+
+    def _save_results(self):
+        """全ワーカーの日別結果を1つのCSVに保存"""
+        with open(self.results_file, 'w', newline='', encoding='utf-8-sig') as f:
+            fieldnames = ['worker', 'employee', 'date', 'status', 'message', 'processing_time', 'timestamp']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for result in sorted(self.results, key=lambda r: (r['employee'], r['date'])):
+                timestamp = result.get('timestamp')
+                writer.writerow({
+                    'worker': result['worker'],
+                    'employee': result['employee'],
+                    'date': result['date'],
+                    'status': result['status'],
+                    'message': result.get('message', ''),
+                    'processing_time': result.get('processing_time', ''),
+                    'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S') if isinstance(timestamp, datetime) else timestamp
+                })
+        self.logger.info(f"処理結果を保存しました: {self.results_file}")
+
+    def show_summary(self):
+        """ジョブごとの結果サマリーを表示"""
+        print("\n" + "=" * 30)
+        print("ワーカープール処理結果")
+        print("=" * 30)
+        for job in self.job_results:
+            mark = "✓" if job['success'] else "✗"
+            print(f"{mark} [{job['worker']}] {job['employee']}: {job['message']}")
+        restarts = sum(state['restarts'] for state in self.states.values())
+        print(f"日別結果: {len(self.results)}件 / 再起動: {restarts}回")
+        print(f"出力先: {self.output_dir}")
+        print("=" * 30)
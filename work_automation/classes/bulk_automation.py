@@ -1,6 +1,7 @@
 """
 一括処理クラス
 """
+import os
 import time
 import logging
 from typing import Dict, List, Optional, Any
@@ -10,6 +11,13 @@ from pathlib import Path
 
 from .work_time_automation import WorkTimeAutomation
 from .csv_processor import WorkDataCSVProcessor
+from .navigation_planner import DateNavigationPlanner
+from .error_scanner import RangeErrorScanner
+from .rate_governor import ThroughputGovernor
+from .day_pipeline import DayCheckpointStore, DayStepPipeline
+from .results_journal import ResultsJournal
+from .failure_artifacts import FailureArtifactBuffer
+from .screenshot_pipeline import ScreenshotPipeline
 
 
 class BulkWorkAutomation:
@@ -37,13 +45,46 @@ class BulkWorkAutomation:
         self.session_refresh_interval = 5  # N日毎にセッションリフレッシュ
         self.error_recovery_enabled = True  # エラー自動回復
         self.processed_count = 0  # 処理済み件数のカウンタ
+        
+        # 日付遷移の経路計画（翌日・前日・直接遷移のコストを実測して選択）
+        self.navigation_planner = DateNavigationPlanner(automation)
+        
+        # 単日処理のステップごとのチェックポイント（中断・失敗したステップから再開、CSVごとに分けて保存）
+        error_records_dir = getattr(automation, 'error_records_dir', None)
+        csv_file_path = getattr(csv_processor, 'csv_file_path', None)
+        self.checkpoints = DayCheckpointStore(
+            os.path.join(os.path.dirname(error_records_dir), "checkpoints") if isinstance(error_records_dir, str) else None,
+            source=csv_file_path if isinstance(csv_file_path, str) else None
+        )
+        self.last_failed_step = None
+        
+        # 処理結果のジャーナル（attach_journal で設定）と再開時に飛ばす処理済みの日付
+        self.journal = None
+        self.completed_dates = set()
     
-    def process_all_data(self, dry_run: bool = False) -> bool:
+    def attach_journal(self, journal: ResultsJournal, resume: bool = False):
+        """
+        処理結果を逐次追記するジャーナルを設定
+        
+        Args:
+            journal: ResultsJournal インスタンス
+            resume: True の場合、ジャーナルの処理済みの日を飛ばして続きから処理する
+        """
+        self.journal = journal
+        if resume:
+            previous = journal.latest_results()
+            self.results = previous + self.results
+            self.completed_dates = {r['date'] for r in previous if r['status'] in ResultsJournal.COMPLETED_STATUSES}
+            self.logger.info(f"ジャーナルから再開: 処理済み {len(self.completed_dates)}日 ({journal.path})")
+        journal.start(resume=resume, csv=getattr(self.csv_processor, 'csv_file_path', None))
+    
+    def process_all_data(self, dry_run: bool = False, concurrency: int = 1) -> bool:
         """
         全データを一括処理
         
         Args:
             dry_run: True の場合、実際の入力を行わない
+            concurrency: 並列に処理するタブ数（2以上の場合はタブごとのワーカーで分担）
             
         Returns:
             bool: 全処理が成功した場合 True
@@ -59,6 +100,15 @@ class BulkWorkAutomation:
         
         self.logger.info(f"処理対象: {len(all_data)}日分")
         
+        if self.completed_dates:
+            all_data = [d for d in all_data if d['date'] not in self.completed_dates]
+            self.logger.info(f"処理済みの日を除いた残り: {len(all_data)}日分")
+            if not all_data:
+                return True
+        
+        if concurrency > 1 and not dry_run:
+            return self._process_in_tabs(all_data, concurrency)
+        
         success_count = 0
         
         for idx, work_data in enumerate(all_data, 1):
@@ -79,38 +129,86 @@ class BulkWorkAutomation:
                 success_count += 1
                 continue
             
-            # セッション安定化チェック
-            if self._should_refresh_session(idx):
-                self._refresh_session()
-            
-            # 単日処理を実行（エラー回復付き）
-            success = self._process_single_day_with_recovery(work_data)
-            
-            if success:
+            if self._process_work_item(idx, work_data):
                 success_count += 1
-                self.processed_count += 1
-                self.logger.info(f"✓ {work_data['date']} の処理が完了しました")
-            else:
-                self.logger.error(f"✗ {work_data['date']} の処理に失敗しました")
-                
-                # エラー後の回復処理
-                if self.error_recovery_enabled:
-                    self._perform_error_recovery()
-            
-            # 最後の日でない場合、次の日に遷移
-            if idx < len(all_data):
-                self.logger.info("次の日に遷移します")
-                
-                # 日付遷移は自動化クラスで行う（要素ベース待機）
-                if not self._navigate_to_next_day_with_element_wait():
-                    self.logger.error("日付遷移に失敗しました")
-                    break
         
         # 処理結果のサマリー
         self.logger.info(f"一括処理完了: {success_count}/{len(all_data)} 件成功")
         
         return success_count == len(all_data)
     
+    def _process_work_item(self, idx: int, work_data: Dict[str, Any], fallback_route: Optional[str] = None) -> bool:
+        """
+        対象日へ遷移して1日分を処理（エラー回復付き）
+        
+        Args:
+            idx: 処理順（1から開始）
+            work_data: 1日分の工数データ
+            fallback_route: 表示中の日付が読めない場合の遷移経路
+                （省略時は従来どおり、初日はそのまま、2日目以降は翌日へ遷移）
+            
+        Returns:
+            bool: 処理が成功した場合 True
+        """
+        # セッション安定化チェック
+        if self._should_refresh_session(idx):
+            self._refresh_session()
+        
+        throttle_start = self._throttle_wait()
+        timing_start = self._action_timing_mark()
+        first_result = len(self.results)
+        artifacts = self._failure_artifacts()
+        if artifacts:
+            artifacts.begin(work_data['date'])
+        
+        # 対象日へ遷移（表示中の日付と比較して最も安価な経路を選択）
+        if fallback_route is None:
+            fallback_route = 'none' if idx == 1 else 'next'
+        navigation = self._navigate_to_work_date(work_data['date'], fallback_route)
+        if not navigation['success']:
+            self._record_failure(work_data['date'], "日付遷移に失敗")
+            self._attach_navigation_stats(work_data['date'], navigation)
+            self._attach_throttle_stats(work_data['date'], throttle_start)
+            self._finish_failure_artifacts(work_data['date'])
+            self._journal_results(first_result)
+            return False
+        
+        # 単日処理を実行（エラー回復付き）
+        success = self._process_single_day_with_recovery(work_data)
+        self._attach_navigation_stats(work_data['date'], navigation)
+        self._attach_throttle_stats(work_data['date'], throttle_start)
+        self._attach_action_timings(work_data['date'], timing_start)
+        self._finish_failure_artifacts(work_data['date'])
+        self._journal_results(first_result)
+        
+        if success:
+            self.processed_count += 1
+            self.logger.info(f"✓ {work_data['date']} の処理が完了しました")
+        else:
+            self.logger.error(f"✗ {work_data['date']} の処理に失敗しました")
+            
+            # エラー後の回復処理
+            if self.error_recovery_enabled:
+                self._perform_error_recovery()
+        
+        return success
+    
+    def _process_in_tabs(self, all_data: List[Dict[str, Any]], concurrency: int) -> bool:
+        """タブごとのワーカーで日付を分担して並列処理し、結果を統合"""
+        from .tab_workers import TabWorkerPool
+        
+        pool = TabWorkerPool(self.automation, self.csv_processor, concurrency, journal=self.journal)
+        results = pool.run(all_data)
+        
+        self.results.extend(results)
+        self.processed_count += len([r for r in results if r['status'] == 'success'])
+        
+        processed = {r['date'] for r in results if r['status'] in ('success', 'skipped_already_submitted')}
+        success_count = len([d for d in all_data if d['date'] in processed])
+        self.logger.info(f"一括処理完了（{pool.concurrency}タブ並列）: {success_count}/{len(all_data)} 件成功")
+        
+        return success_count == len(all_data)
+    
     def process_single_day(self, work_data: Dict[str, Any]) -> bool:
         """
         単日の処理
@@ -122,129 +220,192 @@ class BulkWorkAutomation:
             bool: 処理が成功した場合 True
         """
         start_time = datetime.now()
+        command_start = self._webdriver_command_count()
+        self.last_failed_step = None
         
         try:
             self.logger.info(f"日付 {work_data['date']} の処理を開始")
             
-            # 1. 勤務時間入力
-            if not self.automation.input_work_time(
-                work_data['start_time'],
-                work_data['end_time'], 
-                work_data['location_type']
-            ):
-                self._record_failure(work_data['date'], "勤務時間入力に失敗")
-                return False
-            
-            # 2. 休憩時間入力
-            if work_data['break_times']:
-                if not self.automation.input_break_time(work_data['break_times']):
-                    self._record_failure(work_data['date'], "休憩時間入力に失敗")
-                    return False
-            
-            # 3. 計算実行（プロジェクト入力前に実労働時間を計算）
-            self.logger.info("プロジェクト入力前に計算を実行")
-            if not self.automation.calculate():
-                self._record_failure(work_data['date'], "計算処理に失敗")
-                return False
-            
-            # 4. 画面から実労働時間を取得
-            work_time_data = self.automation.get_actual_work_time_from_screen()
-            if work_time_data['success']:
-                actual_work_minutes = work_time_data['actual_work_minutes']
-                actual_work_hours = f"{actual_work_minutes//60}:{actual_work_minutes%60:02d}"
-                self.logger.info(f"画面から取得した実労働時間: {actual_work_hours}")
-                
-                # プロジェクト時間の調整が必要な場合
-                if work_data['projects']:
-                    self._adjust_project_hours(work_data['projects'], actual_work_hours)
-            else:
-                # フォールバック: 従来の方法
-                actual_work_hours = self.automation.get_actual_work_hours()
-                if actual_work_hours:
-                    self.logger.info(f"フォールバック実労働時間: {actual_work_hours}")
-                    
-                    # プロジェクト時間の調整が必要な場合
-                    if work_data['projects']:
-                        self._adjust_project_hours(work_data['projects'], actual_work_hours)
-            
-            # 5. プロジェクト作業入力
-            for idx, project in enumerate(work_data['projects']):
-                if not self.automation.add_project_work(
-                    idx, 
-                    project['time'], 
-                    project['comment']
-                ):
-                    self._record_failure(work_data['date'], f"プロジェクト{idx+1}入力に失敗")
-                    return False
+            # ステップごとに実行し、完了したステップをチェックポイントに記録
+            outcome = DayStepPipeline(self, work_data, self.checkpoints).run()
             
-            # 6. 再度計算実行（プロジェクト入力後）
-            if not self.automation.calculate():
-                self._record_failure(work_data['date'], "計算処理に失敗")
-                return False
+            if outcome['status'] == 'skipped_already_submitted':
+                self._record_skip(work_data['date'], outcome['status'], outcome['message'], start_time)
+                return True
             
-            # 7. エラーチェックと深夜勤務申請エラー対策
-            errors = self.automation.check_errors()
-            if errors:
-                # 深夜勤務申請エラーの自動修正を試行
-                night_work_error_fixed = self.automation.check_and_handle_night_work_error()
-                
-                if night_work_error_fixed:
-                    # 深夜勤務申請エラーが修正された場合、再度エラーチェック
-                    self.logger.info("深夜勤務申請エラー修正後、再度エラーチェックを実行")
-                    errors = self.automation.check_errors()
-                
-                if errors:
-                    # エラーを記録（申請対象のみ）
-                    self.automation.record_error_for_later_application(work_data['date'], errors)
-                    
-                    # 特定のエラー以外の場合はスキップ
-                    if self.automation.should_skip_date_for_errors(errors):
-                        error_msg = f"スキップ対象エラー: {', '.join(errors)}"
-                        self.logger.warning(f"日付をスキップします: {work_data['date']} - {error_msg}")
-                        self._record_failure(work_data['date'], f"スキップ - {error_msg}")
-                        return True  # スキップとして成功扱い
-                    else:
-                        error_msg = f"エラー検出: {', '.join(errors)}"
-                        self._record_failure(work_data['date'], error_msg)
-                        return False
-                else:
-                    self.logger.info("深夜勤務申請エラー修正により、すべてのエラーが解決されました")
-            else:
-                # エラーがない場合でも予防的に深夜勤務申請エラーチェック
-                self.automation.check_and_handle_night_work_error()
+            if outcome['status'] == 'error_skip':
+                self._record_failure(work_data['date'], outcome['message'])
+                return True  # スキップとして成功扱い
             
-            # 8. 確認画面に遷移
-            if not self.automation.save_and_next():
-                self._record_failure(work_data['date'], "確認画面遷移に失敗")
+            if outcome['status'] == 'failure':
+                # 再試行時は失敗したステップから再開する
+                self.last_failed_step = outcome['failed_step']
+                self._record_failure(work_data['date'], outcome['message'])
                 return False
             
-            # 9. 確認画面での提出処理（常に提出）
-            if not self.automation.submit_confirmation():
-                self._record_failure(work_data['date'], "提出ボタンクリックに失敗")
-                return False
-            action = "提出完了"
-            
             # 成功を記録
-            self._record_success(work_data['date'], action, start_time)
+            command_end = self._webdriver_command_count()
+            commands = command_end - command_start if command_start is not None and command_end is not None else None
+            self._record_success(work_data['date'], outcome['message'], start_time, webdriver_commands=commands)
             return True
             
         except Exception as e:
             self._record_failure(work_data['date'], f"予期しないエラー: {e}")
             return False
     
-    def _record_success(self, date: str, message: str, start_time: datetime):
+    def _navigate_to_work_date(self, date: str, fallback_route: str = 'jump') -> Dict[str, Any]:
+        """
+        処理対象日へ遷移し、入力要素の準備完了まで待機
+        
+        Args:
+            date: 処理対象日
+            fallback_route: 表示中の日付が読めない場合の遷移経路（'none'/'next'/'jump'）
+            
+        Returns:
+            Dict: 遷移結果（DateNavigationPlanner.navigate_to の戻り値）
+        """
+        try:
+            navigation = self.navigation_planner.navigate_to(date, fallback_route=fallback_route)
+        except Exception as e:
+            self.logger.error(f"日付遷移エラー: {date} - {e}")
+            return {'success': False, 'route': None, 'navigations': 0, 'navigation_time': 0.0, 'verified': False}
+        
+        if navigation['success'] and navigation['navigations'] > 0:
+            if not self._wait_for_input_elements_ready():
+                self.logger.warning("日付遷移後の要素準備が未完了")
+        return navigation
+    
+    def _attach_navigation_stats(self, date: str, navigation: Dict[str, Any]):
+        """対象日の処理結果に遷移回数・遷移時間を追記"""
+        for result in reversed(self.results):
+            if result['date'] == date:
+                result['navigations'] = navigation['navigations']
+                result['navigation_time'] = navigation['navigation_time']
+                result['navigation_route'] = navigation['route']
+                return
+    
+    def _journal_results(self, first_result: int):
+        """この日に確定した処理結果をジャーナルへ追記"""
+        if self.journal is None:
+            return
+        for result in self.results[first_result:]:
+            try:
+                self.journal.append(result)
+            except OSError as e:
+                self.logger.error(f"ジャーナルへの追記に失敗: {result['date']} - {e}")
+    
+    def _throttle_wait(self) -> Optional[float]:
+        """レート制御で待機した時間の累計（このスレッド分、未計測時はNone）"""
+        governor = getattr(self.automation, 'governor', None)
+        return governor.thread_wait() if isinstance(governor, ThroughputGovernor) else None
+    
+    def _attach_throttle_stats(self, date: str, throttle_start: Optional[float]):
+        """対象日の処理結果にレート制御の待機時間を追記"""
+        throttle_end = self._throttle_wait()
+        if throttle_start is None or throttle_end is None:
+            return
+        for result in reversed(self.results):
+            if result['date'] == date:
+                result['throttle_wait'] = throttle_end - throttle_start
+                return
+    
+    def _failure_artifacts(self) -> Optional[FailureArtifactBuffer]:
+        """失敗時の調査用記録（未設定時はNone）"""
+        artifacts = getattr(self.automation, 'failure_artifacts', None)
+        return artifacts if isinstance(artifacts, FailureArtifactBuffer) else None
+    
+    def _finish_failure_artifacts(self, date: str):
+        """対象日が失敗した場合のみ調査用記録を保存し、処理結果に保存先を追記"""
+        artifacts = self._failure_artifacts()
+        if artifacts is None:
+            return
+        result = next((r for r in reversed(self.results) if r['date'] == date), None)
+        if result is None or result['status'] != 'failure':
+            artifacts.discard()
+            return
+        screenshots = getattr(self.automation, 'screenshots', None)
+        directory = artifacts.flush(self.automation.driver, result['message'],
+                                    screenshots if isinstance(screenshots, ScreenshotPipeline) else None)
+        if directory:
+            result['artifacts'] = directory
+    
+    def _action_timing_mark(self) -> Optional[int]:
+        """ボタン操作の所要時間の記録件数（未計測時はNone）"""
+        timings = getattr(self.automation, 'action_timings', None)
+        return len(timings) if isinstance(timings, list) else None
+    
+    def _attach_action_timings(self, date: str, timing_start: Optional[int]):
+        """対象日の処理結果に計算・次へ・提出のサーバー応答時間と画面反映時間（秒）を追記"""
+        if timing_start is None:
+            return
+        timings = [t for t in self.automation.action_timings[timing_start:] if not t['timed_out']]
+        if not timings:
+            return
+        for result in reversed(self.results):
+            if result['date'] == date:
+                result['server_time'] = sum(t['server_ms'] for t in timings) / 1000
+                result['render_time'] = sum(t['render_ms'] for t in timings) / 1000
+                return
+    
+    def _plan_form_updates(self, work_data: Dict[str, Any]) -> tuple:
+        """
+        フォーム状態のスナップショットを取得し、入力が必要な項目を判定
+        
+        Returns:
+            tuple: (スナップショット, 差分)。取得できない場合は全項目を入力対象とする
+        """
+        full_update = {'work_time': True, 'break_time': True, 'projects': list(range(len(work_data['projects'] or [])))}
+        try:
+            snapshot = self.automation.snapshot_form_state()
+            if not isinstance(snapshot, dict) or not snapshot:
+                return {}, full_update
+            
+            diff = self.automation.diff_form_state(work_data, snapshot)
+            if not isinstance(diff, dict):
+                return snapshot, full_update
+            return snapshot, diff
+            
+        except Exception as e:
+            self.logger.warning(f"フォーム差分の判定に失敗したため全項目を入力します: {e}")
+            return {}, full_update
+    
+    def _record_success(self, date: str, message: str, start_time: datetime, webdriver_commands: Optional[int] = None):
         """成功を記録"""
         processing_time = (datetime.now() - start_time).total_seconds()
         
-        self.results.append({
+        result = {
             'date': date,
             'status': 'success',
             'message': message,
             'processing_time': processing_time,
             'timestamp': datetime.now()
-        })
+        }
+        if webdriver_commands is not None:
+            result['webdriver_commands'] = webdriver_commands
+        self.results.append(result)
         
         self.logger.info(f"成功記録: {date} - {message} ({processing_time:.1f}秒)")
+        if webdriver_commands is not None:
+            self.logger.info(f"  WebDriverコマンド数: {webdriver_commands}")
+    
+    def _record_skip(self, date: str, status: str, message: str, start_time: datetime):
+        """スキップを記録"""
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        self.results.append({
+            'date': date,
+            'status': status,
+            'message': message,
+            'processing_time': processing_time,
+            'timestamp': datetime.now()
+        })
+        
+        self.logger.info(f"スキップ記録: {date} - {message} ({processing_time:.1f}秒)")
+    
+    def _webdriver_command_count(self) -> Optional[int]:
+        """自動化クラスが計測しているWebDriverコマンド数を取得（未計測時はNone）"""
+        count = getattr(self.automation, 'command_count', None)
+        return count if isinstance(count, int) else None
     
     def _record_failure(self, date: str, message: str):
         """失敗を記録"""
@@ -285,10 +446,13 @@ class BulkWorkAutomation:
         success_count = len([r for r in self.results if r['status'] == 'success'])
         failure_count = len([r for r in self.results if r['status'] == 'failure'])
         dry_run_count = len([r for r in self.results if r['status'] == 'dry_run'])
+        submitted_count = len([r for r in self.results if r['status'] == 'skipped_already_submitted'])
         
         print(f"総処理件数: {len(self.results)}件")
         print(f"成功: {success_count}件")
         print(f"失敗: {failure_count}件")
+        if submitted_count > 0:
+            print(f"提出済みスキップ: {submitted_count}件")
         if dry_run_count > 0:
             print(f"ドライラン: {dry_run_count}件")
         
@@ -298,12 +462,56 @@ class BulkWorkAutomation:
             avg_time = sum(processing_times) / len(processing_times)
             print(f"平均処理時間: {avg_time:.1f}秒")
         
+        # WebDriverコマンド数の統計
+        command_counts = [r['webdriver_commands'] for r in self.results if 'webdriver_commands' in r]
+        if command_counts:
+            avg_commands = sum(command_counts) / len(command_counts)
+            print(f"平均WebDriverコマンド数: {avg_commands:.0f}回/日")
+        
+        # 日付遷移の統計
+        navigation_counts = [r['navigations'] for r in self.results if 'navigations' in r]
+        if navigation_counts:
+            navigation_time = sum(r['navigation_time'] for r in self.results if 'navigation_time' in r)
+            print(f"日付遷移: {sum(navigation_counts)}回 ({navigation_time:.1f}秒)")
+        
+        # ボタン操作（計算・次へ・提出）の所要時間の統計
+        timings = getattr(self.automation, 'action_timings', None)
+        if isinstance(timings, list):
+            by_action = {}
+            for timing in timings:
+                by_action.setdefault(timing['action'], []).append(timing)
+            if by_action:
+                print("ボタン操作の所要時間（平均）:")
+            for action, entries in by_action.items():
+                completed = [t for t in entries if not t['timed_out']]
+                line = f"  {action}: {len(entries)}回"
+                if completed:
+                    line += (f" (サーバー応答 {sum(t['server_ms'] for t in completed) / len(completed):.0f}ms, "
+                             f"画面反映 {sum(t['render_ms'] for t in completed) / len(completed):.0f}ms)")
+                if len(completed) < len(entries):
+                    line += f", 完了未検知 {len(entries) - len(completed)}回"
+                print(line)
+        
+        # レート制御の統計
+        governor = getattr(self.automation, 'governor', None)
+        if isinstance(governor, ThroughputGovernor):
+            metrics = governor.get_metrics()
+            overall = metrics.pop('_global')
+            print(f"レート制御: 待機合計 {governor.total_wait():.1f}秒, 最大同時実行 {overall['peak_in_flight']}/{overall['max_concurrent']}")
+            for action, metric in metrics.items():
+                if metric['requests']:
+                    print(f"  {action}: {metric['requests']}回 (エラー {metric['errors']}回, "
+                          f"平均応答 {metric['avg_latency']:.2f}秒, 待機 {metric['waited']:.1f}秒, "
+                          f"現在 {metric['rate']:.2f}回/秒, 減速 {metric['slowdowns']}回)")
+        
         # 失敗した項目の表示
         failures = [r for r in self.results if r['status'] == 'failure']
         if failures:
             print("\n=== 失敗した項目 ===")
             for failure in failures:
                 print(f"  {failure['date']}: {failure['message']}")
+                if failure.get('artifacts'):
+                    print(f"    調査用記録: {failure['artifacts']}")
         
         print("=" * 30)
     
@@ -319,16 +527,30 @@ class BulkWorkAutomation:
         output_path = log_dir / output_file
         
         with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-            fieldnames = ['date', 'status', 'message', 'processing_time', 'timestamp']
+            fieldnames = ['date', 'status', 'message', 'processing_time', 'navigations', 'navigation_time',
+                          'throttle_wait', 'server_time', 'render_time', 'artifacts', 'timestamp']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             
             writer.writeheader()
-            for result in self.results:
+            # ジャーナルがある場合は、再開前の実行分も含めて日付ごとの最新結果を出力
+            # （ドライランなどジャーナルに記録しない結果は今回の結果から補う）
+            results = self.results
+            if self.journal:
+                latest = {result['date']: result for result in self.results}
+                latest.update({result['date']: result for result in self.journal.latest_results()})
+                results = [latest[date] for date in sorted(latest)]
+            for result in results:
                 row = {
                     'date': result['date'],
                     'status': result['status'],
                     'message': result['message'],
                     'processing_time': result.get('processing_time', ''),
+                    'navigations': result.get('navigations', ''),
+                    'navigation_time': result.get('navigation_time', ''),
+                    'throttle_wait': result.get('throttle_wait', ''),
+                    'server_time': result.get('server_time', ''),
+                    'render_time': result.get('render_time', ''),
+                    'artifacts': result.get('artifacts', ''),
                     'timestamp': result['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
                 }
                 writer.writerow(row)
@@ -349,7 +571,8 @@ class BulkWorkAutomation:
         self.logger.info(f"処理を再開します: {resume_date}から")
         
         # 既に処理済みの日付を取得
-        processed_dates = {r['date'] for r in self.results if r['status'] == 'success'}
+        processed_dates = {r['date'] for r in self.results if r['status'] in ('success', 'skipped_already_submitted')}
+        processed_dates |= self.completed_dates
         
         # 指定日以降のデータを取得
         all_data = self.csv_processor.get_all_data()
@@ -404,8 +627,14 @@ class BulkWorkAutomation:
         self.logger.info(f"リトライ完了: {retry_success}/{len(failed_dates)} 件成功")
         return retry_success == len(failed_dates)
     
-    def _adjust_project_hours(self, projects: List[Dict[str, str]], actual_work_hours: str):
-        """プロジェクト時間をパーセンテージベースで実労働時間に合わせて調整"""
+    def _adjust_project_hours(self, projects: List[Dict[str, str]], actual_work_hours: str) -> List[Dict[str, str]]:
+        """
+        プロジェクト時間をパーセンテージベースで実労働時間に合わせて調整
+        
+        Returns:
+            List[Dict]: 時間を調整したプロジェクトの複製（CSVの値は変更しない。調整できない場合は元の値のまま）
+        """
+        adjusted = [dict(project) for project in projects]
         try:
             # 画面から実際の実働時間を取得
             work_time_data = self.automation.get_actual_work_time_from_screen()
@@ -426,7 +655,7 @@ class BulkWorkAutomation:
             
             if total_work_minutes <= 0:
                 self.logger.warning("実働時間が0以下です")
-                return
+                return adjusted
             
             # CSVの値をパーセンテージとして扱い、100%を超えた分は0にする
             percentages = []
@@ -500,16 +729,18 @@ class BulkWorkAutomation:
             
             # プロジェクト時間を更新
             for i, allocated_minutes in enumerate(allocated_times):
-                if i < len(projects):
+                if i < len(adjusted):
                     allocated_hours = allocated_minutes // 60
                     allocated_mins = allocated_minutes % 60
-                    projects[i]['time'] = f"{allocated_hours}:{allocated_mins:02d}"
-                    self.logger.info(f"プロジェクト{i+1}最終時間: {projects[i]['time']}")
+                    adjusted[i]['time'] = f"{allocated_hours}:{allocated_mins:02d}"
+                    self.logger.info(f"プロジェクト{i+1}最終時間: {adjusted[i]['time']}")
             
             self.logger.info(f"プロジェクト時間調整完了: 実労働={total_work_minutes}分を{len(projects)}個のプロジェクトに完全配分")
         
         except Exception as e:
             self.logger.error(f"プロジェクト時間調整エラー: {e}")
+        
+        return adjusted
 
     def _should_refresh_session(self, current_index: int) -> bool:
         """セッションリフレッシュが必要かどうか判定"""
@@ -535,19 +766,26 @@ class BulkWorkAutomation:
             self.logger.error(f"セッションリフレッシュエラー: {e}")
 
     def _process_single_day_with_recovery(self, work_data: Dict[str, Any]) -> bool:
-        """エラー回復機能付きの単日処理"""
+        """エラー回復機能付きの単日処理（再試行は失敗したステップから再開）"""
         max_attempts = 2
         
         for attempt in range(max_attempts):
             try:
                 if attempt > 0:
-                    self.logger.info(f"処理再試行 {attempt + 1}/{max_attempts}: {work_data['date']}")
+                    self.logger.info(f"処理再試行 {attempt + 1}/{max_attempts}: {work_data['date']}（{self.last_failed_step} から再開）")
                     
-                    # 再試行前の回復処理（要素ベース）
-                    self._perform_error_recovery()
+                    # 再試行前の回復処理（ページは再読み込みしない）
+                    self._prepare_step_retry(self.last_failed_step)
+                
+                # 通常の単日処理を実行（チェックポイントから再開）
+                success = self.process_single_day(work_data)
+                if success or self.last_failed_step is None or attempt == max_attempts - 1:
+                    return success
                 
-                # 通常の単日処理を実行
-                return self.process_single_day(work_data)
+                # 再試行の結果で置き換えるため、今回の失敗記録は取り除く
+                if self.results and self.results[-1]['date'] == work_data['date'] and self.results[-1]['status'] == 'failure':
+                    self.results.pop()
+                time.sleep(2 ** attempt)  # 指数バックオフ
                 
             except Exception as e:
                 self.logger.error(f"処理試行{attempt + 1}でエラー: {e}")
@@ -561,6 +799,15 @@ class BulkWorkAutomation:
         
         return False
 
+    def _prepare_step_retry(self, failed_step: Optional[str]):
+        """ステップ再試行前の回復処理（入力済みの内容を失わないよう、再読み込みとフォームのリセットは行わない）"""
+        try:
+            self.automation.wait_for_page_load()
+            if failed_step != 'submit':
+                self._wait_for_input_elements_ready()
+        except Exception as e:
+            self.logger.warning(f"再試行前の回復処理でエラー: {e}")
+    
     def _perform_error_recovery(self):
         """エラー発生後の回復処理（要素ベース）"""
         try:
@@ -580,10 +827,6 @@ class BulkWorkAutomation:
             # 4. 入力要素が準備完了まで待機
             self._wait_for_input_elements_ready()
             
-            # 5. 回復後のスクリーンショット
-            if hasattr(self.automation, 'save_screenshot'):
-                self.automation.save_screenshot("error_recovery_after")
-            
             self.logger.info("エラー回復処理完了")
             
         except Exception as e:
@@ -613,7 +856,10 @@ class BulkWorkAutomation:
                 errorElements[i].style.display = 'none';
             }
             
-            // オーバーレイを削除
+            // オーバーレイ抑制を停止して非表示要素を戻す
+            if (window.__automationOverlaySuppression) {
+                window.__automationOverlaySuppression.disable();
+            }
             var overlays = document.querySelectorAll('[data-hidden-by-automation="true"]');
             for (var i = 0; i < overlays.length; i++) {
                 overlays[i].style.display = '';
@@ -658,104 +904,46 @@ class BulkWorkAutomation:
         self.logger.error("全ての日付遷移試行が失敗しました")
         return False
 
-    def check_errors_only(self, start_date: str, end_date: str) -> Dict[str, List[str]]:
+    def check_errors_only(self, start_date: str, end_date: str, tabs: int = 1,
+                          include_weekends: bool = False, holidays: Optional[set] = None,
+                          include_holidays: bool = False) -> Dict[str, List[str]]:
         """指定期間のエラーチェックのみを実行
         
+        各日へ直接遷移し、1回のスクリプトでエラーを読み取ってCSVへ逐次出力する。
+        
         Args:
             start_date: 開始日（YYYY-MM-DD）
             end_date: 終了日（YYYY-MM-DD）
+            tabs: 並列に使用するタブ数
+            include_weekends: True の場合、土日もチェックする
+            holidays: 祝日の集合
+            include_holidays: True の場合、祝日もチェックする
             
         Returns:
             日付とエラーリストの辞書
         """
         self.logger.info(f"エラーチェックモード: {start_date} から {end_date}")
         
-        error_results = {}
-        current_date = datetime.strptime(start_date, '%Y-%m-%d')
-        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        while current_date <= end_date_obj:
-            date_str = current_date.strftime('%Y-%m-%d')
-            self.logger.info(f"=== {date_str} のエラーチェック ===")
-            
-            try:
-                # 日付を指定して遷移
-                if not self._navigate_to_specific_date(date_str):
-                    self.logger.error(f"{date_str} への遷移に失敗")
-                    error_results[date_str] = ["ページ遷移エラー"]
-                    current_date += timedelta(days=1)
-                    continue
-                
-                # エラーチェックを実行
-                errors = self.automation.check_errors()
-                
-                # 在宅/出社区分以外のエラーをフィルタリング
-                filtered_errors = []
-                for error in errors:
-                    if "在宅/出社区分が入力されていません" not in error:
-                        filtered_errors.append(error)
-                
-                if filtered_errors:
-                    self.logger.warning(f"{date_str}: {len(filtered_errors)}件のエラー検出")
-                    error_results[date_str] = filtered_errors
-                    # エラー記録も保存
-                    self.automation.record_error_for_later_application(date_str, filtered_errors)
-                else:
-                    self.logger.info(f"{date_str}: エラーなし")
-                    error_results[date_str] = []
-                
-            except Exception as e:
-                self.logger.error(f"{date_str} のエラーチェック中にエラー: {e}")
-                error_results[date_str] = [f"チェック中のエラー: {str(e)}"]
-            
-            # 次の日へ
-            current_date += timedelta(days=1)
-        
-        # 結果をCSVに保存
-        self._save_error_check_results(error_results, start_date, end_date)
+        scanner = RangeErrorScanner(
+            self.automation,
+            tabs=tabs,
+            include_weekends=include_weekends,
+            holidays=holidays,
+            include_holidays=include_holidays
+        )
+        error_results = scanner.scan(start_date, end_date)
+        self.error_scan_stats = scanner.stats
         
         return error_results
     
     def _navigate_to_specific_date(self, target_date: str) -> bool:
-        """特定の日付に遷移"""
+        """特定の日付に遷移（直接遷移できない場合は翌日・前日遷移で到達）"""
         try:
-            # WorkTimeAutomationのメソッドを使用
-            return self.automation.navigate_to_date(target_date)
+            return self.navigation_planner.navigate_to(target_date)['success']
         except Exception as e:
             self.logger.error(f"日付遷移エラー: {e}")
             return False
     
-    def _save_error_check_results(self, error_results: Dict[str, List[str]], start_date: str, end_date: str):
-        """エラーチェック結果をCSVに保存"""
-        try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_file = Path(__file__).parent.parent / "logs" / f"error_check_{start_date}_to_{end_date}_{timestamp}.csv"
-            
-            with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
-                fieldnames = ['日付', 'エラー数', 'エラー内容']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for date, errors in sorted(error_results.items()):
-                    if errors:
-                        for error in errors:
-                            writer.writerow({
-                                '日付': date,
-                                'エラー数': len(errors),
-                                'エラー内容': error
-                            })
-                    else:
-                        writer.writerow({
-                            '日付': date,
-                            'エラー数': 0,
-                            'エラー内容': 'エラーなし'
-                        })
-            
-            self.logger.info(f"エラーチェック結果を保存: {output_file}")
-            
-        except Exception as e:
-            self.logger.error(f"エラーチェック結果の保存エラー: {e}")
-    
     def _wait_for_input_elements_ready(self) -> bool:
         """入力要素が準備完了まで待機"""
         try:
@@ -0,0 +1,806 @@
+"""
+Chrome DevTools Protocol（CDP）バックエンド
+
+chromedriver を経由せず、デバッグポートのWebSocketへ直接CDPコマンドを送る。
+WorkTimeAutomation が使う WebDriver の操作（スクリプト実行、要素の検索・クリック・入力、
+遷移、スクリーンショット、タブの切り替え）を同じ呼び出し方で提供するため、
+実行ごとに Selenium と切り替えられる。CDPのイベント（Network など）も購読できる。
+
+制限:
+    - ActionChains（W3C Actions）は未対応（呼び出し側の代替手段に任せる）
+    - iframe に切り替えた場合、要素の検索のみ iframe 内で行う（execute_script は最上位の文書で実行）
+"""
+import base64
+import itertools
+import json
+import time
+import logging
+import threading
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+import websocket
+from selenium.common.exceptions import (
+    ElementNotInteractableException, JavascriptException, NoSuchElementException, NoSuchFrameException,
+    NoSuchWindowException, StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+
+class CDPError(WebDriverException):
+    """CDPコマンドがエラーを返した場合の例外"""
+
+
+# 遷移中に評価した場合のエラー（遷移後の文書で再評価する）
+_NAVIGATION_ERRORS = ('Execution context was destroyed', 'Cannot find default execution context',
+                      'Cannot find context with specified id')
+# 要素の参照が無効になった場合のエラー
+_STALE_ERRORS = ('Could not find object with given id', 'Cannot find context with specified id')
+
+# 特殊キー（key, code, windowsVirtualKeyCode, 入力文字）
+_SPECIAL_KEYS = {
+    Keys.TAB: ('Tab', 'Tab', 9, None),
+    Keys.ENTER: ('Enter', 'Enter', 13, '\r'),
+    Keys.RETURN: ('Enter', 'Enter', 13, '\r'),
+    Keys.BACKSPACE: ('Backspace', 'Backspace', 8, None),
+    Keys.DELETE: ('Delete', 'Delete', 46, None),
+    Keys.ESCAPE: ('Escape', 'Escape', 27, None),
+    Keys.ARROW_LEFT: ('ArrowLeft', 'ArrowLeft', 37, None),
+    Keys.ARROW_UP: ('ArrowUp', 'ArrowUp', 38, None),
+    Keys.ARROW_RIGHT: ('ArrowRight', 'ArrowRight', 39, None),
+    Keys.ARROW_DOWN: ('ArrowDown', 'ArrowDown', 40, None),
+    Keys.HOME: ('Home', 'Home', 36, None),
+    Keys.END: ('End', 'End', 35, None),
+    Keys.F2: ('F2', 'F2', 113, None),
+}
+
+# 修飾キー（key, code, windowsVirtualKeyCode, modifiers のビット）
+_MODIFIER_KEYS = {
+    Keys.ALT: ('Alt', 'AltLeft', 18, 1),
+    Keys.CONTROL: ('Control', 'ControlLeft', 17, 2),
+    Keys.COMMAND: ('Meta', 'MetaLeft', 91, 4),
+    Keys.SHIFT: ('Shift', 'ShiftLeft', 16, 8),
+}
+
+# ロケーターで要素を探す関数（this が検索の起点）
+_FIND_JS = """
+function(by, value, all) {
+    var root = this;
+    var doc = root.ownerDocument || root;
+    var nodes = [];
+    switch (by) {
+        case 'id':
+            nodes = root.querySelectorAll('[id="' + value.replace(/(["\\\\])/g, '\\\\$1') + '"]');
+            break;
+        case 'name':
+            nodes = root.querySelectorAll('[name="' + value.replace(/(["\\\\])/g, '\\\\$1') + '"]');
+            break;
+        case 'css selector':
+            nodes = root.querySelectorAll(value);
+            break;
+        case 'class name':
+            nodes = root.getElementsByClassName(value);
+            break;
+        case 'tag name':
+            nodes = root.getElementsByTagName(value);
+            break;
+        case 'link text':
+        case 'partial link text':
+            nodes = Array.prototype.filter.call(root.querySelectorAll('a'), function(a) {
+                var text = (a.innerText || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) >= 0;
+            });
+            break;
+        case 'xpath':
+            var snapshot = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            break;
+    }
+    nodes = Array.prototype.slice.call(nodes);
+    return all ? nodes : (nodes[0] || null);
+}
+"""
+
+# スクリプトの戻り値を値として返せる形に変換する関数（DOMノードは番号に置き換えて別に保持）
+_RETURN_JS = """
+function __cdpReturn(result) {
+    var nodes = [];
+    function convert(value, depth) {
+        if (value instanceof Node) {
+            nodes.push(value);
+            return {'__cdp_node__': nodes.length - 1};
+        }
+        if (value === null || typeof value !== 'object' || depth > 20 || value === window) {
+            return value;
+        }
+        if (Array.isArray(value) || value instanceof NodeList || value instanceof HTMLCollection) {
+            return Array.prototype.map.call(value, function(item) { return convert(item, depth + 1); });
+        }
+        var converted = {};
+        Object.keys(value).forEach(function(key) { converted[key] = convert(value[key], depth + 1); });
+        return converted;
+    }
+    var converted = convert(result, 0);
+    window.__cdpReturnedNodes = nodes;
+    return {value: converted, nodes: nodes.length};
+}
+"""
+
+
+def list_page_targets(debugger_address: str, timeout: float = 5) -> List[Dict[str, Any]]:
+    """デバッグポートのページ（タブ）一覧"""
+    with urllib.request.urlopen(f"http://{debugger_address}/json/list", timeout=timeout) as response:
+        targets = json.loads(response.read().decode('utf-8'))
+    return [t for t in targets if t.get('type') == 'page' and not t.get('url', '').startswith('devtools://')]
+
+
+class CDPConnection:
+    """1つのページ（タブ）とのWebSocket接続"""
+
+    def __init__(self, ws_url: str, timeout: float = 30):
+        """
+        初期化
+
+        Args:
+            ws_url: ページのWebSocketデバッガーURL
+            timeout: コマンドの応答待ちの上限（秒）
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.timeout = timeout
+        # Originを送らない（--remote-allow-origins の指定なしで接続するため）
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True,
+                                              enable_multithread=True)
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        self.listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+        # 通信中のリクエスト（ネットワークのアイドル判定用）
+        self.network = threading.Condition()
+        self.inflight = set()
+        self.last_network_activity = time.monotonic()
+
+        self.reader = threading.Thread(target=self._read_loop, name="CDPReader", daemon=True)
+        self.reader.start()
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        CDPコマンドを送信して応答を待つ
+
+        Raises:
+            CDPError: コマンドがエラーを返した場合・接続が切れた場合
+            TimeoutException: 応答がない場合
+        """
+        if self.closed:
+            raise CDPError("CDP接続は終了しています")
+        message_id = next(self.ids)
+        waiter = {'event': threading.Event(), 'response': None}
+        with self.lock:
+            self.pending[message_id] = waiter
+        try:
+            self.ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+            if not waiter['event'].wait(timeout or self.timeout):
+                raise TimeoutException(f"CDPコマンドの応答がありません: {method}")
+        finally:
+            with self.lock:
+                self.pending.pop(message_id, None)
+
+        response = waiter['response']
+        if 'error' in response:
+            raise CDPError(f"{method}: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    def on(self, method: str, callback: Callable[[Dict[str, Any]], None]):
+        """CDPイベントの購読"""
+        with self.lock:
+            self.listeners.setdefault(method, []).append(callback)
+
+    def off(self, method: str, callback: Callable[[Dict[str, Any]], None]):
+        """CDPイベントの購読を解除"""
+        with self.lock:
+            if callback in self.listeners.get(method, []):
+                self.listeners[method].remove(callback)
+
+    def _read_loop(self):
+        while not self.closed:
+            try:
+                message = json.loads(self.ws.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                if not self.closed:
+                    self.logger.debug(f"CDP接続が切断されました: {e}")
+                break
+
+            if 'id' in message:
+                with self.lock:
+                    waiter = self.pending.get(message['id'])
+                if waiter:
+                    waiter['response'] = message
+                    waiter['event'].set()
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+            self._track_network(method, params)
+            with self.lock:
+                callbacks = list(self.listeners.get(method, []))
+            for callback in callbacks:
+                try:
+                    callback(params)
+                except Exception as e:
+                    self.logger.debug(f"CDPイベント処理エラー ({method}): {e}")
+
+        # 応答待ちのコマンドを解放
+        self.closed = True
+        with self.lock:
+            for waiter in self.pending.values():
+                waiter['response'] = {'error': {'message': "CDP接続が切断されました"}}
+                waiter['event'].set()
+
+    def _track_network(self, method: str, params: Dict[str, Any]):
+        if method == 'Network.requestWillBeSent':
+            with self.network:
+                self.inflight.add(params.get('requestId'))
+                self.last_network_activity = time.monotonic()
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+            with self.network:
+                self.inflight.discard(params.get('requestId'))
+                self.last_network_activity = time.monotonic()
+                self.network.notify_all()
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: float = 10) -> bool:
+        """
+        通信中のリクエストがなく、idle_time 秒新しい通信がない状態を待つ
+
+        Returns:
+            bool: アイドルになった場合 True、タイムアウトの場合 False
+        """
+        deadline = time.monotonic() + timeout
+        with self.network:
+            while True:
+                now = time.monotonic()
+                quiet = now - self.last_network_activity
+                if not self.inflight and quiet >= idle_time:
+                    return True
+                if now >= deadline:
+                    return False
+                wait = idle_time - quiet if not self.inflight else idle_time
+                self.network.wait(max(0.01, min(wait, deadline - now)))
+
+    def close(self):
+        """接続を終了（タブは閉じない）"""
+        self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+class CDPElement:
+    """CDPのリモートオブジェクトで参照するDOM要素（WebElement と同じ操作を提供）"""
+
+    def __init__(self, driver: "CDPDriver", object_id: str):
+        self._driver = driver
+        self.id = object_id
+
+    def __repr__(self):
+        return f"<CDPElement {self.id}>"
+
+    def __eq__(self, other):
+        return isinstance(other, CDPElement) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def _call(self, declaration: str, *args, return_by_value: bool = True):
+        return self._driver._call_function(self.id, declaration, list(args), return_by_value=return_by_value)
+
+    @property
+    def tag_name(self) -> str:
+        return self._call("function() { return this.tagName.toLowerCase(); }")
+
+    @property
+    def text(self) -> str:
+        return self._call("function() { return (this.innerText || '').trim(); }")
+
+    @property
+    def rect(self) -> Dict[str, float]:
+        return self._call("function() { var r = this.getBoundingClientRect();"
+                          " return {x: r.left, y: r.top, width: r.width, height: r.height}; }")
+
+    @property
+    def location(self) -> Dict[str, float]:
+        rect = self.rect
+        return {'x': rect['x'], 'y': rect['y']}
+
+    @property
+    def size(self) -> Dict[str, float]:
+        rect = self.rect
+        return {'width': rect['width'], 'height': rect['height']}
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        """属性値（WebElement.get_attribute と同様にプロパティを優先）"""
+        return self._call("""
+            function(name) {
+                var booleans = ['checked', 'selected', 'disabled', 'readonly', 'required', 'multiple', 'hidden'];
+                if (booleans.indexOf(name.toLowerCase()) >= 0) {
+                    return (this[name] || this.hasAttribute(name)) ? 'true' : null;
+                }
+                var property = this[name];
+                if (property !== undefined && property !== null &&
+                        typeof property !== 'object' && typeof property !== 'function') {
+                    return String(property);
+                }
+                return this.getAttribute(name);
+            }
+        """, name)
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        return self._call("function(name) { return this.getAttribute(name); }", name)
+
+    def get_property(self, name: str):
+        return self._call("function(name) { return this[name]; }", name)
+
+    def value_of_css_property(self, name: str) -> str:
+        return self._call("function(name) { return getComputedStyle(this).getPropertyValue(name); }", name)
+
+    def is_displayed(self) -> bool:
+        return bool(self._call("""
+            function() {
+                if (!this.isConnected) { return false; }
+                var style = getComputedStyle(this);
+                if (style.display === 'none' || style.visibility === 'hidden' ||
+                        style.visibility === 'collapse' || parseFloat(style.opacity) === 0) {
+                    return false;
+                }
+                var rect = this.getBoundingClientRect();
+                return (rect.width > 0 && rect.height > 0) || this.tagName === 'OPTION';
+            }
+        """))
+
+    def is_enabled(self) -> bool:
+        return bool(self._call("function() { return !this.disabled; }"))
+
+    def is_selected(self) -> bool:
+        return bool(self._call("function() { return !!(this.checked || this.selected); }"))
+
+    def clear(self):
+        self._call("""
+            function() {
+                this.focus();
+                this.value = '';
+                this.dispatchEvent(new Event('input', {bubbles: true}));
+                this.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+        """)
+
+    def click(self):
+        """要素の中心をクリック（option はマウス操作ではなく選択状態を変更）"""
+        point = self._call("""
+            function() {
+                if (this.tagName === 'OPTION') {
+                    var select = this.closest('select');
+                    this.selected = true;
+                    if (select) {
+                        select.dispatchEvent(new Event('input', {bubbles: true}));
+                        select.dispatchEvent(new Event('change', {bubbles: true}));
+                    }
+                    return null;
+                }
+                this.scrollIntoView({block: 'center', inline: 'center'});
+                var rect = this.getBoundingClientRect();
+                if (rect.width === 0 && rect.height === 0) {
+                    return {hidden: true};
+                }
+                return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2};
+            }
+        """)
+        if point is None:
+            return
+        if point.get('hidden'):
+            raise ElementNotInteractableException("要素が表示されていないためクリックできません")
+        for event_type in ('mousePressed', 'mouseReleased'):
+            self._driver.execute('Input.dispatchMouseEvent', {
+                'type': event_type, 'x': point['x'], 'y': point['y'], 'button': 'left', 'clickCount': 1
+            })
+
+    def send_keys(self, *values):
+        """キー入力（通常の文字は一括で挿入し、特殊キー・修飾キーはキーイベントで送信）"""
+        self._call("function() { this.focus(); }")
+        modifiers = 0
+        held = []
+        text = []
+
+        def flush_text():
+            if text:
+                self._driver.execute('Input.insertText', {'text': "".join(text)})
+                text.clear()
+
+        for char in "".join(str(value) for value in values):
+            if char == Keys.NULL:
+                flush_text()
+                for key in reversed(held):
+                    self._dispatch_key('keyUp', _MODIFIER_KEYS[key][:3], modifiers)
+                held.clear()
+                modifiers = 0
+            elif char in _MODIFIER_KEYS:
+                flush_text()
+                modifiers |= _MODIFIER_KEYS[char][3]
+                held.append(char)
+                self._dispatch_key('rawKeyDown', _MODIFIER_KEYS[char][:3], modifiers)
+            elif char in _SPECIAL_KEYS:
+                flush_text()
+                key, code, key_code, key_text = _SPECIAL_KEYS[char]
+                self._dispatch_key('keyDown' if key_text else 'rawKeyDown', (key, code, key_code), modifiers, key_text)
+                self._dispatch_key('keyUp', (key, code, key_code), modifiers)
+            elif modifiers & ~8:
+                # Ctrl+A などのショートカット
+                key_code = ord(char.upper())
+                code = f"Key{char.upper()}" if char.isalpha() else ''
+                self._dispatch_key('rawKeyDown', (char, code, key_code), modifiers)
+                self._dispatch_key('keyUp', (char, code, key_code), modifiers)
+            else:
+                text.append(char)
+
+        flush_text()
+        for key in reversed(held):
+            self._dispatch_key('keyUp', _MODIFIER_KEYS[key][:3], 0)
+
+    def _dispatch_key(self, event_type: str, key: tuple, modifiers: int, text: Optional[str] = None):
+        params = {'type': event_type, 'key': key[0], 'code': key[1],
+                  'windowsVirtualKeyCode': key[2], 'nativeVirtualKeyCode': key[2], 'modifiers': modifiers}
+        if text:
+            params['text'] = text
+        self._driver.execute('Input.dispatchKeyEvent', params)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "CDPElement":
+        return self._driver._find(self.id, by, value, all_matches=False)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["CDPElement"]:
+        return self._driver._find(self.id, by, value, all_matches=True)
+
+    def screenshot(self, filename: str) -> bool:
+        rect = self._call("function() { this.scrollIntoView({block: 'center'}); var r = this.getBoundingClientRect();"
+                          " return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height}; }")
+        return self._driver._write_screenshot(filename, clip=dict(rect, scale=1))
+
+
+class _CDPSwitchTo:
+    """driver.switch_to 相当（タブ・iframe の切り替え）"""
+
+    def __init__(self, driver: "CDPDriver"):
+        self._driver = driver
+
+    def window(self, handle: str):
+        if handle not in self._driver._connections:
+            raise NoSuchWindowException(f"タブが見つかりません: {handle}")
+        self._driver._current = handle
+        self._driver._frame = None
+
+    def new_window(self, type_hint: Optional[str] = None):
+        result = self._driver._browser_command('Target.createTarget', {'url': 'about:blank'})
+        self._driver._attach(result['targetId'])
+        self._driver._current = result['targetId']
+        self._driver._frame = None
+
+    def frame(self, frame_reference):
+        if isinstance(frame_reference, CDPElement):
+            frame = frame_reference
+        elif isinstance(frame_reference, int):
+            frames = self._driver.find_elements(By.CSS_SELECTOR, 'iframe, frame')
+            if frame_reference >= len(frames):
+                raise NoSuchFrameException(f"iframeが見つかりません: {frame_reference}")
+            frame = frames[frame_reference]
+        else:
+            frames = self._driver.find_elements(By.CSS_SELECTOR, f'iframe[name="{frame_reference}"], iframe[id="{frame_reference}"]')
+            if not frames:
+                raise NoSuchFrameException(f"iframeが見つかりません: {frame_reference}")
+            frame = frames[0]
+        document = self._driver._call_function(frame.id, "function() { return this.contentDocument; }",
+                                               [], return_by_value=False)
+        if not isinstance(document, dict) or not document.get('objectId'):
+            raise NoSuchFrameException("iframeの文書にアクセスできません")
+        self._driver._frame = document['objectId']
+
+    def default_content(self):
+        self._driver._frame = None
+
+    def parent_frame(self):
+        self._driver._frame = None
+
+
+class CDPDriver:
+    """CDPで直接ブラウザを操作するドライバー（WebDriver の主要な操作を同じ呼び出し方で提供）"""
+
+    def __init__(self, debugger_address: str, target_id: Optional[str] = None, timeout: float = 30):
+        """
+        初期化
+
+        Args:
+            debugger_address: 接続先Chromeのデバッグアドレス（ホスト:ポート）
+            target_id: 接続するタブのID（省略時は最初のページ）
+            timeout: コマンドとページ読み込みの待機上限（秒）
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.debugger_address = debugger_address
+        self.timeout = timeout
+        self.page_load_timeout = timeout
+        self._connections: Dict[str, CDPConnection] = {}
+        self._browser = None
+        self._frame = None
+
+        targets = list_page_targets(debugger_address)
+        if target_id is None:
+            if not targets:
+                raise WebDriverException(f"接続できるタブがありません: {debugger_address}")
+            target_id = targets[0]['id']
+        self._attach(target_id, next((t for t in targets if t['id'] == target_id), None))
+        self._current = target_id
+        self.session_id = target_id
+
+    @classmethod
+    def connect(cls, debugger_address: str, timeout: float = 30) -> "CDPDriver":
+        """デバッグモードで起動済みのChromeの最初のタブに接続"""
+        return cls(debugger_address, timeout=timeout)
+
+    def _attach(self, target_id: str, target: Optional[Dict[str, Any]] = None):
+        if target is None:
+            target = next((t for t in list_page_targets(self.debugger_address) if t['id'] == target_id), None)
+        if target is None or not target.get('webSocketDebuggerUrl'):
+            raise NoSuchWindowException(f"タブに接続できません: {target_id}（DevToolsで開いている場合は閉じてください）")
+        connection = CDPConnection(target['webSocketDebuggerUrl'], timeout=self.timeout)
+        self._connections[target_id] = connection
+        # 読み込み完了とネットワークのイベントを受け取る
+        connection.send('Page.enable')
+        connection.send('Network.enable')
+
+    def _browser_command(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """ブラウザ全体に対するコマンド（タブの作成・終了）"""
+        if self._browser is None:
+            with urllib.request.urlopen(f"http://{self.debugger_address}/json/version", timeout=5) as response:
+                ws_url = json.loads(response.read().decode('utf-8'))['webSocketDebuggerUrl']
+            self._browser = CDPConnection(ws_url, timeout=self.timeout)
+        return self._browser.send(method, params)
+
+    @property
+    def connection(self) -> CDPConnection:
+        """表示中のタブとの接続"""
+        return self._connections[self._current]
+
+    # ---- コマンド ----
+
+    def execute(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """表示中のタブにCDPコマンドを送信"""
+        return self.connection.send(method, params)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Selenium の Chrome ドライバーと同じ呼び出し方でCDPコマンドを送信"""
+        return self.execute(cmd, cmd_args)
+
+    def add_listener(self, method: str, callback: Callable[[Dict[str, Any]], None]):
+        """表示中のタブのCDPイベントを購読"""
+        self.connection.on(method, callback)
+
+    def remove_listener(self, method: str, callback: Callable[[Dict[str, Any]], None]):
+        """CDPイベントの購読を解除"""
+        self.connection.off(method, callback)
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: float = 10) -> bool:
+        """表示中のタブの通信が終わるまで待つ"""
+        return self.connection.wait_for_network_idle(idle_time, timeout)
+
+    def _evaluate(self, expression: str, return_by_value: bool = True, await_promise: bool = False):
+        deadline = time.monotonic() + self.page_load_timeout
+        while True:
+            try:
+                result = self.execute('Runtime.evaluate', {
+                    'expression': expression, 'returnByValue': return_by_value,
+                    'awaitPromise': await_promise, 'userGesture': True
+                })
+                break
+            except CDPError as e:
+                # 遷移中は新しい文書の準備を待って再評価する
+                if any(message in str(e) for message in _NAVIGATION_ERRORS) and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    continue
+                raise
+        return self._unwrap(result, return_by_value)
+
+    def _call_function(self, object_id: str, declaration: str, args: List[Any],
+                       return_by_value: bool = True, await_promise: bool = False):
+        arguments = [{'objectId': arg.id} if isinstance(arg, CDPElement) else {'value': arg} for arg in args]
+        try:
+            result = self.execute('Runtime.callFunctionOn', {
+                'objectId': object_id, 'functionDeclaration': declaration, 'arguments': arguments,
+                'returnByValue': return_by_value, 'awaitPromise': await_promise, 'userGesture': True
+            })
+        except CDPError as e:
+            if any(message in str(e) for message in _STALE_ERRORS):
+                raise StaleElementReferenceException("要素が文書から切り離されています")
+            raise
+        return self._unwrap(result, return_by_value)
+
+    def _unwrap(self, result: Dict[str, Any], return_by_value: bool):
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            description = details.get('exception', {}).get('description') or details.get('text')
+            raise JavascriptException(f"javascript error: {description}")
+        remote = result.get('result', {})
+        if return_by_value:
+            return remote.get('value')
+        return remote
+
+    def _returned_value(self, returned: Dict[str, Any]):
+        """__cdpReturn で変換した戻り値から、DOMノードを要素に戻す"""
+        if not returned:
+            return None
+        nodes = []
+        if returned.get('nodes'):
+            array = self._evaluate("window.__cdpReturnedNodes", return_by_value=False)
+            nodes = self._array_elements(array['objectId'])
+
+        def restore(value):
+            if isinstance(value, dict):
+                if set(value) == {'__cdp_node__'}:
+                    return nodes[value['__cdp_node__']]
+                return {key: restore(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [restore(item) for item in value]
+            return value
+
+        return restore(returned.get('value'))
+
+    def _array_elements(self, object_id: str) -> List[CDPElement]:
+        properties = self.execute('Runtime.getProperties', {'objectId': object_id, 'ownProperties': True})
+        indexed = [p for p in properties.get('result', []) if p['name'].isdigit()]
+        indexed.sort(key=lambda p: int(p['name']))
+        return [CDPElement(self, p['value']['objectId']) for p in indexed]
+
+    # ---- WebDriver 互換の操作 ----
+
+    def execute_script(self, script: str, *args):
+        """スクリプトを実行（arguments で引数を参照、DOMノードの戻り値は要素になる）"""
+        element = next((arg for arg in args if isinstance(arg, CDPElement)), None)
+        body = f"return __cdpReturn((function() {{ {script} \n}}).apply(window, arguments));"
+        if element is None:
+            expression = f"(function() {{ {_RETURN_JS} {body} }}).apply(window, {json.dumps(list(args))})"
+            return self._returned_value(self._evaluate(expression))
+        declaration = f"function() {{ {_RETURN_JS} {body} }}"
+        return self._returned_value(self._call_function(element.id, declaration, list(args)))
+
+    def execute_async_script(self, script: str, *args):
+        """非同期スクリプトを実行（最後の引数のコールバックの呼び出しを待つ）"""
+        element = next((arg for arg in args if isinstance(arg, CDPElement)), None)
+        body = (f"var args = Array.prototype.slice.call(arguments);"
+                f"return new Promise(function(resolve) {{ args.push(function(value) {{ resolve(__cdpReturn(value)); }});"
+                f"(function() {{ {script} \n}}).apply(window, args); }});")
+        declaration = f"function() {{ {_RETURN_JS} {body} }}"
+        if element is None:
+            expression = f"({declaration}).apply(window, {json.dumps(list(args))})"
+            result = self._evaluate(expression, await_promise=True)
+        else:
+            result = self._call_function(element.id, declaration, list(args), await_promise=True)
+        return self._returned_value(result)
+
+    def _find(self, root_object_id: Optional[str], by: str, value: str, all_matches: bool):
+        root = root_object_id or self._frame
+        if root:
+            remote = self._call_function(root, _FIND_JS, [by, value, all_matches], return_by_value=False)
+        else:
+            remote = self._evaluate(
+                f"({_FIND_JS}).call(document, {json.dumps(by)}, {json.dumps(value)}, {json.dumps(all_matches)})",
+                return_by_value=False
+            )
+        if all_matches:
+            return self._array_elements(remote['objectId']) if remote.get('objectId') else []
+        if remote.get('subtype') != 'node':
+            raise NoSuchElementException(f"要素が見つかりません: {by}={value}")
+        return CDPElement(self, remote['objectId'])
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> CDPElement:
+        return self._find(None, by, value, all_matches=False)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[CDPElement]:
+        return self._find(None, by, value, all_matches=True)
+
+    def _wait_for_load(self, send: Callable[[], Dict[str, Any]]):
+        loaded = threading.Event()
+        connection = self.connection
+
+        def on_load(params):
+            loaded.set()
+
+        connection.on('Page.loadEventFired', on_load)
+        try:
+            result = send()
+            if result.get('errorText'):
+                raise WebDriverException(f"ページを読み込めません: {result['errorText']}")
+            # 同一文書内の遷移（#の変更など）は読み込みイベントが発生しない
+            if 'loaderId' in result and not result.get('loaderId'):
+                return
+            if not loaded.wait(self.page_load_timeout):
+                raise TimeoutException("ページの読み込みがタイムアウトしました")
+        finally:
+            connection.off('Page.loadEventFired', on_load)
+        self._frame = None
+
+    def get(self, url: str):
+        self._wait_for_load(lambda: self.execute('Page.navigate', {'url': url}))
+
+    def refresh(self):
+        self._wait_for_load(lambda: self.execute('Page.reload', {}))
+
+    def back(self):
+        history = self.execute('Page.getNavigationHistory')
+        if history['currentIndex'] > 0:
+            entry = history['entries'][history['currentIndex'] - 1]
+            self._wait_for_load(lambda: self.execute('Page.navigateToHistoryEntry', {'entryId': entry['id']}))
+
+    @property
+    def current_url(self) -> str:
+        return self._evaluate("location.href")
+
+    @property
+    def title(self) -> str:
+        return self._evaluate("document.title")
+
+    @property
+    def page_source(self) -> str:
+        return self._evaluate("document.documentElement.outerHTML")
+
+    @property
+    def current_window_handle(self) -> str:
+        return self._current
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self._connections)
+
+    @property
+    def switch_to(self) -> _CDPSwitchTo:
+        return _CDPSwitchTo(self)
+
+    def get_window_size(self) -> Dict[str, int]:
+        return self._evaluate("({width: window.outerWidth, height: window.outerHeight})")
+
+    def set_window_size(self, width: int, height: int):
+        window = self._browser_command('Browser.getWindowForTarget', {'targetId': self._current})
+        self._browser_command('Browser.setWindowBounds', {
+            'windowId': window['windowId'], 'bounds': {'width': width, 'height': height}
+        })
+
+    def _write_screenshot(self, filename: str, clip: Optional[Dict[str, float]] = None,
+                          image_format: str = 'png', quality: Optional[int] = None) -> bool:
+        params = {'format': image_format}
+        if clip:
+            params['clip'] = clip
+        if quality is not None:
+            params['quality'] = quality
+        data = base64.b64decode(self.execute('Page.captureScreenshot', params)['data'])
+        with open(filename, 'wb') as f:
+            f.write(data)
+        return True
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self.execute('Page.captureScreenshot', {'format': 'png'})['data'])
+
+    def save_screenshot(self, filename: str) -> bool:
+        return self._write_screenshot(filename)
+
+    def close(self):
+        """表示中のタブを閉じる"""
+        handle = self._current
+        self._connections.pop(handle).close()
+        self._browser_command('Target.closeTarget', {'targetId': handle})
+
+    def quit(self):
+        """接続を終了（ブラウザとタブは閉じない）"""
+        for connection in self._connections.values():
+            connection.close()
+        if self._browser is not None:
+            self._browser.close()
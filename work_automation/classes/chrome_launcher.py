@@ -0,0 +1,225 @@
+"""
+自動化用ヘッドレスChromeの起動・管理
+
+夜間の無人実行向けに、ログイン済みプロファイルのコピー（または保存したCookie）で
+ヘッドレスChromeをデバッグポート付きで起動し、ジョブをまたいで使い回す。
+起動引数は自動化の処理速度向けに調整する（GPU無効、バックグラウンドの間引き無効、
+キャッシュ縮小、ウィンドウサイズ固定）。
+"""
+import os
+import json
+import shutil
+import socket
+import atexit
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .browser_pool import find_chrome, is_chrome_alive, launch_chrome
+
+# 自動化の処理速度向けの起動引数
+TUNED_FLAGS = [
+    '--disable-gpu',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disk-cache-size=33554432',
+    '--media-cache-size=1048576',
+    '--aggressive-cache-discard',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--disable-dev-shm-usage',
+    '--mute-audio',
+]
+
+# プロファイルのコピーから除外するもの（キャッシュ・ロック・クラッシュレポート）
+PROFILE_COPY_IGNORE = (
+    'Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache', 'DawnCache',
+    'Service Worker', 'Crashpad', 'Crash Reports', 'Singleton*', 'lockfile', '*.tmp',
+)
+
+
+def find_free_port() -> int:
+    """空いているローカルポートを探す"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ManagedChrome:
+    """自動化が起動し所有するChrome（停止・クラッシュ時は次の利用時に起動し直す）"""
+
+    def __init__(self, chrome_path: Optional[str] = None, port: int = 0,
+                 source_profile: Optional[str] = None, profile_directory: Optional[str] = None,
+                 cookie_jar: Optional[str] = None, start_url: Optional[str] = None,
+                 headless: bool = True, window_size: Tuple[int, int] = (1366, 900),
+                 extra_args: Optional[List[str]] = None):
+        """
+        初期化
+
+        Args:
+            chrome_path: Chromeの実行ファイル（省略時は自動検出）
+            port: デバッグポート（0の場合は空きポート）
+            source_profile: コピー元のログイン済みユーザーデータディレクトリ
+            profile_directory: 使用するプロファイル名（"Default" 等）
+            cookie_jar: Cookieの保存ファイル（起動後に読み込み、終了時に書き戻す）
+            start_url: 接続後に開くURL（日次画面など）
+            headless: ヘッドレスで起動する
+            window_size: ウィンドウサイズ（幅, 高さ）
+            extra_args: 追加の起動引数
+        """
+        self.chrome_path = chrome_path
+        self.port = port
+        self.source_profile = source_profile
+        self.profile_directory = profile_directory
+        self.cookie_jar = cookie_jar
+        self.start_url = start_url
+        self.headless = headless
+        self.window_size = window_size
+        self.extra_args = list(extra_args or [])
+        self.process = None
+        self.user_data_dir = None
+        self.launch_count = 0
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._atexit_registered = False
+
+    @property
+    def debugger_address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def launch_arguments(self) -> List[str]:
+        """ユーザーデータ・デバッグポート以外の起動引数"""
+        arguments = ['--headless=new'] if self.headless else []
+        arguments.extend(TUNED_FLAGS)
+        arguments.append(f'--window-size={self.window_size[0]},{self.window_size[1]}')
+        arguments.extend(self.extra_args)
+        arguments.append('about:blank')
+        return arguments
+
+    def is_running(self) -> bool:
+        """起動したChromeが動作中で、デバッグポートが応答するか"""
+        return self.process is not None and self.process.poll() is None and is_chrome_alive(self.port)
+
+    def ensure_started(self) -> str:
+        """
+        Chromeが動作していなければ起動し、デバッグアドレスを返す
+
+        Raises:
+            RuntimeError: Chromeが見つからない・起動を確認できない場合
+        """
+        if self.is_running():
+            return self.debugger_address
+        if self.process is not None:
+            self.logger.warning("管理対象のChromeが停止していたため、起動し直します")
+            self.stop(save_profile=False)
+
+        chrome_path = self.chrome_path or find_chrome()
+        if not chrome_path:
+            raise RuntimeError("Chromeが見つかりません。実行ファイルを指定してください")
+        if not self.port:
+            self.port = find_free_port()
+
+        self.user_data_dir = self._prepare_user_data_dir()
+        self.process = launch_chrome(chrome_path, self.port, self.user_data_dir, self.profile_directory,
+                                     extra_args=self.launch_arguments())
+        self.launch_count += 1
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+        self.logger.info(f"Chromeを起動しました: {self.debugger_address}"
+                         f"（{'ヘッドレス' if self.headless else '画面表示'}, プロファイル: {self.user_data_dir}）")
+        return self.debugger_address
+
+    def _prepare_user_data_dir(self) -> str:
+        """作業用のユーザーデータディレクトリ（コピー元があればキャッシュ等を除いて複製）"""
+        user_data_dir = tempfile.mkdtemp(prefix='work_automation_chrome_')
+        if self.source_profile:
+            shutil.copytree(self.source_profile, user_data_dir, dirs_exist_ok=True, symlinks=True,
+                            ignore=shutil.ignore_patterns(*PROFILE_COPY_IGNORE))
+        return user_data_dir
+
+    def stop(self, save_profile: bool = False):
+        """
+        Chromeを終了し、作業用のユーザーデータディレクトリを削除
+
+        Args:
+            save_profile: True の場合、作業用ディレクトリを残す（調査用）
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout=10)
+                except Exception:
+                    self.process.kill()
+            self.process = None
+            self.logger.info("Chromeを終了しました")
+        if self.user_data_dir and not save_profile:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+    def load_cookies(self, driver) -> int:
+        """
+        保存したCookieをブラウザに設定
+
+        Args:
+            driver: execute_cdp_cmd を持つドライバー
+
+        Returns:
+            int: 設定したCookie数（保存ファイルが無い・読み込めない場合は0）
+        """
+        if not self.cookie_jar or not os.path.exists(self.cookie_jar):
+            return 0
+        try:
+            with open(self.cookie_jar, 'r', encoding='utf-8') as f:
+                cookies: List[Dict[str, Any]] = json.load(f)
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+            self.logger.info(f"Cookieを読み込みました: {len(cookies)}件")
+            return len(cookies)
+        except Exception as e:
+            self.logger.error(f"Cookieの読み込みに失敗: {e}")
+            return 0
+
+    def save_cookies(self, driver) -> bool:
+        """ブラウザのCookieを保存ファイルへ書き戻す（本人のみ読み書き可能）"""
+        if not self.cookie_jar:
+            return False
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            path = Path(self.cookie_jar)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(path.suffix + '.tmp')
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cookies, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self.logger.info(f"Cookieを保存しました: {len(cookies)}件")
+            return True
+        except Exception as e:
+            self.logger.error(f"Cookieの保存に失敗: {e}")
+            return False
+
+
+def add_launch_arguments(parser):
+    """Chromeを起動して使う場合のコマンドラインオプションを追加"""
+    parser.add_argument("--launch-chrome", action="store_true",
+                        help="起動済みのChromeに接続せず、自動化用のヘッドレスChromeを起動して使用")
+    parser.add_argument("--chrome-profile", help="コピーして使うログイン済みのユーザーデータディレクトリ（--launch-chrome 時）")
+    parser.add_argument("--profile-directory", help="使用するプロファイル名（例: Default、--launch-chrome 時）")
+    parser.add_argument("--cookie-jar", help="Cookieの保存ファイル（起動時に読み込み、終了時に保存、--launch-chrome 時）")
+    parser.add_argument("--start-url", help="起動後に開く日次画面のURL（--launch-chrome 時）")
+    parser.add_argument("--headed", action="store_true", help="ヘッドレスにせず画面を表示（--launch-chrome 時）")
+    parser.add_argument("--chrome-path", help="Chromeの実行ファイル（--launch-chrome 時、省略時は自動検出）")
+
+
+def managed_chrome_from_args(args, extra_args: Optional[List[str]] = None) -> Optional[ManagedChrome]:
+    """コマンドラインオプションから ManagedChrome を作成（--launch-chrome が無い場合は None）"""
+    if not getattr(args, 'launch_chrome', False):
+        return None
+    return ManagedChrome(chrome_path=args.chrome_path, source_profile=args.chrome_profile,
+                         profile_directory=args.profile_directory, cookie_jar=args.cookie_jar,
+                         start_url=args.start_url, headless=not args.headed, extra_args=extra_args)
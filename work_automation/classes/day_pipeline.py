@@ -0,0 +1,320 @@
+"""
+単日処理のステップ実行クラス
+
+1日分の入力を「勤務時間 → 休憩 → 事前計算 → 実労働時間 → プロジェクト → 再計算 →
+エラーチェック → 確認画面 → 提出」のステップに分け、完了したステップをチェックポイントとして
+保存する。再試行・再実行時は画面のスナップショットで完了済みステップの状態を確認し、
+失敗したステップから再開する。
+"""
+import copy
+import hashlib
+import json
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .failure_artifacts import FailureArtifactBuffer
+
+
+class DayCheckpointStore:
+    """日付ごとのステップ完了状況を保存するクラス（保存先が無い場合はメモリのみ）"""
+
+    def __init__(self, directory: Optional[str] = None, source: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            directory: チェックポイントの保存先ディレクトリ（None の場合は保存しない）
+            source: 入力元のCSVファイルのパス（指定時は CSV ごとのサブディレクトリに分けて保存し、
+                同じ日付・内容の別担当者のCSVとチェックポイントを共有しない）
+        """
+        if directory and source:
+            directory = os.path.join(directory, self.source_key(source))
+        self.directory = directory
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._memory = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def source_key(source: str) -> str:
+        """入力元CSVの識別子（ファイル名と絶対パスのハッシュ、別ディレクトリの同名CSVも区別）"""
+        digest = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()[:8]
+        return f"{os.path.splitext(os.path.basename(source))[0]}_{digest}"
+
+    @staticmethod
+    def fingerprint(work_data: Dict[str, Any]) -> str:
+        """CSVの入力内容の識別子（内容が変わったチェックポイントは使わない）"""
+        fields = {key: work_data.get(key) for key in ('date', 'start_time', 'end_time', 'location_type', 'break_times')}
+        fields['projects'] = [{'time': p.get('time'), 'comment': p.get('comment')} for p in work_data.get('projects') or []]
+        return json.dumps(fields, ensure_ascii=False, sort_keys=True, default=str)
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.directory, f"{date.replace('/', '-')}.json")
+
+    def load(self, work_data: Dict[str, Any]) -> Dict[str, Any]:
+        """日付のチェックポイントを読み込む（無い・入力内容が異なる場合は新規）"""
+        date = work_data['date']
+        fingerprint = self.fingerprint(work_data)
+        checkpoint = self._memory.get(date)
+
+        if checkpoint is None and self.directory and os.path.exists(self._path(date)):
+            try:
+                with open(self._path(date), 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"チェックポイントを読み込めません: {date} - {e}")
+
+        if not checkpoint or checkpoint.get('fingerprint') != fingerprint:
+            checkpoint = {'date': date, 'fingerprint': fingerprint, 'completed': [], 'data': {}}
+        self._memory[date] = checkpoint
+        return checkpoint
+
+    def save(self, checkpoint: Dict[str, Any]):
+        """チェックポイントを保存"""
+        checkpoint['updated'] = datetime.now().isoformat()
+        self._memory[checkpoint['date']] = checkpoint
+        if not self.directory:
+            return
+        try:
+            path = self._path(checkpoint['date'])
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            self.logger.warning(f"チェックポイントを保存できません: {checkpoint['date']} - {e}")
+
+    def clear(self, date: str):
+        """日付のチェックポイントを削除（処理が確定した日）"""
+        self._memory.pop(date, None)
+        if self.directory and os.path.exists(self._path(date)):
+            os.remove(self._path(date))
+
+
+class DayStepPipeline:
+    """1日分の入力をステップ単位で実行し、完了ステップをチェックポイントに記録するクラス"""
+
+    # (ステップ名, 失敗時のメッセージ)
+    STEPS = [
+        ('work_time', "勤務時間入力に失敗"),
+        ('break_time', "休憩時間入力に失敗"),
+        ('pre_calculate', "計算処理に失敗"),
+        ('actual_hours', "実労働時間の取得に失敗"),
+        ('projects', "プロジェクト入力に失敗"),
+        ('post_calculate', "計算処理に失敗"),
+        ('errors', "エラーチェックに失敗"),
+        ('save_and_next', "確認画面遷移に失敗"),
+        ('submit', "提出ボタンクリックに失敗"),
+    ]
+    STEP_NAMES = [name for name, _ in STEPS]
+
+    def __init__(self, bulk, work_data: Dict[str, Any], store: DayCheckpointStore):
+        """
+        初期化
+
+        Args:
+            bulk: BulkWorkAutomation インスタンス
+            work_data: 1日分の工数データ
+            store: チェックポイントの保存先
+        """
+        self.bulk = bulk
+        self.automation = bulk.automation
+        # CSVの行はステップ実行前の内容のまま保持し、チェックポイントの識別子とプロジェクト時間の調整に使う
+        self.source_data = copy.deepcopy(work_data)
+        self.work_data = copy.deepcopy(work_data)
+        self.store = store
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.checkpoint = None
+        self.snapshot = {}
+        self.diff = {}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        チェックポイントから再開してステップを実行
+
+        Returns:
+            Dict: {'status': 'success' | 'skipped_already_submitted' | 'error_skip' | 'failure',
+                   'message', 'failed_step'（再試行可能な失敗のみ）, 'resumed_from'}
+        """
+        date = self.work_data['date']
+        self.checkpoint = self.store.load(self.source_data)
+        completed = self.checkpoint['completed']
+
+        # 調整済みのプロジェクト時間を復元してから画面と比較
+        if 'actual_hours' in completed and 'projects' in self.checkpoint['data']:
+            self.work_data['projects'] = self.checkpoint['data']['projects']
+
+        # 0. 現在のフォーム状態と比較し、差分のある項目のみ入力
+        self.snapshot, self.diff = self.bulk._plan_form_updates(self.work_data)
+
+        # 提出済みの日はスキップ（前回の提出ボタン押下が反映されていた場合は提出完了）
+        if self.snapshot and self.automation.is_day_submitted(self.snapshot, date):
+            self.store.clear(date)
+            if 'save_and_next' in completed:
+                return self._outcome('success', "提出完了（前回の提出を確認）")
+            return self._outcome('skipped_already_submitted', "提出済みのためスキップ")
+
+        start = self._resume_index()
+        if completed:
+            self.logger.info(f"チェックポイントから再開: {date} - {self.STEP_NAMES[start]}"
+                             f"（完了済み: {', '.join(self.STEP_NAMES[:start]) or 'なし'}）")
+        self.checkpoint['completed'] = self.STEP_NAMES[:start]
+
+        for name, failure_message in self.STEPS[start:]:
+            try:
+                outcome = getattr(self, f"_step_{name}")()
+            except Exception as e:
+                self.logger.error(f"ステップ {name} でエラー: {e}")
+                outcome = f"予期しないエラー: {e}"
+
+            if outcome is not None and (not isinstance(outcome, dict) or outcome['status'] == 'failure'):
+                self._record_failure_snapshot(name)
+            if isinstance(outcome, dict):
+                # エラーチェックによる確定（スキップ・記録対象エラー）は再試行しない
+                self.store.clear(date)
+                return dict(outcome, resumed_from=self.STEP_NAMES[start])
+            if outcome is not None:
+                message = outcome if isinstance(outcome, str) else failure_message
+                self.checkpoint['failed_step'] = name
+                self.store.save(self.checkpoint)
+                return self._outcome('failure', message, failed_step=name, resumed_from=self.STEP_NAMES[start])
+
+            self.checkpoint['completed'].append(name)
+            self.store.save(self.checkpoint)
+
+        self.store.clear(date)
+        return self._outcome('success', "提出完了", resumed_from=self.STEP_NAMES[start])
+
+    def _record_failure_snapshot(self, name: str):
+        """失敗したステップの画面状態を調査用記録に追加（その日が失敗で終わった場合のみ保存される）"""
+        artifacts = getattr(self.automation, 'failure_artifacts', None)
+        if isinstance(artifacts, FailureArtifactBuffer) and artifacts.active:
+            artifacts.record(self.automation.driver, f"step_{name}")
+
+    @staticmethod
+    def _outcome(status: str, message: str, **extra) -> Dict[str, Any]:
+        return dict({'status': status, 'message': message, 'failed_step': None, 'resumed_from': None}, **extra)
+
+    def _resume_index(self) -> int:
+        """完了済みステップを画面の状態で確認し、再開するステップの位置を返す"""
+        completed = self.checkpoint['completed']
+        if not completed:
+            return 0
+
+        # 確認画面まで進んでいれば提出から再開
+        if 'save_and_next' in completed and self.automation.is_confirmation_screen():
+            return self.STEP_NAMES.index('submit')
+
+        # 入力画面の項目はスナップショットとの差分が無いことを確認
+        verified = {
+            'work_time': not self.diff.get('work_time'),
+            'break_time': not self.diff.get('break_time'),
+            'projects': not self.diff.get('projects'),
+            'save_and_next': False,
+        }
+        for index, name in enumerate(self.STEP_NAMES):
+            if name not in completed or not verified.get(name, True):
+                return index
+        return len(self.STEP_NAMES) - 1
+
+    def _step_work_time(self):
+        if not self.diff['work_time']:
+            return None
+        self.checkpoint['data']['inputs_changed'] = True
+        if not self.automation.input_work_time(
+            self.work_data['start_time'],
+            self.work_data['end_time'],
+            self.work_data['location_type']
+        ):
+            return False
+        return None
+
+    def _step_break_time(self):
+        if not (self.work_data['break_times'] and self.diff['break_time']):
+            return None
+        self.checkpoint['data']['inputs_changed'] = True
+        if not self.automation.input_break_time(self.work_data['break_times']):
+            return False
+        return None
+
+    def _step_pre_calculate(self):
+        # プロジェクト入力前に実労働時間を計算（勤務・休憩時間に変更が無ければ不要）
+        if not self.checkpoint['data'].get('inputs_changed'):
+            self.logger.info("勤務・休憩時間は入力済みのため事前計算をスキップ")
+            return None
+        self.logger.info("プロジェクト入力前に計算を実行")
+        return None if self.automation.calculate() else False
+
+    def _step_actual_hours(self):
+        work_data = self.work_data
+        work_time_data = self.automation.get_actual_work_time_from_screen()
+        if work_time_data['success']:
+            actual_work_minutes = work_time_data['actual_work_minutes']
+            actual_work_hours = f"{actual_work_minutes//60}:{actual_work_minutes%60:02d}"
+            self.logger.info(f"画面から取得した実労働時間: {actual_work_hours}")
+        else:
+            # フォールバック: 従来の方法
+            actual_work_hours = self.automation.get_actual_work_hours()
+            if actual_work_hours:
+                self.logger.info(f"フォールバック実労働時間: {actual_work_hours}")
+
+        # プロジェクト時間の調整が必要な場合（常にCSVの値から調整する）
+        if actual_work_hours and self.source_data['projects']:
+            work_data['projects'] = self.bulk._adjust_project_hours(self.source_data['projects'], actual_work_hours)
+
+        self.checkpoint['data']['actual_work_hours'] = actual_work_hours
+        self.checkpoint['data']['projects'] = work_data['projects']
+        return None
+
+    def _step_projects(self):
+        # グリッドAPIで一括、失敗行のみセル操作
+        if not self.work_data['projects']:
+            return None
+        current_hours = self.snapshot.get('project_hours')
+        if self.checkpoint['data'].get('inputs_changed'):
+            # 勤務・休憩時間の入力と計算のポストバックでグリッドが変わりうるため、入力直前の値と比較
+            snapshot = self.automation.snapshot_form_state()
+            current_hours = snapshot.get('project_hours') if isinstance(snapshot, dict) else None
+        failed_indices = self.automation.input_project_works(
+            self.work_data['projects'], current_hours=current_hours
+        )
+        if failed_indices:
+            return f"プロジェクト{failed_indices[0]+1}入力に失敗"
+        return None
+
+    def _step_post_calculate(self):
+        return None if self.automation.calculate() else False
+
+    def _step_errors(self):
+        # エラーチェックと深夜勤務申請エラー対策
+        errors = self.automation.check_errors()
+        if not errors:
+            # エラーがない場合でも予防的に深夜勤務申請エラーチェック
+            self.automation.check_and_handle_night_work_error()
+            return None
+
+        # 深夜勤務申請エラーの自動修正を試行
+        if self.automation.check_and_handle_night_work_error():
+            self.logger.info("深夜勤務申請エラー修正後、再度エラーチェックを実行")
+            errors = self.automation.check_errors()
+            if not errors:
+                self.logger.info("深夜勤務申請エラー修正により、すべてのエラーが解決されました")
+                return None
+
+        # エラーを記録（申請対象のみ）
+        self.automation.record_error_for_later_application(self.work_data['date'], errors)
+
+        # 特定のエラー以外の場合はスキップ
+        if self.automation.should_skip_date_for_errors(errors):
+            error_msg = f"スキップ対象エラー: {', '.join(errors)}"
+            self.logger.warning(f"日付をスキップします: {self.work_data['date']} - {error_msg}")
+            return self._outcome('error_skip', f"スキップ - {error_msg}")
+        return self._outcome('failure', f"エラー検出: {', '.join(errors)}")
+
+    def _step_save_and_next(self):
+        return None if self.automation.save_and_next() else False
+
+    def _step_submit(self):
+        # 確認画面での提出処理（常に提出）
+        return None if self.automation.submit_confirmation() else False
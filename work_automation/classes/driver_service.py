@@ -0,0 +1,143 @@
+"""
+chromedriver の共有サービス
+
+webdriver.Chrome はセッションごとに chromedriver を起動・終了するため、
+プロセス内で chromedriver を1回だけ起動し、各セッションはそこへ接続する。
+WebDriverコマンドの送信は keep-alive の接続プールを使い、並列に送れる接続数を指定できる。
+"""
+import atexit
+import time
+import logging
+import threading
+from statistics import median
+from typing import Any, Dict
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+
+class KeepAliveConnection(ChromiumRemoteConnection):
+    """接続プールの大きさを指定できる keep-alive のコマンド接続"""
+
+    def __init__(self, remote_server_addr: str, pool_maxsize: int = 4):
+        self.pool_maxsize = pool_maxsize
+        # chromedriver はローカルのためプロキシを経由しない
+        super().__init__(remote_server_addr, vendor_prefix="goog", browser_name="chrome",
+                         keep_alive=True, ignore_proxy=True)
+
+    def _get_connection_manager(self):
+        manager = super()._get_connection_manager()
+        manager.connection_pool_kw['maxsize'] = self.pool_maxsize
+        return manager
+
+
+class SharedServiceChrome(webdriver.Chrome):
+    """共有の chromedriver に接続する Chrome セッション（終了時に chromedriver を止めない）"""
+
+    def __init__(self, options, service: "ChromeDriverService", pool_maxsize: int = 4):
+        self.service = service.service
+        executor = KeepAliveConnection(service.service_url, pool_maxsize=pool_maxsize)
+        RemoteWebDriver.__init__(self, command_executor=executor, options=options)
+        self._is_remote = False
+
+    def quit(self) -> None:
+        """セッションのみ終了"""
+        RemoteWebDriver.quit(self)
+
+
+class ChromeDriverService:
+    """chromedriver を1回だけ起動し、複数のセッションで使い回すクラス"""
+
+    def __init__(self, pool_maxsize: int = 4):
+        """
+        初期化
+
+        Args:
+            pool_maxsize: 1セッションあたりのコマンド接続の最大数
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.pool_maxsize = pool_maxsize
+        self.service = Service()
+        self.lock = threading.Lock()
+        self.startup_time = None
+        self.sessions = 0
+        self.browser_path = None
+
+    @property
+    def service_url(self) -> str:
+        return self.service.service_url
+
+    def is_running(self) -> bool:
+        process = getattr(self.service, 'process', None)
+        return process is not None and process.poll() is None
+
+    def start(self):
+        """chromedriver を起動（起動済みの場合は何もしない）"""
+        with self.lock:
+            if self.is_running():
+                return
+            started = time.perf_counter()
+            finder = DriverFinder(self.service, webdriver.ChromeOptions())
+            self.browser_path = finder.get_browser_path()
+            self.service.path = finder.get_driver_path()
+            self.service.start()
+            self.startup_time = time.perf_counter() - started
+            self.logger.info(f"chromedriverを起動しました: {self.service_url}（{self.startup_time:.2f}秒）")
+
+    def create_driver(self, options) -> SharedServiceChrome:
+        """共有の chromedriver に新しいセッションを作成"""
+        self.start()
+        if self.browser_path and not options.experimental_options.get('debuggerAddress'):
+            options.binary_location = self.browser_path
+            options.browser_version = None
+        driver = SharedServiceChrome(options, self, pool_maxsize=self.pool_maxsize)
+        with self.lock:
+            self.sessions += 1
+        return driver
+
+    def stop(self):
+        """chromedriver を終了"""
+        with self.lock:
+            if self.is_running():
+                self.service.stop()
+                self.logger.info(f"chromedriverを終了しました（セッション数: {self.sessions}）")
+
+    def stats(self) -> Dict[str, Any]:
+        """起動時間と作成したセッション数"""
+        return {'startup_time': self.startup_time, 'sessions': self.sessions, 'running': self.is_running()}
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_service() -> ChromeDriverService:
+    """プロセス内で共有する chromedriver サービス（終了時に自動で停止）"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = ChromeDriverService()
+            atexit.register(_shared_service.stop)
+        return _shared_service
+
+
+def measure_command_overhead(driver, samples: int = 50) -> Dict[str, float]:
+    """
+    1コマンドあたりの往復時間を計測（ページに依存しない軽いスクリプトを繰り返し実行）
+
+    Returns:
+        平均・中央値・最大（ミリ秒）
+    """
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        driver.execute_script("return 1")
+        durations.append((time.perf_counter() - started) * 1000)
+    return {
+        'mean_ms': sum(durations) / len(durations),
+        'median_ms': median(durations),
+        'max_ms': max(durations),
+    }
@@ -0,0 +1,215 @@
+"""
+エラー記録の保存クラス
+
+後で申請するエラーの記録を SQLite に保存する。日付と状態にインデックスを張り、
+一覧・集計はクエリで取得する。状態の遷移（pending → applied → resolved）は一括更新する。
+"""
+import glob
+import json
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .navigation_planner import parse_date_text
+
+
+class ErrorRecordStore:
+    """エラー記録を SQLite で管理するクラス"""
+
+    STATUSES = ('pending', 'applied', 'resolved')
+
+    # error_records ディレクトリ内のファイル名
+    DB_NAME = "error_records.db"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS error_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            recorded_at TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            errors TEXT NOT NULL,
+            end_time TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_error_records_date ON error_records (date);
+        CREATE INDEX IF NOT EXISTS idx_error_records_status ON error_records (status, date);
+        CREATE TABLE IF NOT EXISTS imported_files (
+            name TEXT PRIMARY KEY,
+            imported_at TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初期化
+
+        Args:
+            db_path: データベースファイルのパス
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            # 複数タブ・複数プロセスからの同時書き込みに備えてWALを使用
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self._SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def normalize_date(date: str) -> str:
+        """日付を YYYY-MM-DD に揃える（解析できない場合はそのまま）"""
+        parsed = parse_date_text(date)
+        return parsed.strftime('%Y-%m-%d') if parsed else date
+
+    def add(self, date: str, errors: List[str], end_time: Optional[str] = None,
+            status: str = 'pending', recorded_at: Optional[str] = None) -> int:
+        """
+        エラー記録を追加
+
+        Returns:
+            int: 追加した記録のID
+        """
+        recorded_at = recorded_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO error_records (date, recorded_at, status, errors, end_time) VALUES (?, ?, ?, ?, ?)",
+                (self.normalize_date(date), recorded_at, status, json.dumps(errors, ensure_ascii=False), end_time)
+            )
+            return cursor.lastrowid
+
+    def get(self, date: str) -> List[Dict]:
+        """指定日のエラー記録（従来のJSONと同じ timestamp / errors / status 形式）"""
+        return self.query(start_date=date, end_date=date)
+
+    def query(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+              status: Optional[str] = None) -> List[Dict]:
+        """
+        条件に合うエラー記録を日付・記録時刻順に取得
+
+        Args:
+            start_date: 開始日（含む）
+            end_date: 終了日（含む）
+            status: 状態
+        """
+        conditions, params = self._conditions(start_date, end_date, status)
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT id, date, recorded_at, status, errors, end_time FROM error_records {conditions} "
+                "ORDER BY date, recorded_at, id",
+                params
+            ).fetchall()
+        return [{
+            'id': row['id'],
+            'date': row['date'],
+            'timestamp': row['recorded_at'],
+            'status': row['status'],
+            'errors': json.loads(row['errors']),
+            'end_time': row['end_time'],
+        } for row in rows]
+
+    def statistics(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, int]:
+        """状態ごとの記録数"""
+        conditions, params = self._conditions(start_date, end_date, None)
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT status, COUNT(*) AS count FROM error_records {conditions} GROUP BY status", params
+            ).fetchall()
+        counts = {status: 0 for status in self.STATUSES}
+        counts.update({row['status']: row['count'] for row in rows})
+        return counts
+
+    def update_status(self, new_status: str, dates: Optional[Iterable[str]] = None,
+                      ids: Optional[Iterable[int]] = None, from_status: Optional[str] = None) -> int:
+        """
+        状態を一括更新
+
+        Args:
+            new_status: 更新後の状態
+            dates: 対象日（省略時は全日）
+            ids: 対象の記録ID
+            from_status: 更新前の状態で絞り込む場合に指定
+
+        Returns:
+            int: 更新した記録数
+        """
+        if new_status not in self.STATUSES:
+            raise ValueError(f"不明な状態です: {new_status}")
+
+        clauses, params = [], []
+        if dates is not None:
+            dates = [self.normalize_date(date) for date in dates]
+            clauses.append(f"date IN ({', '.join('?' * len(dates))})")
+            params.extend(dates)
+        if ids is not None:
+            ids = list(ids)
+            clauses.append(f"id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if from_status:
+            clauses.append("status = ?")
+            params.append(from_status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as connection:
+            cursor = connection.execute(f"UPDATE error_records SET status = ? {where}", [new_status] + params)
+            return cursor.rowcount
+
+    def import_json_directory(self, directory: str) -> int:
+        """
+        従来の日付ごとのJSONファイル（<日付>.json）を取り込む（取り込み済みのファイルは飛ばす）
+
+        Returns:
+            int: 取り込んだ記録数
+        """
+        imported = 0
+        with self._connect() as connection:
+            done = {row['name'] for row in connection.execute("SELECT name FROM imported_files")}
+            for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+                name = os.path.basename(path)
+                if name in done:
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        records = json.load(f)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"エラー記録ファイルを読み込めません: {path} - {e}")
+                    continue
+
+                date = self.normalize_date(os.path.splitext(name)[0])
+                connection.executemany(
+                    "INSERT INTO error_records (date, recorded_at, status, errors, end_time) VALUES (?, ?, ?, ?, NULL)",
+                    [(date, record.get('timestamp', ''), record.get('status', 'pending'),
+                      json.dumps(record.get('errors', []), ensure_ascii=False)) for record in records]
+                )
+                connection.execute("INSERT INTO imported_files (name, imported_at) VALUES (?, ?)",
+                                   (name, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                imported += len(records)
+
+        if imported:
+            self.logger.info(f"エラー記録を取り込みました: {imported}件 ({directory})")
+        return imported
+
+    def _conditions(self, start_date: Optional[str], end_date: Optional[str], status: Optional[str]):
+        clauses, params = [], []
+        if start_date:
+            clauses.append("date >= ?")
+            params.append(self.normalize_date(start_date))
+        if end_date:
+            clauses.append("date <= ?")
+            params.append(self.normalize_date(end_date))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
@@ -0,0 +1,271 @@
+"""
+期間指定エラーチェックの高速走査クラス
+"""
+import os
+import csv
+import time
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .navigation_planner import DateNavigationPlanner, parse_date_text
+from .resource_blocking import ResourceBlockingProfile
+
+
+def load_holidays(holiday_file: str) -> set:
+    """祝日ファイル（1行1日付、CSVの場合は先頭列）を読み込む"""
+    holidays = set()
+    with open(holiday_file, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            value = line.split(',')[0].strip()
+            if not value:
+                continue
+            try:
+                holidays.add(datetime.strptime(value.replace('/', '-'), '%Y-%m-%d').date())
+            except ValueError:
+                continue  # ヘッダー行など
+    return holidays
+
+
+class RangeErrorScanner:
+    """指定期間の各日のエラーを、直接遷移と複数タブ並列で走査するクラス"""
+
+    # 記録対象外のエラー
+    IGNORED_ERRORS = ["在宅/出社区分が入力されていません"]
+
+    # 表示中の日付・エラー・終了時刻を1回で読み取るスクリプト
+    _READ_DAY_SCRIPT = """
+        var dateElement = document.querySelector('#srw_page_navi_date span');
+        var errors = [];
+        var elements = document.querySelectorAll('.error');
+        for (var i = 0; i < elements.length; i++) {
+            var text = (elements[i].innerText || '').trim();
+            if (text) {
+                errors.push(text);
+            }
+        }
+        var endTime = document.getElementsByName('KNMTMRNGETDI')[0];
+        return {
+            ready: document.readyState === 'complete',
+            date: dateElement ? dateElement.textContent.trim() : '',
+            errors: errors,
+            end_time: endTime ? (endTime.value || '') : null
+        };
+    """
+
+    # 読み込み後にページのスクリプトがエラーを表示し終えたとみなす無変更時間（ミリ秒）
+    SETTLE_QUIET_MS = 300
+
+    def __init__(self, automation, tabs: int = 4, include_weekends: bool = False,
+                 holidays: Optional[Set[date]] = None, include_holidays: bool = False,
+                 page_timeout: float = 30):
+        """
+        初期化
+
+        Args:
+            automation: WorkTimeAutomation インスタンス
+            tabs: 並列に使用するタブ数
+            include_weekends: True の場合、土日も走査する
+            holidays: 祝日の集合
+            include_holidays: True の場合、祝日も走査する
+            page_timeout: 1日分の読み込みを待つ最大秒数
+        """
+        self.automation = automation
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.tabs = max(1, tabs)
+        self.include_weekends = include_weekends
+        self.holidays = holidays or set()
+        self.include_holidays = include_holidays
+        self.page_timeout = page_timeout
+        self.stats = {}
+
+    def target_dates(self, start_date: str, end_date: str) -> List[date]:
+        """走査対象の日付一覧（土日・祝日は指定がない限り除外）"""
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+
+        dates = []
+        current = start
+        while current <= end:
+            if (self.include_weekends or current.weekday() < 5) and \
+               (self.include_holidays or current not in self.holidays):
+                dates.append(current)
+            current += timedelta(days=1)
+        return dates
+
+    def scan(self, start_date: str, end_date: str, output_file: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        指定期間を走査し、結果をCSVへ逐次出力
+
+        Args:
+            start_date: 開始日（YYYY-MM-DD）
+            end_date: 終了日（YYYY-MM-DD）
+            output_file: 出力CSVのパス（省略時は logs/ 配下に自動命名）
+
+        Returns:
+            Dict[str, List[str]]: 日付（YYYY-MM-DD）とエラーリストの辞書
+        """
+        dates = self.target_dates(start_date, end_date)
+        if output_file is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_file = str(Path(__file__).parent.parent / "logs" / f"error_check_{start_date}_to_{end_date}_{timestamp}.csv")
+
+        self.logger.info(f"エラー走査: {len(dates)}日分, タブ数={self.tabs}, 出力={output_file}")
+        error_results = {}
+        started = time.perf_counter()
+
+        with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=['日付', 'エラー数', 'エラー内容'])
+            writer.writeheader()
+            f.flush()
+
+            def emit(target: date, errors: List[str]):
+                date_str = target.strftime('%Y-%m-%d')
+                error_results[date_str] = errors
+                rows = [{'日付': date_str, 'エラー数': len(errors), 'エラー内容': error} for error in errors]
+                writer.writerows(rows or [{'日付': date_str, 'エラー数': 0, 'エラー内容': 'エラーなし'}])
+                f.flush()
+
+            # 日付遷移テンプレートは1回の遷移で到着を確認できたものだけを使う
+            template = self.automation._date_navigation_template
+            if not template and dates and self.automation.navigate_to_date(dates[0].strftime('%Y/%m/%d')):
+                template = self.automation._date_navigation_template
+            if template:
+                self._scan_with_template(dates, template, emit)
+            else:
+                self.logger.warning("日付遷移テンプレートが無いため1タブで順次走査します")
+                self._scan_with_planner(dates, emit)
+
+        # 結果は読み込みが終わった順に追記されるため、走査後に日付順へ並べ替える
+        self._sort_output(output_file)
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'days': len(dates),
+            'tabs': self.tabs,
+            'elapsed': elapsed,
+            'days_per_minute': len(dates) / elapsed * 60 if elapsed > 0 else 0.0,
+            'output_file': output_file
+        }
+        self.logger.info(f"エラー走査完了: {len(dates)}日 / {elapsed:.1f}秒 ({self.stats['days_per_minute']:.1f}日/分)")
+        return error_results
+
+    @staticmethod
+    def _sort_output(output_file: str):
+        """出力CSVを日付順に並べ替え（同じ日の行の順序は保持）"""
+        with open(output_file, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames
+            rows = sorted(reader, key=lambda row: row['日付'])
+        temp_file = output_file + '.tmp'
+        with open(temp_file, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temp_file, output_file)
+
+    def _scan_with_template(self, dates: List[date], template: Dict[str, str], emit: Callable):
+        """日付遷移テンプレートで各タブに遷移を投入し、読み込みが終わったタブから結果を回収"""
+        driver = self.automation.driver
+        original_handle = driver.current_window_handle
+        base_url = driver.current_url
+        queue = list(dates)
+        handles = [original_handle]
+        pending = {}
+
+        try:
+            for _ in range(min(self.tabs, len(dates)) - 1):
+                driver.switch_to.new_window('tab')
+                handles.append(driver.current_window_handle)
+                # 通信ブロック設定はタブ単位のため、開いたタブに適用
+                if isinstance(getattr(self.automation, 'resource_blocking', None), ResourceBlockingProfile):
+                    self.automation.resource_blocking.apply(driver)
+                if template['kind'] != 'url':
+                    # onclick実行型のテンプレートはアプリの画面上で実行する必要がある
+                    driver.get(base_url)
+
+            # 各タブに最初の日付を投入（遷移の完了は待たない）
+            for handle in handles:
+                if queue:
+                    pending[handle] = self._start_navigation(handle, queue.pop(0), template)
+
+            # 順番にタブを回り、読み込み済みの結果を回収して次の日付を投入
+            while pending:
+                for handle in list(pending):
+                    target = pending.pop(handle)
+                    emit(target, self._read_day(handle, target))
+                    if queue:
+                        pending[handle] = self._start_navigation(handle, queue.pop(0), template)
+        finally:
+            for handle in handles[1:]:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception as e:
+                    self.logger.debug(f"走査用タブのクローズに失敗: {e}")
+            driver.switch_to.window(original_handle)
+
+    def _start_navigation(self, handle: str, target: date, template: Dict[str, str]) -> date:
+        """タブに対象日への遷移を投入"""
+        driver = self.automation.driver
+        governor = getattr(self.automation, 'governor', None)
+        if governor is not None:
+            # 遷移の完了は待たないため、送信レートのみ制御する
+            governor.throttle('navigation')
+        driver.switch_to.window(handle)
+        request = template['template'].replace(self.automation._DATE_TEMPLATE_TOKEN, target.strftime(template['format']))
+        if template['kind'] == 'url':
+            driver.execute_script("window.location.href = arguments[0];", request)
+        else:
+            driver.execute_script(f"setTimeout(function() {{ {request} }}, 0);")
+        return target
+
+    def _read_day(self, handle: Optional[str], target: date) -> List[str]:
+        """タブの読み込み完了を待って表示中の日のエラーを読み取り、記録対象のエラーを返す"""
+        driver = self.automation.driver
+        try:
+            if handle:
+                driver.switch_to.window(handle)
+            # 遷移前の画面を読まないよう、対象日の読み込み完了まで待つ
+            deadline = time.time() + self.page_timeout
+            while True:
+                day = driver.execute_script(self._READ_DAY_SCRIPT)
+                landed = day.get('ready') and parse_date_text(day.get('date')) == target
+                if landed or time.time() >= deadline:
+                    break
+                time.sleep(0.1)
+
+            if not landed:
+                self.logger.error(f"{target} への遷移に失敗（表示中: {day.get('date')}）")
+                return ["ページ遷移エラー"]
+
+            # 読み込み後にページのスクリプトが表示するエラーを読み漏らさないよう、DOMの静止を待って読み直す
+            settled = self.automation._wait_for_quiescence(quiet_ms=self.SETTLE_QUIET_MS,
+                                                           max_wait=min(self.page_timeout, 10))
+            if isinstance(settled, dict) and not settled.get('quiet'):
+                self.logger.warning(f"{target}: 画面が静止しないまま読み取ります")
+            day = driver.execute_script(self._READ_DAY_SCRIPT)
+
+            errors = [error for error in day.get('errors') or []
+                      if not any(ignored in error for ignored in self.IGNORED_ERRORS)]
+            if errors:
+                self.logger.warning(f"{target}: {len(errors)}件のエラー検出")
+                self.automation.record_error_for_later_application(
+                    target.strftime('%Y-%m-%d'), errors, end_time=day.get('end_time')
+                )
+            return errors
+
+        except Exception as e:
+            self.logger.error(f"{target} のエラーチェック中にエラー: {e}")
+            return [f"チェック中のエラー: {str(e)}"]
+
+    def _scan_with_planner(self, dates: List[date], emit: Callable):
+        """日付遷移の経路計画で1日ずつ遷移して走査"""
+        planner = DateNavigationPlanner(self.automation)
+        for target in dates:
+            if not planner.navigate_to(target.strftime('%Y/%m/%d'))['success']:
+                self.logger.error(f"{target} への遷移に失敗")
+                emit(target, ["ページ遷移エラー"])
+                continue
+            emit(target, self._read_day(None, target))
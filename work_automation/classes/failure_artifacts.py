@@ -0,0 +1,143 @@
+"""
+失敗時の調査用記録（直近の画面スナップショットのリングバッファ）
+
+1日分の処理中は、スクリーンショットの代わりに画面の状態（フォームの入力値・エラー表示、
+必要に応じて圧縮したHTML）をメモリ上に直近 K 件だけ保持する。
+その日が失敗で終わった場合のみ、保持したスナップショットとスクリーンショット1枚を保存する。
+"""
+import os
+import gzip
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# 画面の状態（入力項目・エラー表示・日付・表示範囲）を1回のスクリプトで取得
+_SNAPSHOT_JS = """
+var fields = [];
+var elements = document.querySelectorAll('input, select, textarea');
+for (var i = 0; i < elements.length; i++) {
+    var e = elements[i];
+    if (e.type === 'password') { continue; }
+    var field = {name: e.name || null, id: e.id || null, type: e.type || e.tagName.toLowerCase(),
+                 value: e.value, disabled: !!e.disabled};
+    if (e.type === 'checkbox' || e.type === 'radio') { field.checked = e.checked; }
+    if (e.tagName === 'SELECT' && e.selectedIndex >= 0) { field.text = e.options[e.selectedIndex].text; }
+    fields.push(field);
+}
+var errors = [];
+var errorElements = document.querySelectorAll('.error');
+for (var j = 0; j < errorElements.length; j++) {
+    var text = (errorElements[j].innerText || '').trim();
+    if (text) { errors.push(text); }
+}
+var dateElement = document.querySelector('#srw_page_navi_date span');
+return {
+    url: location.href,
+    title: document.title,
+    date: dateElement ? dateElement.textContent.trim() : null,
+    errors: errors,
+    fields: fields,
+    viewport: {x: window.scrollX, y: window.scrollY, width: window.innerWidth, height: window.innerHeight},
+    html: arguments[0] ? document.documentElement.outerHTML : null
+};
+"""
+
+
+class FailureArtifactBuffer:
+    """直近の画面スナップショットを保持し、失敗した日だけ保存するクラス"""
+
+    def __init__(self, output_dir: str, capacity: int = 5, include_html: bool = False):
+        """
+        初期化
+
+        Args:
+            output_dir: 失敗時の記録の保存先（日ごとにサブディレクトリを作成）
+            capacity: 保持するスナップショット数
+            include_html: スナップショットに圧縮したHTMLを含める
+        """
+        self.output_dir = output_dir
+        self.include_html = include_html
+        self.snapshots = deque(maxlen=capacity)
+        self.date = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def active(self) -> bool:
+        """1日分の処理中か（処理中はスクリーンショットを保存せずスナップショットを記録）"""
+        return self.date is not None
+
+    def begin(self, date: str):
+        """1日分の処理の開始（前の日のスナップショットは破棄）"""
+        self.snapshots.clear()
+        self.date = date
+
+    def discard(self):
+        """成功した日のスナップショットを破棄"""
+        self.snapshots.clear()
+        self.date = None
+
+    def record(self, driver, label: str) -> bool:
+        """
+        表示中の画面の状態をスナップショットとして記録
+
+        Args:
+            driver: WebDriver
+            label: 記録のきっかけ（スクリーンショット名・失敗したステップ名など）
+
+        Returns:
+            bool: 記録できた場合 True
+        """
+        try:
+            state = driver.execute_script(_SNAPSHOT_JS, self.include_html)
+        except Exception as e:
+            self.logger.debug(f"スナップショットの取得に失敗: {label} - {e}")
+            return False
+        if not isinstance(state, dict):
+            return False
+        html = state.pop('html', None)
+        state['label'] = label
+        state['time'] = datetime.now().isoformat(timespec='milliseconds')
+        state['html_gz'] = gzip.compress(html.encode('utf-8'), compresslevel=6) if isinstance(html, str) else None
+        self.snapshots.append(state)
+        return True
+
+    def flush(self, driver, reason: str, screenshots=None) -> Optional[str]:
+        """
+        失敗した日の記録を保存（最後に現在の画面を記録し、スクリーンショットを1枚撮影）
+
+        Args:
+            driver: WebDriver
+            reason: 失敗の理由
+            screenshots: ScreenshotPipeline（省略時はスクリーンショットを保存しない）
+
+        Returns:
+            保存先のディレクトリ（保存できない場合は None）
+        """
+        date = self.date or 'unknown'
+        self.record(driver, 'failure')
+        directory = os.path.join(self.output_dir, f"{date.replace('/', '-')}_{datetime.now():%Y%m%d_%H%M%S}")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            entries = []
+            for index, snapshot in enumerate(self.snapshots, 1):
+                entry = {key: value for key, value in snapshot.items() if key != 'html_gz'}
+                if snapshot['html_gz']:
+                    entry['html_file'] = f"snapshot_{index}.html.gz"
+                    with open(os.path.join(directory, entry['html_file']), 'wb') as f:
+                        f.write(snapshot['html_gz'])
+                entries.append(entry)
+            with open(os.path.join(directory, 'snapshots.json'), 'w', encoding='utf-8') as f:
+                json.dump({'date': date, 'reason': reason, 'snapshots': entries}, f, ensure_ascii=False, indent=2)
+
+            if screenshots is not None:
+                viewport = self.snapshots[-1].get('viewport') if self.snapshots else None
+                screenshots.capture(driver, directory, 'screenshot_failure', viewport)
+            self.logger.info(f"失敗時の記録を保存しました: {directory}（スナップショット {len(entries)}件）")
+            return directory
+        except Exception as e:
+            self.logger.error(f"失敗時の記録の保存に失敗: {e}")
+            return None
+        finally:
+            self.discard()
@@ -0,0 +1,292 @@
+"""
+入力フィールドのクリア方法を学習するクラス
+"""
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.keys import Keys
+
+# 学習結果ファイルの読み込み・統合・書き込みを直列化（タブ並列処理のワーカーが同時に保存するため）
+_SAVE_LOCK = threading.Lock()
+
+
+class AdaptiveFieldClearer:
+    """フィールド種別ごとに最も安価で成功するクリア方法を学習して使うクラス"""
+
+    # 既定のコスト順（安い順）
+    METHODS = ['js_value', 'select_delete', 'webdriver_clear', 'backspace', 'clone_replace']
+
+    # 要素を複製で置き換えるため呼び出し元の要素が切り離される。学習による並べ替えの対象外とし常に最後に試す
+    LAST_RESORT = 'clone_replace'
+
+    # 成功率がこれを下回る方法は、未試行の方法より後に回す
+    MIN_SUCCESS_RATE = 0.5
+
+    # クリア後、ページ側の非同期の再設定（defaulttime の復元など）を待ってから値を確認する時間（ミリ秒）
+    SETTLE_MS = 50
+
+    # 1回目の往復で種別判定・既存値確認・（必要なら）JavaScriptクリアと検証まで行う
+    _PROBE_AND_CLEAR_SCRIPT = """
+    var element = arguments[0];
+    var preferred = arguments[1];
+    var settleMs = arguments[2];
+    var done = arguments[arguments.length - 1];
+    if (!element || !element.parentNode) {
+        done({key: null, before: null, after: null, tried: null});
+        return;
+    }
+    // defaulttime 属性はクリア時に外すため種別に含めない（呼び出しごとに種別が変わらないように）
+    var key = element.tagName.toLowerCase() + ':' + (element.type || '');
+    var before = element.value || '';
+    if (before === '') {
+        done({key: key, before: before, after: before, tried: null});
+        return;
+    }
+    var method = preferred[key] || 'js_value';
+    if (method !== 'js_value') {
+        done({key: key, before: before, after: before, tried: null});
+        return;
+    }
+    element.value = '';
+    element.setAttribute('value', '');
+    element.removeAttribute('defaulttime');
+    element.dispatchEvent(new Event('input', { bubbles: true }));
+    element.dispatchEvent(new Event('change', { bubbles: true }));
+    // 同期的に読み返すと常に空になるため、ページ側のスクリプトに処理を譲ってから確認する
+    setTimeout(function() {
+        done({key: key, before: before, after: element.value || '', tried: 'js_value'});
+    }, settleMs);
+    """
+
+    _READ_VALUE_SCRIPT = """
+    var element = arguments[0];
+    var done = arguments[arguments.length - 1];
+    setTimeout(function() { done(element.value || ''); }, arguments[1]);
+    """
+
+    _CLONE_REPLACE_SCRIPT = """
+    var element = arguments[0];
+    // 全てのイベントリスナーを外すため複製で置き換える
+    var clone = element.cloneNode(true);
+    element.parentNode.replaceChild(clone, element);
+    clone.value = '';
+    clone.setAttribute('value', '');
+    return {after: clone.value || '', element: clone};
+    """
+
+    def __init__(self, stats_file: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            stats_file: 学習結果を保存するJSONファイルのパス（Noneの場合は保存しない）
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats_file = stats_file
+        # {フィールド種別: {方法: {'attempts': n, 'successes': n, 'total_ms': x}}}
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # 最後に読み込み・保存した時点の学習結果（保存時はこれとの差分だけをファイルに加算）
+        self._saved: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # 複数のワーカーで共有した場合の学習結果の更新を直列化
+        self._lock = threading.Lock()
+
+        if stats_file and os.path.exists(stats_file):
+            self.load()
+
+    def clear(self, driver, element) -> Tuple[bool, Any]:
+        """
+        要素の値をクリア（学習済みの最安手段から試し、失敗時のみ上位手段へ）
+
+        複製での置き換え（clone_replace）を行った場合、element はページから切り離されるため
+        以降の操作には戻り値の要素を使う。複数のワーカーで共有されるため状態は保持しない。
+
+        Args:
+            driver: WebDriver インスタンス
+            element: クリア対象の要素
+
+        Returns:
+            Tuple[bool, Any]: (値が空になった場合 True, 以降の操作に使う要素)
+        """
+        started = time.perf_counter()
+        probe = driver.execute_async_script(
+            self._PROBE_AND_CLEAR_SCRIPT, element, self._preferred_methods(), self.SETTLE_MS
+        )
+        key = probe.get('key')
+        if key is None:
+            self.logger.warning("クリア対象の要素が無効化されています")
+            return False, element
+
+        if probe.get('tried') is None and probe.get('after') == '':
+            self.logger.debug(f"既に空のためクリア不要: {key}")
+            return True, element
+
+        if probe.get('tried'):
+            cleared = probe.get('after') == ''
+            self._record(key, probe['tried'], cleared, started)
+            if cleared:
+                self.logger.debug(f"クリア成功: {key} ← {probe['tried']}")
+                return True, element
+
+        remaining_length = len(probe.get('after') or '')
+        for method in self._method_order(key):
+            if method == probe.get('tried'):
+                continue
+
+            started = time.perf_counter()
+            try:
+                after, target = self._run_method(driver, element, method, remaining_length)
+            except Exception as e:
+                self.logger.debug(f"クリア方法 {method} が失敗: {e}")
+                self._record(key, method, False, started)
+                continue
+
+            cleared = after == ''
+            self._record(key, method, cleared, started)
+            if cleared:
+                self.logger.debug(f"クリア成功: {key} ← {method}")
+                return True, target
+            remaining_length = len(after)
+
+        self.logger.warning(f"全てのクリア方法で値が残存: {key}")
+        return False, element
+
+    def _run_method(self, driver, element, method: str, remaining_length: int) -> Tuple[str, Any]:
+        """指定のクリア方法を実行し、実行後の値と以降の操作に使う要素を返す"""
+        if method == 'js_value':
+            probe = driver.execute_async_script(self._PROBE_AND_CLEAR_SCRIPT, element, {}, self.SETTLE_MS)
+            return probe['after'], element
+
+        if method == 'select_delete':
+            element.click()
+            element.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+        elif method == 'webdriver_clear':
+            element.clear()
+        elif method == 'backspace':
+            # 1回のコマンドで末尾移動と削除をまとめて送信（余分に削除）
+            element.send_keys(Keys.END + Keys.BACKSPACE * (remaining_length + 5))
+        elif method == 'clone_replace':
+            result = driver.execute_script(self._CLONE_REPLACE_SCRIPT, element)
+            return result['after'], result['element']
+
+        return driver.execute_async_script(self._READ_VALUE_SCRIPT, element, self.SETTLE_MS), element
+
+    def _method_order(self, key: str) -> List[str]:
+        """
+        成功1回あたりの期待コスト（平均所要時間 / 成功率）の小さい順に並べる
+
+        成功率の低い方法は未試行の方法（既定コスト順）の後、成功実績の無い方法はその後、
+        複製での置き換えは常に最後。
+        """
+        key_stats = self.stats.get(key, {})
+        methods = [m for m in self.METHODS if m != self.LAST_RESORT]
+
+        def expected_cost(method: str) -> float:
+            # 平均所要時間 / 成功率 = 所要時間の合計 / 成功数（失敗時の所要時間も含む）
+            return key_stats[method]['total_ms'] / key_stats[method]['successes']
+
+        def success_rate(method: str) -> float:
+            return key_stats[method]['successes'] / key_stats[method]['attempts']
+
+        succeeded = [m for m in methods if key_stats.get(m, {}).get('successes', 0) > 0]
+        reliable = sorted((m for m in succeeded if success_rate(m) >= self.MIN_SUCCESS_RATE), key=expected_cost)
+        unreliable = sorted((m for m in succeeded if success_rate(m) < self.MIN_SUCCESS_RATE), key=expected_cost)
+
+        untried = [m for m in methods if m not in key_stats]
+        failed_only = [m for m in methods if m in key_stats and m not in succeeded]
+
+        return reliable + untried + unreliable + failed_only + [self.LAST_RESORT]
+
+    def _preferred_methods(self) -> Dict[str, str]:
+        """フィールド種別ごとの最優先の方法"""
+        with self._lock:
+            return {key: self._method_order(key)[0] for key in list(self.stats)}
+
+    def _record(self, key: str, method: str, success: bool, started: float):
+        """試行結果を記録"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            entry = self.stats.setdefault(key, {}).setdefault(
+                method, {'attempts': 0, 'successes': 0, 'total_ms': 0.0}
+            )
+            entry['attempts'] += 1
+            entry['successes'] += 1 if success else 0
+            entry['total_ms'] += elapsed_ms
+
+    def get_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        フィールド種別・方法ごとの成功率と平均所要時間を取得
+
+        Returns:
+            Dict: {フィールド種別: {方法: {'attempts', 'successes', 'success_rate', 'avg_latency_ms'}}}
+        """
+        statistics = {}
+        for key, methods in self.stats.items():
+            statistics[key] = {}
+            for method, entry in methods.items():
+                attempts = entry['attempts']
+                statistics[key][method] = {
+                    'attempts': attempts,
+                    'successes': entry['successes'],
+                    'success_rate': entry['successes'] / attempts if attempts else 0.0,
+                    'avg_latency_ms': entry['total_ms'] / attempts if attempts else 0.0
+                }
+        return statistics
+
+    def load(self):
+        """保存済みの学習結果を読み込む"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            with self._lock:
+                self.stats = stats
+                self._saved = copy.deepcopy(stats)
+            self.logger.info(f"クリア方法の学習結果を読み込みました: {len(self.stats)}種別")
+        except Exception as e:
+            self.logger.warning(f"クリア方法の学習結果の読み込みエラー: {e}")
+            with self._lock:
+                self.stats = {}
+                self._saved = {}
+
+    def save(self):
+        """
+        学習結果を保存
+
+        他のワーカー・実行が先に保存した内容を上書きしないよう、保存済みの内容を読み直して
+        前回の読み込み・保存以降に増えた分だけを加算し、一時ファイル経由で置き換える。
+        """
+        if not self.stats_file:
+            return
+
+        with _SAVE_LOCK, self._lock:
+            try:
+                merged = {}
+                if os.path.exists(self.stats_file):
+                    try:
+                        with open(self.stats_file, 'r', encoding='utf-8') as f:
+                            merged = json.load(f)
+                    except ValueError as e:
+                        self.logger.warning(f"クリア方法の学習結果が壊れているため作り直します: {e}")
+
+                for key, methods in self.stats.items():
+                    for method, entry in methods.items():
+                        saved = self._saved.get(key, {}).get(method, {})
+                        target = merged.setdefault(key, {}).setdefault(
+                            method, {'attempts': 0, 'successes': 0, 'total_ms': 0.0}
+                        )
+                        for field in ('attempts', 'successes', 'total_ms'):
+                            target[field] += entry[field] - saved.get(field, 0)
+
+                temp_file = f"{self.stats_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                os.replace(temp_file, self.stats_file)
+
+                self.stats = merged
+                self._saved = copy.deepcopy(merged)
+            except Exception as e:
+                self.logger.warning(f"クリア方法の学習結果の保存エラー: {e}")
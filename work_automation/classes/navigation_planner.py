@@ -0,0 +1,167 @@
+"""
+日付遷移の経路計画クラス
+"""
+import re
+import time
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+
+def parse_date_text(text) -> Optional[date]:
+    """日付文字列（YYYY/MM/DD、YYYY-MM-DD、YYYY年MM月DD日）を date に変換（失敗時は None）"""
+    if not isinstance(text, str):
+        return None
+
+    numbers = re.findall(r'\d+', text)
+    if len(numbers) < 3 or len(numbers[0]) != 4:
+        return None
+    try:
+        return date(int(numbers[0]), int(numbers[1]), int(numbers[2]))
+    except ValueError:
+        return None
+
+
+class DateNavigationPlanner:
+    """表示中の日付と処理対象日を比較し、計測したコストが最も小さい経路で遷移するクラス"""
+
+    # 1回あたりの遷移コスト（秒）の初期値。実測値で随時更新する
+    DEFAULT_COSTS = {'next': 4.0, 'previous': 4.0, 'jump': 6.0}
+
+    # 実測値の反映率（指数移動平均）
+    SMOOTHING = 0.3
+
+    def __init__(self, automation):
+        """
+        初期化
+
+        Args:
+            automation: WorkTimeAutomation インスタンス
+        """
+        self.automation = automation
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.costs = dict(self.DEFAULT_COSTS)
+        self.samples = {route: 0 for route in self.DEFAULT_COSTS}
+
+    def plan(self, current: date, target: date, exclude: Tuple[str, ...] = ()) -> Tuple[str, int]:
+        """
+        遷移経路を決定
+
+        Args:
+            current: 表示中の日付
+            target: 遷移先の日付
+            exclude: 使用しない経路
+
+        Returns:
+            Tuple[str, int]: (経路 'none'/'next'/'previous'/'jump', 遷移回数)
+        """
+        if current == target:
+            return 'none', 0
+
+        # 翌日・前日遷移はどちらも土日を飛ばして隣の営業日へ進む（土日へは直接遷移のみ）
+        candidates = []
+        if target.weekday() < 5:
+            low, high = min(current, target), max(current, target)
+            # current と target の間（target を含み current を含まない）の営業日数
+            steps = sum(1 for offset in range((high - low).days + 1)
+                        if (low + timedelta(days=offset)).weekday() < 5
+                        and low + timedelta(days=offset) != current)
+            candidates.append(('next' if target > current else 'previous', steps))
+        candidates.append(('jump', 1))
+
+        candidates = [c for c in candidates if c[0] not in exclude]
+        if not candidates:
+            return 'jump', 1
+        return min(candidates, key=lambda c: self.costs[c[0]] * c[1])
+
+    def navigate_to(self, target_text: str, fallback_route: str = 'jump') -> Dict:
+        """
+        指定日付へ遷移し、到着した日付を確認
+
+        Args:
+            target_text: 遷移先の日付
+            fallback_route: 表示中の日付が読めない場合の経路（'none'/'next'/'jump'）
+
+        Returns:
+            Dict: {'success', 'route', 'navigations', 'navigation_time', 'verified'}
+        """
+        result = {'success': False, 'route': None, 'navigations': 0, 'navigation_time': 0.0, 'verified': False}
+        target = parse_date_text(target_text)
+        if target is None:
+            self.logger.error(f"遷移先の日付を解析できません: {target_text}")
+            return result
+
+        current = parse_date_text(self.automation.get_current_date())
+        if current is None:
+            # 日付が読めない場合は従来どおりの動作（連続した日付を想定）
+            self.logger.warning(f"表示中の日付が読めないため経路 '{fallback_route}' で遷移します")
+            result['route'] = fallback_route
+            result['success'] = self._run_route(fallback_route, 0 if fallback_route == 'none' else 1, target, result)
+            return result
+
+        failed_routes = ()
+        while True:
+            route, steps = self.plan(current, target, exclude=failed_routes)
+            result['route'] = route
+            if route == 'none':
+                result['success'] = result['verified'] = True
+                return result
+
+            self.logger.info(f"日付遷移計画: {current} → {target} 経路={route} x{steps} "
+                             f"（推定{self.costs[route] * steps:.1f}秒）")
+            self._run_route(route, steps, target, result)
+
+            landed = parse_date_text(self.automation.get_current_date())
+            if landed == target:
+                result['success'] = result['verified'] = True
+                self.logger.info(f"日付遷移完了: {target}（{result['navigations']}回, {result['navigation_time']:.1f}秒）")
+                return result
+            if landed is None:
+                # 到着を確認できない経路は成功とせず、直接遷移（遷移先の日付を確認する経路）で遷移し直す
+                self.logger.warning(f"遷移後の日付が読めないため確認できません: 経路={route}")
+                if route == 'jump' or 'jump' in failed_routes:
+                    return result
+                result['route'] = 'jump'
+                if self._run_route('jump', 1, target, result) and \
+                        parse_date_text(self.automation.get_current_date()) == target:
+                    result['success'] = result['verified'] = True
+                return result
+
+            self.logger.warning(f"遷移先の日付が異なります: 期待={target}, 実際={landed}")
+            failed_routes += (route,)
+            if len(failed_routes) >= 2:
+                return result
+            current = landed
+
+    def _run_route(self, route: str, steps: int, target: date, result: Dict) -> bool:
+        """経路に従って遷移を実行し、1回ごとの所要時間でコストを更新"""
+        for _ in range(steps):
+            started = time.perf_counter()
+            if route == 'next':
+                success = self.automation.navigate_to_next_day()
+            elif route == 'previous':
+                success = self.automation.navigate_to_previous_day()
+            else:
+                success = self.automation.navigate_to_date(target.strftime('%Y/%m/%d'))
+            elapsed = time.perf_counter() - started
+
+            result['navigations'] += 1
+            result['navigation_time'] += elapsed
+            self._update_cost(route, elapsed, success)
+
+            if not success:
+                self.logger.warning(f"日付遷移に失敗しました: 経路={route}")
+                return False
+        return True
+
+    def _update_cost(self, route: str, elapsed: float, success: bool = True):
+        """実測した所要時間で経路のコストを更新（失敗した経路は初期値分のコストを加算）"""
+        if not success:
+            self.costs[route] += self.DEFAULT_COSTS[route]
+            return
+
+        if self.samples[route] == 0:
+            self.costs[route] = elapsed
+        else:
+            self.costs[route] = self.costs[route] * (1 - self.SMOOTHING) + elapsed * self.SMOOTHING
+        self.samples[route] += 1
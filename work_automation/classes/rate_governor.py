@@ -0,0 +1,247 @@
+"""
+サーバー負荷の制御クラス
+
+計算・次へ・提出・日付遷移など、勤怠サーバーへリクエストが飛ぶ操作を
+操作ごとのトークンバケットと全体の同時実行数の上限で制御する。
+応答時間やエラー率が悪化した操作は送信レートを自動で下げ、回復すると徐々に戻す。
+"""
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """トークンバケット（不足分は予約して待機するため、待機中もロックを保持しない）"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        初期化
+
+        Args:
+            rate: 1秒あたりの補充トークン数
+            capacity: 最大トークン数（連続で送信できる回数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """トークンを1つ予約し、送信までに待つべき秒数を返す"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def set_rate(self, rate: float):
+        """補充レートを変更（それまでの補充分は旧レートで確定）"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = rate
+
+
+class ThroughputGovernor:
+    """操作ごとのレート制限・全体の同時実行数上限・適応的な減速を行うクラス"""
+
+    # 操作ごとの (1秒あたりの回数, 連続回数)
+    DEFAULT_RATES = {
+        'calculate': (1.0, 2),
+        'save_and_next': (1.0, 2),
+        'submit_confirmation': (0.5, 1),
+        'navigation': (2.0, 4),
+    }
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, float]]] = None, max_concurrent: int = 4,
+                 window: int = 20, latency_factor: float = 2.0, error_threshold: float = 0.2,
+                 min_scale: float = 0.1, recovery_step: float = 0.1, baseline_window: Optional[int] = None):
+        """
+        初期化
+
+        Args:
+            rates: 操作ごとの (1秒あたりの回数, 連続回数)
+            max_concurrent: 全操作を合わせた同時実行数の上限
+            window: 応答時間・エラー率を評価する直近の回数（その半数が揃うまでレートを変えない）
+            latency_factor: 直近の平均応答時間が基準応答時間の何倍を超えたら減速するか
+            error_threshold: 直近のエラー率がこれを超えたら減速
+            min_scale: 減速時の下限（基準レートに対する倍率）
+            recovery_step: 正常時に1回ごとに戻す倍率
+            baseline_window: 基準応答時間（成功時の応答時間の下位25%点）を求める直近の成功回数
+                （省略時は window の5倍。単発の極端な値で基準が動かないよう最速値は使わない）
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.base_rates = dict(self.DEFAULT_RATES, **(rates or {}))
+        self.buckets = {action: TokenBucket(rate, capacity) for action, (rate, capacity) in self.base_rates.items()}
+        self.max_concurrent = max_concurrent
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.window = window
+        self.min_samples = max(1, window // 2)
+        self.baseline_window = baseline_window or window * 5
+        self.latency_factor = latency_factor
+        self.error_threshold = error_threshold
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.stats = {action: self._new_stats() for action in self.base_rates}
+
+    def _new_stats(self) -> Dict:
+        return {'requests': 0, 'errors': 0, 'waited': 0.0, 'latency': 0.0,
+                'successes': deque(maxlen=self.baseline_window),
+                'scale': 1.0, 'slowdowns': 0, 'recent': deque(), 'since_slowdown': 0}
+
+    @staticmethod
+    def _baseline_latency(stats: Dict) -> Optional[float]:
+        """基準応答時間（直近の成功時の応答時間の下位25%点、成功が無い場合はNone）"""
+        successes = sorted(stats['successes'])
+        return successes[len(successes) // 4] if successes else None
+
+    def throttle(self, action: str) -> float:
+        """トークンが得られるまで待機し、待機した秒数を返す（同時実行数には数えない）"""
+        bucket = self.buckets.get(action)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        with self.lock:
+            self.stats[action]['waited'] += wait
+        self._local.waited = getattr(self._local, 'waited', 0.0) + wait
+        return wait
+
+    @contextmanager
+    def request(self, action: str):
+        """
+        操作1回分の送信枠を確保するコンテキスト
+
+        ブロック内で例外が発生するか、返した辞書の success を False にするとエラーとして記録する。
+        同じスレッドで入れ子になった操作（翌日遷移から日付指定遷移を呼ぶ等）は外側の枠で実行する。
+        """
+        outcome = {'success': True}
+        if getattr(self._local, 'depth', 0) > 0 or action not in self.buckets:
+            yield outcome
+            return
+
+        started = time.monotonic()
+        self.throttle(action)
+        queued = time.monotonic()
+        self.semaphore.acquire()
+        # 同時実行数の上限による待機も待機時間に含める
+        blocked = time.monotonic() - queued
+        self._local.waited = getattr(self._local, 'waited', 0.0) + blocked
+        with self.lock:
+            self.stats[action]['waited'] += blocked
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._local.depth = 1
+        sent = time.monotonic()
+        try:
+            yield outcome
+        except Exception:
+            outcome['success'] = False
+            raise
+        finally:
+            self._local.depth = 0
+            with self.lock:
+                self.in_flight -= 1
+            self.semaphore.release()
+            self.record(action, time.monotonic() - sent, outcome['success'])
+            self.logger.debug(f"{action}: {time.monotonic() - started:.2f}秒（待機含む）")
+
+    def record(self, action: str, latency: float, success: bool):
+        """操作の結果を記録し、応答時間・エラー率に応じて送信レートを調整"""
+        with self.lock:
+            stats = self.stats[action]
+            stats['requests'] += 1
+            stats['latency'] += latency
+            if not success:
+                stats['errors'] += 1
+            if success:
+                stats['successes'].append(latency)
+
+            recent = stats['recent']
+            recent.append((latency, success))
+            if len(recent) > self.window:
+                recent.popleft()
+
+            # 減速後の結果だけで評価し、一時的な遅延・エラーで繰り返し減速しないよう件数が揃うまで待つ
+            stats['since_slowdown'] += 1
+            samples = list(recent)[-stats['since_slowdown']:]
+            if len(samples) < self.min_samples:
+                return
+
+            error_rate = len([ok for _, ok in samples if not ok]) / len(samples)
+            mean_latency = sum(latency for latency, _ in samples) / len(samples)
+            baseline = self._baseline_latency(stats)
+            slow = baseline is not None and mean_latency > baseline * self.latency_factor
+            previous = stats['scale']
+
+            if error_rate > self.error_threshold or slow:
+                stats['scale'] = max(self.min_scale, previous / 2)
+                stats['since_slowdown'] = 0
+            else:
+                stats['scale'] = min(1.0, previous + self.recovery_step)
+
+            if stats['scale'] != previous:
+                self.buckets[action].set_rate(self.base_rates[action][0] * stats['scale'])
+                if stats['scale'] < previous:
+                    stats['slowdowns'] += 1
+                    self.logger.warning(
+                        f"{action} を減速: {self.base_rates[action][0] * stats['scale']:.2f}回/秒 "
+                        f"(平均応答 {mean_latency:.2f}秒, エラー率 {error_rate:.0%})"
+                    )
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """操作ごとの送信回数・エラー数・待機時間・平均応答時間・現在のレート"""
+        with self.lock:
+            metrics = {}
+            for action, stats in self.stats.items():
+                metrics[action] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'waited': stats['waited'],
+                    'avg_latency': stats['latency'] / stats['requests'] if stats['requests'] else 0.0,
+                    'rate': self.buckets[action].rate,
+                    'slowdowns': stats['slowdowns'],
+                }
+            metrics['_global'] = {'max_concurrent': self.max_concurrent, 'peak_in_flight': self.peak_in_flight}
+            return metrics
+
+    def thread_wait(self) -> float:
+        """呼び出し元スレッドの待機時間の合計（並列処理時に1日ごとの待機を求める用）"""
+        return getattr(self._local, 'waited', 0.0)
+
+    def total_wait(self) -> float:
+        """全操作の待機時間の合計"""
+        with self.lock:
+            return sum(stats['waited'] for stats in self.stats.values())
+
+
+def governed(action: str):
+    """
+    bool を返す操作メソッドを self.governor で制御するデコレータ
+
+    governor が無い場合はそのまま実行し、戻り値が True 以外の場合はエラーとして記録する。
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            governor = getattr(self, 'governor', None)
+            if governor is None:
+                return method(self, *args, **kwargs)
+            with governor.request(action) as outcome:
+                result = method(self, *args, **kwargs)
+                outcome['success'] = result is True
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,122 @@
+"""
+自動化セッションの通信ブロック設定
+
+ロゴなどの画像・Webフォント・アクセス解析など、自動化では使わない通信を
+DevTools プロトコル（Network.setBlockedURLs）でタブ単位にブロックし、
+遷移・再読み込み・リトライごとのページ読み込みを軽くする。
+Chromeを起動する場合は、起動引数による画像読み込みの無効化も利用できる。
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# 画像・フォントの拡張子（クエリ文字列付きのURLも対象）
+IMAGE_EXTENSIONS = ('png', 'jpg', 'jpeg', 'gif', 'svg', 'ico', 'webp', 'bmp')
+FONT_EXTENSIONS = ('woff', 'woff2', 'ttf', 'otf', 'eot')
+
+# アクセス解析・広告配信
+ANALYTICS_PATTERNS = (
+    '*google-analytics.com/*',
+    '*googletagmanager.com/*',
+    '*doubleclick.net/*',
+    '*clarity.ms/*',
+)
+
+
+def _extension_patterns(extensions: Iterable[str]) -> List[str]:
+    patterns = []
+    for extension in extensions:
+        patterns.extend([f'*.{extension}', f'*.{extension}?*'])
+    return patterns
+
+
+class ResourceBlockingProfile:
+    """ブロックするURLパターンの設定"""
+
+    def __init__(self, blocked_urls: Optional[Iterable[str]] = None, block_images: bool = True,
+                 block_fonts: bool = True, block_analytics: bool = True, name: str = 'default'):
+        """
+        初期化
+
+        Args:
+            blocked_urls: 追加でブロックするURLパターン（'*' をワイルドカードとして使用）
+            block_images: 画像をブロックする
+            block_fonts: Webフォントをブロックする
+            block_analytics: アクセス解析・広告配信をブロックする
+            name: 設定名（ログ表示用）
+        """
+        self.name = name
+        self.block_images = block_images
+        patterns = []
+        if block_images:
+            patterns.extend(_extension_patterns(IMAGE_EXTENSIONS))
+        if block_fonts:
+            patterns.extend(_extension_patterns(FONT_EXTENSIONS))
+        if block_analytics:
+            patterns.extend(ANALYTICS_PATTERNS)
+        for pattern in blocked_urls or []:
+            if pattern not in patterns:
+                patterns.append(pattern)
+        self.blocked_urls = patterns
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ResourceBlockingProfile":
+        """
+        JSONファイルから設定を読み込み
+
+        形式: {"block_images": true, "block_fonts": true, "block_analytics": true,
+               "blocked_urls": ["*/static/banner/*"]}（省略した項目は既定値）
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            config: Dict = json.load(f)
+        return cls(
+            blocked_urls=config.get('blocked_urls'),
+            block_images=config.get('block_images', True),
+            block_fonts=config.get('block_fonts', True),
+            block_analytics=config.get('block_analytics', True),
+            name=Path(path).stem,
+        )
+
+    @classmethod
+    def from_option(cls, value: Optional[str]) -> Optional["ResourceBlockingProfile"]:
+        """コマンドラインの指定（None: 無効, 'default': 既定の設定, それ以外: 設定ファイルのパス）"""
+        if not value:
+            return None
+        if value == 'default':
+            return cls()
+        return cls.load(value)
+
+    def apply(self, driver) -> bool:
+        """
+        表示中のタブにブロック設定を適用（以降の遷移・再読み込みにも有効）
+
+        Args:
+            driver: execute_cdp_cmd を持つドライバー（Selenium の Chrome / CDPバックエンド）
+
+        Returns:
+            bool: 適用できた場合 True
+        """
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+            self.logger.info(f"通信ブロック設定を適用しました: {self.name}（{len(self.blocked_urls)}パターン）")
+            return True
+        except Exception as e:
+            self.logger.error(f"通信ブロック設定の適用に失敗: {e}")
+            return False
+
+    @staticmethod
+    def clear(driver) -> bool:
+        """表示中のタブのブロック設定を解除"""
+        try:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            return True
+        except Exception as e:
+            logging.getLogger(ResourceBlockingProfile.__name__).error(f"通信ブロック設定の解除に失敗: {e}")
+            return False
+
+    def launch_arguments(self) -> List[str]:
+        """自動化用にChromeを起動する場合の追加引数（画像読み込みの無効化）"""
+        return ['--blink-settings=imagesEnabled=false'] if self.block_images else []
@@ -0,0 +1,95 @@
+"""
+処理結果の追記型ジャーナル
+
+1日分の処理結果が確定するたびにJSONLへ1行追記して fsync する。
+異常終了しても確定済みの日の結果は残り、--resume で処理済みの日を飛ばして再開できる。
+"""
+import json
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+
+class ResultsJournal:
+    """処理結果をJSONLへ逐次追記するクラス"""
+
+    # 再開時に処理済みとみなす状態
+    COMPLETED_STATUSES = ('success', 'skipped_already_submitted')
+
+    def __init__(self, path: str):
+        """
+        初期化
+
+        Args:
+            path: ジャーナルファイルのパス
+        """
+        self.path = path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _write(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, ensure_ascii=False, default=self._serialize) + "\n"
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
+
+    def start(self, resume: bool = False, **meta):
+        """
+        実行の開始を記録
+
+        Args:
+            resume: True の場合は前回の続き（前回までの結果を引き継ぐ）、False の場合は新しい実行
+            meta: 記録しておく情報（CSVファイル名など）
+        """
+        self._write(dict(meta, event='resume' if resume else 'start', time=datetime.now()))
+
+    def append(self, result: Dict[str, Any]):
+        """1日分の処理結果を追記"""
+        self._write(dict(result, event='result'))
+
+    def load(self) -> List[Dict[str, Any]]:
+        """最後の新しい実行（start）以降の処理結果を記録順に読み込む"""
+        if not os.path.exists(self.path):
+            return []
+
+        results = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 書き込み途中で中断された最終行は読み飛ばす
+                    self.logger.warning(f"ジャーナルの{line_number}行目を読み飛ばしました")
+                    continue
+                event = entry.pop('event', None)
+                if event == 'start':
+                    results = []
+                elif event == 'result':
+                    if isinstance(entry.get('timestamp'), str):
+                        entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+                    results.append(entry)
+        return results
+
+    def latest_results(self) -> List[Dict[str, Any]]:
+        """日付ごとの最新の処理結果（日付順）"""
+        latest = {}
+        for result in self.load():
+            latest[result['date']] = result
+        return [latest[date] for date in sorted(latest)]
+
+    def completed_dates(self) -> Set[str]:
+        """処理済み（成功・提出済みスキップ）の日付"""
+        return {result['date'] for result in self.latest_results() if result['status'] in self.COMPLETED_STATUSES}
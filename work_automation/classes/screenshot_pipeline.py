@@ -0,0 +1,292 @@
+"""
+スクリーンショットの非同期保存
+
+撮影（DevTools の Page.captureScreenshot、表示範囲のクリップ・JPEG/WebP 圧縮）だけを
+呼び出し元で行い、デコード・書き込み・保存数の上限管理はバックグラウンドのスレッドで行う。
+撮影前に縮小画像の知覚ハッシュ（dHash）を取り、同じ保存先の前回の画像と同じ画面であれば
+撮影と保存を省く。
+"""
+import os
+import zlib
+import queue
+import atexit
+import base64
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 知覚ハッシュ用の縮小画像の幅（ピクセル）
+THUMBNAIL_WIDTH = 64
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+
+def decode_png_grayscale(data: bytes) -> List[List[int]]:
+    """
+    8bit・インターレースなしのPNGをグレースケールの画素値（行ごとのリスト）に変換
+
+    Raises:
+        ValueError: 対応していない形式の場合
+    """
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("PNGではありません")
+    position = len(_PNG_SIGNATURE)
+    header = None
+    compressed = []
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        body = data[position + 8:position + 8 + length]
+        position += length + 12
+        if chunk_type == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif chunk_type == b'IDAT':
+            compressed.append(body)
+        elif chunk_type == b'IEND':
+            break
+    if header is None:
+        raise ValueError("IHDRがありません")
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or interlace or color_type not in _PNG_CHANNELS:
+        raise ValueError(f"対応していないPNG形式です（bit深度={depth}, 色={color_type}, インターレース={interlace}）")
+
+    channels = _PNG_CHANNELS[color_type]
+    stride = width * channels
+    raw = zlib.decompress(b''.join(compressed))
+    rows = []
+    previous = bytearray(stride)
+    offset = 0
+    for _ in range(height):
+        filter_type = raw[offset]
+        line = bytearray(raw[offset + 1:offset + 1 + stride])
+        offset += stride + 1
+        for x in range(stride):
+            left = line[x - channels] if x >= channels else 0
+            up = previous[x]
+            if filter_type == 1:
+                line[x] = (line[x] + left) & 0xFF
+            elif filter_type == 2:
+                line[x] = (line[x] + up) & 0xFF
+            elif filter_type == 3:
+                line[x] = (line[x] + (left + up) // 2) & 0xFF
+            elif filter_type == 4:
+                upper_left = previous[x - channels] if x >= channels else 0
+                estimate = left + up - upper_left
+                distances = (abs(estimate - left), abs(estimate - up), abs(estimate - upper_left))
+                predictor = (left, up, upper_left)[distances.index(min(distances))]
+                line[x] = (line[x] + predictor) & 0xFF
+        if channels >= 3:
+            rows.append([(line[i] * 299 + line[i + 1] * 587 + line[i + 2] * 114) // 1000
+                         for i in range(0, stride, channels)])
+        else:
+            rows.append([line[i] for i in range(0, stride, channels)])
+        previous = line
+    return rows
+
+
+def difference_hash(pixels: List[List[int]]) -> Tuple[int, int]:
+    """隣り合う画素の明暗の差によるハッシュ（値, ビット数）"""
+    value = 0
+    bits = 0
+    for row in pixels:
+        for left, right in zip(row, row[1:]):
+            value = (value << 1) | (1 if left < right else 0)
+            bits += 1
+    return value, bits
+
+
+class ScreenshotPipeline:
+    """スクリーンショットの撮影・重複の除外・バックグラウンドでの書き込み・保存数の管理"""
+
+    EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'png': 'png'}
+
+    def __init__(self, root_dir: str, image_format: str = 'jpeg', quality: int = 70,
+                 max_files: int = 500, max_bytes: int = 200 * 1024 * 1024,
+                 duplicate_threshold: float = 0.002, queue_size: int = 32):
+        """
+        初期化
+
+        Args:
+            root_dir: 保存先のルート（保存数・容量の上限はこの配下全体に適用）
+            image_format: 画像形式（'jpeg', 'webp', 'png'）
+            quality: JPEG/WebP の品質（0〜100）
+            max_files: 保存するスクリーンショットの最大数（古いものから削除）
+            max_bytes: 保存するスクリーンショットの合計サイズの上限（バイト）
+            duplicate_threshold: 前回と同じ画面とみなすハッシュの差の割合
+            queue_size: 書き込み待ちの上限（超えた分は保存しない）
+        """
+        if image_format not in self.EXTENSIONS:
+            raise ValueError(f"対応していない画像形式です: {image_format}")
+        self.root_dir = root_dir
+        self.image_format = image_format
+        self.quality = quality
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.duplicate_threshold = duplicate_threshold
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats = {'captured': 0, 'duplicates': 0, 'dropped': 0, 'written': 0, 'removed': 0, 'fallback': 0}
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # 保存先ごとの前回の画像（ハッシュ, ビット数, パス）
+        self._previous: Dict[str, Tuple[int, int, str]] = {}
+        self._writer = threading.Thread(target=self._write_loop, name="ScreenshotWriter", daemon=True)
+        self._writer.start()
+
+    def capture(self, driver, directory: str, name: str,
+                viewport: Optional[Dict[str, float]] = None) -> Optional[str]:
+        """
+        表示中の画面を撮影し、書き込みを予約
+
+        Args:
+            driver: WebDriver（CDPコマンドを送れない場合は従来の save_screenshot で同期保存）
+            directory: 保存先ディレクトリ
+            name: 拡張子を除いたファイル名
+            viewport: 撮影範囲（x, y, width, height: ページ座標のCSSピクセル、省略時は表示範囲全体）
+
+        Returns:
+            保存先のパス（前回と同じ画面の場合は前回のパス、保存できない場合は None）
+        """
+        clip = self._clip(viewport)
+        fingerprint = self._fingerprint(driver, clip) if clip else None
+        if fingerprint is not None:
+            with self._lock:
+                previous = self._previous.get(directory)
+                if previous and previous[1] == fingerprint[1] and \
+                        bin(previous[0] ^ fingerprint[0]).count('1') <= self.duplicate_threshold * fingerprint[1]:
+                    self.stats['duplicates'] += 1
+                else:
+                    previous = None
+            if previous:
+                self.logger.debug(f"前回と同じ画面のため撮影を省略: {previous[2]}")
+                return previous[2]
+
+        filepath = os.path.join(directory, f"{name}.{self.EXTENSIONS[self.image_format]}")
+        params: Dict[str, Any] = {'format': self.image_format}
+        if self.image_format != 'png':
+            params['quality'] = self.quality
+        if clip:
+            params['clip'] = clip
+        try:
+            result = driver.execute_cdp_cmd('Page.captureScreenshot', params)
+            data = result.get('data') if isinstance(result, dict) else None
+        except Exception as e:
+            self.logger.debug(f"DevToolsでの撮影に失敗したため従来の方法で保存します: {e}")
+            data = None
+        if not isinstance(data, str):
+            return self._save_fallback(driver, directory, name)
+
+        try:
+            self._queue.put_nowait((filepath, data))
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+            self.logger.warning(f"書き込み待ちが上限に達したため保存しません: {filepath}")
+            return None
+        with self._lock:
+            self.stats['captured'] += 1
+            if fingerprint is not None:
+                self._previous[directory] = (fingerprint[0], fingerprint[1], filepath)
+        return filepath
+
+    @staticmethod
+    def _clip(viewport: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        if not isinstance(viewport, dict):
+            return None
+        try:
+            clip = {key: float(viewport[key]) for key in ('x', 'y', 'width', 'height')}
+        except (KeyError, TypeError, ValueError):
+            return None
+        if clip['width'] <= 0 or clip['height'] <= 0:
+            return None
+        clip['scale'] = 1
+        return clip
+
+    def _fingerprint(self, driver, clip: Dict[str, float]) -> Optional[Tuple[int, int]]:
+        """縮小画像を撮影して知覚ハッシュを計算（取得できない場合は None）"""
+        try:
+            thumbnail = dict(clip, scale=THUMBNAIL_WIDTH / clip['width'])
+            result = driver.execute_cdp_cmd('Page.captureScreenshot', {'format': 'png', 'clip': thumbnail})
+            if not isinstance(result, dict) or not isinstance(result.get('data'), str):
+                return None
+            return difference_hash(decode_png_grayscale(base64.b64decode(result['data'])))
+        except Exception as e:
+            self.logger.debug(f"縮小画像の取得に失敗: {e}")
+            return None
+
+    def _save_fallback(self, driver, directory: str, name: str) -> Optional[str]:
+        filepath = os.path.join(directory, f"{name}.png")
+        driver.save_screenshot(filepath)
+        with self._lock:
+            self.stats['fallback'] += 1
+        return filepath
+
+    # ---- 書き込み ----
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                filepath, data = item
+                try:
+                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                    with open(filepath, 'wb') as f:
+                        f.write(base64.b64decode(data))
+                    self.stats['written'] += 1
+                    self._enforce_retention()
+                except Exception as e:
+                    self.logger.error(f"スクリーンショットの書き込みに失敗: {filepath} - {e}")
+            finally:
+                self._queue.task_done()
+
+    def _enforce_retention(self):
+        """保存数・合計サイズの上限を超えた分を古いものから削除"""
+        files = []
+        for path in Path(self.root_dir).rglob('screenshot_*'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        count = len(files)
+        for _, size, path in files:
+            if count <= self.max_files and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                self.stats['removed'] += 1
+            except OSError:
+                pass
+            count -= 1
+            total -= size
+
+    def flush(self):
+        """書き込み待ちがなくなるまで待機"""
+        self._queue.join()
+
+    def close(self):
+        """書き込み待ちを保存してスレッドを終了"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=30)
+
+
+_shared_pipeline: Optional[ScreenshotPipeline] = None
+_shared_lock = threading.Lock()
+
+
+def get_screenshot_pipeline(root_dir: Optional[str] = None) -> ScreenshotPipeline:
+    """プロセス内で共有するパイプライン（初回に作成し、終了時に書き込み待ちを保存）"""
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            root_dir = root_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "screenshots")
+            _shared_pipeline = ScreenshotPipeline(root_dir)
+            atexit.register(_shared_pipeline.close)
+        return _shared_pipeline
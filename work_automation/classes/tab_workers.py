@@ -0,0 +1,152 @@
+"""
+タブ並列処理クラス
+"""
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .work_time_automation import WorkTimeAutomation
+from .resource_blocking import ResourceBlockingProfile
+
+
+class TabWorkerPool:
+    """
+    デバッグポートのChrome内でタブごとのワーカーが日付を分担して処理するクラス
+
+    各ワーカーは同じChromeに接続した専用の WebDriver セッションと専用のタブを持つため、
+    待機状態・オーバーレイ非表示・日付遷移テンプレート等のキャッシュ・スクリーンショットは
+    ワーカー間で共有されない。
+    バックグラウンドのタブはタイマーが間引かれるため、Chromeは
+    --disable-background-timer-throttling --disable-renderer-backgrounding 付きでの起動を推奨。
+    """
+
+    def __init__(self, automation: WorkTimeAutomation, csv_processor, concurrency: int,
+                 automation_factory: Optional[Callable[[], WorkTimeAutomation]] = None, journal=None):
+        """
+        初期化
+
+        Args:
+            automation: 起点となる WorkTimeAutomation（表示中の画面URLを各タブで開く）
+            csv_processor: WorkDataCSVProcessor インスタンス
+            concurrency: 並列に処理するタブ数
+            automation_factory: ワーカー用の WorkTimeAutomation を生成する関数
+                （省略時は起点と同じChromeに接続）
+            journal: 処理結果を追記する ResultsJournal（全ワーカーで共有）
+        """
+        self.automation = automation
+        self.csv_processor = csv_processor
+        self.concurrency = max(1, concurrency)
+        self.automation_factory = automation_factory or self._connect_same_chrome
+        self.journal = journal
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # ワーカー用セッションの生成（chromedriverの起動）は直列に行う
+        self._factory_lock = threading.Lock()
+
+    def _connect_same_chrome(self) -> WorkTimeAutomation:
+        """起点と同じChromeに別セッションで接続"""
+        address = getattr(self.automation, 'debugger_address', WorkTimeAutomation.DEFAULT_DEBUGGER_ADDRESS)
+        backend = getattr(self.automation, 'backend', 'selenium')
+        return WorkTimeAutomation.connect_to_existing_chrome(address, backend=backend if isinstance(backend, str) else 'selenium')
+
+    def shard(self, all_data: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """日付順の連続した区間ごとにワーカーへ割り当て"""
+        workers = min(self.concurrency, len(all_data))
+        size, remainder = divmod(len(all_data), workers)
+        shards = []
+        start = 0
+        for worker_id in range(workers):
+            end = start + size + (1 if worker_id < remainder else 0)
+            shards.append(all_data[start:end])
+            start = end
+        return shards
+
+    def run(self, all_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        全データをタブごとのワーカーで並列処理
+
+        Args:
+            all_data: 全日分の工数データ
+
+        Returns:
+            List[Dict]: 全ワーカーの処理結果（日付順）
+        """
+        if not all_data:
+            return []
+
+        base_url = self.automation.driver.current_url
+        shards = self.shard(all_data)
+        self.logger.info(f"タブ並列処理: {len(shards)}タブ, {len(all_data)}日分 ({[len(s) for s in shards]})")
+
+        results = []
+        with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix='tab-worker') as executor:
+            futures = [executor.submit(self._run_worker, worker_id, shard, base_url)
+                       for worker_id, shard in enumerate(shards)]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+        results.sort(key=lambda r: (r['date'], r['timestamp']))
+        return results
+
+    def _run_worker(self, worker_id: int, shard: List[Dict[str, Any]], base_url: str) -> List[Dict[str, Any]]:
+        """専用のタブで担当分の日付を処理"""
+        from .bulk_automation import BulkWorkAutomation
+
+        name = f"tab{worker_id}"
+        automation = None
+        bulk = None
+        try:
+            with self._factory_lock:
+                automation = self.automation_factory()
+
+            # サーバーへの送信レートと同時実行数は全ワーカーで共有
+            if getattr(self.automation, 'governor', None) is not None:
+                automation.governor = self.automation.governor
+            # クリア方法の学習結果も共有（クリアは呼び出しごとの状態を持たないため他タブの要素は混ざらない）
+            if getattr(self.automation, 'field_clearer', None) is not None:
+                automation.field_clearer = self.automation.field_clearer
+
+            # スクリーンショットはワーカーごとのディレクトリに保存
+            automation.screenshot_dir = os.path.join(self.automation.screenshot_dir, name)
+            os.makedirs(automation.screenshot_dir, exist_ok=True)
+
+            automation.driver.switch_to.new_window('tab')
+            # 通信ブロック設定はタブ単位のため、開いたタブに適用
+            if isinstance(getattr(self.automation, 'resource_blocking', None), ResourceBlockingProfile):
+                automation.set_resource_blocking(self.automation.resource_blocking)
+            automation.driver.get(base_url)
+            self.logger.info(f"[{name}] タブを開きました: {len(shard)}日分 ({shard[0]['date']} 〜 {shard[-1]['date']})")
+
+            bulk = BulkWorkAutomation(automation, self.csv_processor)
+            bulk.journal = self.journal
+            for idx, work_data in enumerate(shard, 1):
+                self.logger.info(f"[{name}] === {idx}/{len(shard)} 日目: {work_data['date']} ===")
+                # 開いた画面の日付は担当日と無関係なため、日付が読めない場合も直接遷移する
+                bulk._process_work_item(idx, work_data, fallback_route='jump')
+
+            return bulk.results
+
+        except Exception as e:
+            self.logger.error(f"[{name}] ワーカーエラー: {e}")
+            results = list(bulk.results) if bulk else []
+            processed = {r['date'] for r in results}
+            for work_data in shard:
+                if work_data['date'] not in processed:
+                    results.append({
+                        'date': work_data['date'],
+                        'status': 'failure',
+                        'message': f"タブワーカーエラー: {e}",
+                        'timestamp': datetime.now()
+                    })
+            return results
+
+        finally:
+            if automation:
+                try:
+                    # ワーカーのタブだけを閉じる（接続先のChrome自体は終了しない）
+                    automation.driver.close()
+                except Exception as e:
+                    self.logger.debug(f"[{name}] タブのクローズに失敗: {e}")
+                automation.close()
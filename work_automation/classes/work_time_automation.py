@@ -5,8 +5,8 @@ import time
 import logging
 import os
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
@@ -14,20 +14,131 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+from .field_clearing import AdaptiveFieldClearer
+from .navigation_planner import parse_date_text
+from .rate_governor import ThroughputGovernor, governed
+from .error_record_store import ErrorRecordStore
+from .driver_service import ChromeDriverService, get_shared_service
+from .cdp_backend import CDPDriver
+from .action_completion import ActionCompletionWatcher
+from .resource_blocking import ResourceBlockingProfile
+from .chrome_launcher import ManagedChrome
+from .screenshot_pipeline import get_screenshot_pipeline
+from .failure_artifacts import FailureArtifactBuffer
 
 
 class WorkTimeAutomation:
     """工数管理システムの自動化を行うクラス"""
     
-    def __init__(self, user_data_dir: Optional[str] = None, profile_directory: Optional[str] = None):
+    # 在宅/出社区分とセレクトボックス（GI_COMBOBOX38_Seq0S）の値の対応
+    LOCATION_VALUES = {
+        "在宅": "2",
+        "出社（通勤費往復）": "5",
+        "出社（通勤費片道）": "6",
+        "出社（通勤費なし）": "7",
+        "その他": "4"
+    }
+    
+    # 日付遷移テンプレートの日付部分と、onclick内で探す日付書式
+    _DATE_TEMPLATE_TOKEN = '__AUTOMATION_DATE__'
+    _DATE_TEMPLATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%Y%%2F%m%%2F%d', '%Y%m%d']
+    
+    # 提出済み・承認済みを示す状態表示
+    SUBMITTED_STATUS_PATTERN = r'提出済|申請済|承認済|承認待|確定済'
+    
+    # 表示中の日の提出状態を表示する要素（凡例・ヘルプ等の文言で誤判定しないよう状態表示の要素に限定）
+    DAY_STATUS_SELECTOR = '#srw_page_navi_date, #status'
+    
+    # ページ内でロケーター（By.XXX, 値）を解決するJavaScript関数（各スクリプトの先頭に連結して使用）
+    _FIND_ELEMENTS_JS = """
+        function find(by, value) {
+            switch (by) {
+                case 'id':
+                    return [document.getElementById(value)];
+                case 'name':
+                    return document.getElementsByName(value);
+                case 'css selector':
+                    return document.querySelectorAll(value);
+                case 'class name':
+                    return document.getElementsByClassName(value);
+                case 'tag name':
+                    return document.getElementsByTagName(value);
+                case 'xpath':
+                    var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    var nodes = [];
+                    for (var n = 0; n < snapshot.snapshotLength; n++) {
+                        nodes.push(snapshot.snapshotItem(n));
+                    }
+                    return nodes;
+            }
+            return [];
+        }
+    """
+    
+    # SlickGridインスタンスと時間列を特定するJavaScript関数（各スクリプトの先頭に連結して使用）
+    _FIND_SLICK_GRID_JS = """
+        function isGrid(obj) {
+            return obj && typeof obj.getColumns === 'function' &&
+                   typeof obj.getDataItem === 'function' &&
+                   typeof obj.getDataLength === 'function';
+        }
+        // ページ内で一度だけ探索してキャッシュ
+        function findSlickGrid() {
+            var grid = window.__automationSlickGrid;
+            if (isGrid(grid)) {
+                return grid;
+            }
+            grid = null;
+            var candidates = [window.grid, window.slickGrid, window._grid];
+            for (var i = 0; i < candidates.length && !grid; i++) {
+                if (isGrid(candidates[i])) {
+                    grid = candidates[i];
+                }
+            }
+            if (!grid) {
+                var keys = Object.keys(window);
+                for (var k = 0; k < keys.length && !grid; k++) {
+                    try {
+                        if (isGrid(window[keys[k]])) {
+                            grid = window[keys[k]];
+                        }
+                    } catch (e) {}
+                }
+            }
+            window.__automationSlickGrid = grid;
+            return grid;
+        }
+        // 時間列の特定（列定義に無ければ従来どおり3列目）
+        function findTimeColumn(columns) {
+            for (var c = 0; c < columns.length; c++) {
+                var label = (columns[c].name || '') + ' ' + (columns[c].field || '') + ' ' + (columns[c].id || '');
+                if (/時間|工数|time|hour/i.test(label)) {
+                    return c;
+                }
+            }
+            return Math.min(2, columns.length - 1);
+        }
+    """
+    
+    # 既定の接続先（デバッグモードで起動したChrome）
+    DEFAULT_DEBUGGER_ADDRESS = "127.0.0.1:9222"
+    
+    def __init__(self, user_data_dir: Optional[str] = None, profile_directory: Optional[str] = None,
+                 debugger_address: str = DEFAULT_DEBUGGER_ADDRESS,
+                 driver_service: Optional[ChromeDriverService] = None, backend: str = 'selenium'):
         """
         既存のChromeブラウザに接続するための初期化
         
         Args:
             user_data_dir: Chromeのユーザーデータディレクトリ
             profile_directory: 使用するプロファイル名（デフォルトは"Default"）
+            debugger_address: 接続先Chromeのデバッグアドレス（ホスト:ポート）
+            driver_service: 共有の chromedriver サービス（省略時はセッションごとに chromedriver を起動）
+            backend: ブラウザ操作の方式（'selenium' または chromedriver を経由しない 'cdp'）
         """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.debugger_address = debugger_address
+        self.backend = backend
         chrome_options = Options()
         
         if user_data_dir:
@@ -37,10 +148,20 @@ class WorkTimeAutomation:
                 chrome_options.add_argument(f"--profile-directory={profile_directory}")
         else:
             # デバッグモードでChromeに接続（推奨）
-            chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+            chrome_options.add_experimental_option("debuggerAddress", debugger_address)
         
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            if backend == 'cdp':
+                if user_data_dir:
+                    raise ValueError("CDPバックエンドは起動済みのChrome（デバッグポート）への接続のみ対応しています")
+                self.driver = CDPDriver.connect(debugger_address)
+            elif driver_service:
+                self.driver = driver_service.create_driver(chrome_options)
+            else:
+                self.driver = webdriver.Chrome(options=chrome_options)
+            # WebDriverコマンド数の計測（1日あたりの呼び出し回数の比較用）
+            self.command_count = 0
+            self._install_command_counter()
             # 待機時間を延長（従来の10秒から20秒へ）
             self.wait = WebDriverWait(self.driver, 20)
             # より短い待機時間（アクション間の待機用）
@@ -50,24 +171,113 @@ class WorkTimeAutomation:
             # スクリーンショット保存用ディレクトリ
             self.screenshot_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "screenshots")
             os.makedirs(self.screenshot_dir, exist_ok=True)
+            # 撮影・書き込み・保存数の管理（プロセス内で共有、書き込みはバックグラウンド）
+            self.screenshots = get_screenshot_pipeline(self.screenshot_dir)
             
             # エラー記録保存用ディレクトリ
             self.error_records_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "error_records")
             os.makedirs(self.error_records_dir, exist_ok=True)
             
+            # 失敗した日の調査用記録（処理中は直近の画面状態のみメモリに保持）
+            self.failure_artifacts = FailureArtifactBuffer(
+                os.path.join(os.path.dirname(self.error_records_dir), "failure_artifacts")
+            )
+            
+            # 日付遷移テンプレート（ToNextDateActionのonclickから学習）
+            self._date_navigation_template = None
+            
+            # フィールド種別ごとのクリア方法の学習結果（実行をまたいで引き継ぐ）
+            self.field_clearer = AdaptiveFieldClearer(
+                os.path.join(os.path.dirname(self.error_records_dir), "field_clearing_stats.json")
+            )
+            
+            # サーバーへのリクエストを伴う操作のレート制御（並列処理時はワーカー間で共有）
+            self.governor = ThroughputGovernor()
+            
+            # 計算・次へ・提出の完了検知と所要時間（サーバー応答 / 画面反映）の記録
+            self.action_watcher = ActionCompletionWatcher(self.driver)
+            self.action_timings = []
+            
+            # 不要な通信（画像・フォント・アクセス解析）のブロック設定（set_resource_blocking で有効化）
+            self.resource_blocking = None
+            
+            # 自動化が起動し所有するChrome（launch_managed_chrome で接続した場合）
+            self.managed_chrome = None
+            
         except Exception as e:
             self.logger.error(f"Chrome接続エラー: {e}")
             raise
         
     @classmethod
-    def connect_to_existing_chrome(cls):
+    def connect_to_existing_chrome(cls, debugger_address: str = DEFAULT_DEBUGGER_ADDRESS,
+                                   shared_service: bool = True, backend: str = 'selenium'):
         """
         デバッグモードで起動済みのChromeに接続
         
         事前にChromeを以下のコマンドで起動しておく:
         chrome.exe --remote-debugging-port=9222 --user-data-dir="C:/temp/chrome_dev"
+        
+        Args:
+            debugger_address: 接続先Chromeのデバッグアドレス（ホスト:ポート）
+            shared_service: True の場合、プロセス内で共有する chromedriver に接続する
+            backend: ブラウザ操作の方式（'selenium' または 'cdp'）
+        """
+        return cls(debugger_address=debugger_address,
+                   driver_service=get_shared_service() if shared_service and backend == 'selenium' else None,
+                   backend=backend)
+
+    @classmethod
+    def launch_managed_chrome(cls, chrome: ManagedChrome, backend: str = 'selenium'):
+        """
+        自動化用のChromeを起動（動作中なら再利用）して接続
+        
+        保存したCookieがあれば読み込んでから start_url を開く。
+        接続を閉じても Chrome は終了せず、次のジョブで再利用する（終了は chrome.stop()）。
+        
+        Args:
+            chrome: 起動・管理するChrome
+            backend: ブラウザ操作の方式（'selenium' または 'cdp'）
         """
-        return cls()
+        automation = cls.connect_to_existing_chrome(chrome.ensure_started(), backend=backend)
+        automation.managed_chrome = chrome
+        chrome.load_cookies(automation.driver)
+        if chrome.start_url:
+            automation.driver.get(chrome.start_url)
+            automation.wait_for_page_load()
+        return automation
+
+    def _install_command_counter(self):
+        """WebDriverの全コマンド送信を数えるラッパーを設置"""
+        original_execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.command_count += 1
+            return original_execute(driver_command, params)
+
+        self.driver.execute = counting_execute
+
+    def set_resource_blocking(self, profile: Optional[ResourceBlockingProfile]) -> bool:
+        """
+        表示中のタブに通信ブロック設定を適用（None で解除）
+        
+        設定はタブ単位のため、新しいタブに切り替えた後は再度呼び出す。
+        """
+        self.resource_blocking = profile
+        if profile is None:
+            return ResourceBlockingProfile.clear(self.driver)
+        return profile.apply(self.driver)
+    
+    def page_load_time(self) -> Optional[float]:
+        """表示中のページの読み込み時間（ミリ秒、Navigation Timing の loadEventEnd）"""
+        try:
+            value = self.driver.execute_script("""
+                var navigation = performance.getEntriesByType('navigation')[0];
+                return navigation && navigation.loadEventEnd > 0 ? navigation.loadEventEnd - navigation.startTime : null;
+            """)
+            return float(value) if isinstance(value, (int, float)) else None
+        except Exception as e:
+            self.logger.error(f"ページ読み込み時間の取得エラー: {e}")
+            return None
     
     def get_current_date(self) -> str:
         """現在表示されている日付を取得（改善版）"""
@@ -235,32 +445,33 @@ class WorkTimeAutomation:
                 "//input[contains(@title, '時刻')]",
             ]
             
-            for pattern in time_patterns:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, pattern)
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            field_info = {
-                                'element': element,
-                                'name': element.get_attribute('name'),
-                                'id': element.get_attribute('id'),
-                                'class': element.get_attribute('class'),
-                                'placeholder': element.get_attribute('placeholder'),
-                                'type': element.get_attribute('type')
-                            }
-                            
-                            # フィールドの種類を推定
-                            name = field_info['name'] or ''
-                            if any(x in name.upper() for x in ['START', 'ST', '開始', 'BEGIN']):
-                                available_fields['start_time'].append(field_info)
-                            elif any(x in name.upper() for x in ['END', 'ET', '終了', 'FINISH']):
-                                available_fields['end_time'].append(field_info)
-                            else:
-                                available_fields['other_time'].append(field_info)
-                                
-                except Exception as e:
-                    self.logger.debug(f"パターン検索エラー: {pattern} - {e}")
+            # 全パターンの要素と属性を1回のスクリプト実行でまとめて取得
+            candidates = self.fetch_element_properties(
+                [(By.XPATH, pattern) for pattern in time_patterns],
+                ['displayed', 'enabled', 'name', 'id', 'class', 'placeholder', 'type']
+            )
+            
+            for candidate in candidates:
+                if not (candidate.get('displayed') and candidate.get('enabled')):
                     continue
+                
+                field_info = {
+                    'element': candidate['element'],
+                    'name': candidate.get('name'),
+                    'id': candidate.get('id'),
+                    'class': candidate.get('class'),
+                    'placeholder': candidate.get('placeholder'),
+                    'type': candidate.get('type')
+                }
+                
+                # フィールドの種類を推定
+                name = field_info['name'] or ''
+                if any(x in name.upper() for x in ['START', 'ST', '開始', 'BEGIN']):
+                    available_fields['start_time'].append(field_info)
+                elif any(x in name.upper() for x in ['END', 'ET', '終了', 'FINISH']):
+                    available_fields['end_time'].append(field_info)
+                else:
+                    available_fields['other_time'].append(field_info)
             
             # 検出結果をログ出力
             for field_type, fields in available_fields.items():
@@ -439,7 +650,8 @@ class WorkTimeAutomation:
                 return False
             
             # 既存値を完全にクリア（複数の方法で確実に）
-            self._clear_element_value(element)
+            # 複製で置き換えた場合は元の要素が切り離されるため、置き換え後の要素に入力
+            _, element = self._clear_element_value(element)
             
             # 新しい値を入力
             element.send_keys(value)
@@ -503,101 +715,203 @@ class WorkTimeAutomation:
         except:
             return time_str
 
-    def _clear_element_value(self, element):
-        """要素の値を完全にクリア（stale element対策付き）"""
+    def _clear_element_value(self, element) -> Tuple[bool, Any]:
+        """
+        要素の値を完全にクリア（学習済みの最安手段から試行、stale element対策付き）
+
+        Returns:
+            Tuple[bool, Any]: (クリアできた場合 True, 以降の入力に使う要素)
+        """
         try:
-            from selenium.webdriver.common.keys import Keys
             from selenium.common.exceptions import StaleElementReferenceException
-            import time
             
-            # Stale element対策: 要素が有効かチェック
             try:
-                # クリア前の値を記録
-                before_value = element.get_attribute('value') or ''
-                default_time = element.get_attribute('defaulttime') or ''
-                self.logger.info(f"クリア前の値: '{before_value}', defaulttime: '{default_time}'")
+                cleared, element = self.field_clearer.clear(self.driver, element)
             except StaleElementReferenceException:
                 self.logger.warning("要素が無効化されています（stale element）")
-                return
-            
-            # 方法1: JavaScriptで完全クリア（最初に実行）
-            self.logger.debug("方法1: JavaScriptで属性レベルクリア")
-            try:
-                self.driver.execute_script("""
-                    if (arguments[0] && arguments[0].parentNode) {
-                        arguments[0].value = '';
-                        arguments[0].setAttribute('value', '');
-                        if (arguments[0].hasAttribute('defaulttime')) {
-                            arguments[0].removeAttribute('defaulttime');
-                        }
-                        arguments[0].dispatchEvent(new Event('input', { bubbles: true }));
-                        arguments[0].dispatchEvent(new Event('change', { bubbles: true }));
-                    }
-                """, element)
-                time.sleep(0.1)  # DOM更新待機
-            except StaleElementReferenceException:
-                self.logger.warning("JavaScriptクリア中に要素が無効化されました")
-                return
+                return False, element
             
-            # 方法2: フォーカスして全選択削除（stale element確認付き）
-            try:
-                self.logger.debug("方法2: フォーカス+全選択削除")
-                element.click()
-                time.sleep(0.05)
-                element.send_keys(Keys.CONTROL + "a")
-                element.send_keys(Keys.DELETE)
-                after_select_delete = element.get_attribute('value') or ''
-                self.logger.debug(f"全選択+削除後の値: '{after_select_delete}'")
-            except StaleElementReferenceException:
-                self.logger.warning("フォーカス+全選択削除中に要素が無効化されました")
-                return
-            
-            # 方法3: 標準のclear()
-            self.logger.debug("方法3: element.clear()を実行")
-            element.clear()
-            after_clear = element.get_attribute('value') or ''
-            self.logger.debug(f"clear()後の値: '{after_clear}'")
-            
-            # 方法4: 値が残っていたらBackSpace
-            current_value = element.get_attribute('value') or ''
-            if current_value:
-                self.logger.debug(f"方法4: BackSpaceで{len(current_value)}文字削除")
-                # JavaScriptでフォーカス
-                self.driver.execute_script("arguments[0].focus();", element)
-                element.send_keys(Keys.END)  # カーソルを最後に移動
-                for _ in range(len(current_value) + 5):  # 余分に削除
-                    element.send_keys(Keys.BACKSPACE)
-                after_backspace = element.get_attribute('value') or ''
-                self.logger.debug(f"BackSpace後の値: '{after_backspace}'")
-            
-            # 最終確認
-            time.sleep(0.1)  # 最終的なDOM更新待機
-            final_value = element.get_attribute('value') or ''
-            self.logger.info(f"クリア完了後の値: '{final_value}'")
-            
-            # まだ値が残っている場合の最終手段
-            if final_value != '':
-                self.logger.warning(f"まだ値が残存: '{final_value}' - 最終手段実行")
-                
-                # 最終手段: 強制的にJavaScriptで空文字を設定
-                self.driver.execute_script("""
-                    var element = arguments[0];
-                    // 全てのイベントリスナーを一時的に無効化
-                    var clone = element.cloneNode(true);
-                    element.parentNode.replaceChild(clone, element);
-                    clone.value = '';
-                    clone.setAttribute('value', '');
-                    // 要素を再取得
-                    return clone;
-                """, element)
-                
-                # 要素の再取得が必要な場合があるため、少し待機
-                time.sleep(0.2)
-                self.logger.info("最終手段のクリア完了")
+            if not cleared:
+                self.logger.warning("要素の値をクリアできませんでした")
+            return cleared, element
             
         except Exception as e:
             self.logger.error(f"要素クリアエラー: {e}")
             # エラーがあっても処理を続行
+            return False, element
+    
+    def get_clearing_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        フィールド種別・クリア方法ごとの成功率と平均所要時間を取得
+        
+        Returns:
+            Dict: {フィールド種別: {方法: {'attempts', 'successes', 'success_rate', 'avg_latency_ms'}}}
+        """
+        return self.field_clearer.get_statistics()
+    
+    def snapshot_form_state(self) -> Dict:
+        """
+        現在のフォーム状態を1回のスクリプト実行で取得
+        
+        Returns:
+            Dict: {'date', 'location', 'start_time', 'end_time', 'break_start', 'break_end',
+                   'project_hours', 'status_text', 'ready', 'locked'}（見つからない項目は None）
+        """
+        try:
+            snapshot_script = """
+            function valueOf(name) {
+                var el = document.getElementsByName(name)[0];
+                return el ? (el.value || '') : null;
+            }
+            var dateElement = document.querySelector('#srw_page_navi_date span');
+            var state = {
+                date: dateElement ? dateElement.textContent.trim() : '',
+                location: valueOf('GI_COMBOBOX38_Seq0S'),
+                start_time: valueOf('KNMTMRNGSTDI'),
+                end_time: valueOf('KNMTMRNGETDI'),
+                break_start: valueOf('RCSST10_Seq0STDI'),
+                break_end: valueOf('RCSST10_Seq0ETDI'),
+                project_hours: null,
+                status_text: '',
+                locked: false
+            };
+
+            // 提出状態（状態表示のテキストと、編集・遷移ボタンの有無）
+            var statusTexts = [];
+            var statusElements = document.querySelectorAll(arguments[0]);
+            for (var s = 0; s < statusElements.length; s++) {
+                var text = (statusElements[s].textContent || '').trim();
+                if (text && text.length < 200) {
+                    statusTexts.push(text);
+                }
+            }
+            state.status_text = statusTexts.join(' ');
+            var hasAction = ['btnCalc0', 'btnNext0', 'dSubmission0'].some(function(id) {
+                var button = document.getElementById(id);
+                return button && !button.disabled;
+            });
+            // 描画中・ポストバック中もボタンが無い状態になるため、読み込み完了後のみ編集不可とみなす
+            state.ready = document.readyState === 'complete';
+            state.locked = !!dateElement && !hasAction && state.ready;
+
+            var grid = findSlickGrid();
+            if (grid) {
+                var columns = grid.getColumns();
+                var field = columns[findTimeColumn(columns)].field;
+                state.project_hours = [];
+                for (var r = 0; r < grid.getDataLength(); r++) {
+                    var item = grid.getDataItem(r);
+                    var value = item ? item[field] : null;
+                    state.project_hours.push(value === null || value === undefined ? '' : String(value));
+                }
+            }
+            return state;
+            """
+            snapshot = self.driver.execute_script(self._FIND_SLICK_GRID_JS + snapshot_script, self.DAY_STATUS_SELECTOR)
+            if not isinstance(snapshot, dict):
+                return {}
+            
+            self.logger.debug(f"フォーム状態: {snapshot}")
+            return snapshot
+            
+        except Exception as e:
+            self.logger.error(f"フォーム状態取得エラー: {e}")
+            return {}
+    
+    def is_day_submitted(self, snapshot: Dict, expected_date: Optional[str] = None) -> bool:
+        """
+        スナップショットから表示中の日が提出済みかを判定
+        
+        Args:
+            snapshot: snapshot_form_state() の結果
+            expected_date: 処理対象の日付（指定時は表示中の日付と一致する場合のみ提出済みと判定）
+            
+        Returns:
+            bool: 提出済み・承認済みの場合 True
+        
+        状態表示が無くボタンが無いだけの場合は、描画中・ポストバック中と区別するため
+        画面の静止を待ってスナップショットを取り直し、それでも編集不可の場合のみ提出済みと判定する。
+        """
+        import re
+        
+        if expected_date:
+            page_date = self._parse_date_text(snapshot.get('date') or '')
+            target_date = self._parse_date_text(expected_date)
+            if page_date and target_date and page_date != target_date:
+                self.logger.warning(f"表示中の日付が処理対象と異なるため提出状態を判定しません: 画面={snapshot.get('date')}, 対象={expected_date}")
+                return False
+        
+        status_text = snapshot.get('status_text') or ''
+        if re.search(self.SUBMITTED_STATUS_PATTERN, status_text):
+            self.logger.info(f"提出済みの状態表示を検出: {status_text[:50]}")
+            return True
+        
+        if not snapshot.get('locked'):
+            return False
+        
+        if not self._wait_for_quiescence(quiet_ms=500, max_wait=10).get('quiet'):
+            self.logger.warning("画面が静止しないため、ボタンの有無による提出状態の判定を行いません")
+            return False
+        
+        recheck = self.snapshot_form_state()
+        if recheck.get('date') != snapshot.get('date'):
+            self.logger.warning(f"再確認中に表示中の日付が変わったため提出済みと判定しません: {snapshot.get('date')} → {recheck.get('date')}")
+            return False
+        if re.search(self.SUBMITTED_STATUS_PATTERN, recheck.get('status_text') or ''):
+            self.logger.info(f"提出済みの状態表示を検出: {recheck['status_text'][:50]}")
+            return True
+        if recheck.get('locked'):
+            self.logger.info("画面の静止後も計算・次へ・提出ボタンが無いため提出済み（編集不可）と判定")
+            return True
+        
+        self.logger.info("再確認でボタンが表示されたため未提出と判定")
+        return False
+    
+    def _parse_date_text(self, text: str):
+        """日付文字列（YYYY/MM/DD、YYYY-MM-DD、YYYY年MM月DD日）を date に変換（失敗時は None）"""
+        return parse_date_text(text)
+    
+    def diff_form_state(self, work_data: Dict, snapshot: Dict) -> Dict:
+        """
+        1日分の工数データとフォーム状態を比較し、入力が必要な項目を判定
+        
+        取得できなかった項目は入力が必要として扱う。
+        
+        Args:
+            work_data: 1日分の工数データ
+            snapshot: snapshot_form_state() の結果
+            
+        Returns:
+            Dict: {'work_time': bool, 'break_time': bool, 'projects': [差分のある行番号]}
+        """
+        def same_time(current, desired) -> bool:
+            return current is not None and self._normalize_time(current) == self._normalize_time(desired)
+        
+        # 勤務時間: 平日は在宅/出社区分と22:00超過チェックのみ、土日は開始・終了時刻も比較
+        work_time = snapshot.get('location') != self.LOCATION_VALUES.get(work_data['location_type'])
+        if self._is_weekend_or_holiday(snapshot.get('date')):
+            work_time = work_time or not (
+                same_time(snapshot.get('start_time'), work_data['start_time']) and
+                same_time(snapshot.get('end_time'), work_data['end_time'])
+            )
+        elif snapshot.get('end_time') and self._is_time_greater_than_threshold(snapshot['end_time'], "22:00"):
+            work_time = True
+        
+        break_time = False
+        if work_data['break_times']:
+            break_start, break_end = self._merge_break_times(work_data['break_times'])
+            break_time = not (same_time(snapshot.get('break_start'), break_start) and
+                              same_time(snapshot.get('break_end'), break_end))
+        
+        current_hours = snapshot.get('project_hours')
+        projects = [
+            idx for idx, project in enumerate(work_data['projects'] or [])
+            if current_hours is None or idx >= len(current_hours) or not same_time(current_hours[idx], project['time'])
+        ]
+        
+        diff = {'work_time': work_time, 'break_time': break_time, 'projects': projects}
+        self.logger.info(f"フォーム差分: {diff}")
+        return diff
     
     def input_work_time(self, start_time: str, end_time: str, location_type: str) -> bool:
         """
@@ -645,28 +959,12 @@ class WorkTimeAutomation:
             
             # 在宅/出社区分選択（必須）
             try:
-                # 複数の方法でセレクト要素を探す
-                select_element = None
-                
-                # 方法1: NAME属性
-                try:
-                    select_element = self.wait_for_element(By.NAME, "GI_COMBOBOX38_Seq0S", timeout=5)
-                except:
-                    pass
-                
-                # 方法2: CSS Selector
-                if not select_element:
-                    try:
-                        select_element = self.wait_for_element(By.CSS_SELECTOR, "select[name='GI_COMBOBOX38_Seq0S']", timeout=5)
-                    except:
-                        pass
-                
-                # 方法3: XPath
-                if not select_element:
-                    try:
-                        select_element = self.wait_for_element(By.XPATH, "//select[contains(@name, 'COMBOBOX38')]", timeout=5)
-                    except:
-                        pass
+                # 複数の方法でセレクト要素を探す（NAME属性 / CSS Selector / XPath を同時に監視）
+                select_element, _ = self.wait_for_any_element([
+                    (By.NAME, "GI_COMBOBOX38_Seq0S"),
+                    (By.CSS_SELECTOR, "select[name='GI_COMBOBOX38_Seq0S']"),
+                    (By.XPATH, "//select[contains(@name, 'COMBOBOX38')]")
+                ], timeout=5)
                 
                 if not select_element:
                     self.logger.error("在宅/出社区分のセレクトボックスが見つかりません")
@@ -678,13 +976,7 @@ class WorkTimeAutomation:
                 time.sleep(0.5)
                 
                 location_select = Select(select_element)
-                location_map = {
-                    "在宅": "2",
-                    "出社（通勤費往復）": "5",
-                    "出社（通勤費片道）": "6", 
-                    "出社（通勤費なし）": "7",
-                    "その他": "4"
-                }
+                location_map = self.LOCATION_VALUES
                 
                 if location_type in location_map:
                     location_select.select_by_value(location_map[location_type])
@@ -707,40 +999,43 @@ class WorkTimeAutomation:
             return False
     
     def save_screenshot(self, name: str = ""):
-        """デバッグ用スクリーンショットを保存（強化版）"""
+        """デバッグ用スクリーンショットを保存（撮影のみ同期、書き込みはバックグラウンド）"""
+        if isinstance(getattr(self, 'failure_artifacts', None), FailureArtifactBuffer) and self.failure_artifacts.active:
+            # 1日分の処理中は画面の状態のみ記録し、その日が失敗した場合にまとめて保存
+            self.failure_artifacts.record(self.driver, name or "screenshot")
+            return None
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{name}_{timestamp}.png" if name else f"screenshot_{timestamp}.png"
-            filepath = os.path.join(self.screenshot_dir, filename)
+            filename = f"screenshot_{name}_{timestamp}" if name else f"screenshot_{timestamp}"
+            
+            # 撮影範囲とデバッグ情報（URL・タイトル・グリッドの状態）を1回のスクリプトで取得
+            info = self.driver.execute_script("""
+                return {
+                    url: location.href,
+                    title: document.title,
+                    viewport: {x: window.scrollX, y: window.scrollY, width: window.innerWidth, height: window.innerHeight},
+                    gridRows: document.querySelectorAll('.slick-row').length,
+                    activeCells: document.querySelectorAll('.slick-cell.active').length
+                };
+            """)
+            if not isinstance(info, dict):
+                info = {}
             
-            # スクリーンショット保存
-            self.driver.save_screenshot(filepath)
+            filepath = self.screenshots.capture(self.driver, self.screenshot_dir, filename, info.get('viewport'))
+            if not filepath:
+                return None
             
-            # 追加のデバッグ情報をログに記録
-            try:
-                current_url = self.driver.current_url
-                page_title = self.driver.title
-                window_size = self.driver.get_window_size()
-                
-                self.logger.info(f"スクリーンショット保存: {filepath}")
-                self.logger.info(f"  - URL: {current_url}")
-                self.logger.info(f"  - タイトル: {page_title}")
-                self.logger.info(f"  - ウィンドウサイズ: {window_size['width']}x{window_size['height']}")
+            self.logger.info(f"スクリーンショット保存: {filepath}")
+            if info:
+                viewport = info.get('viewport') or {}
+                self.logger.info(f"  - URL: {info.get('url')}")
+                self.logger.info(f"  - タイトル: {info.get('title')}")
+                self.logger.info(f"  - 表示サイズ: {viewport.get('width')}x{viewport.get('height')}")
                 
                 # プロジェクトグリッドに関する情報も記録（該当する場合）
                 if "project" in name.lower():
-                    try:
-                        grid_rows = self.driver.find_elements(By.CSS_SELECTOR, ".slick-row")
-                        self.logger.info(f"  - SlickGridの行数: {len(grid_rows)}")
-                        
-                        active_cells = self.driver.find_elements(By.CSS_SELECTOR, ".slick-cell.active")
-                        self.logger.info(f"  - アクティブなセル数: {len(active_cells)}")
-                        
-                    except Exception:
-                        pass
-                        
-            except Exception as debug_e:
-                self.logger.warning(f"追加デバッグ情報取得エラー: {debug_e}")
+                    self.logger.info(f"  - SlickGridの行数: {info.get('gridRows')}")
+                    self.logger.info(f"  - アクティブなセル数: {info.get('activeCells')}")
             
             return filepath
         except Exception as e:
@@ -772,6 +1067,141 @@ class WorkTimeAutomation:
             self.save_screenshot("element_not_found")
             return None
 
+    def wait_for_any_element(self, locators: List[Tuple[str, str]], timeout: float = 10) -> Tuple[Optional[object], Optional[int]]:
+        """
+        複数の候補ロケーターを同時に監視し、最初に操作可能になった要素を返す
+
+        各ポーリングでは全候補をページ内の1回のスクリプト実行で判定するため、
+        候補数に関係なく待機時間は timeout で打ち切られる。途中の不一致ではスクリーンショットを取らない。
+
+        Args:
+            locators: [(By.XXX, 値), ...] の候補リスト（優先順）
+            timeout: 全候補で共有する最大待機時間（秒）
+
+        Returns:
+            Tuple: (要素, 一致したロケーターのインデックス)。見つからない場合は (None, None)
+        """
+        race_script = self._FIND_ELEMENTS_JS + """
+        var locators = arguments[0];
+
+        function usable(element) {
+            return element && element.nodeType === 1 &&
+                   element.getClientRects().length > 0 &&
+                   window.getComputedStyle(element).visibility !== 'hidden' &&
+                   !element.disabled;
+        }
+
+        for (var i = 0; i < locators.length; i++) {
+            try {
+                var candidates = find(locators[i][0], locators[i][1]);
+                for (var j = 0; j < candidates.length; j++) {
+                    if (usable(candidates[j])) {
+                        return [candidates[j], i];
+                    }
+                }
+            } catch (e) {}
+        }
+        return null;
+        """
+        try:
+            element, index = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda driver: driver.execute_script(race_script, [list(locator) for locator in locators])
+            )
+            by, value = locators[index]
+            self.logger.debug(f"候補要素の準備完了: {by}={value}（候補{index + 1}/{len(locators)}）")
+            return element, index
+
+        except TimeoutException:
+            self.logger.warning(f"候補要素がいずれも見つかりません（{timeout}秒）: {locators}")
+            return None, None
+        except Exception as e:
+            self.logger.error(f"候補要素待機エラー: {e}")
+            return None, None
+
+    def fetch_element_properties(self, target, properties: List[str]) -> List[Dict]:
+        """
+        複数要素の複数プロパティを1回のスクリプト実行でまとめて取得
+
+        Args:
+            target: WebElementのリスト、CSSセレクタ文字列、または [(By.XXX, 値), ...] のロケーターリスト
+            properties: 取得するプロパティ名のリスト。
+                'text', 'tag', 'location', 'size', 'displayed', 'enabled' は特別扱いし、
+                それ以外はHTML属性名として getAttribute で取得する
+
+        Returns:
+            List[Dict]: 要素ごとの辞書。'element' キーに要素、ロケーター指定時は
+                'locator_index' キーに一致したロケーターのインデックスを含む
+        """
+        try:
+            fetch_script = self._FIND_ELEMENTS_JS + """
+            var target = arguments[0];
+            var properties = arguments[1];
+            var entries = [];
+
+            if (typeof target === 'string') {
+                var matched = document.querySelectorAll(target);
+                for (var m = 0; m < matched.length; m++) {
+                    entries.push({element: matched[m], locator_index: null});
+                }
+            } else {
+                for (var i = 0; i < target.length; i++) {
+                    var item = target[i];
+                    if (Array.isArray(item)) {
+                        // ロケーター指定（候補ごとに文書順で列挙）
+                        try {
+                            var found = find(item[0], item[1]);
+                            for (var f = 0; f < found.length; f++) {
+                                if (found[f]) {
+                                    entries.push({element: found[f], locator_index: i});
+                                }
+                            }
+                        } catch (e) {}
+                    } else if (item) {
+                        entries.push({element: item, locator_index: null});
+                    }
+                }
+            }
+
+            function read(element, property) {
+                switch (property) {
+                    case 'text':
+                        return (element.innerText || element.textContent || '').trim();
+                    case 'tag':
+                        return element.tagName.toLowerCase();
+                    case 'location':
+                        var rect = element.getBoundingClientRect();
+                        return {x: Math.round(rect.left + window.pageXOffset), y: Math.round(rect.top + window.pageYOffset)};
+                    case 'size':
+                        var box = element.getBoundingClientRect();
+                        return {width: Math.round(box.width), height: Math.round(box.height)};
+                    case 'displayed':
+                        var style = window.getComputedStyle(element);
+                        return element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+                    case 'enabled':
+                        return !element.disabled;
+                }
+                return element.getAttribute(property);
+            }
+
+            for (var x = 0; x < entries.length; x++) {
+                for (var p = 0; p < properties.length; p++) {
+                    entries[x][properties[p]] = read(entries[x].element, properties[p]);
+                }
+            }
+            return entries;
+            """
+            if isinstance(target, str):
+                script_target = target
+            else:
+                script_target = [list(item) if isinstance(item, tuple) else item for item in target]
+
+            result = self.driver.execute_script(fetch_script, script_target, list(properties))
+            return result if isinstance(result, list) else []
+
+        except Exception as e:
+            self.logger.error(f"要素プロパティ一括取得エラー: {e}")
+            return []
+
     def _wait_for_element_with_dom_monitoring(self, by: By, value: str, timeout: int) -> Optional:
         """DOM変更監視付きの要素待機"""
         try:
@@ -806,88 +1236,135 @@ class WorkTimeAutomation:
             self.logger.error(f"要素待機エラー: {e}")
             raise
 
-    def _wait_for_dom_stability(self, max_wait: int = 10):
-        """DOM変更が安定するまで待機"""
-        try:
-            stable_count = 0
-            required_stable_count = 3
-            previous_dom_size = 0
+    def _wait_for_quiescence(self, element=None, quiet_ms: int = 500, max_wait: float = 10,
+                             attribute_filter: Optional[List[str]] = None,
+                             require_ready: bool = False) -> Dict:
+        """
+        ページ内のMutationObserverでDOMの静止を待機（WebDriver呼び出しは1回）
+
+        監視対象で変更が quiet_ms ミリ秒発生しなくなった時点で完了する。
+        
+        Args:
+            element: 監視対象要素（None の場合はドキュメント全体をサブツリーごと監視）
+            quiet_ms: 静止とみなす無変更時間（ミリ秒）
+            max_wait: 最大待機時間（秒）
+            attribute_filter: 監視する属性名のリスト（None の場合は全属性）
+            require_ready: True の場合、要素がname属性を持ち無効化されていないことも条件にする
             
-            for _ in range(max_wait):
-                # DOM要素数を取得
-                current_dom_size = self.driver.execute_script(
-                    "return document.getElementsByTagName('*').length"
-                )
-                
-                # DOM要素数が安定しているかチェック
-                if current_dom_size == previous_dom_size:
-                    stable_count += 1
-                    if stable_count >= required_stable_count:
-                        self.logger.debug(f"DOM安定化完了: 要素数={current_dom_size}")
-                        return
-                else:
-                    stable_count = 0
-                
-                previous_dom_size = current_dom_size
-                time.sleep(0.5)
+        Returns:
+            Dict: {'quiet': 静止したか, 'ready': 準備完了か, 'mutations': 変更回数, 'elapsed': 経過ミリ秒}
+        """
+        try:
+            quiescence_script = """
+            var target = arguments[0] || document.documentElement;
+            var quietMs = arguments[1];
+            var timeoutMs = arguments[2];
+            var attributeFilter = arguments[3];
+            var requireReady = arguments[4];
+            var done = arguments[arguments.length - 1];
+
+            var start = Date.now();
+            var mutations = 0;
+            var quietTimer = null;
+            var timeoutTimer = null;
+            var observer = null;
+            var finished = false;
+
+            function ready() {
+                if (!requireReady) {
+                    return true;
+                }
+                if (!target.isConnected || !target.getAttribute('name')) {
+                    return false;
+                }
+                var tag = target.tagName.toLowerCase();
+                if (tag === 'input' || tag === 'select' || tag === 'textarea') {
+                    return !target.disabled;
+                }
+                return true;
+            }
+
+            function finish(quiet) {
+                if (finished) {
+                    return;
+                }
+                finished = true;
+                clearTimeout(quietTimer);
+                clearTimeout(timeoutTimer);
+                if (observer) {
+                    observer.disconnect();
+                }
+                done({quiet: quiet, ready: ready(), mutations: mutations, elapsed: Date.now() - start});
+            }
+
+            function arm() {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(function() {
+                    if (ready()) {
+                        finish(true);
+                    }
+                }, quietMs);
+            }
+
+            var wholeDocument = target === document.documentElement;
+            var options = {attributes: true, childList: wholeDocument, subtree: wholeDocument, characterData: wholeDocument};
+            if (attributeFilter) {
+                options.attributeFilter = attributeFilter;
+            }
+            observer = new MutationObserver(function(records) {
+                mutations += records.length;
+                arm();
+            });
+            observer.observe(target, options);
+
+            timeoutTimer = setTimeout(function() { finish(false); }, timeoutMs);
+            arm();
+            """
+            # WebDriverのスクリプトタイムアウト（既定30秒）より先にページ側で打ち切る
+            timeout_ms = int(min(max_wait, 25) * 1000)
+            result = self.driver.execute_async_script(
+                quiescence_script, element, quiet_ms, timeout_ms, attribute_filter, require_ready
+            )
             
-            self.logger.warning("DOM安定化がタイムアウトしました")
+            return result if isinstance(result, dict) else {}
             
         except Exception as e:
-            self.logger.error(f"DOM安定化監視エラー: {e}")
+            self.logger.error(f"DOM静止待機エラー: {e}")
+            return {}
+
+    def _wait_for_dom_stability(self, max_wait: int = 10):
+        """DOM変更が安定するまで待機"""
+        result = self._wait_for_quiescence(quiet_ms=500, max_wait=max_wait)
+        
+        if result.get('quiet'):
+            self.logger.debug(f"DOM安定化完了: 変更={result.get('mutations')}回, {result.get('elapsed')}ms")
+        elif result:
+            self.logger.warning("DOM安定化がタイムアウトしました")
 
     def _wait_for_element_complete_load(self, element, max_wait: int = 5):
         """要素の完全読み込み待機"""
-        try:
-            for _ in range(max_wait):
-                # 要素の属性が設定されているかチェック
-                if element.get_attribute('name') and element.tag_name:
-                    # フォーム要素の場合は追加チェック
-                    if element.tag_name.lower() in ['input', 'select', 'textarea']:
-                        # disabled状態でないことを確認
-                        if not element.get_attribute('disabled'):
-                            self.logger.debug("要素の完全読み込み確認完了")
-                            return
-                    else:
-                        self.logger.debug("要素の完全読み込み確認完了")
-                        return
-                
-                time.sleep(0.2)
-            
+        # 従来のポーリング上限（0.2秒 × max_wait回）と同じ時間だけ待つ
+        result = self._wait_for_quiescence(
+            element, quiet_ms=0, max_wait=max_wait * 0.2,
+            attribute_filter=['name', 'disabled'], require_ready=True
+        )
+        
+        if result.get('ready'):
+            self.logger.debug("要素の完全読み込み確認完了")
+        elif result:
             self.logger.warning("要素の完全読み込み確認がタイムアウト")
-            
-        except Exception as e:
-            self.logger.error(f"要素完全読み込み確認エラー: {e}")
 
     def _wait_for_element_attributes_stable(self, element, max_wait: int = 3):
         """要素属性の安定化待機"""
-        try:
-            previous_attributes = {}
-            stable_count = 0
-            
-            for _ in range(max_wait * 5):  # 0.2秒 × 5 = 1秒間隔
-                current_attributes = {
-                    'name': element.get_attribute('name'),
-                    'class': element.get_attribute('class'),
-                    'style': element.get_attribute('style'),
-                    'disabled': element.get_attribute('disabled')
-                }
-                
-                if current_attributes == previous_attributes:
-                    stable_count += 1
-                    if stable_count >= 2:  # 2回連続で同じなら安定
-                        self.logger.debug("要素属性の安定化完了")
-                        return
-                else:
-                    stable_count = 0
-                
-                previous_attributes = current_attributes
-                time.sleep(0.2)
-            
+        result = self._wait_for_quiescence(
+            element, quiet_ms=200, max_wait=max_wait,
+            attribute_filter=['name', 'class', 'style', 'disabled']
+        )
+        
+        if result.get('quiet'):
+            self.logger.debug("要素属性の安定化完了")
+        elif result:
             self.logger.debug("要素属性の安定化確認完了（タイムアウト）")
-            
-        except Exception as e:
-            self.logger.error(f"要素属性安定化確認エラー: {e}")
 
     def wait_for_page_load(self, timeout: int = 15):
         """ページの読み込み完了を待機（高速版）"""
@@ -907,6 +1384,12 @@ class WorkTimeAutomation:
     def _wait_for_network_idle(self, max_wait: int = 10):
         """ネットワークアクティビティの終了待機"""
         try:
+            if isinstance(self.driver, CDPDriver):
+                # CDPバックエンドでは Network イベントで通信中のリクエストを追跡している
+                if not self.driver.wait_for_network_idle(timeout=max_wait):
+                    self.logger.debug("ネットワークアイドル確認がタイムアウト")
+                return
+            
             # Performance APIを使用してネットワーク監視
             for _ in range(max_wait):
                 # アクティブなリクエスト数を確認
@@ -1055,19 +1538,10 @@ class WorkTimeAutomation:
                 return True
             
             # 複数の休憩時間を1つに統合
+            break_start, break_end = self._merge_break_times(break_times)
             if len(break_times) == 1:
-                # 1つの休憩時間の場合はそのまま使用
-                break_start, break_end = break_times[0]
                 self.logger.info(f"休憩時間入力: {break_start} - {break_end}")
             else:
-                # 複数の休憩時間を統合（最初の開始時刻から最後の終了時刻まで）
-                all_starts = [break_time[0] for break_time in break_times]
-                all_ends = [break_time[1] for break_time in break_times]
-                
-                # 最も早い開始時刻と最も遅い終了時刻を使用
-                break_start = min(all_starts)
-                break_end = max(all_ends)
-                
                 self.logger.info(f"複数休憩を統合: {len(break_times)}個の休憩 → {break_start} - {break_end}")
                 for i, (start, end) in enumerate(break_times, 1):
                     self.logger.info(f"  休憩{i}: {start} - {end}")
@@ -1083,6 +1557,15 @@ class WorkTimeAutomation:
             self.logger.error(f"休憩時間入力エラー: {e}")
             return False
     
+    def _merge_break_times(self, break_times: List[Tuple[str, str]]) -> Tuple[str, str]:
+        """複数の休憩時間を1つに統合（最も早い開始時刻から最も遅い終了時刻まで）"""
+        if len(break_times) == 1:
+            return break_times[0]
+        
+        all_starts = [break_time[0] for break_time in break_times]
+        all_ends = [break_time[1] for break_time in break_times]
+        return min(all_starts), max(all_ends)
+    
     def _add_break_row(self):
         """休憩行を追加（正しいボタンIDを使用）"""
         try:
@@ -1134,17 +1617,158 @@ class WorkTimeAutomation:
         except Exception as e:
             self.logger.error(f"プロジェクト入力エラー: {e}")
             return False
-    
+
+    def input_project_works(self, projects: List[Dict[str, str]], current_hours: Optional[List[str]] = None) -> List[int]:
+        """
+        プロジェクト作業時間を一括入力（SlickGridのデータモデル経由）
+
+        SlickGridインスタンスを一度だけ特定し、全行をエディタのコミットAPI
+        （エディタが無い列はデータビュー更新）で書き込んだ後、コミット済みの値を読み戻す。
+        書き込めなかった行のみ従来のセルダブルクリック方式で入力する。
+
+        Args:
+            projects: [{'time': 'H:MM', 'comment': 備考}, ...] のリスト
+            current_hours: 画面上の現在の時間（snapshot_form_state の project_hours）。
+                指定時は値が一致する行を入力しない
+
+        Returns:
+            List[int]: 入力に失敗したプロジェクト行番号（0から開始）のリスト
+        """
+        if not projects:
+            return []
+
+        pending = [
+            idx for idx, project in enumerate(projects)
+            if current_hours is None or idx >= len(current_hours)
+            or self._normalize_time(current_hours[idx] or '') != self._normalize_time(project['time'])
+        ]
+        if len(pending) < len(projects):
+            self.logger.info(f"入力済みのためスキップするプロジェクト: {len(projects) - len(pending)}件")
+        if not pending:
+            return []
+
+        grid_rows = self._write_project_hours_to_grid(
+            [{'row': idx, 'value': projects[idx]['time']} for idx in pending]
+        )
+
+        failed_indices = []
+        for idx in pending:
+            project = projects[idx]
+            row_result = grid_rows.get(idx)
+            if row_result and self._normalize_time(str(row_result.get('value') or '')) == self._normalize_time(project['time']):
+                self.logger.info(f"プロジェクト{idx + 1}入力完了（グリッドAPI: {row_result.get('method')}）: {project['time']}")
+                continue
+
+            if row_result:
+                self.logger.warning(f"プロジェクト{idx + 1}のグリッド書き込み結果が不一致: 期待={project['time']}, 実際={row_result.get('value')}, エラー={row_result.get('error')}")
+
+            # フォールバック: DOMのダブルクリック方式
+            if not self.add_project_work(idx, project['time'], project['comment']):
+                failed_indices.append(idx)
+
+        return failed_indices
+
+    def _write_project_hours_to_grid(self, rows: List[Dict[str, str]]) -> Dict[int, Dict]:
+        """SlickGridのデータモデルへ時間を書き込み、行番号ごとの読み戻し結果を返す"""
+        try:
+            grid_script = """
+            var rows = arguments[0];
+
+            var grid = findSlickGrid();
+            if (!grid) {
+                return {found: false, rows: []};
+            }
+
+            var columns = grid.getColumns();
+            var col = findTimeColumn(columns);
+            var field = columns[col].field;
+            var data = typeof grid.getData === 'function' ? grid.getData() : null;
+            var lock = typeof grid.getEditorLock === 'function' ? grid.getEditorLock() : null;
+
+            var results = [];
+            for (var r = 0; r < rows.length; r++) {
+                var target = rows[r];
+                var result = {row: target.row, method: null, value: null, error: null};
+                try {
+                    if (target.row >= grid.getDataLength()) {
+                        result.error = 'row_out_of_range';
+                        results.push(result);
+                        continue;
+                    }
+
+                    // エディタ経由でコミット（アプリ側のonCellChange処理を通す）
+                    var committed = false;
+                    if (columns[col].editor && typeof grid.editActiveCell === 'function') {
+                        grid.setActiveCell(target.row, col);
+                        grid.editActiveCell();
+                        var editor = grid.getCellEditor();
+                        if (editor) {
+                            var node = grid.getActiveCellNode();
+                            var input = node ? node.querySelector('input, textarea') : null;
+                            if (input) {
+                                input.value = target.value;
+                            } else if (typeof editor.setValue === 'function') {
+                                editor.setValue(target.value);
+                            }
+                            committed = lock ? lock.commitCurrentEdit() : true;
+                            if (committed) {
+                                result.method = 'editor';
+                            }
+                        }
+                    }
+
+                    // エディタが使えない場合はデータビューを直接更新
+                    if (!committed) {
+                        if (lock && lock.isActive()) {
+                            lock.cancelCurrentEdit();
+                        }
+                        var item = grid.getDataItem(target.row);
+                        item[field] = target.value;
+                        if (data && typeof data.updateItem === 'function') {
+                            var idProperty = typeof data.getIdPropertyName === 'function' ? data.getIdPropertyName() : 'id';
+                            data.updateItem(item[idProperty], item);
+                        } else {
+                            grid.invalidateRow(target.row);
+                        }
+                        if (grid.onCellChange && typeof grid.onCellChange.notify === 'function') {
+                            grid.onCellChange.notify({row: target.row, cell: col, item: item, grid: grid});
+                        }
+                        result.method = 'data_view';
+                    }
+
+                    // コミット済みの値を読み戻す
+                    var committedItem = grid.getDataItem(target.row);
+                    result.value = committedItem ? committedItem[field] : null;
+                } catch (e) {
+                    result.error = String(e);
+                }
+                results.push(result);
+            }
+            grid.render();
+            return {found: true, field: field, column: col, rows: results};
+            """
+            grid_result = self.driver.execute_script(self._FIND_SLICK_GRID_JS + grid_script, rows)
+
+            if not isinstance(grid_result, dict) or not grid_result.get('found'):
+                self.logger.info("SlickGridインスタンスが見つからないため従来方式で入力します")
+                return {}
+
+            self.logger.info(f"SlickGridへ一括書き込み: 列={grid_result.get('field')}({grid_result.get('column')}), {len(grid_result.get('rows', []))}行")
+            return {row_result['row']: row_result for row_result in grid_result.get('rows', [])}
+
+        except Exception as e:
+            self.logger.error(f"SlickGrid一括書き込みエラー: {e}")
+            return {}
+
+    @governed('calculate')
     def calculate(self) -> bool:
         """計算ボタンを押下"""
         try:
             calc_btn = self.driver.find_element(By.ID, "btnCalc0")
             
-            # JavaScriptで直接クリック（座標の問題を回避）
-            self.driver.execute_script("arguments[0].click();", calc_btn)
             self.logger.info("計算実行中...")
-            time.sleep(3)  # 計算完了を待機
-            return True
+            # JavaScriptで直接クリック（座標の問題を回避）し、計算結果の反映まで待機
+            return self._click_and_wait_for_completion(calc_btn, 'calculate')
             
         except Exception as e:
             self.logger.error(f"計算エラー: {e}")
@@ -1153,14 +1777,21 @@ class WorkTimeAutomation:
     def check_errors(self) -> List[str]:
         """エラーメッセージの確認"""
         try:
-            error_elements = self.driver.find_elements(By.CSS_SELECTOR, ".error")
-            errors = []
+            # 全エラー要素のテキストを1回のスクリプトで取得
+            errors = self.driver.execute_script("""
+                var errors = [];
+                var elements = document.querySelectorAll('.error');
+                for (var i = 0; i < elements.length; i++) {
+                    var text = (elements[i].innerText || '').trim();
+                    if (text) {
+                        errors.push(text);
+                    }
+                }
+                return errors;
+            """) or []
             
-            for error in error_elements:
-                error_text = error.text.strip()
-                if error_text:
-                    errors.append(error_text)
-                    self.logger.error(f"エラー検出: {error_text}")
+            for error_text in errors:
+                self.logger.error(f"エラー検出: {error_text}")
             
             return errors
             
@@ -1187,15 +1818,14 @@ class WorkTimeAutomation:
         
         return False
     
+    @governed('save_and_next')
     def save_and_next(self) -> bool:
         """次へボタンを押下して確認画面に遷移"""
         try:
             next_btn = self.driver.find_element(By.ID, "btnNext0")
-            # JavaScriptで直接クリック
-            self.driver.execute_script("arguments[0].click();", next_btn)
             self.logger.info("確認画面に遷移中...")
-            time.sleep(5)  # 画面遷移を待機
-            return True
+            # JavaScriptで直接クリックし、確認画面の表示まで待機
+            return self._click_and_wait_for_completion(next_btn, 'save_and_next')
             
         except Exception as e:
             self.logger.error(f"画面遷移エラー: {e}")
@@ -1246,6 +1876,15 @@ class WorkTimeAutomation:
             self.logger.error(f"実労働時間取得エラー: {e}")
             return None
     
+    def is_confirmation_screen(self) -> bool:
+        """確認画面（提出ボタン dSubmission0 がある画面）を表示中か"""
+        try:
+            return bool(self.driver.execute_script("return !!document.getElementById('dSubmission0');"))
+        except Exception as e:
+            self.logger.error(f"画面判定エラー: {e}")
+            return False
+    
+    @governed('submit_confirmation')
     def submit_confirmation(self) -> bool:
         """確認画面でdSubmission0ボタンをクリックして提出"""
         try:
@@ -1254,19 +1893,33 @@ class WorkTimeAutomation:
             # dSubmission0ボタンを探してクリック
             submit_button = self.driver.find_element(By.ID, "dSubmission0")
             self.driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
-            time.sleep(1)
             
-            # JavaScriptで直接クリック
-            self.driver.execute_script("arguments[0].click();", submit_button)
-            self.logger.info("提出ボタン(dSubmission0)をクリックしました")
-            
-            time.sleep(3)
-            return True
+            # JavaScriptで直接クリックし、提出の完了まで待機
+            self.logger.info("提出ボタン(dSubmission0)をクリックします")
+            return self._click_and_wait_for_completion(submit_button, 'submit_confirmation')
             
         except Exception as e:
             self.logger.error(f"提出ボタンクリックエラー: {e}")
             return False
     
+    def _click_and_wait_for_completion(self, button, action: str) -> bool:
+        """
+        ボタンをクリックし、発生した通信の応答が画面に反映されるまで待機
+        
+        固定の待機時間の代わりに、ページ内の通信（fetch / XMLHttpRequest）と画面遷移を
+        追跡して完了を検知する。所要時間は self.action_timings に記録する。
+        
+        Returns:
+            bool: 完了を検知できた場合 True（上限時間内に完了しない場合 False）
+        """
+        timing = self.action_watcher.click_and_wait(button, action)
+        self.action_timings.append(timing)
+        if timing['timed_out']:
+            return False
+        self.logger.info(f"{action} 完了: サーバー応答 {timing['server_ms']:.0f}ms / "
+                         f"画面反映 {timing['render_ms']:.0f}ms（通信 {timing['requests']}件）")
+        return True
+    
     def confirm_and_submit(self) -> bool:
         """確認画面で最終提出"""
         try:
@@ -1297,6 +1950,7 @@ class WorkTimeAutomation:
             self.logger.error(f"戻るエラー: {e}")
             return False
     
+    @governed('navigation')
     def navigate_to_next_day(self) -> bool:
         """翌日に遷移（土日スキップ対応版）"""
         try:
@@ -1318,7 +1972,7 @@ class WorkTimeAutomation:
                 # 土日をスキップする必要があるかチェック
                 if self._should_skip_weekends(current_date, next_business_date):
                     self.logger.info("土日をスキップして遷移します")
-                    return self._navigate_to_specific_date(next_business_date)
+                    return self._navigate_to_specific_date(next_business_date) or self._navigate_to_next_day_standard()
                 else:
                     # 通常の翌日遷移
                     return self._navigate_to_next_day_standard()
@@ -1403,40 +2057,144 @@ class WorkTimeAutomation:
     
     def _navigate_to_specific_date(self, target_date: str) -> bool:
         """指定の日付に直接遷移"""
-        try:
-            self.logger.info(f"指定日付へ遷移: {target_date}")
+        self.logger.info(f"指定日付へ遷移: {target_date}")
+        return self.navigate_to_date(target_date)
+    
+    @governed('navigation')
+    def navigate_to_date(self, target_date: str) -> bool:
+        """
+        任意の日付へ1回のリクエストで遷移
+        
+        翌日遷移（ToNextDateAction）のonclickから学習した日付遷移テンプレートに
+        対象日を埋め込んで遷移し、表示中の日付が対象日になったことを確認する。
+        
+        Args:
+            target_date: 遷移先の日付（YYYY/MM/DD、YYYY-MM-DD など）
             
-            # URLパラメータを使用して日付を指定
-            current_url = self.driver.current_url
+        Returns:
+            bool: 対象日に遷移できた場合 True
+        """
+        try:
+            target = parse_date_text(target_date)
+            if target is None:
+                self.logger.error(f"遷移先の日付を解析できません: {target_date}")
+                return False
             
-            # URLに日付パラメータを追加/更新
-            if "?" in current_url:
-                base_url = current_url.split("?")[0]
-            else:
-                base_url = current_url
+            # 学習済みのテンプレートが無ければ候補を抽出し、実際に遷移して確認できたものだけを保存
+            templates = [self._date_navigation_template] if self._date_navigation_template \
+                else self._learn_date_navigation_template()
+            if not templates:
+                self.logger.warning("日付遷移テンプレートを学習できないため直接遷移できません")
+                return False
             
-            # 日付パラメータを追加（システムに応じて調整が必要）
-            target_url = f"{base_url}?date={target_date.replace('/', '-')}"
+            for template in templates:
+                if self._navigate_with_template(template, target):
+                    if self._date_navigation_template is None:
+                        self.logger.info(f"日付遷移テンプレートを学習: {template}")
+                    self._date_navigation_template = template
+                    return True
+                # テンプレートが使えなくなった可能性があるため次回は再学習
+                self._date_navigation_template = None
+            return False
             
-            self.logger.info(f"遷移先URL: {target_url}")
-            self.driver.get(target_url)
+        except Exception as e:
+            self.logger.error(f"指定日付遷移エラー: {e}")
+            self._date_navigation_template = None
+            return False
+    
+    def _navigate_with_template(self, template: Dict[str, str], target) -> bool:
+        """日付遷移テンプレートに対象日を埋め込んで遷移し、表示中の日付が対象日になったか確認"""
+        value = target.strftime(template['format'])
+        request = template['template'].replace(self._DATE_TEMPLATE_TOKEN, value)
+        self.logger.info(f"日付遷移（{template['kind']}）: {target} → {request}")
+        
+        if template['kind'] == 'url':
+            self.driver.get(request)
+        else:
+            self.driver.execute_script(f"(function() {{ {request} }}).call(document.body);")
+        
+        self.wait_for_page_load()
+        
+        landed = parse_date_text(self.get_current_date())
+        if landed == target:
+            self.logger.info(f"日付遷移成功: {target}")
+            return True
+        
+        self.logger.warning(f"日付遷移後の確認失敗: 期待={target}, 実際={landed}")
+        return False
+    
+    def _learn_date_navigation_template(self) -> List[Dict[str, str]]:
+        """
+        日付遷移のonclick（ToNextDateAction等）と表示中の日付から日付遷移テンプレートの候補を抽出
+        
+        onclick内の日付のうち表示中の日付の前後の日付（遷移先）だけを置き換える。表示中の日付は
+        置き換えない（表示中の日付を渡してサーバー側で日付を進めるハンドラーでは対象日にならないため）。
+        候補は未検証のため保存せず、navigate_to_date で遷移を確認できたものを保存する。
+        
+        Returns:
+            List[Dict]: [{'kind': 'url'/'script', 'template': テンプレート, 'format': 日付書式}]
+        """
+        import re
+        from datetime import timedelta
+        
+        try:
+            page = self.driver.execute_script("""
+                var dateElement = document.querySelector('#srw_page_navi_date span');
+                var handlers = [];
+                var elements = document.querySelectorAll('[onclick*="ToNextDateAction"], [onclick*="DateAction"]');
+                for (var i = 0; i < elements.length; i++) {
+                    handlers.push(elements[i].getAttribute('onclick'));
+                }
+                return {date: dateElement ? dateElement.textContent.trim() : '', handlers: handlers};
+            """)
+            current = parse_date_text(page.get('date'))
+            if current is None:
+                self.logger.warning(f"表示中の日付を解析できないため学習できません: {page.get('date')}")
+                return []
             
-            # ページ読み込み完了を待機
-            self.wait_for_page_load()
-            time.sleep(2)
+            # 翌日・前日遷移は土日を飛ばすため前後数日分を遷移先の候補にする
+            destinations = [current + timedelta(days=offset) for offset in (1, 2, 3, 4, -1, -2, -3, -4)]
             
-            # 日付が正しく更新されたかを確認
-            new_date = self.get_current_date()
-            if target_date in new_date:
-                self.logger.info(f"日付遷移成功: {new_date}")
-                return True
-            else:
-                self.logger.warning(f"日付遷移後の確認失敗: 期待={target_date}, 実際={new_date}")
-                return self._navigate_to_next_day_standard()
+            templates = []
+            for onclick_value in page.get('handlers') or []:
+                url_match = re.search(r"location\.href\s*=\s*['\"]([^'\"]+)['\"]", onclick_value or '')
+                if url_match:
+                    kind, payload = 'url', self._resolve_navigation_url(url_match.group(1))
+                else:
+                    kind, payload = 'script', onclick_value or ''
                 
+                for destination in destinations:
+                    for date_format in self._DATE_TEMPLATE_FORMATS:
+                        value = destination.strftime(date_format)
+                        if value not in payload:
+                            continue
+                        template = {
+                            'kind': kind,
+                            'template': payload.replace(value, self._DATE_TEMPLATE_TOKEN),
+                            'format': date_format
+                        }
+                        if template not in templates:
+                            templates.append(template)
+            
+            if not templates:
+                self.logger.warning(f"onclickに遷移先の日付が含まれないため学習できません: {page.get('handlers')}")
+            return templates
+            
         except Exception as e:
-            self.logger.error(f"指定日付遷移エラー: {e}")
-            return self._navigate_to_next_day_standard()
+            self.logger.error(f"日付遷移テンプレート学習エラー: {e}")
+            return []
+    
+    def _resolve_navigation_url(self, target_url: str) -> str:
+        """onclickから抽出したURLを絶対URLに変換"""
+        # 相対パスの場合は現在のベースURLと結合
+        if target_url.startswith('/'):
+            base_url = self.driver.current_url.split('/')[0:3]  # protocol://host:port
+            return '/'.join(base_url) + target_url
+        elif not target_url.startswith('http'):
+            current_url = self.driver.current_url
+            base_url = '/'.join(current_url.split('/')[:-1])
+            return base_url + '/' + target_url
+        return target_url
     
     def _navigate_to_next_day_standard(self) -> bool:
         """標準的な翌日遷移"""
@@ -1502,16 +2260,7 @@ class WorkTimeAutomation:
                 target_url = url_match.group(1)
                 self.logger.info(f"抽出したURL: {target_url}")
                 
-                # 相対パスの場合は現在のベースURLと結合
-                if target_url.startswith('/'):
-                    base_url = self.driver.current_url.split('/')[0:3]  # protocol://host:port
-                    full_url = '/'.join(base_url) + target_url
-                elif not target_url.startswith('http'):
-                    current_url = self.driver.current_url
-                    base_url = '/'.join(current_url.split('/')[:-1])
-                    full_url = base_url + '/' + target_url
-                else:
-                    full_url = target_url
+                full_url = self._resolve_navigation_url(target_url)
                 
                 self.logger.info(f"遷移先URL: {full_url}")
                 self.driver.get(full_url)
@@ -1535,28 +2284,12 @@ class WorkTimeAutomation:
         try:
             self.logger.info("従来の方法でナビゲーションを試行")
             
-            # 複数の方法で翌日ボタンを探す
-            next_day_btn = None
-            
-            # 方法1: title属性で検索
-            try:
-                next_day_btn = self.wait_for_element(By.XPATH, "//button[contains(@title, '翌日')]", timeout=5)
-            except:
-                pass
-            
-            # 方法2: テキストで検索
-            if not next_day_btn:
-                try:
-                    next_day_btn = self.wait_for_element(By.XPATH, "//button[contains(text(), '翌日')]", timeout=5)
-                except:
-                    pass
-            
-            # 方法3: リンクとして実装されている場合
-            if not next_day_btn:
-                try:
-                    next_day_btn = self.wait_for_element(By.XPATH, "//a[contains(@title, '翌日') or contains(text(), '翌日')]", timeout=5)
-                except:
-                    pass
+            # 複数の方法で翌日ボタンを探す（title属性 / テキスト / リンクを同時に監視）
+            next_day_btn, _ = self.wait_for_any_element([
+                (By.XPATH, "//button[contains(@title, '翌日')]"),
+                (By.XPATH, "//button[contains(text(), '翌日')]"),
+                (By.XPATH, "//a[contains(@title, '翌日') or contains(text(), '翌日')]")
+            ], timeout=5)
             
             if not next_day_btn:
                 self.logger.error("翌日ボタンが見つかりません")
@@ -1589,22 +2322,33 @@ class WorkTimeAutomation:
             current_url = self.driver.current_url
             self.logger.info(f"現在のURL: {current_url}")
             
-            # URLから日付パラメータを解析して翌日のURLを生成
-            # （実際のURLパターンに応じて調整が必要）
-            
-            # とりあえずページをリロードして続行
-            self.driver.refresh()
-            time.sleep(3)
+            # 学習済みの日付遷移テンプレートで翌営業日へ遷移（到着した日付を確認）
+            next_business_date = self._get_next_business_date(self.get_current_date())
+            if next_business_date and self.navigate_to_date(next_business_date):
+                return True
             
-            return True
+            # 確認できない遷移は行わず、呼び出し元で別の経路を使う
+            self.logger.warning("日付遷移テンプレートで翌営業日へ遷移できませんでした")
+            return False
             
         except Exception as e:
             self.logger.error(f"URL遷移エラー: {e}")
             return False
     
+    @governed('navigation')
     def navigate_to_previous_day(self) -> bool:
-        """前日に遷移"""
-        try:
+        """前日に遷移（土日スキップ対応、翌日遷移と同じく前の営業日へ進む）"""
+        try:
+            current = parse_date_text(self.get_current_date())
+            if current:
+                previous_business_date = current - timedelta(days=1)
+                while previous_business_date.weekday() >= 5:  # 5=土曜, 6=日曜
+                    previous_business_date -= timedelta(days=1)
+                if (current - previous_business_date).days > 1:
+                    self.logger.info(f"土日をスキップして前の営業日へ遷移します: {previous_business_date:%Y/%m/%d}")
+                    if self._navigate_to_specific_date(previous_business_date.strftime('%Y/%m/%d')):
+                        return True
+            
             prev_day_btn = self.driver.find_element(By.XPATH, "//button[contains(@title, '前日')]")
             # JavaScriptで直接クリック
             self.driver.execute_script("arguments[0].click();", prev_day_btn)
@@ -1976,97 +2720,120 @@ class WorkTimeAutomation:
             return False
 
     def _hide_overlay_elements(self) -> bool:
-        """オーバーレイ要素を一時的に非表示（強化版）"""
-        try:
-            # 固定フッターボタンエリアの強制非表示（最優先）
-            footer_script = """
-            // 特定のIDで固定フッターを強制非表示
-            var mainFooter = document.getElementById('srw_fixed_footer_button_area');
-            if (mainFooter) {
-                mainFooter.style.display = 'none !important';
-                mainFooter.style.visibility = 'hidden !important';
-                mainFooter.style.zIndex = '-9999';
-                mainFooter.setAttribute('data-hidden-by-automation', 'true');
+        """オーバーレイ要素を非表示（ページ単位で一度だけ抑制を設置）
+
+        スタイルシートの注入とMutationObserverによる監視はページごとに一度だけ行い、
+        2回目以降の呼び出しは設置済みフラグを確認するだけで終了する。
+        """
+        try:
+            suppression_script = """
+            var state = window.__automationOverlaySuppression;
+            if (state) {
+                // 設置済み: 一時停止中なら再開するだけ
+                state.enable();
+                return {installed: false, hidden: state.hidden};
             }
-            
-            // その他のフッター要素も非表示
-            var footers = document.querySelectorAll('[id*="footer"], [class*="footer"], [class*="fixed-footer"]');
-            var hiddenCount = 0;
-            for (var i = 0; i < footers.length; i++) {
-                if (footers[i].style.position === 'fixed' || footers[i].style.position === 'sticky') {
-                    footers[i].style.display = 'none !important';
-                    footers[i].style.visibility = 'hidden !important';
-                    footers[i].style.zIndex = '-9999';
-                    footers[i].setAttribute('data-hidden-by-automation', 'true');
-                    hiddenCount++;
+
+            var HIDE_ATTR = 'data-hidden-by-automation';
+            var FOOTER_PATTERN = /footer/i;
+
+            var style = document.createElement('style');
+            style.id = 'automation-overlay-suppression';
+            style.textContent = [
+                '#srw_fixed_footer_button_area, #srw_global_logo_img, [id*="logo"], [class*="logo"], [' + HIDE_ATTR + '="true"] {',
+                '    display: none !important;',
+                '    visibility: hidden !important;',
+                '}',
+                'body { padding-bottom: 200px !important; }'
+            ].join('\\n');
+            (document.head || document.documentElement).appendChild(style);
+
+            state = {style: style, hidden: 0, observing: false};
+
+            function mark(node) {
+                if (!node || node.nodeType !== 1 || node === style || node.hasAttribute(HIDE_ATTR)) {
+                    return;
+                }
+                var computed = window.getComputedStyle(node);
+                var position = computed.position;
+                var zIndex = parseInt(computed.zIndex, 10);
+                var footerLike = FOOTER_PATTERN.test(node.id || '') ||
+                                 FOOTER_PATTERN.test(typeof node.className === 'string' ? node.className : '');
+
+                // 固定/stickyフッター、または高z-indexのfixed/absolute要素
+                if (((position === 'fixed' || position === 'sticky') && footerLike) ||
+                    ((position === 'fixed' || position === 'absolute') && zIndex > 900)) {
+                    node.setAttribute(HIDE_ATTR, 'true');
+                    state.hidden++;
                 }
             }
-            return hiddenCount + (mainFooter ? 1 : 0);
-            """
-            footer_hidden_count = self.driver.execute_script(footer_script)
-            
-            # company ロゴの非表示
-            logo_script = """
-            var logos = document.querySelectorAll('#srw_global_logo_img, [id*="logo"], [class*="logo"]');
-            var hiddenCount = 0;
-            for (var i = 0; i < logos.length; i++) {
-                logos[i].style.display = 'none !important';
-                logos[i].style.visibility = 'hidden !important';
-                logos[i].setAttribute('data-hidden-by-automation', 'true');
-                hiddenCount++;
-            }
-            return hiddenCount;
-            """
-            logo_hidden_count = self.driver.execute_script(logo_script)
-            
-            # 高z-indexオーバーレイ要素の非表示
-            overlay_script = """
-            var overlays = document.querySelectorAll('*');
-            var hiddenCount = 0;
-            for (var i = 0; i < overlays.length; i++) {
-                var overlay = overlays[i];
-                var computedStyle = window.getComputedStyle(overlay);
-                var zIndex = parseInt(computedStyle.zIndex);
-                var position = computedStyle.position;
-                
-                // 高z-indexかつfixed/absoluteの要素を非表示
-                if ((position === 'fixed' || position === 'absolute') && zIndex > 900) {
-                    overlay.style.display = 'none !important';
-                    overlay.style.visibility = 'hidden !important';
-                    overlay.setAttribute('data-hidden-by-automation', 'true');
-                    hiddenCount++;
+
+            var observer = new MutationObserver(function(mutations) {
+                for (var i = 0; i < mutations.length; i++) {
+                    var added = mutations[i].addedNodes;
+                    for (var j = 0; j < added.length; j++) {
+                        mark(added[j]);
+                        if (added[j].querySelectorAll) {
+                            var nested = added[j].querySelectorAll('[style*="fixed"], [style*="sticky"], [id*="footer"], [class*="footer"]');
+                            for (var k = 0; k < nested.length; k++) {
+                                mark(nested[k]);
+                            }
+                        }
+                    }
                 }
+            });
+
+            state.enable = function() {
+                style.disabled = false;
+                if (!state.observing) {
+                    observer.observe(document.documentElement, {childList: true, subtree: true});
+                    state.observing = true;
+                }
+            };
+            state.disable = function() {
+                style.disabled = true;
+                if (state.observing) {
+                    observer.disconnect();
+                    state.observing = false;
+                }
+            };
+
+            // 既存要素の走査は設置時の一度だけ
+            var all = document.body ? document.body.getElementsByTagName('*') : [];
+            for (var n = 0; n < all.length; n++) {
+                mark(all[n]);
             }
-            return hiddenCount;
+
+            window.__automationOverlaySuppression = state;
+            state.enable();
+            return {installed: true, hidden: state.hidden};
             """
-            overlay_count = self.driver.execute_script(overlay_script)
+            result = self.driver.execute_script(suppression_script)
             
-            # ボディのパディング底部を一時的に増加（フッター分のスペース確保）
-            self.driver.execute_script("""
-                document.body.style.paddingBottom = '200px';
-                document.body.setAttribute('data-padding-adjusted', 'true');
-            """)
+            if not isinstance(result, dict):
+                return False
             
-            self.logger.debug(f"オーバーレイ要素を非表示: フッター={footer_hidden_count}, ロゴ={logo_hidden_count}, その他={overlay_count}")
-            return footer_hidden_count > 0 or logo_hidden_count > 0 or overlay_count > 0
+            if result.get('installed'):
+                self.logger.debug(f"オーバーレイ抑制を設置: 非表示要素={result.get('hidden', 0)}")
+            return True
             
         except Exception as e:
             self.logger.error(f"オーバーレイ非表示エラー: {e}")
             return False
 
     def _restore_overlay_elements(self):
-        """非表示にしたオーバーレイ要素を復元"""
+        """非表示にしたオーバーレイ要素を復元（スタイルシート無効化のみ）"""
         try:
             restore_script = """
-            var hiddenElements = document.querySelectorAll('[data-hidden-by-automation="true"]');
-            for (var i = 0; i < hiddenElements.length; i++) {
-                hiddenElements[i].style.display = '';
-                hiddenElements[i].removeAttribute('data-hidden-by-automation');
+            var state = window.__automationOverlaySuppression;
+            if (!state) {
+                return false;
             }
-            return hiddenElements.length;
+            state.disable();
+            return true;
             """
-            restored_count = self.driver.execute_script(restore_script)
-            self.logger.debug(f"オーバーレイ要素を復元: {restored_count}個")
+            restored = self.driver.execute_script(restore_script)
+            self.logger.debug(f"オーバーレイ抑制を一時停止: {bool(restored)}")
             
         except Exception as e:
             self.logger.error(f"オーバーレイ復元エラー: {e}")
@@ -2116,19 +2883,19 @@ class WorkTimeAutomation:
                 try:
                     active_cell = self.driver.find_element(By.CSS_SELECTOR, selector)
                     if active_cell:
-                        # セルの詳細情報をログ出力
-                        cell_text = active_cell.text or "（空）"
-                        cell_class = active_cell.get_attribute("class") or "（クラスなし）"
-                        cell_tag = active_cell.tag_name
-                        cell_location = active_cell.location
-                        cell_size = active_cell.size
+                        # セルの詳細情報をログ出力（1回のスクリプト実行でまとめて取得）
+                        cell_info = (self.fetch_element_properties(
+                            [active_cell], ['text', 'class', 'tag', 'location', 'size']
+                        ) or [{}])[0]
+                        cell_location = cell_info.get('location') or {}
+                        cell_size = cell_info.get('size') or {}
                         
                         self.logger.info(f"アクティブセル発見: {selector}")
-                        self.logger.info(f"  - テキスト: '{cell_text}'")
-                        self.logger.info(f"  - クラス: {cell_class}")
-                        self.logger.info(f"  - タグ: {cell_tag}")
-                        self.logger.info(f"  - 位置: x={cell_location['x']}, y={cell_location['y']}")
-                        self.logger.info(f"  - サイズ: w={cell_size['width']}, h={cell_size['height']}")
+                        self.logger.info(f"  - テキスト: '{cell_info.get('text') or '（空）'}'")
+                        self.logger.info(f"  - クラス: {cell_info.get('class') or '（クラスなし）'}")
+                        self.logger.info(f"  - タグ: {cell_info.get('tag')}")
+                        self.logger.info(f"  - 位置: x={cell_location.get('x')}, y={cell_location.get('y')}")
+                        self.logger.info(f"  - サイズ: w={cell_size.get('width')}, h={cell_size.get('height')}")
                         break
                 except:
                     continue
@@ -2215,7 +2982,7 @@ class WorkTimeAutomation:
                 return False
             
             # 入力値をクリアして新しい値を設定
-            self._clear_element_value(active_input)
+            _, active_input = self._clear_element_value(active_input)
             
             # 値を入力
             active_input.send_keys(value)
@@ -2726,40 +3493,38 @@ class WorkTimeAutomation:
                 f".slick-row:nth-child({row_number}) .slick-cell:nth-child(3)",
             ]
             
-            for selector in cell_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            self.logger.info(f"時間入力セル発見: {selector}")
-                            self.logger.info(f"セル内容: '{element.text}'")
-                            self.logger.info(f"セルクラス: {element.get_attribute('class')}")
-                            return element
-                except Exception as e:
-                    self.logger.debug(f"セレクタ {selector} での検索失敗: {e}")
-                    continue
+            # 全セレクタの候補と表示状態・テキスト・クラスを1回のスクリプト実行で取得
+            candidates = self.fetch_element_properties(
+                [(By.CSS_SELECTOR, selector) for selector in cell_selectors],
+                ['displayed', 'enabled', 'text', 'class']
+            )
+            for candidate in candidates:
+                if candidate.get('displayed') and candidate.get('enabled'):
+                    self.logger.info(f"時間入力セル発見: {cell_selectors[candidate['locator_index']]}")
+                    self.logger.info(f"セル内容: '{candidate.get('text')}'")
+                    self.logger.info(f"セルクラス: {candidate.get('class')}")
+                    return candidate['element']
             
             # 最後の手段: プロジェクトグリッド内の全セルを調査
             self.logger.warning("標準セレクタで見つからない場合の詳細調査")
             try:
-                row_element = self.driver.find_element(By.CSS_SELECTOR, f".slick-row:nth-child({row_number})")
-                cells = row_element.find_elements(By.CSS_SELECTOR, ".slick-cell")
+                cells = self.fetch_element_properties(
+                    f".slick-row:nth-child({row_number}) .slick-cell", ['text', 'class']
+                )
                 
                 self.logger.info(f"行{row_number}のセル情報:")
                 for i, cell in enumerate(cells):
-                    cell_text = cell.text or "（空）"
-                    cell_class = cell.get_attribute("class") or "（クラスなし）"
-                    self.logger.info(f"  セル{i}: '{cell_text}' | クラス: {cell_class}")
+                    self.logger.info(f"  セル{i}: '{cell.get('text') or '（空）'}' | クラス: {cell.get('class') or '（クラスなし）'}")
                 
                 # 時間らしいセルを探す（例：数字:数字のパターンや空のセル）
                 for i, cell in enumerate(cells):
-                    cell_text = cell.text.strip()
+                    cell_text = (cell.get('text') or '').strip()
                     # 時間パターンまたは空のセルを時間入力候補とする
                     if (not cell_text or 
                         ":" in cell_text or 
                         cell_text.replace(":", "").replace(".", "").isdigit()):
                         self.logger.info(f"時間入力候補セルを発見（セル{i}）: '{cell_text}'")
-                        return cell
+                        return cell['element']
                         
             except Exception as e:
                 self.logger.error(f"詳細調査でもエラー: {e}")
@@ -3111,8 +3876,15 @@ class WorkTimeAutomation:
             self.save_screenshot("force_adjust_end_time_error")
             return False
 
-    def record_error_for_later_application(self, date: str, errors: List[str]) -> bool:
-        """エラーを記録して後で申請できるようにする"""
+    def record_error_for_later_application(self, date: str, errors: List[str], end_time: Optional[str] = None) -> bool:
+        """
+        エラーを記録して後で申請できるようにする
+        
+        Args:
+            date: 対象日
+            errors: エラーメッセージのリスト
+            end_time: 終了時刻（省略時は表示中の画面から取得）
+        """
         try:
             # 無視すべきエラーをフィルタリング
             filtered_errors = []
@@ -3126,7 +3898,8 @@ class WorkTimeAutomation:
                 # 深夜勤務申請エラーの処理
                 if "深夜勤務申請が提出されていません" in error:
                     # 終了時間をチェック
-                    end_time = self._get_current_end_time()
+                    if end_time is None:
+                        end_time = self._get_current_end_time()
                     if end_time:
                         try:
                             # 時刻を分単位に変換
@@ -3147,33 +3920,10 @@ class WorkTimeAutomation:
                 self.logger.info("記録すべきエラーはありません")
                 return True
             
-            # エラー記録ファイルのパス
-            error_file = os.path.join(self.error_records_dir, f"{date}.json")
-            
-            # 既存の記録を読み込む
-            existing_records = []
-            if os.path.exists(error_file):
-                try:
-                    with open(error_file, 'r', encoding='utf-8') as f:
-                        existing_records = json.load(f)
-                except Exception as e:
-                    self.logger.warning(f"既存エラー記録の読み込みエラー: {e}")
-            
-            # 新しいエラー記録を追加
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            new_record = {
-                "timestamp": timestamp,
-                "errors": filtered_errors,
-                "status": "pending"  # pending, applied, resolved
-            }
-            
-            existing_records.append(new_record)
+            # エラー記録を追加（既存の記録は読み書きせずに追記のみ）
+            record_id = self._error_store().add(date, filtered_errors, end_time=end_time)
             
-            # ファイルに保存
-            with open(error_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_records, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"エラー記録を保存しました: {error_file}")
+            self.logger.info(f"エラー記録を保存しました: {date} (ID: {record_id})")
             self.logger.info(f"記録されたエラー: {filtered_errors}")
             
             return True
@@ -3219,20 +3969,34 @@ class WorkTimeAutomation:
     def get_error_records(self, date: str) -> List[Dict]:
         """指定日のエラー記録を取得"""
         try:
-            error_file = os.path.join(self.error_records_dir, f"{date}.json")
-            
-            if not os.path.exists(error_file):
-                return []
-            
-            with open(error_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._error_store().get(date)
                 
         except Exception as e:
             self.logger.error(f"エラー記録の読み込みエラー: {e}")
             return []
     
+    def _error_store(self) -> ErrorRecordStore:
+        """エラー記録の保存先（error_records_dir 内のデータベース、初回は従来のJSONファイルを取り込む）"""
+        db_path = os.path.join(self.error_records_dir, ErrorRecordStore.DB_NAME)
+        store = getattr(self, '_error_record_store', None)
+        if store is None or store.db_path != db_path:
+            store = ErrorRecordStore(db_path)
+            imported = store.import_json_directory(self.error_records_dir)
+            if imported:
+                self.logger.info(f"従来のエラー記録ファイルを取り込みました: {imported}件")
+            self._error_record_store = store
+        return store
+    
     def close(self):
         """ブラウザを閉じる"""
+        if hasattr(self, 'field_clearer'):
+            self.field_clearer.save()
+        if hasattr(self, 'screenshots'):
+            # 書き込み待ちのスクリーンショットを保存
+            self.screenshots.flush()
         if hasattr(self, 'driver'):
+            if getattr(self, 'managed_chrome', None) is not None:
+                # 次回の起動時に使うCookieを保存
+                self.managed_chrome.save_cookies(self.driver)
             self.driver.quit()
             self.logger.info("ブラウザを閉じました")
\ No newline at end of file
@@ -2,8 +2,7 @@
 """
 エラー記録を表示するスクリプト
 """
-import os
-import json
+import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -11,135 +10,124 @@ from pathlib import Path
 # プロジェクトのルートディレクトリをパスに追加
 sys.path.insert(0, str(Path(__file__).parent))
 
+from classes.error_record_store import ErrorRecordStore
 
-def show_error_records():
+ERROR_RECORDS_DIR = Path(__file__).parent / "logs" / "error_records"
+
+
+def open_store() -> ErrorRecordStore:
+    """エラー記録の保存先を開く（従来のJSONファイルが残っていれば初回のみ取り込む）"""
+    store = ErrorRecordStore(str(ERROR_RECORDS_DIR / ErrorRecordStore.DB_NAME))
+    store.import_json_directory(str(ERROR_RECORDS_DIR))
+    return store
+
+
+def show_error_records(start_date: str = None, end_date: str = None, status: str = None):
     """エラー記録を表示"""
-    error_records_dir = Path(__file__).parent / "logs" / "error_records"
-    
-    if not error_records_dir.exists():
-        print("エラー記録ディレクトリが存在しません")
-        return
-    
-    # 全てのエラー記録ファイルを取得
-    error_files = sorted(error_records_dir.glob("*.json"))
-    
-    if not error_files:
+    store = open_store()
+    records = store.query(start_date, end_date, status)
+
+    if not records:
         print("エラー記録はありません")
         return
-    
+
     print("=== エラー記録一覧 ===\n")
-    
-    total_pending = 0
-    total_applied = 0
-    total_resolved = 0
-    
-    for error_file in error_files:
-        date = error_file.stem
-        
-        try:
-            with open(error_file, 'r', encoding='utf-8') as f:
-                records = json.load(f)
-            
-            if not records:
-                continue
-            
-            print(f"【{date}】")
-            
-            for record in records:
-                timestamp = record.get('timestamp', 'Unknown')
-                status = record.get('status', 'pending')
-                errors = record.get('errors', [])
-                
-                status_mark = {
-                    'pending': '⚠️ 未申請',
-                    'applied': '📋 申請済',
-                    'resolved': '✅ 解決済'
-                }.get(status, status)
-                
-                print(f"  時刻: {timestamp}")
-                print(f"  状態: {status_mark}")
-                print(f"  エラー:")
-                for error in errors:
-                    print(f"    - {error}")
-                print()
-                
-                # 統計
-                if status == 'pending':
-                    total_pending += 1
-                elif status == 'applied':
-                    total_applied += 1
-                elif status == 'resolved':
-                    total_resolved += 1
-            
-        except Exception as e:
-            print(f"  エラー: ファイル読み込み失敗 - {e}")
-    
+
+    current_date = None
+    for record in records:
+        if record['date'] != current_date:
+            current_date = record['date']
+            print(f"【{current_date}】")
+
+        status_mark = {
+            'pending': '⚠️ 未申請',
+            'applied': '📋 申請済',
+            'resolved': '✅ 解決済'
+        }.get(record['status'], record['status'])
+
+        print(f"  時刻: {record['timestamp']}")
+        print(f"  状態: {status_mark}")
+        print(f"  エラー:")
+        for error in record['errors']:
+            print(f"    - {error}")
+        print()
+
+    # 統計（状態ごとの件数をクエリで集計）
+    counts = store.statistics(start_date, end_date)
+    total_pending = counts['pending']
+
     print("\n=== 統計 ===")
-    print(f"未申請: {total_pending}件")
-    print(f"申請済: {total_applied}件")
-    print(f"解決済: {total_resolved}件")
-    print(f"合計: {total_pending + total_applied + total_resolved}件")
-    
+    print(f"未申請: {counts['pending']}件")
+    print(f"申請済: {counts['applied']}件")
+    print(f"解決済: {counts['resolved']}件")
+    print(f"合計: {sum(counts.values())}件")
+
     if total_pending > 0:
         print(f"\n⚠️ {total_pending}件の未申請エラーがあります")
 
 
-def export_error_records_csv():
+def export_error_records_csv(start_date: str = None, end_date: str = None, status: str = None):
     """エラー記録をCSV形式でエクスポート"""
     import csv
-    
-    error_records_dir = Path(__file__).parent / "logs" / "error_records"
+
     output_file = Path(__file__).parent / "logs" / f"error_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    
-    if not error_records_dir.exists():
-        print("エラー記録ディレクトリが存在しません")
-        return
-    
-    error_files = sorted(error_records_dir.glob("*.json"))
-    
-    if not error_files:
+    records = open_store().query(start_date, end_date, status)
+
+    if not records:
         print("エラー記録はありません")
         return
-    
+
     rows = []
-    
-    for error_file in error_files:
-        date = error_file.stem
-        
-        try:
-            with open(error_file, 'r', encoding='utf-8') as f:
-                records = json.load(f)
-            
-            for record in records:
-                timestamp = record.get('timestamp', 'Unknown')
-                status = record.get('status', 'pending')
-                errors = record.get('errors', [])
-                
-                for error in errors:
-                    rows.append({
-                        '日付': date,
-                        '記録時刻': timestamp,
-                        '状態': status,
-                        'エラー内容': error
-                    })
-                    
-        except Exception as e:
-            print(f"エラー: {error_file} - {e}")
-    
+    for record in records:
+        for error in record['errors']:
+            rows.append({
+                '日付': record['date'],
+                '記録時刻': record['timestamp'],
+                '状態': record['status'],
+                'エラー内容': error
+            })
+
     # CSVファイルに出力
     with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
         fieldnames = ['日付', '記録時刻', '状態', 'エラー内容']
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(rows)
-    
+
     print(f"\nエラー記録をCSVファイルに出力しました: {output_file}")
 
 
-if __name__ == "__main__":
-    show_error_records()
-    
+def main():
+    parser = argparse.ArgumentParser(description="エラー記録の表示・状態更新")
+    parser.add_argument("--start-date", help="開始日（YYYY-MM-DD形式）")
+    parser.add_argument("--end-date", help="終了日（YYYY-MM-DD形式）")
+    parser.add_argument("--status", choices=ErrorRecordStore.STATUSES, help="表示する状態")
+    parser.add_argument("--mark", choices=ErrorRecordStore.STATUSES,
+                        help="指定期間（--start-date/--end-date）の記録の状態を一括更新")
+    parser.add_argument("--export", action="store_true", help="確認なしでCSVファイルに出力")
+    args = parser.parse_args()
+
+    if args.mark:
+        if not (args.start_date or args.end_date):
+            print("--mark には --start-date または --end-date が必要です")
+            return 1
+        store = open_store()
+        dates = {record['date'] for record in store.query(args.start_date, args.end_date, args.status)}
+        updated = store.update_status(args.mark, dates=sorted(dates), from_status=args.status)
+        print(f"{updated}件の状態を {args.mark} に更新しました")
+        return 0
+
+    show_error_records(args.start_date, args.end_date, args.status)
+
     # CSVエクスポートも実行する場合
+    if args.export:
+        export_error_records_csv(args.start_date, args.end_date, args.status)
+        return 0
     response = input("\nCSVファイルとしてエクスポートしますか？ (y/n): ")
     if response.lower() == 'y':
-        export_error_records_csv()
\ No newline at end of file
+        export_error_records_csv(args.start_date, args.end_date, args.status)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
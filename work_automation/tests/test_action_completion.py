@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ボタン操作の完了検知の単体テスト
+"""
+import unittest
+import sys
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.action_completion import ActionCompletionWatcher
+
+
+def same_document(now, requests=0, pending=0, request_at=None, response_at=None, painted_at=None,
+                  last_mutation=None, navigating=False):
+    """遷移していない画面での操作状態"""
+    return {'document': 'same', 'now': now, 'started': 1000.0, 'requests': requests, 'pending': pending,
+            'requestAt': request_at, 'responseAt': response_at, 'paintedAt': painted_at,
+            'lastMutation': last_mutation, 'navigating': navigating}
+
+
+class TestActionCompletionWatcher(unittest.TestCase):
+    """ActionCompletionWatcher クラスのテスト"""
+
+    def make_watcher(self, states):
+        """クリック後、状態取得のたびに states を順に返すドライバーで作成"""
+        driver = Mock()
+        driver.execute_script.side_effect = [True] + list(states) + [None]
+        return ActionCompletionWatcher(driver, timeout=5, poll_interval=0), driver
+
+    def test_waits_for_response_and_render(self):
+        """通信中・描画前は待ち、応答後に画面が落ち着いた時点で完了"""
+        watcher, driver = self.make_watcher([
+            same_document(1100, requests=1, pending=1, request_at=1010),
+            same_document(1500, requests=1, request_at=1010, response_at=1410),
+            same_document(1520, requests=1, request_at=1010, response_at=1410, painted_at=1430,
+                          last_mutation=1415),
+            same_document(1600, requests=1, request_at=1010, response_at=1410, painted_at=1430,
+                          last_mutation=1415),
+        ])
+
+        timing = watcher.click_and_wait(Mock(), 'calculate')
+
+        self.assertFalse(timing['timed_out'])
+        self.assertEqual(timing['action'], 'calculate')
+        self.assertAlmostEqual(timing['server_ms'], 400)
+        self.assertAlmostEqual(timing['render_ms'], 20)
+        self.assertFalse(timing['navigated'])
+        # クリック + 状態取得4回 + 完了の通知
+        self.assertEqual(driver.execute_script.call_count, 6)
+        self.assertTrue(driver.execute_script.call_args_list[-1][0][2])
+
+    def test_navigation_uses_navigation_timing(self):
+        """画面遷移した場合は遷移先の読み込み完了まで待つ"""
+        watcher, driver = self.make_watcher([
+            same_document(1100, navigating=True),
+            Exception("遷移中"),
+            {'document': 'new', 'readyState': 'interactive', 'requestStart': 5, 'responseEnd': 305,
+             'loadEventEnd': 0},
+            {'document': 'new', 'readyState': 'complete', 'requestStart': 5, 'responseEnd': 305,
+             'loadEventEnd': 385},
+        ])
+
+        timing = watcher.click_and_wait(Mock(), 'save_and_next')
+
+        self.assertTrue(timing['navigated'])
+        self.assertAlmostEqual(timing['server_ms'], 300)
+        self.assertAlmostEqual(timing['render_ms'], 80)
+        self.assertEqual(driver.execute_script.call_count, 5)
+
+    def test_action_without_request_completes_after_grace(self):
+        """通信が始まらない操作は猶予時間の経過後に完了"""
+        watcher, _ = self.make_watcher([
+            same_document(1500),
+            same_document(2100, last_mutation=1050),
+        ])
+
+        timing = watcher.click_and_wait(Mock(), 'calculate')
+
+        self.assertFalse(timing['timed_out'])
+        self.assertEqual(timing['requests'], 0)
+        self.assertEqual(timing['server_ms'], 0.0)
+        self.assertAlmostEqual(timing['render_ms'], 50)
+
+    def test_timeout(self):
+        """完了しない場合は上限時間で打ち切る"""
+        driver = Mock()
+        driver.execute_script.side_effect = (
+            lambda script, *args: same_document(1100, requests=1, pending=1, request_at=1010))
+        watcher = ActionCompletionWatcher(driver, timeout=0.05, poll_interval=0.01)
+
+        timing = watcher.click_and_wait(Mock(), 'submit_confirmation')
+
+        self.assertTrue(timing['timed_out'])
+        self.assertIsNone(timing['server_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
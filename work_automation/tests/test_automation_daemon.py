@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+常駐デーモンとジョブAPIの単体テスト
+"""
+import unittest
+import logging
+import os
+import sys
+import tempfile
+import stat
+import threading
+from unittest.mock import Mock
+from pathlib import Path
+from urllib import error as urlerror
+from urllib import request as urlrequest
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.automation_daemon import TOKEN_HEADER, AutomationDaemon, DaemonClient, DaemonError
+
+
+class TestAutomationDaemon(unittest.TestCase):
+    """AutomationDaemon クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_level = logging.getLogger().level
+        logging.getLogger().setLevel(logging.INFO)
+        self.csv_file = os.path.join(self.temp_dir.name, 'work.csv')
+        Path(self.csv_file).write_text('日付\n', encoding='utf-8')
+
+        self.automations = []
+        self.release = threading.Event()
+        self.calls = []
+
+        def bulk(automation, params):
+            self.calls.append((automation, params))
+            logging.getLogger('BulkWorkAutomation').info(f"処理中: {params['csv']}")
+            self.release.wait(5)
+            return {'success': True, 'counts': {'success': 1}}
+
+        def fail(automation, params):
+            raise RuntimeError("接続エラー")
+
+        self.token_file = os.path.join(self.temp_dir.name, 'daemon.token')
+        self.daemon = AutomationDaemon(port=0, automation_factory=self._factory,
+                                       runners={'bulk': bulk, 'error_check': fail},
+                                       token_file=self.token_file)
+        self.daemon.start()
+        self.client = DaemonClient(self.daemon.address, token_file=self.token_file)
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.release.set()
+        self.daemon.shutdown()
+        logging.getLogger().setLevel(self.root_level)
+        self.temp_dir.cleanup()
+
+    def _factory(self):
+        automation = Mock()
+        self.automations.append(automation)
+        return automation
+
+    def test_jobs_queue_on_warm_session(self):
+        """ジョブはすぐに登録され、同じ接続で順に実行して進捗を返す"""
+        first = self.client.submit('bulk', csv=self.csv_file)
+        second = self.client.submit('bulk', csv=self.csv_file)
+        self.assertEqual(self.client.job(second['id'])['status'], 'queued')
+
+        self.release.set()
+        events = list(self.client.follow(second['id']))
+
+        self.assertEqual(events[-1]['type'], 'finished')
+        self.assertEqual(events[-1]['status'], 'success')
+        self.assertTrue(any(e['type'] == 'log' and '処理中' in e['message'] for e in events))
+        self.assertEqual(self.client.job(first['id'])['status'], 'success')
+        self.assertEqual(len(self.automations), 1)
+        self.assertIs(self.calls[0][0], self.calls[1][0])
+
+    def test_reconnect_when_session_lost(self):
+        """ブラウザとの接続が切れていれば次のジョブで再接続"""
+        self.release.set()
+        list(self.client.follow(self.client.submit('bulk', csv=self.csv_file)['id']))
+        type(self.automations[0].driver).current_url = property(Mock(side_effect=ConnectionError()))
+
+        list(self.client.follow(self.client.submit('bulk', csv=self.csv_file)['id']))
+        self.assertEqual(len(self.automations), 2)
+        self.automations[0].close.assert_called_once()
+
+    def test_invalid_and_failed_jobs(self):
+        """不正なジョブは登録時に拒否し、実行時の例外はジョブのエラーとして返す"""
+        with self.assertRaises(DaemonError):
+            self.client.submit('bulk', csv=os.path.join(self.temp_dir.name, 'missing.csv'))
+        with self.assertRaises(DaemonError):
+            self.client.submit('error_check', start_date='2024/01/01', end_date='2024-01-31')
+
+        job = self.client.submit('error_check', start_date='2024-01-01', end_date='2024-01-31')
+        events = list(self.client.follow(job['id']))
+        self.assertEqual(events[-1]['status'], 'error')
+        self.assertIn("接続エラー", events[-1]['result']['message'])
+
+
+    def _raw_post(self, headers):
+        """ヘッダーを指定してジョブ登録を送信し、HTTPステータスを返す"""
+        req = urlrequest.Request(f"http://{self.daemon.address}/jobs", method='POST', headers=headers,
+                                 data=b'{"type": "bulk", "csv": "' + self.csv_file.encode('utf-8') + b'"}')
+        try:
+            with urlrequest.urlopen(req, timeout=5) as response:
+                return response.status
+        except urlerror.HTTPError as e:
+            return e.code
+
+    def test_token_file_private(self):
+        """認証トークンは本人のみ読み書きできるファイルに保存し、停止時に削除する"""
+        self.assertEqual(stat.S_IMODE(os.stat(self.token_file).st_mode), 0o600)
+        self.assertEqual(Path(self.token_file).read_text(encoding='utf-8'), self.daemon.token)
+
+        self.daemon.shutdown()
+        self.assertFalse(os.path.exists(self.token_file))
+
+    def test_rejects_unauthenticated_requests(self):
+        """トークンなし・ブラウザから・JSON以外の本文の要求は拒否し、ジョブを登録しない"""
+        token = self.daemon.token
+        json_type = {'Content-Type': 'application/json'}
+
+        self.assertEqual(self._raw_post(json_type), 401)
+        self.assertEqual(self._raw_post(dict(json_type, **{TOKEN_HEADER: 'wrong'})), 401)
+        self.assertEqual(self._raw_post({TOKEN_HEADER: token, 'Content-Type': 'text/plain'}), 415)
+        self.assertEqual(self._raw_post(dict(json_type, **{TOKEN_HEADER: token, 'Origin': 'http://example.com'})), 403)
+        self.assertEqual(self._raw_post(dict(json_type, **{TOKEN_HEADER: token, 'Origin': 'null'})), 403)
+        self.assertEqual(self.daemon.jobs, {})
+
+        with self.assertRaises(DaemonError):
+            DaemonClient(self.daemon.address, token_file=os.path.join(self.temp_dir.name, 'missing')).jobs()
+        self.assertEqual(self._raw_post(dict(json_type, **{TOKEN_HEADER: token})), 202)
+
+
+if __name__ == "__main__":
+    unittest.main()
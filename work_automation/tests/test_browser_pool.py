@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+複数Chromeでの並列処理クラスの単体テスト
+"""
+import unittest
+import csv
+import json
+import os
+import sys
+import queue
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.browser_pool import BrowserWorkerPool, load_pool_config, run_worker
+from classes.results_journal import ResultsJournal
+
+DATES = ['2024/01/15', '2024/01/16', '2024/01/17']
+
+
+def fake_worker(worker, jobs, events, chrome_path=None):
+    """全ジョブの全日を成功として通知するワーカー"""
+    events.put({'type': 'ready', 'worker': worker['name'], 'time': datetime.now()})
+    for job in jobs:
+        for date in DATES:
+            if date in job['skip_dates']:
+                continue
+            events.put({'type': 'day', 'worker': worker['name'], 'employee': job['employee'],
+                        'result': {'date': date, 'status': 'success', 'message': '一時保存完了',
+                                   'timestamp': datetime.now()}})
+        events.put({'type': 'job_finished', 'worker': worker['name'], 'employee': job['employee'],
+                    'success': True, 'message': f"{len(DATES)}/{len(DATES)} 件成功"})
+
+
+def crashing_worker(worker, jobs, events, chrome_path=None):
+    """初回は1日処理した時点で異常終了するワーカー"""
+    if not jobs[0]['skip_dates']:
+        events.put({'type': 'day', 'worker': worker['name'], 'employee': jobs[0]['employee'],
+                    'result': {'date': DATES[0], 'status': 'success', 'message': '一時保存完了',
+                               'timestamp': datetime.now()}})
+        # 通知の送信完了を待ってから異常終了
+        events.close()
+        events.join_thread()
+        os._exit(1)
+    fake_worker(worker, jobs, events, chrome_path)
+
+
+class TestBrowserWorkerPool(unittest.TestCase):
+    """BrowserWorkerPool クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config = {'workers': [
+            {'name': 'yamada', 'port': 9222, 'jobs': [{'employee': '山田', 'csv': 'yamada.csv'}]},
+            {'name': 'suzuki', 'port': 9223, 'jobs': [{'employee': '鈴木', 'csv': 'suzuki.csv'},
+                                                      {'employee': '佐藤', 'csv': 'sato.csv'}]},
+        ]}
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    def _pool(self, target, **kwargs):
+        return BrowserWorkerPool(self.config, output_dir=self.temp_dir.name, health_interval=0.1,
+                                 start_method='fork', worker_target=target,
+                                 health_check=lambda port: True, **kwargs)
+
+    def test_load_pool_config(self):
+        """構成ファイルの読み込みと重複ポートの検出"""
+        config_file = os.path.join(self.temp_dir.name, 'pool.json')
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f)
+        config = load_pool_config(config_file)
+        self.assertEqual(config['workers'][0]['jobs'][0]['csv'], os.path.join(self.temp_dir.name, 'yamada.csv'))
+
+        self.config['workers'][1]['port'] = 9222
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f)
+        with self.assertRaises(ValueError):
+            load_pool_config(config_file)
+
+    def test_run_aggregates_results(self):
+        """全ワーカーの結果を1つのCSVと進捗ファイルに集約"""
+        pool = self._pool(fake_worker)
+        self.assertTrue(pool.run())
+
+        self.assertEqual(len(pool.job_results), 3)
+        with open(pool.results_file, encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual({row['employee'] for row in rows}, {'山田', '鈴木', '佐藤'})
+        with open(pool.progress_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2 + 9 + 3)
+
+    def test_restart_resumes_remaining_days(self):
+        """異常終了したワーカーを再起動し、処理済みの日は繰り返さない"""
+        self.config['workers'] = self.config['workers'][:1]
+        pool = self._pool(crashing_worker)
+        self.assertTrue(pool.run())
+
+        self.assertEqual(pool.states['yamada']['restarts'], 1)
+        self.assertEqual(sorted(r['date'] for r in pool.results), DATES)
+
+    def test_restart_limit(self):
+        """再起動の上限を超えたら残りのジョブを失敗として記録"""
+        self.config['workers'] = self.config['workers'][:1]
+        pool = self._pool(crashing_worker, max_restarts=0)
+        self.assertFalse(pool.run())
+
+        self.assertEqual(len(pool.job_results), 1)
+        self.assertFalse(pool.job_results[0]['success'])
+
+
+
+class TestRunWorker(unittest.TestCase):
+    """run_worker 関数のテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = os.path.join(self.temp_dir.name, 'journals')
+        self.events = queue.Queue()
+
+        self.csv_processor = Mock()
+        self.csv_processor.load_csv_data.return_value = True
+        self.csv_processor.validate_data.return_value = True
+        self.csv_processor.get_all_data.return_value = [{'date': date} for date in DATES]
+        self.csv_processor.csv_file_path = 'yamada.csv'
+
+        automation = Mock()
+        automation.screenshot_dir = self.temp_dir.name
+        patches = [
+            patch('classes.browser_pool.is_chrome_alive', return_value=True),
+            patch('classes.work_time_automation.WorkTimeAutomation.connect_to_existing_chrome',
+                  return_value=automation),
+            patch('classes.csv_processor.WorkDataCSVProcessor', return_value=self.csv_processor),
+            patch('classes.bulk_automation.BulkWorkAutomation._process_work_item',
+                  autospec=True, side_effect=self._process_work_item),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _process_work_item(bulk, idx, work_data, fallback_route=None):
+        """1日分の処理結果を記録してジャーナルへ追記"""
+        first_result = len(bulk.results)
+        bulk.results.append({'date': work_data['date'], 'status': 'success', 'message': '一時保存完了',
+                             'timestamp': datetime.now()})
+        bulk._journal_results(first_result)
+        return True
+
+    def _run(self, skip_dates=()):
+        worker = {'name': 'yamada', 'port': 9222, 'journal_dir': self.journal_dir}
+        jobs = [{'employee': '山田', 'csv': 'yamada.csv', 'skip_dates': list(skip_dates)}]
+        run_worker(worker, jobs, self.events)
+        events = []
+        while not self.events.empty():
+            events.append(self.events.get())
+        return events
+
+    def test_results_journaled_per_worker(self):
+        """ワーカーの処理結果はワーカー・CSVごとのジャーナルへ逐次追記される"""
+        events = self._run()
+
+        journal = ResultsJournal(os.path.join(self.journal_dir, 'yamada_yamada.jsonl'))
+        self.assertEqual(journal.completed_dates(), set(DATES))
+        self.assertEqual(events[-1]['message'], f"{len(DATES)}/{len(DATES)} 件成功")
+
+    def test_restart_appends_to_same_journal(self):
+        """再起動後は同じジャーナルに続けて追記し、集計は今回処理した日だけ"""
+        self._run(skip_dates=[])
+        events = self._run(skip_dates=DATES[:2])
+
+        journal = ResultsJournal(os.path.join(self.journal_dir, 'yamada_yamada.jsonl'))
+        self.assertEqual(journal.completed_dates(), set(DATES))
+        self.assertEqual(events[-1]['message'], "1/1 件成功")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -191,6 +191,59 @@ class TestBulkWorkAutomation(unittest.TestCase):
         self.mock_automation.confirm_and_submit.assert_called_once()
         self.assertEqual(self.bulk_automation.results[0]['message'], '提出完了')
 
+    def test_process_single_day_skips_unchanged_fields(self):
+        """単日処理テスト - 入力済みの項目は操作せず計算・提出のみ行う"""
+        work_data = {
+            'date': '2024/01/15',
+            'start_time': '09:00',
+            'end_time': '18:00',
+            'location_type': '在宅',
+            'break_times': [('12:00', '13:00')],
+            'projects': [{'time': '8:00', 'comment': 'プロジェクトA'}]
+        }
+        
+        self.mock_automation.snapshot_form_state.return_value = {'date': '2024/01/15', 'project_hours': ['8:00']}
+        self.mock_automation.is_day_submitted.return_value = False
+        self.mock_automation.diff_form_state.return_value = {'work_time': False, 'break_time': False, 'projects': []}
+        self.mock_automation.get_actual_work_time_from_screen.return_value = {'success': True, 'actual_work_minutes': 480}
+        self.mock_automation.input_project_works.return_value = []
+        self.mock_automation.calculate.return_value = True
+        self.mock_automation.check_errors.return_value = []
+        self.mock_automation.save_and_next.return_value = True
+        self.mock_automation.submit_confirmation.return_value = True
+        
+        result = self.bulk_automation.process_single_day(work_data)
+        
+        self.assertTrue(result)
+        self.mock_automation.input_work_time.assert_not_called()
+        self.mock_automation.input_break_time.assert_not_called()
+        self.mock_automation.calculate.assert_called_once()
+        self.mock_automation.input_project_works.assert_called_once_with(
+            work_data['projects'], current_hours=['8:00']
+        )
+
+    def test_process_single_day_skips_submitted_day(self):
+        """単日処理テスト - 提出済みの日は入力せずスキップとして記録"""
+        work_data = {
+            'date': '2024/01/15',
+            'start_time': '09:00',
+            'end_time': '18:00',
+            'location_type': '在宅',
+            'break_times': [],
+            'projects': []
+        }
+        
+        self.mock_automation.snapshot_form_state.return_value = {'date': '2024/01/15', 'status_text': '承認済'}
+        self.mock_automation.is_day_submitted.return_value = True
+        
+        result = self.bulk_automation.process_single_day(work_data)
+        
+        self.assertTrue(result)
+        self.assertEqual(self.bulk_automation.results[0]['status'], 'skipped_already_submitted')
+        self.mock_automation.input_work_time.assert_not_called()
+        self.mock_automation.calculate.assert_not_called()
+        self.mock_automation.submit_confirmation.assert_not_called()
+
     @patch('classes.bulk_automation.time.sleep')
     def test_process_all_data_success(self, mock_sleep):
         """全データ処理成功テスト"""
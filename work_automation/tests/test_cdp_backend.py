@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+CDPバックエンドの単体テスト
+"""
+import unittest
+import json
+import queue
+import sys
+import time
+from unittest.mock import patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import websocket
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from classes.cdp_backend import CDPDriver, CDPElement
+
+
+class FakeWebSocket:
+    """CDPのWebSocketの代替（送信されたコマンドを記録し、handler の応答を返す）"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.sent = []
+        self.inbox = queue.Queue()
+
+    def send(self, data):
+        message = json.loads(data)
+        self.sent.append(message)
+        result = self.handler(message['method'], message['params'])
+        if isinstance(result, Exception):
+            self.inbox.put({'id': message['id'], 'error': {'message': str(result)}})
+        else:
+            self.inbox.put({'id': message['id'], 'result': result or {}})
+
+    def emit(self, method, params):
+        self.inbox.put({'method': method, 'params': params})
+
+    def recv(self):
+        try:
+            return json.dumps(self.inbox.get(timeout=0.05))
+        except queue.Empty:
+            raise websocket.WebSocketTimeoutException()
+
+    def close(self):
+        pass
+
+
+class TestCDPDriver(unittest.TestCase):
+    """CDPDriver クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.responses = {}
+        self.ws = FakeWebSocket(self._handle)
+        targets = [{'id': 'T1', 'type': 'page', 'url': 'https://example.com/daily',
+                    'webSocketDebuggerUrl': 'ws://127.0.0.1:9222/devtools/page/T1'}]
+        with patch('classes.cdp_backend.list_page_targets', return_value=targets), \
+             patch('classes.cdp_backend.websocket.create_connection', return_value=self.ws):
+            self.driver = CDPDriver.connect('127.0.0.1:9222', timeout=2)
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.driver.quit()
+
+    def _handle(self, method, params):
+        response = self.responses.get(method)
+        return response(params) if callable(response) else response
+
+    def _methods(self):
+        return [message['method'] for message in self.ws.sent]
+
+    def test_connect_enables_domains(self):
+        """接続時に読み込み完了とネットワークのイベントを有効化"""
+        self.assertEqual(self._methods(), ['Page.enable', 'Network.enable'])
+        self.assertEqual(self.driver.window_handles, ['T1'])
+
+    def test_execute_script_values_and_errors(self):
+        """スクリプトの戻り値を返し、例外は JavascriptException にする"""
+        self.responses['Runtime.evaluate'] = {'result': {'type': 'object', 'value': {'value': {'date': '2024/01/15'}, 'nodes': 0}}}
+        self.assertEqual(self.driver.execute_script("return {date: arguments[0]};", '2024/01/15'), {'date': '2024/01/15'})
+        self.assertIn('["2024/01/15"]', self.ws.sent[-1]['params']['expression'])
+
+        self.responses['Runtime.evaluate'] = {'result': {'type': 'object'},
+                                              'exceptionDetails': {'text': 'Uncaught', 'exception': {'description': 'ReferenceError: x'}}}
+        with self.assertRaises(JavascriptException):
+            self.driver.execute_script("return x;")
+
+    def test_find_element(self):
+        """要素をリモートオブジェクトで参照し、見つからない場合は NoSuchElementException"""
+        self.responses['Runtime.evaluate'] = {'result': {'type': 'object', 'subtype': 'node', 'objectId': 'N1'}}
+        element = self.driver.find_element(By.NAME, 'KNMTMRNGSTDI')
+        self.assertEqual(element, CDPElement(self.driver, 'N1'))
+
+        self.responses['Runtime.evaluate'] = {'result': {'type': 'object', 'subtype': 'null'}}
+        with self.assertRaises(NoSuchElementException):
+            self.driver.find_element(By.ID, 'btnCalc0')
+
+        self.responses['Runtime.callFunctionOn'] = Exception('Could not find object with given id')
+        with self.assertRaises(StaleElementReferenceException):
+            element.is_displayed()
+
+    def test_click_and_send_keys(self):
+        """クリックは要素の中心へのマウスイベント、文字は一括挿入、特殊キーはキーイベント"""
+        self.responses['Runtime.callFunctionOn'] = {'result': {'type': 'object', 'value': {'x': 10, 'y': 20}}}
+        element = CDPElement(self.driver, 'N1')
+        element.click()
+        mouse = [m['params'] for m in self.ws.sent if m['method'] == 'Input.dispatchMouseEvent']
+        self.assertEqual([(m['type'], m['x'], m['y']) for m in mouse], [('mousePressed', 10, 20), ('mouseReleased', 10, 20)])
+
+        self.ws.sent.clear()
+        self.responses['Runtime.callFunctionOn'] = {'result': {'type': 'undefined'}}
+        element.send_keys(Keys.CONTROL + 'a')
+        element.send_keys('09:00', Keys.TAB)
+        keys = [(m['method'], m['params'].get('type'), m['params'].get('key') or m['params'].get('text'))
+                for m in self.ws.sent if m['method'].startswith('Input.')]
+        self.assertEqual(keys, [
+            ('Input.dispatchKeyEvent', 'rawKeyDown', 'Control'),
+            ('Input.dispatchKeyEvent', 'rawKeyDown', 'a'),
+            ('Input.dispatchKeyEvent', 'keyUp', 'a'),
+            ('Input.dispatchKeyEvent', 'keyUp', 'Control'),
+            ('Input.insertText', None, '09:00'),
+            ('Input.dispatchKeyEvent', 'rawKeyDown', 'Tab'),
+            ('Input.dispatchKeyEvent', 'keyUp', 'Tab'),
+        ])
+
+    def test_network_idle_from_events(self):
+        """Network イベントで通信中のリクエストを追跡してアイドルを判定"""
+        self.ws.emit('Network.requestWillBeSent', {'requestId': 'R1'})
+        time.sleep(0.1)
+        self.assertFalse(self.driver.wait_for_network_idle(idle_time=0.05, timeout=0.2))
+
+        self.ws.emit('Network.loadingFinished', {'requestId': 'R1'})
+        started = time.monotonic()
+        self.assertTrue(self.driver.wait_for_network_idle(idle_time=0.05, timeout=2))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_get_waits_for_load_event(self):
+        """遷移は読み込み完了イベントまで待つ"""
+        def navigate(params):
+            self.ws.emit('Page.loadEventFired', {'timestamp': 1})
+            return {'frameId': 'F1', 'loaderId': 'L1'}
+
+        self.responses['Page.navigate'] = navigate
+        self.driver.get('https://example.com/daily?date=20240115')
+        self.assertEqual(self.ws.sent[-1]['params']['url'], 'https://example.com/daily?date=20240115')
+
+
+if __name__ == "__main__":
+    unittest.main()
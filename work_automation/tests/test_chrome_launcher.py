@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+自動化用Chromeの起動・管理の単体テスト
+"""
+import os
+import stat
+import tempfile
+import unittest
+import sys
+from unittest.mock import Mock, patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.chrome_launcher import ManagedChrome
+from classes.work_time_automation import WorkTimeAutomation
+
+
+class TestManagedChrome(unittest.TestCase):
+    """ManagedChrome クラスのテスト"""
+
+    def test_launch_arguments(self):
+        """ヘッドレス・調整済みの引数・固定のウィンドウサイズで起動"""
+        arguments = ManagedChrome(window_size=(1280, 800), extra_args=['--blink-settings=imagesEnabled=false']).launch_arguments()
+
+        self.assertEqual(arguments[0], '--headless=new')
+        self.assertIn('--disable-gpu', arguments)
+        self.assertIn('--disable-background-timer-throttling', arguments)
+        self.assertIn('--window-size=1280,800', arguments)
+        self.assertIn('--blink-settings=imagesEnabled=false', arguments)
+        self.assertNotIn('--headless=new', ManagedChrome(headless=False).launch_arguments())
+
+    @patch('classes.chrome_launcher.is_chrome_alive', return_value=True)
+    @patch('classes.chrome_launcher.find_chrome', return_value='/usr/bin/google-chrome')
+    @patch('classes.chrome_launcher.launch_chrome')
+    def test_reuses_running_instance(self, mock_launch, mock_find, mock_alive):
+        """動作中は再利用し、停止していた場合は起動し直す"""
+        process = Mock(**{'poll.return_value': None})
+        mock_launch.return_value = process
+        chrome = ManagedChrome(port=9333)
+        try:
+            self.assertEqual(chrome.ensure_started(), '127.0.0.1:9333')
+            self.assertEqual(chrome.ensure_started(), '127.0.0.1:9333')
+            self.assertEqual(mock_launch.call_count, 1)
+
+            # クラッシュ後は次の利用時に起動し直す
+            process.poll.return_value = 1
+            mock_launch.return_value = Mock(**{'poll.return_value': None})
+            chrome.ensure_started()
+            self.assertEqual(chrome.launch_count, 2)
+        finally:
+            chrome.stop()
+
+    def test_profile_copy_skips_caches(self):
+        """ログイン済みプロファイルをキャッシュ・ロックを除いてコピーし、停止時に削除"""
+        with tempfile.TemporaryDirectory() as source:
+            os.makedirs(os.path.join(source, 'Default', 'Cache'))
+            Path(source, 'Default', 'Cookies').write_bytes(b'cookies')
+            Path(source, 'Default', 'Cache', 'data_0').write_bytes(b'cache')
+            Path(source, 'SingletonLock').write_text('lock')
+
+            chrome = ManagedChrome(source_profile=source)
+            chrome.user_data_dir = chrome._prepare_user_data_dir()
+            copied = chrome.user_data_dir
+
+            self.assertTrue(os.path.exists(os.path.join(copied, 'Default', 'Cookies')))
+            self.assertFalse(os.path.exists(os.path.join(copied, 'Default', 'Cache')))
+            self.assertFalse(os.path.exists(os.path.join(copied, 'SingletonLock')))
+
+            chrome.stop()
+            self.assertFalse(os.path.exists(copied))
+
+    def test_cookie_jar_round_trip(self):
+        """Cookieを本人のみ読み書き可能なファイルへ保存し、次回の起動時に読み込む"""
+        cookies = [{'name': 'JSESSIONID', 'value': 'abc', 'domain': 'example.com', 'path': '/'}]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chrome = ManagedChrome(cookie_jar=os.path.join(temp_dir, 'cookies.json'))
+            driver = Mock()
+            driver.execute_cdp_cmd.return_value = {'cookies': cookies}
+
+            self.assertTrue(chrome.save_cookies(driver))
+            self.assertEqual(stat.S_IMODE(os.stat(chrome.cookie_jar).st_mode), 0o600)
+
+            driver = Mock()
+            self.assertEqual(chrome.load_cookies(driver), 1)
+            driver.execute_cdp_cmd.assert_called_once_with('Network.setCookies', {'cookies': cookies})
+
+    @patch.object(WorkTimeAutomation, 'connect_to_existing_chrome')
+    def test_launch_managed_chrome(self, mock_connect):
+        """起動したChromeに接続し、Cookieの読み込み後に日次画面を開く"""
+        chrome = Mock(start_url='https://example.com/daily')
+        chrome.ensure_started.return_value = '127.0.0.1:9333'
+
+        automation = WorkTimeAutomation.launch_managed_chrome(chrome, backend='cdp')
+
+        mock_connect.assert_called_once_with('127.0.0.1:9333', backend='cdp')
+        self.assertIs(automation.managed_chrome, chrome)
+        chrome.load_cookies.assert_called_once_with(automation.driver)
+        automation.driver.get.assert_called_once_with('https://example.com/daily')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+単日処理のステップ実行クラスの単体テスト
+"""
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.bulk_automation import BulkWorkAutomation
+from classes.day_pipeline import DayCheckpointStore, DayStepPipeline
+
+
+class TestDayStepPipeline(unittest.TestCase):
+    """DayStepPipeline クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.automation = self._automation()
+        self.work_data = {
+            'date': '2024/01/15',
+            'start_time': '09:00',
+            'end_time': '18:00',
+            'location_type': '在宅',
+            'break_times': [('12:00', '13:00')],
+            'projects': []
+        }
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    def _automation(self):
+        automation = Mock()
+        automation.snapshot_form_state.return_value = {'date': '2024/01/15', 'project_hours': []}
+        automation.diff_form_state.return_value = {'work_time': True, 'break_time': True, 'projects': []}
+        automation.is_day_submitted.return_value = False
+        automation.input_work_time.return_value = True
+        automation.input_break_time.return_value = True
+        automation.calculate.return_value = True
+        automation.get_actual_work_time_from_screen.return_value = {'success': True, 'actual_work_minutes': 480}
+        automation.check_errors.return_value = []
+        automation.save_and_next.return_value = True
+        automation.submit_confirmation.return_value = True
+        automation.is_confirmation_screen.return_value = True
+        return automation
+
+    def _bulk(self, automation):
+        bulk = BulkWorkAutomation(automation, Mock())
+        bulk.checkpoints = DayCheckpointStore(self.temp_dir.name)
+        return bulk
+
+    def test_all_steps_and_checkpoint_cleared(self):
+        """全ステップを実行し、完了した日のチェックポイントは残さない"""
+        bulk = self._bulk(self.automation)
+        self.assertTrue(bulk.process_single_day(self.work_data))
+
+        self.assertEqual(self.automation.calculate.call_count, 2)
+        self.assertEqual(bulk.results[-1]['status'], 'success')
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    @patch('classes.bulk_automation.time.sleep')
+    def test_retry_resumes_at_submit(self, mock_sleep):
+        """提出で失敗した場合、再試行は確認画面の提出から再開する"""
+        self.automation.submit_confirmation.side_effect = [False, True]
+        bulk = self._bulk(self.automation)
+
+        self.assertTrue(bulk._process_single_day_with_recovery(self.work_data))
+
+        self.automation.input_work_time.assert_called_once()
+        self.assertEqual(self.automation.calculate.call_count, 2)
+        self.automation.save_and_next.assert_called_once()
+        self.assertEqual(self.automation.submit_confirmation.call_count, 2)
+        self.automation.driver.refresh.assert_not_called()
+        self.assertEqual([r['status'] for r in bulk.results], ['success'])
+
+    def test_retry_with_projects_resumes_at_submit(self):
+        """プロジェクトのある日も提出から再開し、調整済みのプロジェクト時間を再調整しない"""
+        self.work_data['projects'] = [{'time': '50', 'comment': 'A'}, {'time': '50', 'comment': 'B'}]
+        self.automation.input_project_works.return_value = []
+        self.automation.submit_confirmation.side_effect = [False, True]
+        bulk = self._bulk(self.automation)
+
+        with patch.object(bulk, '_adjust_project_hours', wraps=bulk._adjust_project_hours) as adjust:
+            first = DayStepPipeline(bulk, self.work_data, bulk.checkpoints).run()
+            second = DayStepPipeline(bulk, self.work_data, bulk.checkpoints).run()
+
+        self.assertEqual(first['failed_step'], 'submit')
+        self.assertEqual(second['status'], 'success')
+        self.assertEqual(second['resumed_from'], 'submit')
+        adjust.assert_called_once()
+        projects = self.automation.input_project_works.call_args[0][0]
+        self.assertEqual([p['time'] for p in projects], ['4:00', '4:00'])
+        # CSVの行は変更しない
+        self.assertEqual([p['time'] for p in self.work_data['projects']], ['50', '50'])
+
+    def test_projects_compared_with_grid_after_calculate(self):
+        """勤務時間の入力・計算後はグリッドを読み直してからプロジェクトを入力"""
+        self.work_data['projects'] = [{'time': '100', 'comment': 'A'}]
+        self.automation.input_project_works.return_value = []
+        self.automation.snapshot_form_state.side_effect = [
+            {'date': '2024/01/15', 'project_hours': ['8:00']},
+            {'date': '2024/01/15', 'project_hours': ['']},
+        ]
+
+        self.assertTrue(self._bulk(self.automation).process_single_day(self.work_data))
+
+        self.assertEqual(self.automation.input_project_works.call_args[1]['current_hours'], [''])
+
+    def test_resume_from_persisted_checkpoint(self):
+        """別の実行でも保存済みチェックポイントから再開し、画面と一致する入力は繰り返さない"""
+        self.automation.save_and_next.return_value = False
+        self.assertFalse(self._bulk(self.automation).process_single_day(self.work_data))
+
+        # 入力済みの内容が画面に残っている（差分なし）、入力画面のまま
+        automation = self._automation()
+        automation.diff_form_state.return_value = {'work_time': False, 'break_time': False, 'projects': []}
+        automation.is_confirmation_screen.return_value = False
+        bulk = self._bulk(automation)
+        self.assertTrue(bulk.process_single_day(self.work_data))
+
+        automation.input_work_time.assert_not_called()
+        automation.calculate.assert_not_called()
+        automation.save_and_next.assert_called_once()
+        automation.submit_confirmation.assert_called_once()
+
+    def test_changed_input_redoes_steps(self):
+        """画面の内容が変わっていれば該当ステップからやり直す"""
+        self.automation.save_and_next.return_value = False
+        self._bulk(self.automation).process_single_day(self.work_data)
+
+        automation = self._automation()
+        automation.diff_form_state.return_value = {'work_time': True, 'break_time': False, 'projects': []}
+        automation.is_confirmation_screen.return_value = False
+        self.assertTrue(self._bulk(automation).process_single_day(self.work_data))
+
+        automation.input_work_time.assert_called_once()
+        self.assertEqual(automation.calculate.call_count, 2)
+
+    def test_previous_submit_confirmed(self):
+        """前回の提出が反映済みなら提出完了として記録"""
+        store = DayCheckpointStore(self.temp_dir.name)
+        checkpoint = store.load(self.work_data)
+        checkpoint['completed'] = DayStepPipeline.STEP_NAMES[:-1]
+        store.save(checkpoint)
+
+        self.automation.is_day_submitted.return_value = True
+        bulk = self._bulk(self.automation)
+        self.assertTrue(bulk.process_single_day(self.work_data))
+
+        self.assertEqual(bulk.results[-1]['status'], 'success')
+        self.automation.submit_confirmation.assert_not_called()
+
+    def test_checkpoint_discarded_when_csv_changes(self):
+        """CSVの内容が変わった日のチェックポイントは使わない"""
+        store = DayCheckpointStore(self.temp_dir.name)
+        checkpoint = store.load(self.work_data)
+        checkpoint['completed'] = ['work_time', 'break_time']
+        store.save(checkpoint)
+
+        changed = dict(self.work_data, end_time='19:00')
+        self.assertEqual(DayCheckpointStore(self.temp_dir.name).load(changed)['completed'], [])
+
+
+    def test_checkpoints_separated_per_csv(self):
+        """同じ日付・同じ内容の行でも、別のCSVのチェックポイントは共有しない"""
+        yamada = DayCheckpointStore(self.temp_dir.name, source=os.path.join('yamada', '202401.csv'))
+        checkpoint = yamada.load(self.work_data)
+        checkpoint['completed'] = ['work_time', 'break_time']
+        yamada.save(checkpoint)
+
+        suzuki = DayCheckpointStore(self.temp_dir.name, source=os.path.join('suzuki', '202401.csv'))
+        self.assertEqual(suzuki.load(self.work_data)['completed'], [])
+        reopened = DayCheckpointStore(self.temp_dir.name, source=os.path.join('yamada', '202401.csv'))
+        self.assertEqual(reopened.load(self.work_data)['completed'], ['work_time', 'break_time'])
+
+    def test_bulk_checkpoints_scoped_by_csv(self):
+        """一括処理のチェックポイントは読み込んだCSVごとのディレクトリに保存"""
+        self.automation.error_records_dir = os.path.join(self.temp_dir.name, 'error_records')
+        yamada = Mock(csv_file_path='yamada.csv')
+        suzuki = Mock(csv_file_path='suzuki.csv')
+
+        first = BulkWorkAutomation(self.automation, yamada).checkpoints.directory
+        second = BulkWorkAutomation(self.automation, suzuki).checkpoints.directory
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.path.dirname(first), os.path.join(self.temp_dir.name, 'checkpoints'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+chromedriver 共有サービスの単体テスト
+"""
+import unittest
+import sys
+from unittest.mock import Mock, patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from selenium.webdriver.chrome.options import Options
+
+from classes.driver_service import ChromeDriverService, KeepAliveConnection, SharedServiceChrome
+from classes.work_time_automation import WorkTimeAutomation
+
+
+class TestChromeDriverService(unittest.TestCase):
+    """ChromeDriverService クラスのテスト"""
+
+    @patch('classes.driver_service.SharedServiceChrome')
+    @patch('classes.driver_service.DriverFinder')
+    @patch('classes.driver_service.Service')
+    def test_starts_chromedriver_once(self, mock_service_class, mock_finder, mock_chrome):
+        """複数のセッションで chromedriver を1回だけ起動"""
+        service = mock_service_class.return_value
+        service.process = None
+        service.start.side_effect = lambda: setattr(service, 'process', Mock(**{'poll.return_value': None}))
+        mock_finder.return_value.get_browser_path.return_value = None
+
+        driver_service = ChromeDriverService()
+        for _ in range(3):
+            options = Options()
+            options.add_experimental_option('debuggerAddress', '127.0.0.1:9222')
+            driver_service.create_driver(options)
+
+        service.start.assert_called_once()
+        self.assertEqual(mock_chrome.call_count, 3)
+        self.assertEqual(driver_service.stats()['sessions'], 3)
+        self.assertIsNotNone(driver_service.stats()['startup_time'])
+
+        driver_service.stop()
+        service.stop.assert_called_once()
+
+    def test_keep_alive_pool_size(self):
+        """コマンド接続は keep-alive で、接続プールの大きさを指定できる"""
+        connection = KeepAliveConnection('http://127.0.0.1:9515', pool_maxsize=8)
+        self.assertTrue(connection.keep_alive)
+        self.assertEqual(connection._conn.connection_pool_kw['maxsize'], 8)
+        self.assertIn('executeCdpCommand', connection._commands)
+
+    @patch('classes.driver_service.RemoteWebDriver.quit')
+    def test_quit_keeps_service(self, mock_quit):
+        """セッションを終了しても chromedriver は止めない"""
+        driver = SharedServiceChrome.__new__(SharedServiceChrome)
+        driver.service = Mock()
+        driver.quit()
+
+        mock_quit.assert_called_once()
+        driver.service.stop.assert_not_called()
+
+    @patch('classes.work_time_automation.webdriver.Chrome')
+    @patch('classes.work_time_automation.get_shared_service')
+    def test_connect_uses_shared_service(self, mock_shared, mock_chrome):
+        """既存のChromeへの接続は共有の chromedriver を使う"""
+        automation = WorkTimeAutomation.connect_to_existing_chrome('127.0.0.1:9333')
+
+        mock_chrome.assert_not_called()
+        options = mock_shared.return_value.create_driver.call_args[0][0]
+        self.assertEqual(options.experimental_options['debuggerAddress'], '127.0.0.1:9333')
+        self.assertIs(automation.driver, mock_shared.return_value.create_driver.return_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
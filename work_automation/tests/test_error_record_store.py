@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+エラー記録の保存クラスの単体テスト
+"""
+import unittest
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.error_record_store import ErrorRecordStore
+
+
+class TestErrorRecordStore(unittest.TestCase):
+    """ErrorRecordStore クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ErrorRecordStore(os.path.join(self.temp_dir.name, ErrorRecordStore.DB_NAME))
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    def test_add_and_query(self):
+        """日付の表記を揃えて保存し、期間・状態で取得"""
+        self.store.add('2024/01/15', ['勤務時間が不足しています'], end_time='18:00')
+        self.store.add('2024-01-16', ['休憩時間が不足しています'])
+        self.store.add('2024/01/20', ['打刻漏れ'], status='resolved')
+
+        records = self.store.get('2024/01/15')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['date'], '2024-01-15')
+        self.assertEqual(records[0]['errors'], ['勤務時間が不足しています'])
+        self.assertEqual(records[0]['status'], 'pending')
+
+        self.assertEqual([r['date'] for r in self.store.query('2024/01/15', '2024/01/16')],
+                         ['2024-01-15', '2024-01-16'])
+        self.assertEqual([r['date'] for r in self.store.query(status='resolved')], ['2024-01-20'])
+        self.assertEqual(self.store.statistics(), {'pending': 2, 'applied': 0, 'resolved': 1})
+
+    def test_bulk_status_update(self):
+        """状態を一括更新し、更新前の状態でも絞り込める"""
+        self.store.add('2024/01/15', ['a'])
+        self.store.add('2024/01/15', ['b'], status='applied')
+        self.store.add('2024/01/16', ['c'])
+
+        self.assertEqual(self.store.update_status('applied', dates=['2024/01/15', '2024/01/16'],
+                                                  from_status='pending'), 2)
+        self.assertEqual(self.store.update_status('resolved', dates=['2024/01/15']), 2)
+        self.assertEqual(self.store.statistics(), {'pending': 0, 'applied': 1, 'resolved': 2})
+        with self.assertRaises(ValueError):
+            self.store.update_status('unknown')
+
+    def test_import_json_directory_once(self):
+        """従来のJSONファイルを取り込み、2回目は取り込まない"""
+        with open(os.path.join(self.temp_dir.name, '2024-01-15.json'), 'w', encoding='utf-8') as f:
+            json.dump([{'timestamp': '2024-01-15 18:00:00', 'errors': ['a', 'b'], 'status': 'applied'}], f)
+        with open(os.path.join(self.temp_dir.name, 'broken.json'), 'w', encoding='utf-8') as f:
+            f.write('[{')
+
+        self.assertEqual(self.store.import_json_directory(self.temp_dir.name), 1)
+        self.assertEqual(self.store.import_json_directory(self.temp_dir.name), 0)
+
+        records = self.store.get('2024/01/15')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['errors'], ['a', 'b'])
+        self.assertEqual(records[0]['status'], 'applied')
+
+
+if __name__ == "__main__":
+    unittest.main()
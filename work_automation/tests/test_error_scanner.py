@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+期間指定エラー走査クラスの単体テスト
+"""
+import unittest
+import csv
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.error_scanner import RangeErrorScanner
+
+
+class FakeTabDriver:
+    """タブごとに表示中の日付を持つ WebDriver の代替"""
+
+    def __init__(self):
+        self.pages = {'tab0': '2024/01/01'}
+        self.current_window_handle = 'tab0'
+        self.current_url = 'https://example.com/daily?date=20240101'
+        self.read_count = 0
+        self.switch_to = Mock()
+        self.switch_to.window.side_effect = self._switch
+        self.switch_to.new_window.side_effect = self._new_window
+
+    def _switch(self, handle):
+        self.current_window_handle = handle
+
+    def _new_window(self, kind):
+        handle = f'tab{len(self.pages)}'
+        self.pages[handle] = ''
+        self.current_window_handle = handle
+
+    def close(self):
+        del self.pages[self.current_window_handle]
+
+    def execute_script(self, script, *args):
+        if 'location.href' in script:
+            value = args[0].split('date=')[1]
+            self.pages[self.current_window_handle] = datetime.strptime(value, '%Y%m%d').strftime('%Y/%m/%d')
+            return None
+        self.read_count += 1
+        page_date = self.pages[self.current_window_handle]
+        errors = ["在宅/出社区分が入力されていません"]
+        if page_date == '2024/01/03':
+            errors.append("勤務時間と工数の合計が一致しません")
+        return {'ready': True, 'date': page_date, 'errors': errors, 'end_time': '18:00'}
+
+
+class TestRangeErrorScanner(unittest.TestCase):
+    """RangeErrorScanner クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.driver = FakeTabDriver()
+        self.automation = Mock()
+        self.automation.driver = self.driver
+        self.automation._DATE_TEMPLATE_TOKEN = '__DATE__'
+        self.automation._date_navigation_template = {
+            'kind': 'url', 'template': 'https://example.com/daily?date=__DATE__', 'format': '%Y%m%d'
+        }
+
+    def test_target_dates_skip_weekends_and_holidays(self):
+        """土日・祝日は指定がない限り対象外"""
+        scanner = RangeErrorScanner(self.automation, holidays={date(2024, 1, 8)})
+        dates = scanner.target_dates('2024-01-05', '2024-01-09')
+        self.assertEqual(dates, [date(2024, 1, 5), date(2024, 1, 9)])
+
+        scanner = RangeErrorScanner(self.automation, include_weekends=True, include_holidays=True,
+                                    holidays={date(2024, 1, 8)})
+        self.assertEqual(len(scanner.target_dates('2024-01-05', '2024-01-09')), 5)
+
+    def test_scan_in_tabs_streams_csv(self):
+        """複数タブで走査し、全日の結果をCSVへ出力"""
+        scanner = RangeErrorScanner(self.automation, tabs=3)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, 'result.csv')
+            results = scanner.scan('2024-01-01', '2024-01-05', output_file=output_file)
+
+            with open(output_file, encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results['2024-01-03'], ["勤務時間と工数の合計が一致しません"])
+        self.assertEqual(results['2024-01-02'], [])
+        self.assertEqual(len(rows), 5)
+        # 遷移の確認と、DOMの静止後の読み直しで1日2回
+        self.assertEqual(self.driver.read_count, 10)
+        self.assertEqual(self.automation._wait_for_quiescence.call_count, 5)
+        self.assertEqual([row['日付'] for row in rows], sorted(row['日付'] for row in rows))
+        # 走査用タブは閉じて元のタブに戻る
+        self.assertEqual(list(self.driver.pages), ['tab0'])
+        self.assertEqual(self.driver.current_window_handle, 'tab0')
+        self.automation.record_error_for_later_application.assert_called_once_with(
+            '2024-01-03', ["勤務時間と工数の合計が一致しません"], end_time='18:00'
+        )
+
+    def test_errors_rendered_after_load_are_read(self):
+        """読み込み完了後にページのスクリプトが表示したエラーも読み取る"""
+        reads = iter([
+            {'ready': True, 'date': '2024/01/03', 'errors': [], 'end_time': '18:00'},
+            {'ready': True, 'date': '2024/01/03', 'errors': ["勤務時間と工数の合計が一致しません"], 'end_time': '18:00'},
+        ])
+        self.automation.driver = Mock(**{'execute_script.side_effect': lambda *args: next(reads)})
+        self.automation._wait_for_quiescence.return_value = {'quiet': True}
+
+        errors = RangeErrorScanner(self.automation)._read_day(None, date(2024, 1, 3))
+
+        self.assertEqual(errors, ["勤務時間と工数の合計が一致しません"])
+
+    def test_output_sorted_by_date(self):
+        """読み込み完了順に追記した結果を日付順に並べ替える"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, 'result.csv')
+            with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.DictWriter(f, fieldnames=['日付', 'エラー数', 'エラー内容'])
+                writer.writeheader()
+                writer.writerow({'日付': '2024-01-04', 'エラー数': 0, 'エラー内容': 'エラーなし'})
+                writer.writerow({'日付': '2024-01-02', 'エラー数': 2, 'エラー内容': 'a'})
+                writer.writerow({'日付': '2024-01-02', 'エラー数': 2, 'エラー内容': 'b'})
+
+            RangeErrorScanner._sort_output(output_file)
+
+            with open(output_file, encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([(r['日付'], r['エラー内容']) for r in rows],
+                         [('2024-01-02', 'a'), ('2024-01-02', 'b'), ('2024-01-04', 'エラーなし')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+失敗時の調査用記録の単体テスト
+"""
+import os
+import gzip
+import json
+import tempfile
+import unittest
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.bulk_automation import BulkWorkAutomation
+from classes.failure_artifacts import FailureArtifactBuffer
+
+
+def page_state(value, html=None):
+    """スナップショット取得スクリプトの戻り値"""
+    return {'url': 'https://example.com/daily', 'title': '勤務実績入力（日次用）', 'date': '2024/01/15(月)',
+            'errors': ['在宅/出社区分が入力されていません'],
+            'fields': [{'name': 'KNMTMRNGSTDI', 'id': None, 'type': 'text', 'value': value, 'disabled': False}],
+            'viewport': {'x': 0, 'y': 0, 'width': 1280, 'height': 800}, 'html': html}
+
+
+class TestFailureArtifactBuffer(unittest.TestCase):
+    """FailureArtifactBuffer クラスのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.buffer = FailureArtifactBuffer(self.temp_dir.name, capacity=2, include_html=True)
+        self.driver = Mock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_keeps_latest_snapshots_in_memory(self):
+        """直近のスナップショットのみ保持し、成功した日は何も保存しない"""
+        self.buffer.begin('2024/01/15')
+        for value in ('9:00', '9:30', '10:00'):
+            self.driver.execute_script.return_value = page_state(value, '<html></html>')
+            self.assertTrue(self.buffer.record(self.driver, f"input_{value}"))
+
+        self.assertEqual([s['fields'][0]['value'] for s in self.buffer.snapshots], ['9:30', '10:00'])
+        self.assertEqual(gzip.decompress(self.buffer.snapshots[-1]['html_gz']), b'<html></html>')
+        self.assertTrue(self.driver.execute_script.call_args[0][1])
+
+        self.buffer.discard()
+        self.assertFalse(self.buffer.active)
+        self.assertEqual(len(self.buffer.snapshots), 0)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_flush_on_failure(self):
+        """失敗した日はスナップショット・HTML・スクリーンショット1枚を保存"""
+        screenshots = Mock()
+        self.buffer.begin('2024/01/15')
+        self.driver.execute_script.return_value = page_state('9:00', '<html>step</html>')
+        self.buffer.record(self.driver, 'step_pre_calculate')
+        self.driver.execute_script.return_value = page_state('9:00')
+
+        directory = self.buffer.flush(self.driver, "計算処理に失敗", screenshots)
+
+        with open(os.path.join(directory, 'snapshots.json'), encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['reason'], "計算処理に失敗")
+        self.assertEqual([s['label'] for s in saved['snapshots']], ['step_pre_calculate', 'failure'])
+        self.assertEqual(saved['snapshots'][0]['html_file'], 'snapshot_1.html.gz')
+        self.assertTrue(os.path.exists(os.path.join(directory, 'snapshot_1.html.gz')))
+        screenshots.capture.assert_called_once_with(self.driver, directory, 'screenshot_failure',
+                                                    page_state('9:00')['viewport'])
+        self.assertFalse(self.buffer.active)
+
+
+class TestBulkFailureArtifacts(unittest.TestCase):
+    """一括処理での失敗時の記録の保存のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.automation = Mock()
+        self.automation.failure_artifacts = FailureArtifactBuffer(self.temp_dir.name)
+        self.automation.driver.execute_script.return_value = page_state('9:00')
+        self.bulk = BulkWorkAutomation(self.automation, Mock())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_success_discards(self):
+        """成功した日は保存しない"""
+        self.automation.failure_artifacts.begin('2024/01/15')
+        self.bulk._record_success('2024/01/15', "提出完了", datetime.now())
+
+        self.bulk._finish_failure_artifacts('2024/01/15')
+
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+        self.assertNotIn('artifacts', self.bulk.results[-1])
+
+    def test_failure_flushes_and_links_result(self):
+        """失敗した日は保存し、処理結果に保存先を追記"""
+        self.automation.failure_artifacts.begin('2024/01/15')
+        self.bulk._record_failure('2024/01/15', "計算処理に失敗")
+
+        self.bulk._finish_failure_artifacts('2024/01/15')
+
+        directory = self.bulk.results[-1]['artifacts']
+        self.assertTrue(os.path.exists(os.path.join(directory, 'snapshots.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+フィールドクリア方法学習クラスの単体テスト
+"""
+import unittest
+import tempfile
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.field_clearing import AdaptiveFieldClearer
+
+
+class TestAdaptiveFieldClearer(unittest.TestCase):
+    """AdaptiveFieldClearer クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.clearer = AdaptiveFieldClearer()
+        self.driver = Mock()
+        self.element = Mock()
+
+    def test_js_clear_single_round_trip(self):
+        """JavaScriptクリアが成功した場合は1回の往復で完了"""
+        self.driver.execute_async_script.return_value = {
+            'key': 'input:text', 'before': '9:00', 'after': '', 'tried': 'js_value'
+        }
+
+        cleared, element = self.clearer.clear(self.driver, self.element)
+
+        self.assertTrue(cleared)
+        self.assertIs(element, self.element)
+        self.assertEqual(self.driver.execute_async_script.call_count, 1)
+        self.driver.execute_script.assert_not_called()
+        self.element.click.assert_not_called()
+        stats = self.clearer.get_statistics()['input:text']['js_value']
+        self.assertEqual(stats['attempts'], 1)
+        self.assertEqual(stats['success_rate'], 1.0)
+
+    def test_already_empty_skips_clearing(self):
+        """既に空の場合はクリアを行わない"""
+        self.driver.execute_async_script.return_value = {
+            'key': 'input:text', 'before': '', 'after': '', 'tried': None
+        }
+
+        self.assertEqual(self.clearer.clear(self.driver, self.element), (True, self.element))
+        self.assertEqual(self.clearer.get_statistics(), {})
+
+    def test_escalates_and_learns_working_method(self):
+        """失敗時のみ上位手段へ進み、成功した手段を次回から優先"""
+        self.driver.execute_async_script.side_effect = [
+            {'key': 'input:text', 'before': '9:00', 'after': '9:00', 'tried': 'js_value'},
+            '',  # select_delete 後の値
+        ]
+
+        self.assertEqual(self.clearer.clear(self.driver, self.element), (True, self.element))
+        self.element.click.assert_called_once()
+        self.element.clear.assert_not_called()
+
+        # 次回はJavaScriptクリアを飛ばして学習済みの手段から試す
+        self.assertEqual(self.clearer._method_order('input:text')[0], 'select_delete')
+        self.assertEqual(self.clearer._preferred_methods(), {'input:text': 'select_delete'})
+
+    def test_unreliable_method_demoted(self):
+        """一度成功しただけで失敗を繰り返す高速な方法より、確実に成功する方法を優先"""
+        self.clearer._record('input:text', 'select_delete', True, time.perf_counter())
+        for _ in range(9):
+            self.clearer._record('input:text', 'select_delete', False, time.perf_counter())
+        for _ in range(3):
+            self.clearer._record('input:text', 'webdriver_clear', True, time.perf_counter() - 0.02)
+
+        order = self.clearer._method_order('input:text')
+        self.assertEqual(order[0], 'webdriver_clear')
+        # 成功率の低い方法は未試行の方法より後
+        self.assertLess(order.index('backspace'), order.index('select_delete'))
+
+    def test_clone_replace_always_last(self):
+        """複製での置き換えは最速でも学習順位に入れず最後に試し、置き換え後の要素を返す"""
+        self.clearer._record('input:text', 'clone_replace', True, time.perf_counter() + 1)
+        self.clearer._record('input:text', 'backspace', True, 0.0)
+        self.assertEqual(self.clearer._method_order('input:text')[0], 'backspace')
+        self.assertEqual(self.clearer._method_order('input:text')[-1], 'clone_replace')
+
+        clone = Mock()
+        self.clearer.stats = {}
+        self.driver.execute_async_script.side_effect = [
+            {'key': 'input:text', 'before': '9:00', 'after': '9:00', 'tried': 'js_value'},
+            '9:00', '9:00', '9:00',  # select_delete・webdriver_clear・backspace 後も値が残る
+        ]
+        self.driver.execute_script.return_value = {'after': '', 'element': clone}
+
+        cleared, element = self.clearer.clear(self.driver, self.element)
+        self.assertTrue(cleared)
+        self.assertIs(element, clone)
+
+    def test_shared_clearer_keeps_no_per_call_element(self):
+        """複数タブで共有しても他タブの置き換え要素を参照しないよう、要素は戻り値だけで返す"""
+        other_element = Mock()
+        clone = Mock()
+        self.driver.execute_async_script.side_effect = [
+            {'key': 'input:text', 'before': '9:00', 'after': '9:00', 'tried': 'js_value'},
+            '9:00', '9:00', '9:00',
+            {'key': 'input:text', 'before': '8:00', 'after': '', 'tried': 'js_value'},
+        ]
+        self.driver.execute_script.return_value = {'after': '', 'element': clone}
+
+        self.assertEqual(self.clearer.clear(self.driver, self.element), (True, clone))
+        # 別タブの呼び出しは自身の要素を受け取る
+        self.assertEqual(self.clearer.clear(self.driver, other_element), (True, other_element))
+        self.assertFalse(hasattr(self.clearer, 'replaced_element'))
+
+    def test_verifies_after_yield(self):
+        """ページ側の非同期の再設定を待ってから値を確認するよう待機時間を渡す"""
+        self.driver.execute_async_script.return_value = {
+            'key': 'input:text', 'before': '9:00', 'after': '', 'tried': 'js_value'
+        }
+
+        self.clearer.clear(self.driver, self.element)
+
+        script, *args = self.driver.execute_async_script.call_args[0]
+        self.assertIn('setTimeout', script)
+        self.assertEqual(args[-1], AdaptiveFieldClearer.SETTLE_MS)
+
+    def test_save_and_load(self):
+        """学習結果の保存と読み込み"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats_file = os.path.join(temp_dir, 'stats.json')
+            self.clearer.stats_file = stats_file
+            self.clearer._record('input:text', 'webdriver_clear', True, 0.0)
+            self.clearer.save()
+
+            loaded = AdaptiveFieldClearer(stats_file)
+            self.assertEqual(loaded._method_order('input:text')[0], 'webdriver_clear')
+
+    def test_concurrent_saves_merge(self):
+        """同じファイルへ保存する複数のインスタンスの学習結果を失わずに統合"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats_file = os.path.join(temp_dir, 'stats.json')
+            first = AdaptiveFieldClearer(stats_file)
+            second = AdaptiveFieldClearer(stats_file)
+            first._record('input:text', 'webdriver_clear', True, 0.0)
+            second._record('input:text', 'webdriver_clear', True, 0.0)
+            second._record('input:text', 'backspace', False, 0.0)
+
+            threads = [threading.Thread(target=clearer.save) for clearer in (first, second)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            first.save()
+
+            stats = AdaptiveFieldClearer(stats_file).stats['input:text']
+            self.assertEqual(stats['webdriver_clear']['attempts'], 2)
+            self.assertEqual(stats['backspace']['attempts'], 1)
+            self.assertEqual(os.listdir(temp_dir), ['stats.json'])
+
+    def test_corrupt_file_is_replaced(self):
+        """壊れた学習結果ファイルは作り直す"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats_file = os.path.join(temp_dir, 'stats.json')
+            Path(stats_file).write_text('{"input:text": ', encoding='utf-8')
+            clearer = AdaptiveFieldClearer(stats_file)
+            clearer._record('input:text', 'js_value', True, 0.0)
+            clearer.save()
+
+            self.assertEqual(AdaptiveFieldClearer(stats_file).stats['input:text']['js_value']['attempts'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
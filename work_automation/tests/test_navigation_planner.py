@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+日付遷移の経路計画クラスの単体テスト
+"""
+import unittest
+import sys
+from datetime import date
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.navigation_planner import DateNavigationPlanner, parse_date_text
+
+
+class TestDateNavigationPlanner(unittest.TestCase):
+    """DateNavigationPlanner クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.automation = Mock()
+        self.planner = DateNavigationPlanner(self.automation)
+
+    def test_parse_date_text(self):
+        """日付文字列の解析"""
+        self.assertEqual(parse_date_text('2024/01/15'), date(2024, 1, 15))
+        self.assertEqual(parse_date_text('2024-01-15'), date(2024, 1, 15))
+        self.assertEqual(parse_date_text('2024年1月15日(月)'), date(2024, 1, 15))
+        self.assertIsNone(parse_date_text('1月15日'))
+        self.assertIsNone(parse_date_text(Mock()))
+
+    def test_plan_routes(self):
+        """経路計画 - 隣接日は翌日/前日、離れた日は直接遷移"""
+        monday = date(2024, 1, 15)
+        self.assertEqual(self.planner.plan(monday, monday), ('none', 0))
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 16)), ('next', 1))
+        self.assertEqual(self.planner.plan(date(2024, 1, 16), monday), ('previous', 1))
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 10)), ('jump', 1))
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 25)), ('jump', 1))
+        # 翌日・前日遷移はどちらも土日を飛ばす（金曜⇔月曜は1回）
+        self.assertEqual(self.planner.plan(date(2024, 1, 12), monday), ('next', 1))
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 12)), ('previous', 1))
+        self.assertEqual(self.planner.plan(date(2024, 1, 13), date(2024, 1, 12)), ('previous', 1))
+        # 土日は翌日・前日遷移では到達できない
+        self.assertEqual(self.planner.plan(date(2024, 1, 12), date(2024, 1, 13)), ('jump', 1))
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 14)), ('jump', 1))
+        # 同じ営業日数なら前後どちらの方向も同じ回数
+        self.planner.costs['jump'] = 100.0
+        self.assertEqual(self.planner.plan(monday, date(2024, 1, 22)), ('next', 5))
+        self.assertEqual(self.planner.plan(date(2024, 1, 22), monday), ('previous', 5))
+
+    def test_plan_uses_measured_costs(self):
+        """経路計画 - 実測コストが変われば経路も変わる"""
+        self.planner.costs['jump'] = 100.0
+        self.assertEqual(self.planner.plan(date(2024, 1, 15), date(2024, 1, 25)), ('next', 8))
+
+    def test_navigate_to_verifies_and_falls_back(self):
+        """遷移後の日付が異なる場合は別経路で再遷移"""
+        self.automation.get_current_date.side_effect = [
+            '2024/01/15',  # 遷移前
+            '2024/01/15',  # 翌日遷移に失敗
+            '2024/01/16',  # 直接遷移後
+        ]
+        self.automation.navigate_to_next_day.return_value = True
+        self.automation.navigate_to_date.return_value = True
+
+        result = self.planner.navigate_to('2024/01/16')
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['verified'])
+        self.assertEqual(result['route'], 'jump')
+        self.assertEqual(result['navigations'], 2)
+        self.automation.navigate_to_date.assert_called_once_with('2024/01/16')
+
+    def test_unreadable_landing_is_not_success(self):
+        """遷移後の日付が読めない場合は成功とせず、直接遷移で確認できたときのみ成功"""
+        self.automation.get_current_date.side_effect = ['2024/01/15', '', '']
+        self.automation.navigate_to_next_day.return_value = True
+        self.automation.navigate_to_date.return_value = True
+
+        result = self.planner.navigate_to('2024/01/16')
+
+        self.assertFalse(result['success'])
+        self.assertFalse(result['verified'])
+        self.automation.navigate_to_date.assert_called_once_with('2024/01/16')
+
+        self.automation.get_current_date.side_effect = ['2024/01/15', '', '2024/01/16']
+        self.assertTrue(self.planner.navigate_to('2024/01/16')['verified'])
+
+    def test_navigate_to_unreadable_date_uses_fallback(self):
+        """表示中の日付が読めない場合は指定の経路で遷移"""
+        self.automation.get_current_date.return_value = ''
+        self.automation.navigate_to_next_day.return_value = True
+
+        result = self.planner.navigate_to('2024/01/16', fallback_route='next')
+
+        self.assertTrue(result['success'])
+        self.assertFalse(result['verified'])
+        self.automation.navigate_to_next_day.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
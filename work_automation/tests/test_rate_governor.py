@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+サーバー負荷の制御クラスの単体テスト
+"""
+import unittest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.rate_governor import ThroughputGovernor, TokenBucket, governed
+
+
+class Operations:
+    """governed を適用した操作の代替"""
+
+    def __init__(self, governor):
+        self.governor = governor
+        self.result = True
+
+    @governed('calculate')
+    def calculate(self):
+        return self.result
+
+    @governed('navigation')
+    def navigate_to_next_day(self):
+        return self.navigate_to_date()
+
+    @governed('navigation')
+    def navigate_to_date(self):
+        return True
+
+
+class TestThroughputGovernor(unittest.TestCase):
+    """ThroughputGovernor クラスのテスト"""
+
+    def test_token_bucket_reserves_ahead(self):
+        """連続回数を超えた分はレートに応じた待機時間になる"""
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.02)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.02)
+
+    def test_concurrency_cap(self):
+        """全体の同時実行数が上限を超えない"""
+        governor = ThroughputGovernor(rates={'calculate': (1000.0, 100)}, max_concurrent=2)
+
+        def work():
+            with governor.request('calculate'):
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = governor.get_metrics()
+        self.assertEqual(metrics['_global']['peak_in_flight'], 2)
+        self.assertEqual(metrics['calculate']['requests'], 6)
+
+    def test_slows_down_on_errors_and_recovers(self):
+        """エラーが続くとレートを下げ、正常に戻ると元のレートへ戻す"""
+        governor = ThroughputGovernor(rates={'calculate': (100.0, 100)})
+        operations = Operations(governor)
+
+        operations.result = False
+        for _ in range(governor.min_samples):
+            operations.calculate()
+        metrics = governor.get_metrics()['calculate']
+        self.assertEqual(metrics['errors'], governor.min_samples)
+        self.assertEqual(metrics['slowdowns'], 1)
+        self.assertEqual(metrics['rate'], 50.0)
+
+        operations.result = True
+        for _ in range(20):
+            operations.calculate()
+        self.assertEqual(governor.get_metrics()['calculate']['rate'], 100.0)
+
+    def test_slows_down_on_latency(self):
+        """応答時間が基準応答時間の倍率を超えるとレートを下げる"""
+        governor = ThroughputGovernor(latency_factor=2.0)
+        for _ in range(governor.min_samples):
+            governor.record('save_and_next', 0.1, True)
+        governor.record('save_and_next', 1.0, True)
+        self.assertEqual(governor.get_metrics()['save_and_next']['slowdowns'], 0)
+        governor.record('save_and_next', 1.5, True)
+        self.assertEqual(governor.get_metrics()['save_and_next']['slowdowns'], 1)
+
+    def test_isolated_blips_do_not_compound(self):
+        """単発の遅延・エラーでは減速せず、減速直後の1件で再度減速しない"""
+        governor = ThroughputGovernor()
+        for index in range(100):
+            governor.record('calculate', 1.0 if index % 20 == 5 else 0.1, index % 20 != 15)
+        self.assertEqual(governor.get_metrics()['calculate']['slowdowns'], 0)
+
+        for _ in range(governor.min_samples):
+            governor.record('calculate', 0.1, False)
+        governor.record('calculate', 0.1, False)
+        metrics = governor.get_metrics()['calculate']
+        self.assertEqual(metrics['slowdowns'], 1)
+        self.assertEqual(metrics['rate'], 0.5)
+
+    def test_fast_outlier_does_not_pin_baseline(self):
+        """単発の極端に速い応答の後も通常の応答時間が続けばレートが元に戻る"""
+        governor = ThroughputGovernor(rates={'calculate': (100.0, 100)})
+        governor.record('calculate', 0.01, True)
+        for _ in range(governor.window * 3):
+            governor.record('calculate', 0.5, True)
+
+        metrics = governor.get_metrics()['calculate']
+        self.assertEqual(metrics['slowdowns'], 0)
+        self.assertEqual(metrics['rate'], 100.0)
+
+    def test_recovers_after_outlier_during_slowdown(self):
+        """減速中に極端に速い応答が1件あっても、通常の応答時間に戻れば元のレートへ回復する"""
+        governor = ThroughputGovernor(rates={'calculate': (100.0, 100)})
+        for _ in range(governor.min_samples):
+            governor.record('calculate', 0.5, False)
+        self.assertEqual(governor.get_metrics()['calculate']['rate'], 50.0)
+
+        governor.record('calculate', 0.01, True)
+        for _ in range(governor.window * 2):
+            governor.record('calculate', 0.5, True)
+        self.assertEqual(governor.get_metrics()['calculate']['rate'], 100.0)
+
+    def test_nested_operations_use_one_slot(self):
+        """翌日遷移の中の日付指定遷移は外側の1回として数える"""
+        governor = ThroughputGovernor(max_concurrent=1)
+        self.assertTrue(Operations(governor).navigate_to_next_day())
+        self.assertEqual(governor.get_metrics()['navigation']['requests'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
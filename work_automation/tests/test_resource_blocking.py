@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+通信ブロック設定の単体テスト
+"""
+import json
+import os
+import tempfile
+import unittest
+import sys
+from unittest.mock import Mock, call
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.resource_blocking import ResourceBlockingProfile
+
+
+class TestResourceBlockingProfile(unittest.TestCase):
+    """ResourceBlockingProfile クラスのテスト"""
+
+    def test_default_patterns(self):
+        """既定では画像・フォント・アクセス解析をブロック（クエリ文字列付きも対象）"""
+        profile = ResourceBlockingProfile()
+
+        self.assertIn('*.png', profile.blocked_urls)
+        self.assertIn('*.jpg?*', profile.blocked_urls)
+        self.assertIn('*.woff2', profile.blocked_urls)
+        self.assertIn('*google-analytics.com/*', profile.blocked_urls)
+        self.assertEqual(profile.launch_arguments(), ['--blink-settings=imagesEnabled=false'])
+
+    def test_load_from_file(self):
+        """設定ファイルで種類の選択と追加パターンを指定"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'light.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'block_images': False, 'blocked_urls': ['*/static/banner/*']}, f)
+
+            profile = ResourceBlockingProfile.from_option(path)
+
+        self.assertEqual(profile.name, 'light')
+        self.assertNotIn('*.png', profile.blocked_urls)
+        self.assertIn('*.woff', profile.blocked_urls)
+        self.assertEqual(profile.blocked_urls[-1], '*/static/banner/*')
+        self.assertEqual(profile.launch_arguments(), [])
+        self.assertIsNone(ResourceBlockingProfile.from_option(None))
+
+    def test_apply_and_clear(self):
+        """DevToolsプロトコルでブロック対象のURLを設定・解除"""
+        driver = Mock()
+        profile = ResourceBlockingProfile(block_images=False, block_fonts=False, block_analytics=False,
+                                          blocked_urls=['*.gif'])
+
+        self.assertTrue(profile.apply(driver))
+        self.assertTrue(ResourceBlockingProfile.clear(driver))
+
+        driver.execute_cdp_cmd.assert_has_calls([
+            call('Network.enable', {}),
+            call('Network.setBlockedURLs', {'urls': ['*.gif']}),
+            call('Network.setBlockedURLs', {'urls': []}),
+        ])
+
+    def test_apply_failure(self):
+        """適用できない場合は False"""
+        driver = Mock()
+        driver.execute_cdp_cmd.side_effect = Exception("not supported")
+
+        self.assertFalse(ResourceBlockingProfile().apply(driver))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+処理結果ジャーナルの単体テスト
+"""
+import unittest
+import csv
+import os
+import sys
+import tempfile
+from datetime import datetime
+from unittest.mock import Mock, patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.bulk_automation import BulkWorkAutomation
+from classes.results_journal import ResultsJournal
+
+
+class TestResultsJournal(unittest.TestCase):
+    """ResultsJournal クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'journals', 'work.jsonl')
+        self.journal = ResultsJournal(self.path)
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    def _result(self, date, status):
+        return {'date': date, 'status': status, 'message': status, 'timestamp': datetime(2024, 1, 20, 9, 0)}
+
+    def test_latest_result_per_date(self):
+        """日付ごとの最新結果から処理済みの日を判定"""
+        self.journal.start()
+        self.journal.append(self._result('2024/01/15', 'success'))
+        self.journal.append(self._result('2024/01/16', 'failure'))
+        self.journal.append(self._result('2024/01/17', 'failure'))
+        self.journal.start(resume=True)
+        self.journal.append(self._result('2024/01/16', 'success'))
+
+        self.assertEqual(self.journal.completed_dates(), {'2024/01/15', '2024/01/16'})
+        latest = self.journal.latest_results()
+        self.assertEqual([r['status'] for r in latest], ['success', 'success', 'failure'])
+        self.assertIsInstance(latest[0]['timestamp'], datetime)
+
+    def test_new_run_and_truncated_line(self):
+        """新しい実行は前回の結果を引き継がず、書き込み途中の行は読み飛ばす"""
+        self.journal.start()
+        self.journal.append(self._result('2024/01/15', 'success'))
+        self.journal.start()
+        self.journal.append(self._result('2024/01/16', 'success'))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"event": "result", "date": "2024/01/1')
+
+        self.assertEqual(self.journal.completed_dates(), {'2024/01/16'})
+
+    @patch('classes.bulk_automation.time.sleep')
+    def test_resume_skips_completed_dates(self, mock_sleep):
+        """--resume ではジャーナルの処理済みの日を飛ばし、CSVはジャーナルから出力"""
+        self.journal.start()
+        self.journal.append(self._result('2024/01/15', 'success'))
+
+        csv_processor = Mock()
+        csv_processor.get_all_data.return_value = [{'date': '2024/01/15'}, {'date': '2024/01/16'}]
+        bulk = BulkWorkAutomation(Mock(), csv_processor)
+        bulk.attach_journal(ResultsJournal(self.path), resume=True)
+
+        processed = []
+
+        def process(work_data):
+            processed.append(work_data['date'])
+            bulk._record_success(work_data['date'], '提出完了', datetime.now())
+            return True
+
+        with patch.object(bulk, '_navigate_to_work_date',
+                          return_value={'success': True, 'route': None, 'navigations': 0,
+                                        'navigation_time': 0.0, 'verified': True}), \
+             patch.object(bulk, '_process_single_day_with_recovery', side_effect=process):
+            self.assertTrue(bulk.process_all_data())
+
+        self.assertEqual(processed, ['2024/01/16'])
+        self.assertEqual(ResultsJournal(self.path).completed_dates(), {'2024/01/15', '2024/01/16'})
+
+        output = os.path.join(self.temp_dir.name, 'result.csv')
+        self.assertEqual(bulk.save_results_to_csv(output), output)
+        with open(output, encoding='utf-8-sig') as f:
+            self.assertEqual([row['date'] for row in csv.DictReader(f)], ['2024/01/15', '2024/01/16'])
+
+
+    def test_dry_run_results_in_csv_with_journal(self):
+        """ジャーナルに記録しないドライランの結果もCSVに出力する"""
+        self.journal.start()
+        self.journal.append(self._result('2024/01/15', 'success'))
+
+        csv_processor = Mock()
+        csv_processor.get_all_data.return_value = [{'date': '2024/01/16'}, {'date': '2024/01/17'}]
+        bulk = BulkWorkAutomation(Mock(), csv_processor)
+        bulk.attach_journal(ResultsJournal(self.path), resume=True)
+        with patch.object(bulk, '_log_work_data'):
+            self.assertTrue(bulk.process_all_data(dry_run=True))
+
+        output = os.path.join(self.temp_dir.name, 'result.csv')
+        bulk.save_results_to_csv(output)
+        with open(output, encoding='utf-8-sig') as f:
+            rows = [(row['date'], row['status']) for row in csv.DictReader(f)]
+        self.assertEqual(rows, [('2024/01/15', 'success'), ('2024/01/16', 'dry_run'), ('2024/01/17', 'dry_run')])
+
+
+if __name__ == "__main__":
+    unittest.main()
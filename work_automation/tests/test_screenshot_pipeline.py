@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+スクリーンショットの非同期保存の単体テスト
+"""
+import os
+import base64
+import struct
+import zlib
+import tempfile
+import unittest
+import sys
+from unittest.mock import Mock
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.screenshot_pipeline import ScreenshotPipeline, decode_png_grayscale, difference_hash
+
+
+def make_png(rows, filter_type=0):
+    """グレー値の行からRGBのPNGを作成（filter_type=1 の場合は Sub フィルタで符号化）"""
+    def chunk(chunk_type, body):
+        return struct.pack('>I', len(body)) + chunk_type + body + struct.pack('>I', zlib.crc32(chunk_type + body))
+
+    raw = b''
+    for row in rows:
+        line = bytes(value for gray in row for value in (gray, gray, gray))
+        if filter_type == 1:
+            line = bytes((line[i] - (line[i - 3] if i >= 3 else 0)) & 0xFF for i in range(len(line)))
+        raw += bytes([filter_type]) + line
+    header = struct.pack('>IIBBBBB', len(rows[0]), len(rows), 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b'')
+
+
+class FakeDriver:
+    """縮小画像（PNG）と本画像（JPEG）を返すドライバー"""
+
+    def __init__(self, thumbnail_rows):
+        self.thumbnail_rows = thumbnail_rows
+        self.full_captures = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        if params['format'] == 'png':
+            return {'data': base64.b64encode(make_png(self.thumbnail_rows)).decode('ascii')}
+        self.full_captures += 1
+        return {'data': base64.b64encode(b'\xff\xd8jpeg' + bytes([self.full_captures])).decode('ascii')}
+
+
+VIEWPORT = {'x': 0, 'y': 0, 'width': 1280, 'height': 800}
+
+
+class TestPngHash(unittest.TestCase):
+    """PNGのデコードと知覚ハッシュのテスト"""
+
+    def test_decode_with_filters(self):
+        """フィルタ付きの行を復元してグレースケール化"""
+        rows = [[0, 128, 255], [10, 20, 30]]
+        self.assertEqual(decode_png_grayscale(make_png(rows)), rows)
+        self.assertEqual(decode_png_grayscale(make_png(rows, filter_type=1)), rows)
+
+    def test_difference_hash(self):
+        """隣り合う画素が明るくなる箇所を1とする"""
+        self.assertEqual(difference_hash([[0, 10, 5], [1, 2, 3]]), (0b1011, 4))
+
+
+class TestScreenshotPipeline(unittest.TestCase):
+    """ScreenshotPipeline クラスのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pipeline = ScreenshotPipeline(self.temp_dir.name, max_files=2)
+
+    def tearDown(self):
+        self.pipeline.close()
+        self.temp_dir.cleanup()
+
+    def test_writes_compressed_image_in_background(self):
+        """表示範囲をJPEGで撮影し、バックグラウンドで書き込む"""
+        driver = FakeDriver([[0, 50, 100, 150]])
+
+        path = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_test')
+        self.assertIsNone(self.pipeline._clip(None))
+        path = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_clip', VIEWPORT)
+        self.pipeline.flush()
+
+        self.assertTrue(path.endswith('screenshot_clip.jpg'))
+        self.assertTrue(Path(path).read_bytes().startswith(b'\xff\xd8'))
+
+    def test_skips_duplicate_frames(self):
+        """前回と同じ画面は撮影せず前回のパスを返し、画面が変われば撮影する"""
+        driver = FakeDriver([[0, 50, 100, 150], [150, 100, 50, 0]])
+
+        first = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_a', VIEWPORT)
+        second = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_b', VIEWPORT)
+        driver.thumbnail_rows = [[150, 100, 50, 0], [0, 50, 100, 150]]
+        third = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_c', VIEWPORT)
+        self.pipeline.flush()
+
+        self.assertEqual(second, first)
+        self.assertNotEqual(third, first)
+        self.assertEqual(driver.full_captures, 2)
+        self.assertEqual(self.pipeline.stats['duplicates'], 1)
+
+    def test_retention_by_count(self):
+        """保存数の上限を超えた分は古いものから削除"""
+        for index, row in enumerate([[0, 10, 20, 30], [30, 20, 10, 0], [0, 30, 0, 30]]):
+            driver = FakeDriver([row])
+            self.pipeline.capture(driver, os.path.join(self.temp_dir.name, 'tab0'), f'screenshot_{index}', VIEWPORT)
+            self.pipeline.flush()
+
+        remaining = sorted(p.name for p in Path(self.temp_dir.name).rglob('screenshot_*'))
+        self.assertEqual(len(remaining), 2)
+        self.assertNotIn('screenshot_0.jpg', remaining)
+
+    def test_fallback_without_devtools(self):
+        """DevToolsで撮影できないドライバーは従来の方法でPNGを保存"""
+        driver = Mock()
+        driver.execute_cdp_cmd.side_effect = Exception("not supported")
+
+        path = self.pipeline.capture(driver, self.temp_dir.name, 'screenshot_fallback', VIEWPORT)
+
+        self.assertTrue(path.endswith('screenshot_fallback.png'))
+        driver.save_screenshot.assert_called_once_with(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
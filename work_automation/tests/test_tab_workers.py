@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+タブ並列処理クラスの単体テスト
+"""
+import unittest
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from unittest.mock import Mock, patch
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.tab_workers import TabWorkerPool
+
+
+class TestTabWorkerPool(unittest.TestCase):
+    """TabWorkerPool クラスのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.automation = Mock()
+        self.automation.driver.current_url = 'https://example.com/daily'
+        self.automation.screenshot_dir = self.temp_dir.name
+        self.workers = []
+        self.lock = threading.Lock()
+        self.data = [{'date': f'2024/01/{day:02d}'} for day in range(1, 8)]
+
+    def tearDown(self):
+        """テスト後の後始末"""
+        self.temp_dir.cleanup()
+
+    def _factory(self):
+        worker = Mock()
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+
+    def test_shard_contiguous(self):
+        """日付順の連続した区間に分割"""
+        pool = TabWorkerPool(self.automation, Mock(), 3, automation_factory=self._factory)
+        shards = pool.shard(self.data)
+        self.assertEqual([len(s) for s in shards], [3, 2, 2])
+        self.assertEqual([d for s in shards for d in s], self.data)
+
+        # データ数よりタブ数が多い場合はデータ数まで
+        self.assertEqual(len(pool.shard(self.data[:2])), 2)
+
+    def test_run_merges_results_and_closes_sessions(self):
+        """各ワーカーが専用タブで処理し、結果を日付順に統合"""
+        def process(bulk, idx, work_data, fallback_route=None):
+            bulk.results.append({'date': work_data['date'], 'status': 'success',
+                                 'fallback_route': fallback_route, 'timestamp': datetime.now()})
+            return True
+
+        pool = TabWorkerPool(self.automation, Mock(), 3, automation_factory=self._factory)
+        with patch('classes.bulk_automation.BulkWorkAutomation._process_work_item',
+                   autospec=True, side_effect=process):
+            results = pool.run(self.data)
+
+        self.assertEqual([r['date'] for r in results], [d['date'] for d in self.data])
+        self.assertTrue(all(r['fallback_route'] == 'jump' for r in results))
+        self.assertEqual(len(self.workers), 3)
+        for worker in self.workers:
+            worker.driver.switch_to.new_window.assert_called_once_with('tab')
+            worker.driver.get.assert_called_once_with('https://example.com/daily')
+            worker.driver.close.assert_called_once()
+            worker.close.assert_called_once()
+            self.assertIs(worker.field_clearer, self.automation.field_clearer)
+        self.assertEqual(len({w.screenshot_dir for w in self.workers}), 3)
+
+    def test_worker_error_marks_remaining_days_failed(self):
+        """ワーカーの例外時は未処理の日を失敗として記録"""
+        def process(bulk, idx, work_data, fallback_route=None):
+            if work_data['date'] == '2024/01/02':
+                raise RuntimeError("セッション切断")
+            bulk.results.append({'date': work_data['date'], 'status': 'success', 'timestamp': datetime.now()})
+            return True
+
+        pool = TabWorkerPool(self.automation, Mock(), 2, automation_factory=self._factory)
+        with patch('classes.bulk_automation.BulkWorkAutomation._process_work_item',
+                   autospec=True, side_effect=process):
+            results = pool.run(self.data)
+
+        statuses = {r['date']: r['status'] for r in results}
+        self.assertEqual(len(statuses), 7)
+        self.assertEqual(statuses['2024/01/01'], 'success')
+        self.assertEqual(statuses['2024/01/02'], 'failure')
+        self.assertEqual(statuses['2024/01/04'], 'failure')
+        self.assertEqual(statuses['2024/01/05'], 'success')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,8 @@ WorkTimeAutomation クラスのテストコード
 import unittest
 import sys
 import os
+import json
+import tempfile
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
@@ -210,6 +212,278 @@ class TestWorkTimeAutomation(unittest.TestCase):
         
         self.assertIsNone(result)
 
+    def test_hide_overlay_elements_single_script_call(self):
+        """オーバーレイ抑制テスト - 1回のスクリプト呼び出しで設置"""
+        self.mock_driver.execute_script.return_value = {'installed': True, 'hidden': 3}
+
+        result = self.automation._hide_overlay_elements()
+
+        self.assertTrue(result)
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+        script = self.mock_driver.execute_script.call_args[0][0]
+        self.assertIn('MutationObserver', script)
+        self.assertNotIn("querySelectorAll('*')", script)
+
+    def test_restore_overlay_elements_single_script_call(self):
+        """オーバーレイ復元テスト - スタイルシート無効化のみ"""
+        self.mock_driver.execute_script.return_value = True
+
+        self.automation._restore_overlay_elements()
+
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+        self.assertIn('disable()', self.mock_driver.execute_script.call_args[0][0])
+
+    def test_input_project_works_via_grid(self):
+        """プロジェクト一括入力テスト - グリッドAPIで全行書き込み"""
+        projects = [{'time': '4:00', 'comment': 'A'}, {'time': '3:45', 'comment': 'B'}]
+        self.mock_driver.execute_script.return_value = {
+            'found': True, 'field': 'time', 'column': 2,
+            'rows': [
+                {'row': 0, 'method': 'editor', 'value': '4:00', 'error': None},
+                {'row': 1, 'method': 'editor', 'value': '3:45', 'error': None},
+            ]
+        }
+
+        with patch.object(self.automation, 'add_project_work') as mock_add:
+            failed = self.automation.input_project_works(projects)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+        mock_add.assert_not_called()
+
+    def test_input_project_works_fallback_to_dom(self):
+        """プロジェクト一括入力テスト - グリッド未検出時はセル操作にフォールバック"""
+        projects = [{'time': '8:00', 'comment': 'A'}]
+        self.mock_driver.execute_script.return_value = {'found': False, 'rows': []}
+
+        with patch.object(self.automation, 'add_project_work', return_value=False) as mock_add:
+            failed = self.automation.input_project_works(projects)
+
+        self.assertEqual(failed, [0])
+        mock_add.assert_called_once_with(0, '8:00', 'A')
+
+    def test_input_project_works_skips_matching_rows(self):
+        """プロジェクト一括入力テスト - 画面の値と一致する行は書き込まない"""
+        projects = [{'time': '4:00', 'comment': 'A'}, {'time': '3:45', 'comment': 'B'}]
+
+        with patch.object(self.automation, '_write_project_hours_to_grid', return_value={}) as mock_write, \
+             patch.object(self.automation, 'add_project_work', return_value=True):
+            failed = self.automation.input_project_works(projects, current_hours=['04:00', '2:00'])
+
+        self.assertEqual(failed, [])
+        mock_write.assert_called_once_with([{'row': 1, 'value': '3:45'}])
+
+    def test_diff_form_state(self):
+        """フォーム差分テスト - 入力済みの項目は差分なし"""
+        work_data = {
+            'date': '2024/01/15', 'start_time': '09:00', 'end_time': '18:00', 'location_type': '在宅',
+            'break_times': [('12:00', '13:00')],
+            'projects': [{'time': '4:00', 'comment': 'A'}, {'time': '3:00', 'comment': 'B'}]
+        }
+        snapshot = {
+            'date': '2024年1月15日(月)', 'location': '2', 'start_time': '9:00', 'end_time': '18:00',
+            'break_start': '12:00', 'break_end': '13:00', 'project_hours': ['4:00', '2:30']
+        }
+
+        diff = self.automation.diff_form_state(work_data, snapshot)
+
+        self.assertEqual(diff, {'work_time': False, 'break_time': False, 'projects': [1]})
+
+        snapshot['location'] = '5'
+        snapshot['break_start'] = None
+        diff = self.automation.diff_form_state(work_data, snapshot)
+        self.assertTrue(diff['work_time'])
+        self.assertTrue(diff['break_time'])
+
+    def test_error_records_import_legacy_json(self):
+        """エラー記録の初回参照時に従来のJSONファイルを取り込む"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, '2024-01-15.json'), 'w', encoding='utf-8') as f:
+                json.dump([{'timestamp': '2024-01-15 18:00:00', 'errors': ['打刻漏れ'], 'status': 'pending'}], f)
+            self.automation.error_records_dir = temp_dir
+
+            records = self.automation.get_error_records('2024/01/15')
+
+            self.assertEqual([r['errors'] for r in records], [['打刻漏れ']])
+
+    def test_navigate_to_previous_day_skips_weekend(self):
+        """前日遷移は翌日遷移と同じく土日を飛ばして前の営業日へ遷移"""
+        with patch.object(self.automation, 'get_current_date', return_value='2024/01/15'), \
+                patch.object(self.automation, 'navigate_to_date', return_value=True) as mock_navigate:
+            self.assertTrue(self.automation.navigate_to_previous_day())
+
+        mock_navigate.assert_called_once_with('2024/01/12')
+        self.mock_driver.find_element.assert_not_called()
+
+    def test_is_day_submitted(self):
+        """提出状態判定テスト - 状態表示とボタン有無、日付の一致を確認"""
+        self.assertTrue(self.automation.is_day_submitted(
+            {'date': '2024年1月15日(月)', 'status_text': '承認済', 'locked': False}, '2024/01/15'))
+        locked = {'date': '2024年1月15日(月)', 'status_text': '', 'ready': True, 'locked': True}
+        with patch.object(self.automation, '_wait_for_quiescence', return_value={'quiet': True}), \
+                patch.object(self.automation, 'snapshot_form_state', return_value=locked):
+            self.assertTrue(self.automation.is_day_submitted(dict(locked), '2024-01-15'))
+        self.assertFalse(self.automation.is_day_submitted(
+            {'date': '2024年1月15日(月)', 'status_text': '未提出', 'locked': False}, '2024/01/15'))
+        # ボタンが無いだけの状態は、静止後の再確認でボタンが表示されれば提出済みと判定しない
+        rendered = dict(locked, locked=False)
+        with patch.object(self.automation, '_wait_for_quiescence', return_value={'quiet': True}), \
+                patch.object(self.automation, 'snapshot_form_state', return_value=rendered):
+            self.assertFalse(self.automation.is_day_submitted(dict(locked), '2024-01-15'))
+        with patch.object(self.automation, '_wait_for_quiescence', return_value={}):
+            self.assertFalse(self.automation.is_day_submitted(dict(locked), '2024-01-15'))
+        # 表示中の日付が異なる場合は提出済みと判定しない
+        self.assertFalse(self.automation.is_day_submitted(
+            {'date': '2024年1月16日(火)', 'status_text': '承認済', 'locked': True}, '2024/01/15'))
+
+    def test_navigate_to_date_learns_url_template(self):
+        """日付指定遷移テスト - ToNextDateActionのURLからテンプレートを学習して1回で遷移"""
+        self.mock_driver.current_url = "https://example.com/app/daily?date=20240115"
+        self.mock_driver.execute_script.return_value = {
+            'date': '2024/01/15(月)',
+            'handlers': ["ToNextDateAction(); location.href='/app/daily?date=20240116&mode=edit'"]
+        }
+
+        with patch.object(self.automation, 'wait_for_page_load'), \
+             patch.object(self.automation, 'get_current_date', return_value='2024/03/01(金)'):
+            self.assertTrue(self.automation.navigate_to_date('2024-03-01'))
+            self.mock_driver.get.assert_called_once_with("https://example.com/app/daily?date=20240301&mode=edit")
+
+            # 学習済みテンプレートは再利用される
+            self.mock_driver.execute_script.reset_mock()
+            self.automation.navigate_to_date('2024/03/01')
+            self.mock_driver.execute_script.assert_not_called()
+
+    def test_navigate_to_date_template_replaces_destination_only(self):
+        """日付遷移テスト - 表示中の日付と遷移先の両方を含むonclickは遷移先の日付のみを置き換える"""
+        self.mock_driver.execute_script.side_effect = [
+            {'date': '2024/01/15', 'handlers': ["ToNextDateAction('20240115', '20240116');"]},
+            None,
+        ]
+
+        with patch.object(self.automation, 'wait_for_page_load'), \
+             patch.object(self.automation, 'get_current_date', return_value='2024/03/01'):
+            self.assertTrue(self.automation.navigate_to_date('2024/03/01'))
+
+        self.assertIn("ToNextDateAction('20240115', '20240301');", self.mock_driver.execute_script.call_args[0][0])
+        self.assertEqual(self.automation._date_navigation_template['template'],
+                         "ToNextDateAction('20240115', '__AUTOMATION_DATE__');")
+
+    def test_navigate_to_date_saves_template_only_after_verified(self):
+        """日付遷移テスト - 到着を確認できなかったテンプレートは保存しない"""
+        self.mock_driver.current_url = "https://example.com/app/daily"
+        self.mock_driver.execute_script.return_value = {
+            'date': '2024/01/15', 'handlers': ["location.href='/app/daily?date=20240116'"]
+        }
+
+        with patch.object(self.automation, 'wait_for_page_load'), \
+             patch.object(self.automation, 'get_current_date', return_value='2024/01/16'):
+            self.assertFalse(self.automation.navigate_to_date('2024/03/01'))
+
+        self.assertIsNone(self.automation._date_navigation_template)
+
+    def test_navigate_to_date_ignores_current_date_literal(self):
+        """日付遷移テスト - 表示中の日付だけを渡すonclick（サーバー側で日付を進める）からは学習しない"""
+        self.mock_driver.execute_script.return_value = {
+            'date': '2024/01/15', 'handlers': ["ToNextDateAction('2024/01/15');"]
+        }
+
+        self.assertFalse(self.automation.navigate_to_date('2024/03/01'))
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+
+    def test_navigate_to_date_without_template(self):
+        """日付指定遷移テスト - onclickに日付が無い場合は遷移しない"""
+        self.mock_driver.execute_script.return_value = {
+            'date': '2024/01/15', 'handlers': ["ToNextDateAction();"]
+        }
+
+        self.assertFalse(self.automation.navigate_to_date('2024/03/01'))
+        self.mock_driver.get.assert_not_called()
+
+    @patch('classes.work_time_automation.time.sleep')
+    def test_wait_for_dom_stability_single_async_call(self, mock_sleep):
+        """DOM安定化待機テスト - ページ内監視を1回の非同期スクリプトで実行"""
+        self.mock_driver.execute_async_script.return_value = {
+            'quiet': True, 'ready': True, 'mutations': 0, 'elapsed': 500
+        }
+
+        self.automation._wait_for_dom_stability()
+
+        self.assertEqual(self.mock_driver.execute_async_script.call_count, 1)
+        self.mock_driver.execute_script.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_element_attributes_stable_observes_element(self):
+        """要素属性安定化待機テスト - 対象要素の属性のみ監視"""
+        mock_element = Mock()
+        self.mock_driver.execute_async_script.return_value = {'quiet': True, 'ready': True}
+
+        self.automation._wait_for_element_attributes_stable(mock_element)
+
+        args = self.mock_driver.execute_async_script.call_args[0]
+        self.assertIs(args[1], mock_element)
+        self.assertEqual(args[4], ['name', 'class', 'style', 'disabled'])
+        mock_element.get_attribute.assert_not_called()
+
+    def test_wait_for_any_element_returns_matched_locator(self):
+        """候補ロケーター同時待機テスト - 一致したロケーターを返す"""
+        from selenium.webdriver.common.by import By
+
+        mock_element = Mock()
+        self.mock_driver.execute_script.return_value = [mock_element, 1]
+        locators = [(By.NAME, "A"), (By.CSS_SELECTOR, "select[name='A']")]
+
+        element, index = self.automation.wait_for_any_element(locators, timeout=1)
+
+        self.assertIs(element, mock_element)
+        self.assertEqual(index, 1)
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+
+    def test_wait_for_any_element_timeout_without_screenshot(self):
+        """候補ロケーター同時待機テスト - タイムアウト時にスクリーンショットを取らない"""
+        from selenium.webdriver.common.by import By
+
+        self.mock_driver.execute_script.return_value = None
+
+        with patch.object(self.automation, 'save_screenshot') as mock_screenshot:
+            element, index = self.automation.wait_for_any_element([(By.NAME, "A")], timeout=0.3)
+
+        self.assertIsNone(element)
+        self.assertIsNone(index)
+        mock_screenshot.assert_not_called()
+
+    def test_fetch_element_properties_single_call(self):
+        """要素プロパティ一括取得テスト - 複数要素を1回のスクリプトで取得"""
+        elements = [Mock(), Mock()]
+        self.mock_driver.execute_script.return_value = [
+            {'element': elements[0], 'locator_index': None, 'text': 'A', 'class': 'x'},
+            {'element': elements[1], 'locator_index': None, 'text': 'B', 'class': 'y'},
+        ]
+
+        result = self.automation.fetch_element_properties(elements, ['text', 'class'])
+
+        self.assertEqual([r['text'] for r in result], ['A', 'B'])
+        self.assertEqual(self.mock_driver.execute_script.call_count, 1)
+        for element in elements:
+            element.get_attribute.assert_not_called()
+
+    def test_detect_available_time_fields_uses_bulk_fetch(self):
+        """時間フィールド検出テスト - 属性を一括取得して分類"""
+        start_element = Mock()
+        self.mock_driver.execute_script.return_value = [
+            {'element': start_element, 'locator_index': 0, 'displayed': True, 'enabled': True,
+             'name': 'KNMTMRNGSTDI', 'id': '', 'class': '', 'placeholder': '', 'type': 'text'},
+            {'element': Mock(), 'locator_index': 0, 'displayed': False, 'enabled': True,
+             'name': 'KNMTMRNGETDI', 'id': '', 'class': '', 'placeholder': '', 'type': 'text'},
+        ]
+
+        fields = self.automation._detect_available_time_fields()
+
+        self.assertEqual(len(fields['start_time']), 1)
+        self.assertIs(fields['start_time'][0]['element'], start_element)
+        self.assertEqual(fields['end_time'], [])
+        self.mock_driver.find_elements.assert_not_called()
+
 
 class TestWorkTimeAutomationIntegration(unittest.TestCase):
     """WorkTimeAutomationの統合テストクラス"""
@@ -14,6 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from classes.work_time_automation import WorkTimeAutomation
 from classes.csv_processor import WorkDataCSVProcessor
 from classes.bulk_automation import BulkWorkAutomation
+from classes.results_journal import ResultsJournal
+from classes.resource_blocking import ResourceBlockingProfile
+from classes.chrome_launcher import add_launch_arguments, managed_chrome_from_args
 
 
 def setup_logging():
@@ -102,6 +105,14 @@ def create_template(days: int, start_date: str = None):
     return True
 
 
+def connect_chrome(args, blocking=None) -> WorkTimeAutomation:
+    """起動済みのChromeに接続（--launch-chrome 指定時は自動化用のChromeを起動して接続）"""
+    managed = managed_chrome_from_args(args, blocking.launch_arguments() if blocking else None)
+    if managed:
+        return WorkTimeAutomation.launch_managed_chrome(managed, backend=args.backend)
+    return WorkTimeAutomation.connect_to_existing_chrome(backend=args.backend)
+
+
 def main():
     """メイン処理"""
     parser = argparse.ArgumentParser(
@@ -137,6 +148,36 @@ def main():
         action="store_true",
         help="接続確認テストを実行"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="並列に処理するタブ数（デフォルト: 1）"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="前回の処理結果（ジャーナル）を読み込み、処理済みの日を飛ばして再開"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["selenium", "cdp"],
+        default="selenium",
+        help="ブラウザ操作の方式（cdp: chromedriverを経由せずDevToolsプロトコルで直接操作、デフォルト: selenium）"
+    )
+    parser.add_argument(
+        "--block-resources",
+        nargs="?",
+        const="default",
+        metavar="PROFILE",
+        help="画像・フォント・アクセス解析などの不要な通信をブロック（PROFILE: 設定JSONファイル、省略時は既定の設定）"
+    )
+    parser.add_argument(
+        "--capture-html",
+        action="store_true",
+        help="失敗した日の調査用記録に、直近の画面のHTML（圧縮）を含める"
+    )
+    add_launch_arguments(parser)
     
     args = parser.parse_args()
     
@@ -156,7 +197,7 @@ def main():
             
             try:
                 # Chrome接続
-                automation = WorkTimeAutomation.connect_to_existing_chrome()
+                automation = connect_chrome(args)
                 
                 # 包括的な接続テスト実行
                 test_results = automation.comprehensive_connection_test()
@@ -233,12 +274,18 @@ def main():
             
             # Chrome接続
             logger.info("Chromeブラウザに接続します")
-            automation = WorkTimeAutomation.connect_to_existing_chrome()
+            blocking = ResourceBlockingProfile.from_option(args.block_resources)
+            automation = connect_chrome(args, blocking)
+            if blocking:
+                automation.set_resource_blocking(blocking)
+            automation.failure_artifacts.include_html = args.capture_html
             
-            # 一括処理実行
+            # 一括処理実行（結果は1日ごとにジャーナルへ追記）
             bulk_processor = BulkWorkAutomation(automation, csv_processor)
+            journal_file = Path(__file__).parent / "logs" / "journals" / f"{Path(args.csv).stem}.jsonl"
+            bulk_processor.attach_journal(ResultsJournal(str(journal_file)), resume=args.resume)
             
-            success = bulk_processor.process_all_data()
+            success = bulk_processor.process_all_data(concurrency=args.concurrency)
             
             # 結果表示
             bulk_processor.show_results_summary()
@@ -247,6 +294,10 @@ def main():
             result_file = bulk_processor.save_results_to_csv()
             logger.info(f"処理結果を保存しました: {result_file}")
             
+            if automation.managed_chrome is not None:
+                # 起動したChromeのCookieを保存して接続を閉じる（Chromeは終了時に停止）
+                automation.close()
+            
             return 0 if success else 1
             
         else:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+常駐デーモンとジョブ投入クライアント
+
+デーモンを起動しておくと、Chromeへの接続を保持したままジョブを順に処理します。
+ジョブの投入はすぐに戻り、--follow を付けると進捗を表示します。
+
+使用例:
+    python work_automation_daemon.py serve
+    python work_automation_daemon.py csv work_data.csv --start-date 2024-01-01 --end-date 2024-01-31 --follow
+    python work_automation_daemon.py check --start-date 2024-01-01 --end-date 2024-01-31
+    python work_automation_daemon.py status
+    python work_automation_daemon.py follow 3
+    python work_automation_daemon.py stop
+"""
+import sys
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from classes.automation_daemon import DEFAULT_HOST, DEFAULT_PORT, AutomationDaemon, DaemonClient, DaemonError
+from classes.chrome_launcher import add_launch_arguments, managed_chrome_from_args
+
+
+def setup_logging():
+    """ログ設定の初期化"""
+    log_dir = Path(__file__).parent / "logs"
+    log_dir.mkdir(exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = log_dir / f"work_automation_daemon_{timestamp}.log"
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def follow_job(client: DaemonClient, job_id: str) -> int:
+    """ジョブの進捗を表示し、結果に応じた終了コードを返す"""
+    status = None
+    for event in client.follow(job_id):
+        if event['type'] == 'log':
+            print(f"{event['time']} - {event['level']} - {event['message']}")
+        elif event['type'] == 'finished':
+            status = event['status']
+            print(f"\nジョブ #{job_id}: {status}")
+            for key, value in (event.get('result') or {}).items():
+                print(f"  {key}: {value}")
+    return 0 if status == 'success' else 1
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="工数管理システム自動化デーモン")
+    parser.add_argument("--address", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+                        help=f"デーモンのアドレス（デフォルト: {DEFAULT_HOST}:{DEFAULT_PORT}）")
+    parser.add_argument("--token-file",
+                        help="認証トークンファイル（デフォルト: ~/.work_automation/daemon_<ポート>.token）")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="デーモンを起動")
+    serve.add_argument("--debugger-address", help="接続先Chromeのデバッグアドレス（デフォルト: 127.0.0.1:9222）")
+    add_launch_arguments(serve)
+
+    csv_job = subparsers.add_parser("csv", help="CSV一括入力ジョブを投入")
+    csv_job.add_argument("csv", help="処理するCSVファイルのパス")
+    csv_job.add_argument("--start-date", help="処理する期間の開始日（YYYY-MM-DD形式）")
+    csv_job.add_argument("--end-date", help="処理する期間の終了日（YYYY-MM-DD形式）")
+    csv_job.add_argument("--concurrency", type=int, default=1, help="並列に処理するタブ数（デフォルト: 1）")
+    csv_job.add_argument("--resume", action="store_true", help="ジャーナルの処理済みの日を飛ばして再開")
+    csv_job.add_argument("--dry-run", action="store_true", help="実際の入力を行わず検証のみ実行")
+    csv_job.add_argument("--follow", action="store_true", help="進捗を表示して終了を待つ")
+
+    check_job = subparsers.add_parser("check", help="期間エラーチェックジョブを投入")
+    check_job.add_argument("--start-date", required=True, help="開始日（YYYY-MM-DD形式）")
+    check_job.add_argument("--end-date", required=True, help="終了日（YYYY-MM-DD形式）")
+    check_job.add_argument("--tabs", type=int, default=4, help="並列に使用するタブ数（デフォルト: 4）")
+    check_job.add_argument("--include-weekends", action="store_true", help="土日もチェックする")
+    check_job.add_argument("--holidays", help="祝日一覧ファイル（1行1日付 YYYY-MM-DD）")
+    check_job.add_argument("--include-holidays", action="store_true", help="祝日もチェックする")
+    check_job.add_argument("--follow", action="store_true", help="進捗を表示して終了を待つ")
+
+    subparsers.add_parser("status", help="ジョブ一覧を表示")
+    follow = subparsers.add_parser("follow", help="ジョブの進捗を表示")
+    follow.add_argument("job_id", help="ジョブ番号")
+    subparsers.add_parser("stop", help="デーモンを停止")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        logger = setup_logging()
+        host, port = args.address.rsplit(':', 1)
+        try:
+            daemon = AutomationDaemon(host, int(port), debugger_address=args.debugger_address,
+                                      managed_chrome=managed_chrome_from_args(args),
+                                      token_file=args.token_file)
+        except OSError as e:
+            logger.error(f"デーモンを起動できません（{args.address}）: {e}")
+            return 1
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("ユーザーによって停止されました")
+        return 0
+
+    client = DaemonClient(args.address, token_file=args.token_file)
+    try:
+        if args.command == "csv":
+            job = client.submit(
+                'bulk', csv=str(Path(args.csv).resolve()), start_date=args.start_date, end_date=args.end_date,
+                concurrency=args.concurrency, resume=args.resume, dry_run=args.dry_run
+            )
+        elif args.command == "check":
+            job = client.submit(
+                'error_check', start_date=args.start_date, end_date=args.end_date, tabs=args.tabs,
+                include_weekends=args.include_weekends, include_holidays=args.include_holidays,
+                holidays=str(Path(args.holidays).resolve()) if args.holidays else None
+            )
+        elif args.command == "status":
+            for job in client.jobs():
+                print(f"#{job['id']} {job['type']:<12} {job['status']:<10} 登録 {job['submitted_at']}")
+            return 0
+        elif args.command == "follow":
+            return follow_job(client, args.job_id)
+        else:
+            client.shutdown()
+            print("デーモンを停止しました")
+            return 0
+    except DaemonError as e:
+        print(f"エラー: {e}")
+        return 1
+
+    print(f"ジョブ #{job['id']} を登録しました（{job['type']}）")
+    if args.follow:
+        return follow_job(client, job['id'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
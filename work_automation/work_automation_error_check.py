@@ -10,7 +10,7 @@ import os
 import time
 import logging
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 # プロジェクトのルートディレクトリをパスに追加
@@ -19,6 +19,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 from classes.work_time_automation import WorkTimeAutomation
 from classes.bulk_automation import BulkWorkAutomation
 from classes.csv_processor import WorkDataCSVProcessor
+from classes.resource_blocking import ResourceBlockingProfile
+from classes.chrome_launcher import add_launch_arguments, managed_chrome_from_args
+from classes.error_scanner import RangeErrorScanner, load_holidays
 
 
 def setup_logging():
@@ -60,6 +63,47 @@ def main():
         help="終了日（YYYY-MM-DD形式）"
     )
     
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=4,
+        help="並列に使用するタブ数（デフォルト: 4）"
+    )
+    
+    parser.add_argument(
+        "--include-weekends",
+        action="store_true",
+        help="土日もチェックする"
+    )
+    
+    parser.add_argument(
+        "--holidays",
+        help="祝日一覧ファイル（1行1日付 YYYY-MM-DD）。指定した祝日はチェックしない"
+    )
+    
+    parser.add_argument(
+        "--include-holidays",
+        action="store_true",
+        help="祝日もチェックする"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=["selenium", "cdp"],
+        default="selenium",
+        help="ブラウザ操作の方式（cdp: chromedriverを経由せずDevToolsプロトコルで直接操作、デフォルト: selenium）"
+    )
+    
+    parser.add_argument(
+        "--block-resources",
+        nargs="?",
+        const="default",
+        metavar="PROFILE",
+        help="画像・フォント・アクセス解析などの不要な通信をブロック（PROFILE: 設定JSONファイル、省略時は既定の設定）"
+    )
+    
+    add_launch_arguments(parser)
+    
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -89,18 +133,23 @@ def main():
         logger.error("日付形式が正しくありません（YYYY-MM-DD形式で指定してください）")
         return 1
     
+    holidays = load_holidays(args.holidays) if args.holidays else set()
+    
     # ドライランの場合
     if args.dry_run:
         logger.info("ドライランモード: 日付の確認のみ実行")
-        current = start_date
-        check_count = 0
+        scanner = RangeErrorScanner(
+            None,
+            include_weekends=args.include_weekends,
+            holidays=holidays,
+            include_holidays=args.include_holidays
+        )
+        target_dates = scanner.target_dates(args.start_date, args.end_date)
         
-        while current <= end_date:
-            logger.info(f"  - {current.strftime('%Y-%m-%d')}")
-            current += timedelta(days=1)
-            check_count += 1
+        for target in target_dates:
+            logger.info(f"  - {target.strftime('%Y-%m-%d')}")
             
-        logger.info(f"チェック対象: {check_count}日分")
+        logger.info(f"チェック対象: {len(target_dates)}日分")
         return 0
     
     # Chromeブラウザに接続
@@ -113,7 +162,14 @@ def main():
         csv_processor = WorkDataCSVProcessor(None)
         
         # 自動化インスタンスの作成
-        automation = WorkTimeAutomation.connect_to_existing_chrome()
+        blocking = ResourceBlockingProfile.from_option(args.block_resources)
+        managed = managed_chrome_from_args(args, blocking.launch_arguments() if blocking else None)
+        if managed:
+            automation = WorkTimeAutomation.launch_managed_chrome(managed, backend=args.backend)
+        else:
+            automation = WorkTimeAutomation.connect_to_existing_chrome(backend=args.backend)
+        if blocking:
+            automation.set_resource_blocking(blocking)
         bulk_automation = BulkWorkAutomation(automation, csv_processor)
         
         logger.info("接続成功")
@@ -123,8 +179,13 @@ def main():
         
         error_results = bulk_automation.check_errors_only(
             args.start_date,
-            args.end_date
+            args.end_date,
+            tabs=args.tabs,
+            include_weekends=args.include_weekends,
+            holidays=holidays,
+            include_holidays=args.include_holidays
         )
+        stats = bulk_automation.error_scan_stats
         
         # 結果のサマリー表示
         logger.info("\n" + "=" * 50)
@@ -145,6 +206,8 @@ def main():
                 logger.info(f"{date}: エラーなし")
         
         logger.info(f"\n合計: {total_errors}件のエラー（{len(error_dates)}日分）")
+        logger.info(f"処理速度: {stats['days_per_minute']:.1f}日/分（{stats['days']}日 / {stats['elapsed']:.1f}秒, タブ数={stats['tabs']}）")
+        logger.info(f"結果CSV: {stats['output_file']}")
         
         if total_errors > 0:
             logger.warning(f"\n⚠️ エラーが検出されました。")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+複数担当者の一括入力ツール
+
+担当者ごとのChromeプロファイル（デバッグポート別）を起動または接続し、
+構成ファイルに書かれた (担当者, CSV) のジョブを並列に処理します。
+
+構成ファイルの例（pool.json）:
+    {
+      "chrome_path": "C:/Program Files/Google/Chrome/Application/chrome.exe",
+      "workers": [
+        {"name": "yamada", "port": 9222, "user_data_dir": "C:/temp/chrome_yamada",
+         "jobs": [{"employee": "山田", "csv": "yamada_202401.csv"}]},
+        {"name": "suzuki", "port": 9223, "user_data_dir": "C:/temp/chrome_suzuki",
+         "jobs": [{"employee": "鈴木", "csv": "suzuki_202401.csv"}]}
+      ]
+    }
+"""
+import sys
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from classes.browser_pool import BrowserWorkerPool, load_pool_config
+
+
+def setup_logging():
+    """ログ設定の初期化"""
+    log_dir = Path(__file__).parent / "logs"
+    log_dir.mkdir(exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = log_dir / f"work_automation_pool_{timestamp}.log"
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="複数担当者の一括入力ツール"
+    )
+
+    parser.add_argument(
+        "--config",
+        required=True,
+        help="ワーカー構成ファイル（JSON）"
+    )
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        default=2,
+        help="ワーカーごとの再起動の上限（デフォルト: 2）"
+    )
+    parser.add_argument(
+        "--heartbeat-timeout",
+        type=int,
+        default=600,
+        help="進捗が途絶えたワーカーを再起動するまでの秒数（デフォルト: 600）"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="構成の確認のみ実行"
+    )
+    parser.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="開始前の確認を省略（タスクスケジューラ等からの非対話実行用）"
+    )
+
+    args = parser.parse_args()
+
+    logger = setup_logging()
+    logger.info("複数担当者の一括入力ツールを開始します")
+
+    try:
+        config = load_pool_config(args.config)
+    except (OSError, ValueError) as e:
+        logger.error(f"構成ファイルの読み込みに失敗しました: {e}")
+        return 1
+
+    for worker in config['workers']:
+        logger.info(f"[{worker['name']}] ポート{worker['port']} {worker.get('user_data_dir', '（起動済みChromeに接続）')}")
+        for job in worker['jobs']:
+            logger.info(f"  - {job['employee']}: {job['csv']}")
+
+    if args.dry_run:
+        logger.info("ドライランモードで実行しました（実際の入力は行われません）")
+        return 0
+
+    if not args.yes:
+        response = input("\n処理を開始しますか？ (y/n): ")
+        if response.lower() != 'y':
+            logger.info("処理をキャンセルしました")
+            return 0
+
+    try:
+        pool = BrowserWorkerPool(
+            config,
+            max_restarts=args.max_restarts,
+            heartbeat_timeout=args.heartbeat_timeout
+        )
+        success = pool.run()
+        logger.info(f"処理結果を保存しました: {pool.results_file}")
+        return 0 if success else 1
+
+    except KeyboardInterrupt:
+        logger.info("ユーザーによって処理が中断されました")
+        return 1
+    except Exception as e:
+        logger.error(f"予期しないエラーが発生しました: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())